@@ -0,0 +1,46 @@
+#################################################################################
+# Benchmark 01: Torchreid -> Per-person recognize() vs batched recognizeBatch()
+#################################################################################
+
+import time
+import cv2
+
+from pyppbox.config.myconfig import MyConfigurator
+from pyppbox.modules.reiders.torchreid import MyTorchreid
+
+
+internal_configs = MyConfigurator()
+internal_configs.setAllRCFG()
+reider = MyTorchreid(internal_configs.rcfg_torchreid, auto_load=True)
+model_wh = internal_configs.rcfg_torchreid.model_wh
+
+image = cv2.imread("../../examples/data/gta.jpg")
+(h, w) = image.shape[:2]
+
+repeat = 10 # Number of measured frames for each number of people
+
+print("people | loop (ms/frame) | batch (ms/frame) | speedup")
+for num_people in [1, 2, 4, 8, 16, 32]:
+
+    # Fake a frame with `num_people` people
+    miniframes = []
+    for i in range(num_people):
+        x1 = int((i * 37) % (w - 64))
+        y1 = int((i * 53) % (h - 128))
+        miniframes.append(cv2.resize(image[y1:y1 + 128, x1:x1 + 64], model_wh))
+
+    # Warm up
+    reider.recognizeBatch(miniframes)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loop_res = [reider.recognize(m) for m in miniframes]
+    loop_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        batch_res = reider.recognizeBatch(miniframes)
+    batch_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    assert [r[0] for r in loop_res] == [r[0] for r in batch_res]
+    print(f"{num_people:6d} | {loop_ms:15.2f} | {batch_ms:16.2f} | {loop_ms / batch_ms:6.2f}x")
@@ -0,0 +1,58 @@
+#################################################################################
+# Benchmark 02: Torchreid -> SVC vs GalleryClassifier on the GTA5 dataset
+#################################################################################
+
+import time
+import numpy as np
+from sklearn.svm import SVC
+
+from pyppbox.config.myconfig import MyConfigurator
+from pyppbox.modules.reiders.torchreid import MyTorchreid
+from pyppbox.modules.reiders.torchreid.utils import get_dataset, get_image_paths_and_labels
+from pyppbox.modules.reiders.gallery import GalleryClassifier
+
+
+internal_configs = MyConfigurator()
+internal_configs.setAllRCFG()
+reider = MyTorchreid(internal_configs.rcfg_torchreid)
+min_confidence = internal_configs.rcfg_torchreid.min_confidence
+
+dataset = get_dataset(internal_configs.rcfg_torchreid.train_data)
+paths, labels = get_image_paths_and_labels(dataset)
+labels = np.asarray(labels)
+embeddings = reider.extractor(paths).cpu().numpy()
+
+# Keep every 5th image of each identity for testing
+test_mask = np.zeros(len(labels), dtype=bool)
+for label in np.unique(labels):
+    test_mask[np.flatnonzero(labels == label)[::5]] = True
+train_x, train_y = embeddings[~test_mask], labels[~test_mask]
+test_x, test_y = embeddings[test_mask], labels[test_mask]
+print(f"identities = {len(dataset)}, train = {len(train_y)}, test = {len(test_y)}")
+
+classifiers = {
+    'SVC': SVC(C=1.0, kernel='rbf', probability=True, decision_function_shape='ovr'),
+    'Gallery': GalleryClassifier(mode='gallery'),
+    'Centroid': GalleryClassifier(mode='centroid'),
+}
+
+print("classifier | fit (s) | accuracy | accepted | one-by-one (ms/query) | batch (ms/query)")
+for name, classifier in classifiers.items():
+    start = time.perf_counter()
+    classifier.fit(train_x, train_y)
+    fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for x in test_x:
+        classifier.predict_proba(x.reshape(1, -1))
+    single_ms = 1000 * (time.perf_counter() - start) / len(test_x)
+
+    start = time.perf_counter()
+    probas = classifier.predict_proba(test_x)
+    batch_ms = 1000 * (time.perf_counter() - start) / len(test_x)
+
+    best = np.argmax(probas, axis=1)
+    accuracy = float(np.mean(classifier.classes_[best] == test_y))
+    accepted = float(np.mean(probas[np.arange(len(best)), best] >= min_confidence))
+    print(f"{name:>10} | {fit_s:7.2f} | {accuracy:8.3f} | {accepted:8.3f} | "
+          f"{single_ms:21.3f} | {batch_ms:16.3f}")
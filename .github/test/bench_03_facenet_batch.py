@@ -0,0 +1,52 @@
+#################################################################################
+# Benchmark 03: FaceNet -> Per-face recognize() vs batched recognizeBatch()
+#################################################################################
+
+import time
+import cv2
+
+from pyppbox.standalone import setMainModules, detectPeople
+from pyppbox.config.myconfig import MyConfigurator
+from pyppbox.modules.reiders.facenet import MyFaceNet
+
+
+internal_configs = MyConfigurator()
+internal_configs.setAllRCFG()
+reider = MyFaceNet(internal_configs.rcfg_facenet, auto_load=True)
+yl_h = internal_configs.rcfg_facenet.yl_h_calibration
+yl_w = internal_configs.rcfg_facenet.yl_w_calibration
+
+setMainModules(main_yaml={'detector': 'YOLO_Classic', 'tracker': 'None', 'reider': 'None'})
+image = cv2.imread("../../examples/data/gta.jpg")
+people, _ = detectPeople(image, img_is_mat=True)
+assert len(people) > 0
+
+# The same face regions as MT.reidPeople()
+faces = []
+for person in people:
+    (x, y) = person.repspoint
+    faces.append(image[y + int(yl_h[0]):y + int(yl_h[1]), x + int(yl_w[0]):x + int(yl_w[1])])
+
+repeat = 10 # Number of measured frames for each number of people
+
+print("people | loop (ms/frame) | batch (ms/frame) | speedup")
+for num_people in [1, 2, 4, 8, 16]:
+
+    # Fake a frame with `num_people` people by repeating the detected ones
+    miniframes = [faces[i % len(faces)] for i in range(num_people)]
+
+    # Warm up
+    reider.recognizeBatch(miniframes)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loop_res = [reider.recognize(m) for m in miniframes]
+    loop_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        batch_res = reider.recognizeBatch(miniframes)
+    batch_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    assert [r[0] for r in loop_res] == [r[0] for r in batch_res]
+    print(f"{num_people:6d} | {loop_ms:15.2f} | {batch_ms:16.2f} | {loop_ms / batch_ms:6.2f}x")
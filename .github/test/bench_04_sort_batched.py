@@ -0,0 +1,48 @@
+#################################################################################
+# Benchmark 04: SORT -> Classic (filterpy per track) vs Batched (stacked arrays)
+#################################################################################
+
+import time
+import numpy as np
+
+from pyppbox.utils.persontools import Person
+from pyppbox.modules.trackers.sort.origin.sort import Sort, KalmanBoxTracker
+from pyppbox.modules.trackers.sort.batched import BatchedSort
+
+
+num_frames = 50 # Number of measured frames for each number of tracks
+
+def makeFrames(num_tracks, seed=0):
+    # People moving on a large canvas, so most of them do not overlap
+    rng = np.random.default_rng(seed)
+    side = int(200 * np.sqrt(num_tracks))
+    pos = rng.uniform(0, side, (num_tracks, 2))
+    vel = rng.normal(0, 2, (num_tracks, 2))
+    size = rng.uniform(30, 90, (num_tracks, 2)) * [1, 2]
+    frames = []
+    for _ in range(num_frames):
+        pos += vel + rng.normal(0, 0.5, (num_tracks, 2))
+        boxes = np.concatenate([pos, pos + size], axis=1).astype(int)
+        frames.append([(box, float(conf)) for box, conf in zip(boxes, rng.uniform(0.5, 1.0, num_tracks))])
+    return frames
+
+def run(engine, frames):
+    KalmanBoxTracker.count = 0
+    tracker = engine(max_age=1, min_hits=3, iou_threshold=0.3)
+    cids = []
+    elapsed = 0.0
+    for frame in frames:
+        people = [Person(i, i, box_xyxy=box, det_conf=conf) for i, (box, conf) in enumerate(frame)]
+        start = time.perf_counter()
+        tracker.update_pyppbox(people)
+        elapsed += time.perf_counter() - start
+        cids.append([p.cid for p in people])
+    return cids, 1000 * elapsed / len(frames)
+
+print("tracks | classic (ms/frame) | batched (ms/frame) | speedup")
+for num_tracks in [10, 50, 100, 500, 1000, 2000]:
+    frames = makeFrames(num_tracks)
+    classic_cids, classic_ms = run(Sort, frames)
+    batched_cids, batched_ms = run(BatchedSort, frames)
+    assert classic_cids == batched_cids
+    print(f"{num_tracks:6d} | {classic_ms:18.2f} | {batched_ms:18.2f} | {classic_ms / batched_ms:6.2f}x")
@@ -0,0 +1,53 @@
+#################################################################################
+# Benchmark 05: DeepSORT -> Per-track Kalman filter vs batched Kalman filter
+#################################################################################
+
+import time
+import numpy as np
+
+from pyppbox.modules.trackers.deepsort.origin.kalman_filter import KalmanFilter
+
+
+repeat = 20 # Number of measured frames for each number of tracks
+
+kf = KalmanFilter()
+
+def makeStates(num_tracks, seed=0):
+    rng = np.random.default_rng(seed)
+    side = 200 * np.sqrt(num_tracks)
+    boxes = np.stack([rng.uniform(0, side, num_tracks),
+                      rng.uniform(0, side, num_tracks),
+                      rng.uniform(0.3, 0.6, num_tracks),
+                      rng.uniform(80, 200, num_tracks)], axis=1)
+    mean, covariance = kf.initiate_batch(boxes)
+    measurements = boxes + rng.normal(0, 1, boxes.shape)
+    return mean, covariance, measurements
+
+def loop(mean, covariance, measurements):
+    states = [kf.predict(m, c) for m, c in zip(mean, covariance)]
+    gating = np.stack([kf.gating_distance(m, c, measurements) for m, c in states])
+    states = [kf.update(m, c, z) for (m, c), z in zip(states, measurements)]
+    return np.stack([m for m, _ in states]), gating
+
+def batch(mean, covariance, measurements):
+    mean, covariance = kf.predict_batch(mean, covariance)
+    gating = kf.gating_distance_batch(mean, covariance, measurements)
+    mean, covariance = kf.update_batch(mean, covariance, measurements)
+    return mean, gating
+
+print("tracks | loop (ms/frame) | batch (ms/frame) | speedup")
+for num_tracks in [10, 50, 100, 500, 1000]:
+    mean, covariance, measurements = makeStates(num_tracks)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loop_mean, loop_gating = loop(mean, covariance, measurements)
+    loop_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        batch_mean, batch_gating = batch(mean, covariance, measurements)
+    batch_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    assert np.allclose(loop_mean, batch_mean) and np.allclose(loop_gating, batch_gating)
+    print(f"{num_tracks:6d} | {loop_ms:15.2f} | {batch_ms:16.2f} | {loop_ms / batch_ms:6.2f}x")
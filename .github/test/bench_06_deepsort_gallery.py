@@ -0,0 +1,55 @@
+#################################################################################
+# Benchmark 06: DeepSORT -> Dict of lists gallery vs ring-buffer gallery
+#################################################################################
+
+import time
+import numpy as np
+
+from pyppbox.modules.trackers.deepsort.origin.nn_matching import (NearestNeighborDistanceMetric, 
+                                                                   _nn_cosine_distance)
+
+
+class ListGallery(object):
+
+    # The previous dict of lists gallery, kept here as the baseline
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.samples = {}
+
+    def partial_fit(self, features, targets, active_targets):
+        for feature, target in zip(features, targets):
+            self.samples.setdefault(target, []).append(feature)
+            self.samples[target] = self.samples[target][-self.budget:]
+        self.samples = {k: self.samples[k] for k in active_targets}
+
+    def distance(self, features, targets):
+        cost_matrix = np.zeros((len(targets), len(features)))
+        for i, target in enumerate(targets):
+            cost_matrix[i, :] = _nn_cosine_distance(self.samples[target], features)
+        return cost_matrix
+
+
+budget = 100     # Same as nn_budget of the default config
+dim = 128        # Same as the features of mars-small128
+num_frames = 30  # Number of measured frames for each number of tracks
+
+def run(gallery, num_tracks, seed=0):
+    rng = np.random.default_rng(seed)
+    targets = np.arange(num_tracks)
+    elapsed = 0.0
+    for _ in range(num_frames):
+        features = rng.normal(size=(num_tracks, dim)).astype(np.float32)
+        start = time.perf_counter()
+        gallery.partial_fit(features, targets, targets.tolist())
+        cost_matrix = gallery.distance(features, targets.tolist())
+        elapsed += time.perf_counter() - start
+    return cost_matrix, 1000 * elapsed / num_frames
+
+print("tracks | lists (ms/frame) | ring fp32 (ms/frame) | ring fp16 (ms/frame) | speedup fp32")
+for num_tracks in [10, 50, 100, 200, 500]:
+    list_cost, list_ms = run(ListGallery(budget), num_tracks)
+    ring_cost, ring_ms = run(NearestNeighborDistanceMetric("cosine", 0.2, budget), num_tracks)
+    half_cost, half_ms = run(NearestNeighborDistanceMetric("cosine", 0.2, budget, half=True), num_tracks)
+    assert np.allclose(list_cost, ring_cost, atol=1e-4) and np.allclose(list_cost, half_cost, atol=1e-2)
+    print(f"{num_tracks:6d} | {list_ms:16.2f} | {ring_ms:20.2f} | {half_ms:20.2f} | {list_ms / ring_ms:6.2f}x")
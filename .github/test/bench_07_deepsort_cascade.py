@@ -0,0 +1,93 @@
+#################################################################################
+# Benchmark 07: DeepSORT -> Matching cascade with a cost matrix per level vs shared
+#################################################################################
+
+import time
+import numpy as np
+
+from scipy.optimize import linear_sum_assignment
+
+from pyppbox.modules.trackers.deepsort.origin import linear_assignment
+from pyppbox.modules.trackers.deepsort.origin.nn_matching import NearestNeighborDistanceMetric
+
+
+class FakeTrack(object):
+
+    def __init__(self, time_since_update):
+        self.time_since_update = time_since_update
+
+
+def perLevelMatching(distance_metric, max_distance, tracks, detections, track_indices, 
+                     detection_indices):
+    # The previous matching, kept here as the baseline
+    if len(detection_indices) == 0 or len(track_indices) == 0:
+        return [], track_indices, detection_indices
+    cost_matrix = distance_metric(tracks, detections, track_indices, detection_indices)
+    cost_matrix[cost_matrix > max_distance] = max_distance + 1e-5
+    indices = np.transpose(np.asarray(linear_sum_assignment(cost_matrix)))
+    matches, unmatched_tracks, unmatched_detections = [], [], []
+    for col, detection_idx in enumerate(detection_indices):
+        if col not in indices[:, 1]: unmatched_detections.append(detection_idx)
+    for row, track_idx in enumerate(track_indices):
+        if row not in indices[:, 0]: unmatched_tracks.append(track_idx)
+    for row, col in indices:
+        if cost_matrix[row, col] > max_distance:
+            unmatched_tracks.append(track_indices[row])
+            unmatched_detections.append(detection_indices[col])
+        else:
+            matches.append((track_indices[row], detection_indices[col]))
+    return matches, unmatched_tracks, unmatched_detections
+
+def perLevelCascade(distance_metric, max_distance, cascade_depth, tracks, detections, 
+                    track_indices, detection_indices):
+    # The previous cascade, kept here as the baseline
+    unmatched_detections = detection_indices
+    matches = []
+    for level in range(cascade_depth):
+        if len(unmatched_detections) == 0: break
+        track_indices_l = [k for k in track_indices if tracks[k].time_since_update == 1 + level]
+        if len(track_indices_l) == 0: continue
+        matches_l, _, unmatched_detections = perLevelMatching(
+            distance_metric, max_distance, tracks, detections, track_indices_l, unmatched_detections)
+        matches += matches_l
+    unmatched_tracks = list(set(track_indices) - set(k for k, _ in matches))
+    return matches, unmatched_tracks, unmatched_detections
+
+
+max_age = 30
+repeat = 10 # Number of measured frames for each number of tracks
+
+print("tracks | per level (ms/frame) | shared (ms/frame) | speedup")
+for num_tracks in [10, 50, 100, 500, 1000]:
+    rng = np.random.default_rng(0)
+    # Most tracks are matched every frame, the others are missed for up to max_age frames
+    tracks = [FakeTrack(1 if rng.random() < 0.7 else int(rng.integers(2, max_age + 1))) 
+              for _ in range(num_tracks)]
+    detections = list(range(int(0.8 * num_tracks)))
+    # A gallery of 20 samples per track, and detections near the first tracks
+    centers = rng.normal(size=(num_tracks, 128)).astype(np.float32)
+    metric = NearestNeighborDistanceMetric("cosine", 0.2, 100)
+    for _ in range(20):
+        metric.partial_fit(centers + rng.normal(0, 0.3, centers.shape).astype(np.float32), 
+                           np.arange(num_tracks), list(range(num_tracks)))
+    features = centers[rng.permutation(num_tracks)[:len(detections)]] + \
+        rng.normal(0, 0.3, (len(detections), 128)).astype(np.float32)
+
+    def distance_metric(tracks, dets, track_indices, detection_indices):
+        return metric.distance(features[detection_indices], list(track_indices))
+
+    args = (distance_metric, 0.2, max_age, tracks, detections, 
+            list(range(num_tracks)), list(range(len(detections))))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        level_res = perLevelCascade(*args)
+    level_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        once_res = linear_assignment.matching_cascade(*args)
+    once_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    assert level_res[0] == once_res[0] and level_res[2] == once_res[2]
+    print(f"{num_tracks:6d} | {level_ms:20.2f} | {once_ms:17.2f} | {level_ms / once_ms:6.2f}x")
@@ -0,0 +1,97 @@
+#################################################################################
+# Benchmark 08: Centroid, SORT, DeepSORT -> Dense vs sparse association in crowds
+#################################################################################
+
+import time
+import numpy as np
+
+from pyppbox.config.myconfig import TCFGCentroid
+from pyppbox.utils.persontools import Person
+from pyppbox.modules.trackers.centroid import MyCentroid
+from pyppbox.modules.trackers.sort.origin.sort import KalmanBoxTracker
+from pyppbox.modules.trackers.sort.batched import BatchedSort
+from pyppbox.modules.trackers.deepsort.origin.tracker import Tracker
+from pyppbox.modules.trackers.deepsort.origin.detection import Detection
+from pyppbox.modules.trackers.deepsort.origin.nn_matching import NearestNeighborDistanceMetric
+
+
+num_frames = 30 # Number of measured frames for each number of people
+
+def makeFrames(num_people, seed=0):
+    # A crowd with about 4 people per 200x200 pixels, where about 5% of the people 
+    # leave each frame and as many new people enter somewhere else
+    rng = np.random.default_rng(seed)
+    side = int(100 * np.sqrt(num_people))
+    pos = rng.uniform(0, side, (num_people, 2))
+    vel = rng.normal(0, 2, (num_people, 2))
+    size = rng.uniform(20, 40, (num_people, 2)) * [1, 2]
+    idents = np.arange(num_people)
+    frames = []
+    for _ in range(num_frames):
+        new = rng.random(num_people) < 0.05
+        pos[new] = rng.uniform(0, side, (new.sum(), 2))
+        idents[new] = idents.max() + 1 + np.arange(new.sum())
+        pos += vel + rng.normal(0, 0.5, (num_people, 2))
+        boxes = np.concatenate([pos, pos + size], axis=1).astype(int)
+        frames.append((boxes, idents.copy()))
+    return frames
+
+def runSORT(sparse, frames):
+    KalmanBoxTracker.count = 0
+    tracker = BatchedSort(max_age=1, min_hits=3, iou_threshold=0.3, sparse=sparse)
+    cids = []
+    elapsed = 0.0
+    for boxes, _ in frames:
+        people = [Person(i, i, box_xyxy=box, det_conf=0.9) for i, box in enumerate(boxes)]
+        start = time.perf_counter()
+        tracker.update_pyppbox(people)
+        elapsed += time.perf_counter() - start
+        cids.append([p.cid for p in people])
+    return cids, 1000 * elapsed / len(frames)
+
+def runCentroid(sparse, frames):
+    cfg = TCFGCentroid()
+    cfg.set({'tk_name': 'Centroid', 'max_spread': 16, 'sparse': sparse})
+    tracker = MyCentroid(cfg)
+    cids = []
+    elapsed = 0.0
+    for boxes, _ in frames:
+        people = [Person(i, i, box_xyxy=box, repspoint=((box[0] + box[2]) // 2, (box[1] + box[3]) // 2)) 
+                  for i, box in enumerate(boxes)]
+        start = time.perf_counter()
+        tracker.update(people)
+        elapsed += time.perf_counter() - start
+        cids.append([p.cid for p in people])
+    return cids, 1000 * elapsed / len(frames)
+
+def runDeepSORT(sparse, frames):
+    rng = np.random.default_rng(0)
+    order = np.random.default_rng(1) # Same shuffled detection order for dense and sparse
+    features = rng.normal(size=(frames[-1][1].max() + 1, 128))
+    tracker = Tracker(NearestNeighborDistanceMetric("cosine", 0.2, 100), sparse=sparse)
+    ids = []
+    elapsed = 0.0
+    for boxes, idents in frames:
+        noisy = features[idents] + rng.normal(0, 0.2, (len(idents), 128))
+        detections = [Detection(np.array([b[0], b[1], b[2] - b[0], b[3] - b[1]], dtype=np.float64), 
+                                0.9, "person", f / np.linalg.norm(f)) 
+                      for b, f in zip(boxes, noisy)]
+        detections = [detections[i] for i in order.permutation(len(detections))]
+        start = time.perf_counter()
+        tracker.predict()
+        tracker.update(detections)
+        elapsed += time.perf_counter() - start
+        ids.append(sorted((int(t.track_id), tuple(np.round(t.to_tlwh(), 3))) for t in tracker.tracks))
+    return ids, 1000 * elapsed / len(frames)
+
+for name, run in [("SORT", runSORT), ("Centroid", runCentroid), ("DeepSORT", runDeepSORT)]:
+    # Both give the same cost, but the solvers may break the ties of equal distances differently, 
+    # and sparse DeepSORT may start the new tracks in another order, so their IDs can differ
+    print(f"{name}: people | dense (ms/frame) | sparse (ms/frame) | speedup | same IDs")
+    for num_people in [100, 500, 1000, 2000]:
+        frames = makeFrames(num_people)
+        dense_cids, dense_ms = run(False, frames)
+        sparse_cids, sparse_ms = run(True, frames)
+        same = np.mean([np.mean([a == b for a, b in zip(d, s)]) if len(d) == len(s) else 0.0 
+                        for d, s in zip(dense_cids, sparse_cids)])
+        print(f"{num_people:6d} | {dense_ms:16.2f} | {sparse_ms:17.2f} | {dense_ms / sparse_ms:6.2f}x | {100 * same:7.2f}%")
@@ -0,0 +1,64 @@
+#################################################################################
+# Benchmark 09: YOLO_Classic -> Per-box makePeople() loop vs array-native makeArrays()
+#################################################################################
+
+import time
+import numpy as np
+
+from pyppbox.config.myconfig import MyConfigurator
+from pyppbox.modules.detectors.yolocls import MyYOLOCLS
+from pyppbox.utils.persontools import Person, findRepspoint
+from pyppbox.utils.commontools import to_xyxy
+
+
+internal_configs = MyConfigurator()
+internal_configs.setAllDCFG()
+detector = MyYOLOCLS(internal_configs.dcfg_yolocs)
+calibration = internal_configs.dcfg_yolocs.repspoint_calibration
+
+def loopPeople(det, min_width_filter=15):
+    # The per-box postprocessing of makePeople() before it became array-native
+    people = []
+    classes, confidences, boxes = det
+    if len(classes) > 0:
+        i = 0
+        for class_id, conf, box_xywh in zip(classes.flatten(), confidences, boxes):
+            if class_id == 0 and box_xywh[2] >= min_width_filter:
+                box_xywh = box_xywh.astype(int)
+                box_xyxy = to_xyxy(box_xywh)
+                repspoint = findRepspoint(box_xyxy, calibration)
+                people.append(Person(i, i, box_xywh=box_xywh, box_xyxy=box_xyxy, 
+                                     repspoint=repspoint, det_conf=float(conf)))
+                i += 1
+    return people
+
+def makeDet(num_boxes, seed=0):
+    # Boxes in the same format as cv::dnn::DetectionModel.detect(), some of them are too narrow
+    rng = np.random.default_rng(seed)
+    xy = rng.integers(0, 1920, (num_boxes, 2))
+    wh = rng.integers(5, 200, (num_boxes, 2))
+    boxes = np.concatenate([xy, wh], axis=1).astype(np.int32)
+    return (np.zeros((num_boxes, 1), dtype=np.int32), rng.uniform(0.5, 1.0, num_boxes).astype(np.float32), boxes)
+
+repeat = 50 # Number of measured frames for each number of boxes
+
+print("boxes | loop (ms/frame) | array (ms/frame) | speedup")
+for num_boxes in [10, 100, 1000, 10000]:
+
+    det = makeDet(num_boxes)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loop_people = loopPeople(det)
+    loop_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        array_people, _ = detector.makePeople(None, det, visual=False)
+    array_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    assert len(loop_people) == len(array_people)
+    for p, q in zip(loop_people, array_people):
+        assert p.cid == q.cid and p.repspoint == q.repspoint and p.det_conf == q.det_conf
+        assert np.array_equal(p.box_xywh, q.box_xywh) and np.array_equal(p.box_xyxy, q.box_xyxy)
+    print(f"{num_boxes:5d} | {loop_ms:15.2f} | {array_ms:16.2f} | {loop_ms / array_ms:6.2f}x")
@@ -0,0 +1,66 @@
+#################################################################################
+# Benchmark 10: People -> list[Person] vs columnar PeopleFrame
+#################################################################################
+
+import time
+import tracemalloc
+import numpy as np
+
+from copy import deepcopy
+from pyppbox.utils.persontools import Person, PeopleFrame
+
+
+def makeArrays(num_people, seed=0):
+    # Detections like the ones of YOLO_Ultralytics with a pose model
+    rng = np.random.default_rng(seed)
+    xy = rng.integers(0, 1920, (num_people, 2))
+    boxes_xyxy = np.concatenate([xy, xy + rng.integers(20, 200, (num_people, 2))], axis=1)
+    repspoints = np.stack([(boxes_xyxy[:, 0] + boxes_xyxy[:, 2]) // 2, boxes_xyxy[:, 1]], axis=1)
+    return boxes_xyxy, repspoints, rng.uniform(0.5, 1.0, num_people), rng.uniform(0, 1, (num_people, 17, 3))
+
+def makeList(boxes_xyxy, repspoints, confs, keypoints):
+    return [Person(i, i, box_xywh=np.concatenate([b[:2], b[2:] - b[:2]]), box_xyxy=b, keypoints=k.astype(np.float32), 
+                   repspoint=tuple(r), det_conf=float(c)) 
+            for i, (b, r, c, k) in enumerate(zip(boxes_xyxy, repspoints.tolist(), confs, keypoints))]
+
+def makeFrame(boxes_xyxy, repspoints, confs, keypoints):
+    return PeopleFrame(boxes_xyxy=boxes_xyxy, repspoints=repspoints, det_confs=confs, keypoints=keypoints)
+
+def measureMemory(make, arrays):
+    tracemalloc.start()
+    people = make(*arrays)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del people
+    return size
+
+def measureTime(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        res = func()
+    return res, 1000 * (time.perf_counter() - start) / repeat
+
+repeat = 20 # Number of measured runs for each number of people
+
+print("people | list (B/person) | frame (B/person) | dets list (ms) | dets frame (ms) | copy list (ms) | copy frame (ms)")
+for num_people in [10, 100, 1000, 10000]:
+
+    arrays = makeArrays(num_people)
+    list_bytes = measureMemory(makeList, arrays) / num_people
+    frame_bytes = measureMemory(makeFrame, arrays) / num_people
+
+    people = makeList(*arrays)
+    frame = makeFrame(*arrays)
+
+    # The detections given to SORT
+    list_dets, list_dets_ms = measureTime(lambda: np.vstack([p.getDetRS() for p in people]).astype(np.float32), repeat)
+    frame_dets, frame_dets_ms = measureTime(lambda: frame.getDets(), repeat)
+    assert np.array_equal(list_dets, frame_dets)
+
+    # The copy kept by ResIO.addPeople()
+    list_copy, list_copy_ms = measureTime(lambda: [deepcopy(p) for p in people], repeat)
+    frame_copy, frame_copy_ms = measureTime(lambda: frame.copy(), repeat)
+    assert [p.repspoint for p in list_copy] == [p.repspoint for p in frame_copy]
+
+    print(f"{num_people:6d} | {list_bytes:15.0f} | {frame_bytes:16.0f} | {list_dets_ms:14.3f} | "
+          f"{frame_dets_ms:15.3f} | {list_copy_ms:14.3f} | {frame_copy_ms:15.3f}")
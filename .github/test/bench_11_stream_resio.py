@@ -0,0 +1,60 @@
+#################################################################################
+# Benchmark 11: ResIO -> In-memory dump() vs streaming StreamResIO
+#################################################################################
+
+import os
+import time
+import shutil
+import tempfile
+import tracemalloc
+import numpy as np
+
+from pyppbox.utils.persontools import Person
+from pyppbox.utils.restools import ResIO, StreamResIO
+
+
+num_people = 10 # Number of people in each frame
+
+def makeFrame(rng):
+    # People with pose keypoints, like the ones of YOLO_Ultralytics
+    xy = rng.integers(0, 1920, (num_people, 2))
+    boxes = np.concatenate([xy, xy + rng.integers(20, 200, (num_people, 2))], axis=1)
+    return [Person(i, i, box_xywh=np.concatenate([b[:2], b[2:] - b[:2]]), box_xyxy=b, 
+                   keypoints=rng.uniform(0, 1, (17, 3)).astype(np.float32), 
+                   repspoint=(int((b[0] + b[2]) // 2), int(b[1])), deepid=f"ID{i}") 
+            for i, b in enumerate(boxes)]
+
+def run(num_frames, stream, trace=False):
+    rng = np.random.default_rng(0)
+    frames = [makeFrame(rng) for _ in range(16)]
+    dump_dir = tempfile.mkdtemp()
+    # The memory is traced in a separate run since tracing slows everything down
+    if trace: tracemalloc.start()
+    start = time.perf_counter()
+    if stream:
+        with StreamResIO(dump_dir) as res:
+            for frame in range(num_frames):
+                res.addPeople(frame, frames[frame % len(frames)])
+    else:
+        res = ResIO()
+        for frame in range(num_frames):
+            res.addPeople(frame, frames[frame % len(frames)])
+        res.dump(dump_dir)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    files = sorted(os.listdir(dump_dir))
+    text = ''.join(open(os.path.join(dump_dir, f)).read() for f in files)
+    shutil.rmtree(dump_dir)
+    return text, elapsed, peak
+
+print("frames | ResIO (s) | ResIO peak (MB) | StreamResIO (s) | StreamResIO peak (MB)")
+for num_frames in [500, 1000, 2000, 4000]:
+    res_text, res_s, _ = run(num_frames, stream=False)
+    stream_text, stream_s, _ = run(num_frames, stream=True)
+    assert res_text == stream_text
+    res_peak = run(num_frames, stream=False, trace=True)[2]
+    stream_peak = run(num_frames, stream=True, trace=True)[2]
+    print(f"{num_frames:6d} | {res_s:9.2f} | {res_peak / 2**20:15.2f} | {stream_s:15.2f} | {stream_peak / 2**20:21.2f}")
@@ -0,0 +1,77 @@
+#################################################################################
+# Benchmark 12: Results -> Text files vs binary columnar files
+#################################################################################
+
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+
+from pyppbox.utils.persontools import Person
+from pyppbox.utils.restools import BinResWriter, BinResReader, convertBin2Res, convertRes2Bin
+from pyppbox.utils.gttools import GTIO
+from pyppbox.utils.evatools import compareRes2Ref
+from pyppbox.utils.logtools import ignore_this_logger
+
+
+num_people = 10 # Number of people in each frame
+names = ["Lester", "Michael", "Franklin", "Trevor", "Amanda"]
+
+def makeFrame(rng, wrong_ids=0.0):
+    xy = rng.integers(0, 1920, (num_people, 2))
+    boxes = np.concatenate([xy, xy + rng.integers(20, 200, (num_people, 2))], axis=1)
+    ids = rng.integers(0, len(names), num_people)
+    wrong = rng.uniform(0, 1, num_people) < wrong_ids
+    return [Person(i, i, box_xywh=np.concatenate([b[:2], b[2:] - b[:2]]), box_xyxy=b, 
+                   repspoint=(int((b[0] + b[2]) // 2), int(b[1])), 
+                   deepid=names[(ids[i] + wrong[i]) % len(names)], faceid=names[ids[i]]) 
+            for i, b in enumerate(boxes)]
+
+def write(bin_file, num_frames, wrong_ids):
+    rng = np.random.default_rng(0)
+    with BinResWriter(bin_file, id_mode="all") as writer:
+        for frame in range(num_frames):
+            writer.addPeople(frame, makeFrame(rng, wrong_ids))
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    out = func(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+ignore_this_logger("pyppbox.utils.logtools") # Not every wrong ID
+print("records | text (MB) | bin (MB) | loadGT text (s) | loadGT bin (s) | reader (s) | compare text (s) | compare bin (s)")
+for num_records in [10_000, 50_000, 200_000]:
+    work_dir = tempfile.mkdtemp()
+    res_bin, ref_bin = os.path.join(work_dir, "res.bin"), os.path.join(work_dir, "ref.bin")
+    res_txt, ref_txt = os.path.join(work_dir, "res.txt"), os.path.join(work_dir, "ref.txt")
+    write(res_bin, num_records // num_people, wrong_ids=0.1)
+    write(ref_bin, num_records // num_people, wrong_ids=0.0)
+    convertBin2Res(res_bin, res_txt)
+    convertBin2Res(ref_bin, ref_txt)
+
+    # The text converted back has the same records, only the cids are lost
+    convertRes2Bin(res_txt, os.path.join(work_dir, "back.bin"), id_mode="all")
+    res, back = BinResReader(res_bin), BinResReader(os.path.join(work_dir, "back.bin"))
+    assert (res.boxes_xyxy == back.boxes_xyxy).all() and res.getIDs("deepid") == back.getIDs("deepid")
+
+    gt_txt, load_txt_s = timed(GTIO().loadGT, ref_txt)
+    gt_bin, load_bin_s = timed(GTIO().loadGT, ref_bin)
+    assert gt_txt[1:] == gt_bin[1:]
+
+    # Zero-copy columns, the boxes of the last frame are read without touching the others
+    start = time.perf_counter()
+    reader = BinResReader(ref_bin)
+    last = reader.boxes_xyxy[reader.findFrame(int(reader.frame_index[-1]))]
+    reader_s = time.perf_counter() - start
+    assert len(last) == num_people
+
+    txt_counts, compare_txt_s = timed(compareRes2Ref, res_txt, ref_txt, res_box_xyxy_index=5, ref_box_xyxy_index=5)
+    bin_counts, compare_bin_s = timed(compareRes2Ref, res_bin, ref_bin, res_box_xyxy_index=5, ref_box_xyxy_index=5)
+    assert txt_counts == bin_counts
+
+    text_mb = os.path.getsize(res_txt) / 2**20
+    bin_mb = os.path.getsize(res_bin) / 2**20
+    print(f"{num_records:7d} | {text_mb:9.2f} | {bin_mb:8.2f} | {load_txt_s:15.2f} | {load_bin_s:14.2f} | "
+          f"{reader_s:10.4f} | {compare_txt_s:16.2f} | {compare_bin_s:15.2f}")
+    shutil.rmtree(work_dir)
@@ -0,0 +1,81 @@
+#################################################################################
+# Benchmark 13: ResIO -> Per-frame list sort vs one np.lexsort() for dump()
+#################################################################################
+
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+
+from pyppbox.utils.persontools import Person
+from pyppbox.utils.restools import ResIO
+
+
+num_people = 10 # Number of people in each frame
+
+def makeFrame(rng):
+    # Distinct x in a frame, so the order by x is unique
+    xs = rng.choice(1920, num_people, replace=False)
+    ys = rng.integers(0, 1080, num_people)
+    return [Person(i, i, box_xywh=np.array([x, y, 40, 120]), box_xyxy=np.array([x, y, x + 40, y + 120]), 
+                   repspoint=(int(x + 20), int(y)), deepid=f"ID{i}") 
+            for i, (x, y) in enumerate(zip(xs, ys))]
+
+def legacySort(frames, people):
+    # ResIO.__sort_people_by_x__() before the parallel arrays
+    sorted_people = []
+    tmp_x = []
+    tmp_pp = []
+    current_frame = int(frames[0])
+    previous_frame = int(frames[0])
+    for frame, person in zip(frames, people):
+        (x, _) = person.repspoint
+        current_frame = int(frame)
+        if current_frame == previous_frame:
+            tmp_pp.append(person)
+            tmp_x.append(x)
+        elif current_frame > previous_frame:
+            previous_frame = current_frame
+            sorted_idx = np.argsort(tmp_x)
+            tmp_pp_np = np.array(tmp_pp)[sorted_idx]
+            sorted_people = sorted_people + tmp_pp_np.tolist()
+            tmp_pp = []
+            tmp_x = []
+            tmp_pp.append(person)
+            tmp_x.append(x)
+    sorted_idx = np.argsort(tmp_x)
+    tmp_pp_np = np.array(tmp_pp)[sorted_idx]
+    return sorted_people + tmp_pp_np.tolist()
+
+rng = np.random.default_rng(0)
+templates = [makeFrame(rng) for _ in range(64)]
+
+legacy_max = 100_000 # The legacy sort is quadratic, it is skipped beyond
+print(" records | legacy sort (s) | lexsort (s) | dump (s) | dump (MB)")
+for num_records in [10_000, 100_000, 1_000_000, 10_000_000]:
+    res = ResIO()
+    for frame in range(num_records // num_people):
+        # Shuffled, so the people of a frame are sorted by the dump
+        for person in reversed(templates[frame % len(templates)]):
+            res.addPerson(frame, person)
+
+    start = time.perf_counter()
+    order = res.__sort_people_by_x__()
+    lexsort_s = time.perf_counter() - start
+
+    legacy = "-"
+    if num_records <= legacy_max:
+        start = time.perf_counter()
+        legacy_people = legacySort(res.frames, res.people)
+        legacy = f"{time.perf_counter() - start:.2f}"
+        assert legacy_people == [res.people[i] for i in order.tolist()]
+
+    dump_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    res.dump(dump_dir, dump_mode=1)
+    dump_s = time.perf_counter() - start
+    dump_file = os.path.join(dump_dir, os.listdir(dump_dir)[0])
+    dump_mb = os.path.getsize(dump_file) / 2**20
+    shutil.rmtree(dump_dir)
+    print(f"{num_records:8d} | {legacy:>15} | {lexsort_s:11.2f} | {dump_s:8.2f} | {dump_mb:9.1f}")
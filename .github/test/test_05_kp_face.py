@@ -0,0 +1,48 @@
+#################################################################################
+# Test 05: Face boxes from pose keypoints (CPU-Only) -> Pairing with the boxes
+#################################################################################
+
+from types import SimpleNamespace
+import numpy as np
+
+from pyppbox.utils.persontools import findFaceBoxKP
+from pyppbox.modules.detectors.yoloult import MyYOLOULT
+
+
+def makeKeypoints(cx, cy):
+    # Nose, left eye, and right eye of a face centered around (cx, cy), the rest unseen
+    keypoints = np.zeros((17, 3), dtype=np.float32)
+    keypoints[:3] = [[cx, cy + 5, 0.9], [cx + 10, cy - 5, 0.9], [cx - 10, cy - 5, 0.9]]
+    return keypoints
+
+# Two people side by side, each with the keypoints of its own face
+boxes_xyxy = np.array([[100, 100, 200, 400], [400, 120, 500, 420]], dtype=np.float32)
+keypoints = np.stack([makeKeypoints(150, 140), makeKeypoints(450, 160)])
+det = SimpleNamespace(
+    keypoints=keypoints, 
+    numpy=lambda: SimpleNamespace(boxes=SimpleNamespace(xyxy=boxes_xyxy, conf=np.array([0.9, 0.8])), 
+                                  keypoints=SimpleNamespace(data=keypoints))
+)
+detector = SimpleNamespace(cpu_only=True, cfg=SimpleNamespace(repspoint_calibration=0.25))
+(_, dt_boxes_xyxy, _, _, dt_keypoints) = MyYOLOULT.makeArrays(detector, det, min_width_filter=15)
+
+# The keypoints of every person give a face inside its own box
+for box_xyxy, keypoint in zip(dt_boxes_xyxy, dt_keypoints):
+    face_box = findFaceBoxKP(keypoint, box_xyxy=box_xyxy)
+    assert face_box is not None, "The face of a person is not found in its own box"
+    (cx, cy) = ((face_box[0] + face_box[2]) / 2, (face_box[1] + face_box[3]) / 2)
+    assert box_xyxy[0] <= cx <= box_xyxy[2] and box_xyxy[1] <= cy <= box_xyxy[3]
+
+# The keypoints of someone else are rejected, so MTCNN is used instead
+assert findFaceBoxKP(dt_keypoints[1], box_xyxy=dt_boxes_xyxy[0]) is None
+assert findFaceBoxKP(dt_keypoints[0], box_xyxy=dt_boxes_xyxy[1]) is None
+
+# Without a person box, the face box is still found
+assert findFaceBoxKP(dt_keypoints[1]) is not None
+
+# A narrow person is filtered with its own keypoints
+boxes_xyxy[0, 2] = 105
+(_, dt_boxes_xyxy, _, _, dt_keypoints) = MyYOLOULT.makeArrays(detector, det, min_width_filter=15)
+assert len(dt_boxes_xyxy) == 1 and np.array_equal(dt_keypoints[0], keypoints[1])
+
+print("Test 05 passed")
@@ -0,0 +1,70 @@
+#################################################################################
+# Test 06: `DetectorBatcher` (CPU-Only) -> Shutdown never leaves a caller waiting
+#################################################################################
+
+import time
+import threading
+
+from pyppbox.modules.detectors.yolocls import MyYOLOCLS
+from pyppbox.ppb.batching import DetectorBatcher
+
+
+class FakeDetector(MyYOLOCLS):
+
+    # A detector without model, every image has no people
+    def __init__(self, delay=0.001, gate=None):
+        self.delay = delay
+        self.gate = gate
+
+    def predictBatch(self, imgs):
+        if self.gate is not None: self.gate.wait()
+        time.sleep(self.delay)
+        return [None] * len(imgs)
+
+    def makePeople(self, img, det, **kwargs):
+        return [], img
+
+
+# Callers keep submitting while the batcher is stopped
+batcher = DetectorBatcher(FakeDetector(), max_batch_size=4, window_ms=1.0)
+outcomes = []
+outcomes_lock = threading.Lock()
+
+def caller():
+    while True:
+        try:
+            batcher.detectPeople(None)
+            outcome = "done"
+        except RuntimeError:
+            outcome = "stopped"
+        with outcomes_lock:
+            outcomes.append(outcome)
+        if outcome == "stopped": return
+
+callers = [threading.Thread(target=caller, daemon=True) for _ in range(16)]
+for c in callers: c.start()
+time.sleep(0.5)
+batcher.stop()
+for c in callers: c.join(timeout=10)
+assert not any(c.is_alive() for c in callers), "A caller is still waiting after stop()"
+assert outcomes.count("stopped") == len(callers) and "done" in outcomes
+
+# A request waits no longer than its timeout
+gate = threading.Event()
+batcher = DetectorBatcher(FakeDetector(gate=gate), max_batch_size=1, window_ms=1.0)
+start = time.perf_counter()
+try:
+    batcher.detectPeople(None, timeout=0.3)
+    raise AssertionError("No TimeoutError")
+except TimeoutError:
+    assert time.perf_counter() - start < 5
+gate.set()
+assert batcher.detectPeople(None, timeout=5)[0] == []
+batcher.stop()
+try:
+    batcher.detectPeople(None)
+    raise AssertionError("A stopped batcher accepted a request")
+except RuntimeError:
+    pass
+
+print("Test 06 passed")
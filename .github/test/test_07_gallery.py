@@ -0,0 +1,64 @@
+#################################################################################
+# Test 07: Gallery classifier (CPU-Only) -> Rewriting the classifier files
+#################################################################################
+
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+
+from pyppbox.modules.reiders.gallery import (GalleryClassifier, enrollGalleryIdentity, 
+                                             removeGalleryIdentity, dumpClassifier, loadClassifier)
+
+
+rng = np.random.default_rng(0)
+centers = {name: rng.normal(size=128) for name in ["Amanda", "Franklin", "Lester", "Michael", "Trevor"]}
+
+def embed(name, n=4):
+    return centers[name] + 0.05 * rng.normal(size=(n, 128))
+
+work_dir = tempfile.mkdtemp()
+classifier_pkl = os.path.join(work_dir, "gallery.pkl")
+classes_txt = os.path.join(work_dir, "gallery.txt")
+
+names = ["Franklin", "Michael"]
+model = GalleryClassifier().fit(np.concatenate([embed(n) for n in names]), np.repeat(np.arange(2), 4))
+dumpClassifier(classifier_pkl, classes_txt, model, names)
+
+# A reader keeps reloading while identities are enrolled and removed
+errors = []
+stop = threading.Event()
+
+def reader():
+    while not stop.is_set():
+        try:
+            (loaded, loaded_names) = loadClassifier(classifier_pkl)
+            # Every name predicts itself, so the labels and the names are from the same version
+            for i, name in enumerate(loaded_names):
+                assert loaded.classes_[np.argmax(loaded.predict_proba(embed(name, 1)))] == i
+        except Exception as e:
+            errors.append(e)
+
+thread = threading.Thread(target=reader, daemon=True)
+thread.start()
+for step in range(30):
+    name = ["Amanda", "Lester", "Trevor"][step % 3]
+    if name in names:
+        names = removeGalleryIdentity(model, names, name)
+    else:
+        names = enrollGalleryIdentity(model, names, name, embed(name))
+    dumpClassifier(classifier_pkl, classes_txt, model, names)
+stop.set()
+thread.join()
+assert len(errors) == 0, f"A reload saw an inconsistent classifier: {errors[0]!r}"
+
+# The names are read from the pickle, even with a stale text file
+with open(classes_txt, 'w') as classes_file:
+    classes_file.write("Stale\n")
+(loaded, loaded_names) = loadClassifier(classifier_pkl)
+assert loaded_names == names
+assert not any(f.endswith(".tmp") for f in os.listdir(work_dir))
+shutil.rmtree(work_dir)
+
+print("Test 07 passed")
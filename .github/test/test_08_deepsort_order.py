@@ -0,0 +1,114 @@
+#################################################################################
+# Test 08: DeepSORT (CPU-Only) -> Matching & track IDs in the original order
+#################################################################################
+
+import numpy as np
+
+from scipy.optimize import linear_sum_assignment
+from pyppbox.modules.trackers.deepsort.origin import linear_assignment, iou_matching
+from pyppbox.modules.trackers.deepsort.origin.tracker import Tracker
+from pyppbox.modules.trackers.deepsort.origin.detection import Detection
+from pyppbox.modules.trackers.deepsort.origin.nn_matching import NearestNeighborDistanceMetric
+
+
+# The original matching of deep_sort, one track at a time and one level at a time
+def minCostMatching(distance_metric, max_distance, tracks, detections, track_indices, detection_indices):
+    if len(detection_indices) == 0 or len(track_indices) == 0:
+        return [], track_indices, detection_indices
+    cost_matrix = distance_metric(tracks, detections, track_indices, detection_indices)
+    cost_matrix[cost_matrix > max_distance] = max_distance + 1e-5
+    row_indices, col_indices = linear_sum_assignment(cost_matrix)
+    matches, unmatched_tracks, unmatched_detections = [], [], []
+    for col, detection_idx in enumerate(detection_indices):
+        if col not in col_indices:
+            unmatched_detections.append(detection_idx)
+    for row, track_idx in enumerate(track_indices):
+        if row not in row_indices:
+            unmatched_tracks.append(track_idx)
+    for row, col in zip(row_indices, col_indices):
+        if cost_matrix[row, col] > max_distance:
+            unmatched_tracks.append(track_indices[row])
+            unmatched_detections.append(detection_indices[col])
+        else:
+            matches.append((track_indices[row], detection_indices[col]))
+    return matches, unmatched_tracks, unmatched_detections
+
+def matchingCascade(distance_metric, max_distance, cascade_depth, tracks, detections, track_indices):
+    unmatched_detections = list(range(len(detections)))
+    matches = []
+    for level in range(cascade_depth):
+        if len(unmatched_detections) == 0:
+            break
+        track_indices_l = [k for k in track_indices if tracks[k].time_since_update == 1 + level]
+        if len(track_indices_l) == 0:
+            continue
+        matches_l, _, unmatched_detections = minCostMatching(
+            distance_metric, max_distance, tracks, detections, track_indices_l, unmatched_detections)
+        matches += matches_l
+    unmatched_tracks = list(set(track_indices) - set(k for k, _ in matches))
+    return matches, unmatched_tracks, unmatched_detections
+
+class CheckedTracker(Tracker):
+
+    # Check the dense matching against the original one, and the sparse matching up to order
+    def _match(self, detections):
+        def gated_metric(tracks, dets, track_indices, detection_indices):
+            features = np.array([dets[i].feature for i in detection_indices])
+            targets = np.array([tracks[i].track_id for i in track_indices])
+            cost_matrix = self.metric.distance(features, targets)
+            return linear_assignment.gate_cost_matrix(
+                self.kf, cost_matrix, tracks, dets, track_indices, detection_indices)
+        tracks = self.tracks
+        confirmed = [i for i, t in enumerate(tracks) if t.is_confirmed()]
+        unconfirmed = [i for i, t in enumerate(tracks) if not t.is_confirmed()]
+        matches_a, unmatched_a, unmatched_detections = matchingCascade(
+            gated_metric, self.metric.matching_threshold, self.max_age, tracks, detections, confirmed)
+        candidates = unconfirmed + [k for k in unmatched_a if tracks[k].time_since_update == 1]
+        unmatched_a = [k for k in unmatched_a if tracks[k].time_since_update != 1]
+        matches_b, unmatched_b, unmatched_detections = minCostMatching(
+            iou_matching.iou_cost, self.max_iou_distance, tracks, detections, candidates, unmatched_detections)
+        expected = (matches_a + matches_b, set(unmatched_a + unmatched_b), unmatched_detections)
+
+        matches, unmatched_tracks, unmatched_detections = super()._match(detections)
+        assert [tuple(map(int, m)) for m in matches] == expected[0], "Dense matches differ"
+        assert set(unmatched_tracks) == expected[1], "Dense unmatched tracks differ"
+        assert list(map(int, unmatched_detections)) == expected[2], "Dense unmatched detections differ"
+        sparse = self._match_sparse(detections)
+        assert set(sparse[0]) == set(expected[0]), "Sparse matches differ"
+        assert set(sparse[2]) == set(expected[2]), "Sparse unmatched detections differ"
+        self.expected_new = [detections[i] for i in expected[2]]
+        return matches, unmatched_tracks, unmatched_detections
+
+    def _initiate_tracks(self, detections):
+        # New tracks are started in the order of the original unmatched detections
+        assert all(d is e for d, e in zip(detections, self.expected_new)), "New tracks differ"
+        assert len(detections) == len(self.expected_new), "New tracks differ"
+        super()._initiate_tracks(detections)
+
+# A crowd where about 10% of the people leave each frame and as many new people enter 
+# somewhere else, with the detections in a different order every frame
+num_people = 150
+rng = np.random.default_rng(0)
+side = 100 * np.sqrt(num_people)
+pos = rng.uniform(0, side, (num_people, 2))
+vel = rng.normal(0, 2, (num_people, 2))
+size = rng.uniform(20, 40, (num_people, 2)) * [1, 2]
+features = rng.normal(size=(num_people, 128))
+tracker = CheckedTracker(NearestNeighborDistanceMetric("cosine", 0.2, 100))
+num_gated = 0
+for _ in range(30):
+    new = rng.random(num_people) < 0.1
+    pos[new] = rng.uniform(0, side, (new.sum(), 2))
+    features[new] = rng.normal(size=(new.sum(), 128))
+    pos += vel + rng.normal(0, 0.5, (num_people, 2))
+    noisy = features + rng.normal(0, 0.2, features.shape)
+    detections = [Detection(np.array([*p, *s]), 0.9, "person", f / np.linalg.norm(f)) 
+                  for p, s, f in zip(pos, size, noisy)]
+    detections = [detections[i] for i in rng.permutation(num_people)]
+    tracker.predict()
+    tracker.update(detections)
+    # The order only matters when some unmatched detections are not sorted
+    num_gated += tracker.expected_new != sorted(tracker.expected_new, key=detections.index)
+assert num_gated > 0, "No frame checks the order of the new tracks"
+
+print("Test 08 passed")
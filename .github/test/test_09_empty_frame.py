@@ -0,0 +1,37 @@
+#################################################################################
+# Test 09: Trackers & ReIDer (CPU-Only) -> Empty PeopleFrame in, PeopleFrame out
+#################################################################################
+
+import numpy as np
+
+from pyppbox.ppb.mt import MT
+from pyppbox.utils.persontools import PeopleFrame
+
+
+def makeFrame(num_people):
+    boxes = np.array([[40 * i, 10, 30, 60] for i in range(num_people)], dtype=np.int32).reshape(-1, 4)
+    return PeopleFrame(boxes_xywh=boxes, det_confs=np.full(num_people, 0.9, dtype=np.float32))
+
+mt = MT()
+
+# Nothing is set yet
+assert isinstance(mt.trackPeople(None, makeFrame(3), img_is_mat=True), PeopleFrame)
+people, _ = mt.reidPeople(None, makeFrame(3), img_is_mat=True)
+assert isinstance(people, PeopleFrame) and len(people) == 0
+
+for tracker in ["Centroid", "SORT"]:
+    mt.setMainTracker(tracker)
+    # Empty frames between frames of people
+    for num_people in [0, 3, 0, 0, 3, 3, 0]:
+        people = mt.trackPeople(None, makeFrame(num_people), img_is_mat=True)
+        assert isinstance(people, PeopleFrame), f"{tracker} returned {type(people).__name__}"
+    assert mt.trackPeople(None, [], img_is_mat=True) == []
+
+mt.setMainReIDer("None")
+people, reid_count = mt.reidPeople(None, makeFrame(0), img_is_mat=True)
+assert isinstance(people, PeopleFrame) and len(people) == 0
+assert reid_count == (0, 0)
+people, _ = mt.reidPeople(None, [], img_is_mat=True)
+assert people == []
+
+print("Test 09 passed")
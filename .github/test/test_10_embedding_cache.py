@@ -0,0 +1,69 @@
+#################################################################################
+# Test 10: Embedding cache (CPU-Only) -> Reusing & invalidating the cached embeddings
+#################################################################################
+
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from pyppbox.modules.reiders.embeddingcache import EmbeddingCache
+
+
+work_dir = tempfile.mkdtemp()
+classifier_pkl = os.path.join(work_dir, "classifier.pkl")
+
+def writeImage(name, content):
+    path = os.path.join(work_dir, name)
+    with open(path, 'wb') as image_file:
+        image_file.write(content)
+    return path
+
+embedded = []
+def embed(paths):
+    # A fake model, which embeds the size of the file
+    embedded.extend(os.path.basename(p) for p in paths)
+    return np.array([[os.path.getsize(p), 1.0, 2.0] for p in paths])
+
+def getEmbeddings(paths, model_key="model-a"):
+    embedded.clear()
+    return EmbeddingCache(classifier_pkl, model_key).getEmbeddings(paths, embed)
+
+# Nothing to embed and no cache yet
+emb_array = getEmbeddings([])
+assert emb_array.shape == (0, 0) and len(embedded) == 0
+assert not os.path.isfile(os.path.join(work_dir, "classifier.emb.npy"))
+
+paths = [writeImage(f"{i}.jpg", b"x" * (i + 1)) for i in range(4)]
+emb_array = getEmbeddings(paths)
+assert embedded == ["0.jpg", "1.jpg", "2.jpg", "3.jpg"]
+assert emb_array.dtype == np.float32 and emb_array[:, 0].tolist() == [1, 2, 3, 4]
+
+# Everything is cached
+emb_array = getEmbeddings(paths[::-1])
+assert embedded == [] and emb_array[:, 0].tolist() == [4, 3, 2, 1]
+
+# A changed file is embedded again
+writeImage("2.jpg", b"x" * 10)
+emb_array = getEmbeddings(paths)
+assert embedded == ["2.jpg"] and emb_array[:, 0].tolist() == [1, 2, 10, 4]
+
+# A removed file is pruned, a new one is embedded
+os.remove(paths[0])
+paths = paths[1:] + [writeImage("4.jpg", b"x" * 5)]
+emb_array = getEmbeddings(paths)
+assert embedded == ["4.jpg"] and emb_array[:, 0].tolist() == [2, 10, 4, 5]
+emb_array = getEmbeddings(paths)
+assert embedded == [] and emb_array.shape == (4, 3)
+
+# Another model invalidates the whole cache
+emb_array = getEmbeddings(paths, model_key="model-b")
+assert embedded == ["1.jpg", "2.jpg", "3.jpg", "4.jpg"]
+
+# Removing all files keeps the dimension of the cache
+emb_array = getEmbeddings([], model_key="model-b")
+assert embedded == [] and emb_array.shape == (0, 3)
+assert not any(f.endswith(".tmp") or ".tmp." in f for f in os.listdir(work_dir))
+shutil.rmtree(work_dir)
+
+print("Test 10 passed")
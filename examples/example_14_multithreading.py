@@ -8,7 +8,7 @@ from pyppbox.utils.visualizetools import visualizePeople
 from pyppbox.standalone import MT
 
 def ppb_task(input, main_configs, name="Task"):
-    ppbmt = MT() # Use `MT` for multithreading
+    ppbmt = MT(share_models=True) # Use `MT` for multithreading, and share the same loaded models
     ppbmt.setMainModules(main_yaml=main_configs)
     cap = cv2.VideoCapture(input)
     while cap.isOpened():
@@ -506,6 +506,10 @@ class TCFGCentroid(BaseCGF):
     max_spread : int
         Maximum distance of the being tracked :class:`pyppbox.utils.persontools.Person` 
         object of previous and current state.
+    sparse : bool, default=False
+        An indication of whether to only match the people within :attr:`max_spread` found 
+        with a grid, and solve them as small independent problems, see 
+        :mod:`pyppbox.modules.trackers.association`. Recommended for very crowded scenes.
     """
 
     def __init__(self) -> None:
@@ -525,6 +529,7 @@ class TCFGCentroid(BaseCGF):
             try:
                 self.tk_name = self.unified_strings.getUnifiedFormat(self.config['tk_name'])
                 self.max_spread = self.config['max_spread']
+                self.sparse = self.config.get('sparse', False)
                 self.config = self.getDocument()
             except Exception as e:
                 msg = f"TCFGCentroid : set() -> {e}"
@@ -544,7 +549,8 @@ class TCFGCentroid(BaseCGF):
         """
         centroid_doc = {
             "tk_name": self.tk_name,
-            "max_spread": self.max_spread
+            "max_spread": self.max_spread,
+            "sparse": self.sparse
         }
         return centroid_doc
 
@@ -564,6 +570,16 @@ class TCFGSORT(BaseCGF):
         Parameter :obj:`min_hits` of tracker SORT.
     iou_threshold : float
         Parameter :obj:`iou_threshold` of tracker SORT.
+    engine : str, default='Batched'
+        :code:`'Batched'` to keep the Kalman filters of all the tracks in stacked arrays, see 
+        :class:`pyppbox.modules.trackers.sort.batched.BatchedSort`, or :code:`'Classic'` to use 
+        one filterpy Kalman filter per track. Both give the same results.
+    sparse : bool, default=False
+        An indication of whether to only match the overlapping boxes found with a grid, and 
+        solve them as small independent problems, see 
+        :func:`pyppbox.modules.trackers.sort.batched.associateSparse`. Recommended for very 
+        crowded scenes, and only used by engine :code:`'Batched'` with 
+        :attr:`iou_threshold` > 0.
     """
 
     def __init__(self) -> None:
@@ -585,6 +601,8 @@ class TCFGSORT(BaseCGF):
                 self.max_age = self.config['max_age']
                 self.min_hits = self.config['min_hits']
                 self.iou_threshold = self.config['iou_threshold']
+                self.engine = self.config.get('engine', 'Batched')
+                self.sparse = self.config.get('sparse', False)
                 self.config = self.getDocument()
             except Exception as e:
                 msg = f"TCFGSORT : set() -> {e}"
@@ -607,7 +625,9 @@ class TCFGSORT(BaseCGF):
             "tk_name": self.tk_name,
             "max_age": self.max_age,
             "min_hits": self.min_hits,
-            "iou_threshold": self.iou_threshold
+            "iou_threshold": self.iou_threshold,
+            "engine": self.engine,
+            "sparse": self.sparse
         }
         return sort_doc
         
@@ -629,6 +649,22 @@ class TCFGDeepSORT(BaseCGF):
         Parameter :obj:`max_cosine_distance` of tracker DeepSORT.
     model_file : str
         Path of model file for tracker DeepSORT.
+    feature_source : str, default='DeepSORT'
+        Source of the appearance features: :code:`'DeepSORT'` to use the encoder of 
+        :attr:`model_file`, :code:`'ReIDer'` to reuse the features extracted once per person by 
+        the main reider Torchreid, which are also reused to re-identify the people, or 
+        :code:`'Person'` to use the features given by :attr:`Person.feature`. The encoder and 
+        TF are not loaded with :code:`'ReIDer'` or :code:`'Person'`, and 
+        :attr:`max_cosine_distance` may need to be tuned for the features of a different model.
+    gallery_fp16 : bool, default=False
+        An indication of whether to store the appearance gallery of the tracks, which holds up 
+        to :attr:`nn_budget` features per track, as float16 to halve its memory.
+    sparse : bool, default=False
+        An indication of whether to only match the tracks and the detections which pass the 
+        gating, or which overlap for the IOU association, and solve them as small independent 
+        problems, see :mod:`pyppbox.modules.trackers.association`. Recommended for very 
+        crowded scenes. The new tracks may be started in another order than without it, so 
+        their IDs can differ.
     from_dir : str
         Path of the root directory, relative to path of :attr:`model_file`.
     """
@@ -671,6 +707,9 @@ class TCFGDeepSORT(BaseCGF):
                 self.nms_max_overlap = self.config['nms_max_overlap']
                 self.max_cosine_distance = self.config['max_cosine_distance']
                 self.model_file = getAdaptiveAbsPathFDS(self.from_dir, self.config['model_file'])
+                self.feature_source = self.config.get('feature_source', 'DeepSORT')
+                self.gallery_fp16 = self.config.get('gallery_fp16', False)
+                self.sparse = self.config.get('sparse', False)
                 self.config = self.getDocument()
             except Exception as e:
                 msg = f"TCFGDeepSORT : set() -> {e}"
@@ -693,7 +732,10 @@ class TCFGDeepSORT(BaseCGF):
             "nn_budget": self.nn_budget,
             "nms_max_overlap": self.nms_max_overlap,
             "max_cosine_distance": self.max_cosine_distance,
-            "model_file": normalizePathFDS(internal_root_dir, self.model_file)
+            "model_file": normalizePathFDS(internal_root_dir, self.model_file),
+            "feature_source": self.feature_source,
+            "gallery_fp16": self.gallery_fp16,
+            "sparse": self.sparse
         }
         return deepsort_doc
 
@@ -724,6 +766,10 @@ class RCFGFaceNet(BaseCGF):
         Parameter :obj:`batch_size` of reider FaceNet.
     min_confidence : float
         Minimum confidence of the prediction.
+    classifier_type : str, default='SVC'
+        Type of the classifier trained by :meth:`train_classifier()`: :code:`'SVC'`, 
+        :code:`'Gallery'`, or :code:`'Centroid'`, see 
+        :class:`pyppbox.modules.reiders.gallery.GalleryClassifier`.
     yl_h_calibration : list[int, int], default=[-125, 75]
         When YOLO is used as the detector, this list of :code:`[val_1, val_2]` and a 
         :class:`pyppbox.utils.persontools.Person`'s respoint :code:`(X, Y)` are used to find 
@@ -732,6 +778,16 @@ class RCFGFaceNet(BaseCGF):
         When YOLO is used as the detector, this list of :code:`[val_1, val_2]` and a 
         :class:`pyppbox.utils.persontools.Person`'s respoint :code:`(X, Y)` are used to find 
         the from-to :code:`X` for cropping the face: :code:`[..., X + val_1 : X + val_2]`.
+    kp_face : bool, default=False
+        When the detector gives the pose keypoints, e.g. YOLO_Ultralytics with a pose model, 
+        whether to find the face box directly by the nose and eyes keypoints and skip MTCNN, see 
+        :func:`pyppbox.utils.persontools.findFaceBoxKP`. A person without confident keypoints 
+        falls back to MTCNN in the face crop of :attr:`yl_h_calibration` and 
+        :attr:`yl_w_calibration`.
+    kp_face_conf : float, default=0.5
+        Minimum confidence of the nose and eyes keypoints used by :attr:`kp_face`.
+    kp_face_scale : float, default=2.5
+        Scale of the face box found by :attr:`kp_face`.
     from_dir : str
         Path of the root directory, relative to path of :attr:`model_file`.
     """
@@ -778,8 +834,12 @@ class RCFGFaceNet(BaseCGF):
                 self.train_data = getAdaptiveAbsPathFDS(self.from_dir, self.config['train_data'])
                 self.batch_size = self.config['batch_size']
                 self.min_confidence = self.config['min_confidence']
+                self.classifier_type = self.config.get('classifier_type', 'SVC')
                 self.yl_h_calibration = self.config['yl_h_calibration']
                 self.yl_w_calibration = self.config['yl_w_calibration']
+                self.kp_face = self.config.get('kp_face', False)
+                self.kp_face_conf = self.config.get('kp_face_conf', 0.5)
+                self.kp_face_scale = self.config.get('kp_face_scale', 2.5)
                 self.config = self.getDocument()
             except Exception as e:
                 msg = f"RCFGFaceNet : set() -> {e}"
@@ -806,8 +866,12 @@ class RCFGFaceNet(BaseCGF):
             "train_data": normalizePathFDS(internal_root_dir, self.train_data),
             "batch_size": self.batch_size,
             "min_confidence": self.min_confidence,
+            "classifier_type": self.classifier_type,
             "yl_h_calibration": self.yl_h_calibration,
-            "yl_w_calibration": self.yl_w_calibration
+            "yl_w_calibration": self.yl_w_calibration,
+            "kp_face": self.kp_face,
+            "kp_face_conf": self.kp_face_conf,
+            "kp_face_scale": self.kp_face_scale
         }
         return facenet_doc
 
@@ -834,6 +898,10 @@ class RCFGTorchreid(BaseCGF):
         Path of a pretrained model file for reider Torchreid.
     min_confidence : float
         Minimum confidence of the prediction.
+    classifier_type : str, default='SVC'
+        Type of the classifier trained by :meth:`train_classifier()`: :code:`'SVC'`, 
+        :code:`'Gallery'`, or :code:`'Centroid'`, see 
+        :class:`pyppbox.modules.reiders.gallery.GalleryClassifier`.
     device : str
         Parameter device for specifying a computing device.
     base_model_path : str
@@ -888,6 +956,7 @@ class RCFGTorchreid(BaseCGF):
                 self.model_name = self.config['model_name']
                 self.model_path = getAdaptiveAbsPathFDS(self.from_dir, self.config['model_path'])
                 self.min_confidence = self.config['min_confidence']
+                self.classifier_type = self.config.get('classifier_type', 'SVC')
                 self.device = self.config['device']
                 self.config = self.getDocument()
                 self.base_model_path = getAdaptiveAbsPathFDS(
@@ -919,6 +988,7 @@ class RCFGTorchreid(BaseCGF):
             "model_name": self.model_name,
             "model_path": normalizePathFDS(internal_root_dir, self.model_path),
             "min_confidence": self.min_confidence,
+            "classifier_type": self.classifier_type,
             "device": self.device
         }
         return torchreid_doc
@@ -1000,12 +1070,15 @@ class MyCFGHeaders(object):
                 "# --- # Centroid\n"
                 "# tk_name: Centroid\n"
                 "# max_spread: 64\n"
+                "# sparse: False\n"
                 "###########################################################\n"
                 "# --- # SORT\n"
                 "# tk_name: SORT\n"
                 "# max_age: 1\n"
                 "# min_hits: 3\n"
                 "# iou_threshold: 0.3\n"
+                "# engine: Batched | Classic\n"
+                "# sparse: False\n"
                 "###########################################################\n"
                 "# --- # DeepSORT\n"
                 "# tk_name: DeepSORT\n"
@@ -1013,6 +1086,9 @@ class MyCFGHeaders(object):
                 "# nms_max_overlap: 0.5\n"
                 "# max_cosine_distance: 0.1\n"
                 "# model_file: data/modules/deepsort/mars-small128.pb\n"
+                "# feature_source: DeepSORT | ReIDer | Person\n"
+                "# gallery_fp16: False\n"
+                "# sparse: False\n"
                 "###########################################################\n")
         return header
 
@@ -1036,8 +1112,12 @@ class MyCFGHeaders(object):
                 "# train_data: data/datasets/GTA_V_DATASET/face_182x182\n"
                 "# batch_size: 1000\n"
                 "# min_confidence: 0.75\n"
+                "# classifier_type: SVC | Gallery | Centroid\n"
                 "# yl_h_calibration: [-125, 75]\n"
                 "# yl_w_calibration: [-55, 55]\n"
+                "# kp_face: False\n"
+                "# kp_face_conf: 0.5\n"
+                "# kp_face_scale: 2.5\n"
                 "###########################################################\n"
                 "# --- # Torchreid\n"
                 "# ri_name: Torchreid\n"
@@ -1046,6 +1126,7 @@ class MyCFGHeaders(object):
                 "# model_name: osnet_ain_x1_0\n"
                 "# model_path: data/modules/torchreid/models/torchreid/osnet_ain_ms_d_c.pth.tar\n"
                 "# min_confidence: 0.35\n"
+                "# classifier_type: SVC | Gallery | Centroid\n"
                 "# device: cuda\n"
                 "###########################################################\n")
         return header
@@ -20,9 +20,29 @@
 
 
 import cv2
+import threading
+import numpy as np
 
-from pyppbox.utils.persontools import Person, findRepspoint, findRepspointBB
-from pyppbox.utils.commontools import to_xyxy
+from pyppbox.utils.persontools import findRepspoints, findRepspointsBB, toPeople
+from pyppbox.utils.registrytools import acquireModel, getModelKey
+from pyppbox.utils.stattools import getNullStats
+
+
+class YOLOCLSModel(object):
+
+    """
+    :meta private:
+    """
+
+    def __init__(self, cfg):
+        self.net = cv2.dnn.readNet(cfg.model_weights, cfg.model_cfg_file)
+        if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+            self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+            self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+        self.out_names = self.net.getUnconnectedOutLayersNames()
+        # The detection model shares the same network as self.net
+        self.model = cv2.dnn_DetectionModel(self.net)
+        self.model.setInputParams(size=cfg.model_resolution, scale=1/255.0)
 
 
 class MyYOLOCLS(object):
@@ -37,9 +57,16 @@ class MyYOLOCLS(object):
         YOLO_Classic.
     model: cv::dnn::DetectionModel
         A detection model object of OpenCV's deep learning network.
+    net: cv::dnn::Net
+        The network of :attr:`model`, used for the batched forward.
+    lock : threading.RLock
+        The lock which serializes the inference, shared with the other objects if 
+        :obj:`shared=True`.
+    stats : MyStats or NullStats
+        The recorder of the sub-stage timings, set by :class:`pyppbox.ppb.mt.MT`.
     """
 
-    def __init__(self, cfg):
+    def __init__(self, cfg, shared=False):
         """Initialize according to the given configuration :obj:`cfg` 
         as :class:`DCFGYOLOCLS` object.
 
@@ -48,14 +75,18 @@ class MyYOLOCLS(object):
         cfg : DCFGYOLOCLS
             A :class:`DCFGYOLOCLS` object which manages the configurations of detector 
             YOLO_Classic.
+        shared : bool, default=False
+            An indication of whether to share the model with the other objects loading the 
+            same weights through :class:`pyppbox.utils.registrytools.ModelRegistry`.
         """
         self.cfg = cfg
-        net = cv2.dnn.readNet(cfg.model_weights, cfg.model_cfg_file)
-        if cv2.cuda.getCudaEnabledDeviceCount() > 0:
-            net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
-            net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
-        self.model = cv2.dnn_DetectionModel(net)
-        self.model.setInputParams(size=cfg.model_resolution, scale=1/255.0)
+        key = getModelKey("YOLO_Classic", cfg.model_weights, cfg.model_cfg_file, cfg.model_resolution)
+        yolo = acquireModel(key, lambda: YOLOCLSModel(cfg), owner=self, shared=shared)
+        self.lock = yolo.lock if shared else threading.RLock()
+        self.net = yolo.net
+        self.out_names = yolo.out_names
+        self.model = yolo.model
+        self.stats = getNullStats()
 
     def detect(self, img, visual=True, class_filter=[0], min_width_filter=15):
         """Detect general object with object's class filter :obj:`class_filter` in a 
@@ -85,26 +116,18 @@ class MyYOLOCLS(object):
         float
             A list of the detection confidence of every detected object.
         """
-        pboxes_xywh = []
-        pboxes_xyxy = []
-        repspoints = []
-        confs = []
-        classes, confidences, boxes = self.model.detect(img, 
-                                                        confThreshold=float(self.cfg.conf), 
-                                                        nmsThreshold=float(self.cfg.nms))
-        if len(classes) > 0:
-            for class_id, conf, box_xywh in zip(classes.flatten(), confidences, boxes):
-                if class_id in class_filter and box_xywh[2] >= min_width_filter:
-                    box_xywh = box_xywh.astype(int)
-                    pboxes_xywh.append(box_xywh)
-                    box_xyxy = to_xyxy(box_xywh)
-                    pboxes_xyxy.append(box_xyxy)
-                    repspoint = findRepspoint(box_xyxy, self.cfg.repspoint_calibration)
-                    repspoints.append(repspoint)
-                    confs.append(float(conf))
-                    if visual:
-                        cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
-                        cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
+        with self.lock:
+            det = self.model.detect(img, 
+                                    confThreshold=float(self.cfg.conf), 
+                                    nmsThreshold=float(self.cfg.nms))
+        (boxes_xywh, boxes_xyxy, repspoints, confs) = self.makeArrays(det, 
+                                                                     class_filter=class_filter, 
+                                                                     min_width_filter=min_width_filter)
+        if visual: self.__draw__(img, boxes_xyxy, repspoints)
+        pboxes_xywh = list(boxes_xywh)
+        pboxes_xyxy = list(boxes_xyxy)
+        repspoints = [tuple(p) for p in repspoints.tolist()]
+        confs = confs.tolist()
         return img, pboxes_xywh, pboxes_xyxy, repspoints, confs
 
     def detectPeople(self, img, visual=True, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
@@ -130,24 +153,115 @@ class MyYOLOCLS(object):
         Mat
             A :obj:`Mat` like image.
         """
-        people = []
-        classes, confidences, boxes = self.model.detect(
-            img, 
-            confThreshold=float(self.cfg.conf), 
-            nmsThreshold=float(self.cfg.nms)
-        )
-        if len(classes) > 0:
-            i = 0
-            for class_id, conf, box_xywh in zip(classes.flatten(), confidences, boxes):
-                if class_id == 0 and box_xywh[2] >= min_width_filter:
-                    box_xywh = box_xywh.astype(int)
-                    box_xyxy = to_xyxy(box_xywh)
-                    if alt_repspoint: repspoint = findRepspointBB(box_xyxy, prefer_top=alt_repspoint_top)
-                    else: repspoint = findRepspoint(box_xyxy, self.cfg.repspoint_calibration)
-                    people.append(Person(i, i, box_xywh=box_xywh, box_xyxy=box_xyxy, 
-                                         repspoint=repspoint, det_conf=float(conf)))
-                    i += 1
-                    if visual:
-                        cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
-                        cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
-        return people, img
+        with self.stats.timer("detect.predict"), self.lock:
+            det = self.model.detect(img, 
+                                    confThreshold=float(self.cfg.conf), 
+                                    nmsThreshold=float(self.cfg.nms))
+        with self.stats.timer("detect.people"):
+            return self.makePeople(img, det, 
+                                   visual=visual, 
+                                   min_width_filter=min_width_filter, 
+                                   alt_repspoint=alt_repspoint, 
+                                   alt_repspoint_top=alt_repspoint_top)
+
+    def detectPeopleBatch(self, imgs, visual=False, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
+        """Detect person(s) in a batch of :obj:`Mat` like images with one single forward of 
+        :code:`cv2.dnn.blobFromImages()`.
+
+        Parameters
+        ----------
+        imgs : list[Mat, ...]
+            A list of :obj:`Mat` like images.
+        visual : bool, default=False
+            An indication of whether to visualize the detected people.
+        min_width_filter : int, default=15
+            Minimum width filter of a detected person.
+        alt_repspoint : bool, default=False
+            An indication of whether to use the alternative :meth:`findRepspointBB`.
+        alt_repspoint_top : bool, default=True
+            A parameter passed to :obj:`prefer_top` of :meth:`findRepspointBB`.
+
+        Returns
+        -------
+        list[tuple(list[Person, ...], Mat), ...]
+            A list of (detected people, image) in the same order as :obj:`imgs`, as returned by 
+            :meth:`detectPeople()` for each image.
+        """
+        if len(imgs) == 0: return []
+        dets = self.predictBatch(imgs)
+        return [self.makePeople(img, det, 
+                                visual=visual, 
+                                min_width_filter=min_width_filter, 
+                                alt_repspoint=alt_repspoint, 
+                                alt_repspoint_top=alt_repspoint_top) for img, det in zip(imgs, dets)]
+
+    def predictBatch(self, imgs):
+        """
+        :meta private:
+        """
+        blob = cv2.dnn.blobFromImages(imgs, 
+                                      scalefactor=1/255.0, 
+                                      size=tuple(self.cfg.model_resolution), 
+                                      swapRB=False, 
+                                      crop=False)
+        with self.lock:
+            self.net.setInput(blob)
+            outs = self.net.forward(self.out_names)
+        outs = [out.reshape(len(imgs), -1, out.shape[-1]) for out in outs]
+        return [self.__decodeRegion__(np.concatenate([out[i] for out in outs]), img.shape[1], img.shape[0]) 
+                for i, img in enumerate(imgs)]
+
+    def __decodeRegion__(self, rows, frame_w, frame_h):
+        # Same decoding as cv::dnn::DetectionModel for the 'Region' output of YOLO, but 
+        # only for class 0 (person) which is the only class kept by makePeople()
+        scores = rows[:, 5:]
+        class_ids = np.argmax(scores, axis=1)
+        confs = scores[np.arange(len(rows)), class_ids]
+        keep = (confs >= float(self.cfg.conf)) & (class_ids == 0)
+        rows, confs = rows[keep], confs[keep]
+        center_x = (rows[:, 0] * frame_w).astype(np.int32)
+        center_y = (rows[:, 1] * frame_h).astype(np.int32)
+        width = (rows[:, 2] * frame_w).astype(np.int32)
+        height = (rows[:, 3] * frame_h).astype(np.int32)
+        left = np.maximum(0, np.minimum(center_x - width // 2, frame_w - 1))
+        top = np.maximum(0, np.minimum(center_y - height // 2, frame_h - 1))
+        width = np.maximum(1, np.minimum(width, frame_w - left))
+        height = np.maximum(1, np.minimum(height, frame_h - top))
+        boxes = np.stack([left, top, width, height], axis=1)
+        indices = cv2.dnn.NMSBoxes(boxes.tolist(), confs.tolist(), float(self.cfg.conf), float(self.cfg.nms))
+        indices = np.asarray(indices, dtype=np.int64).flatten()
+        return (np.zeros((len(indices), 1), dtype=np.int32), confs[indices], boxes[indices])
+
+    def makePeople(self, img, det, visual=True, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
+        """
+        :meta private:
+        """
+        (boxes_xywh, boxes_xyxy, repspoints, confs) = self.makeArrays(det, 
+                                                                     min_width_filter=min_width_filter, 
+                                                                     alt_repspoint=alt_repspoint, 
+                                                                     alt_repspoint_top=alt_repspoint_top)
+        if visual: self.__draw__(img, boxes_xyxy, repspoints)
+        return toPeople(boxes_xywh, boxes_xyxy, repspoints, confs), img
+
+    def makeArrays(self, det, class_filter=[0], min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
+        """
+        :meta private:
+        """
+        # All the detections are filtered and converted at once, the people are made later
+        classes, confidences, boxes = det
+        classes = np.asarray(classes).reshape(-1)
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        keep = np.isin(classes, class_filter) & (boxes[:, 2] >= min_width_filter)
+        boxes_xywh = boxes[keep].astype(int)
+        boxes_xyxy = boxes_xywh.copy()
+        boxes_xyxy[:, 2:] += boxes_xyxy[:, :2]
+        confs = np.asarray(confidences).reshape(-1)[keep]
+        if alt_repspoint: repspoints = findRepspointsBB(boxes_xyxy, prefer_top=alt_repspoint_top)
+        else: repspoints = findRepspoints(boxes_xyxy, self.cfg.repspoint_calibration)
+        return boxes_xywh, boxes_xyxy, repspoints, confs
+
+    def __draw__(self, img, boxes_xyxy, repspoints):
+        # Internal function
+        for box_xyxy, repspoint in zip(boxes_xyxy.tolist(), repspoints.tolist()):
+            cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
+            cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
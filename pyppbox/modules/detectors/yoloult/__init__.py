@@ -20,10 +20,12 @@
 
 
 import cv2
+import numpy as np
 
-from pyppbox.utils.persontools import Person, findRepspoint, findRepspointBB
-from pyppbox.utils.commontools import to_xywh
+from pyppbox.utils.persontools import findRepspoints, findRepspointsBB, toPeople
 from pyppbox.utils.logtools import ignore_this_logger
+from pyppbox.utils.registrytools import acquireModel, getModelKey
+from pyppbox.utils.stattools import getNullStats
 
 
 class MyYOLOULT(object):
@@ -37,14 +39,17 @@ class MyYOLOULT(object):
         A :class:`DCFGYOLOULT` object which manages the configurations 
         of detector YOLO_Ultralytics.
     model: ultralytics.yolo.engine.YOLO
-        A detection model object of YOLO_Ultralytics.
+        A detection model object of YOLO_Ultralytics, or its thread-safe 
+        :class:`pyppbox.utils.registrytools.SharedModel` proxy if :obj:`shared=True`.
     colors: ultralytics.yolo.utils.Colors
         A hex color object of YOLO_Ultralytics.
     skeleton : list[list[int, int], ...]
         A list used for mapping skeletons of a supported model of YOLO_Ultralytics.
+    stats : MyStats or NullStats
+        The recorder of the sub-stage timings, set by :class:`pyppbox.ppb.mt.MT`.
     """
 
-    def __init__(self, cfg):
+    def __init__(self, cfg, shared=False):
         """Initialize according to the given configuration :obj:`cfg` 
         as :class:`DCFGYOLOULT` object.
 
@@ -53,8 +58,12 @@ class MyYOLOULT(object):
         cfg : DCFGYOLOULT
             A :class:`DCFGYOLOULT` object which manages the configurations 
             of detector YOLO_Ultralytics.
+        shared : bool, default=False
+            An indication of whether to share the model with the other objects loading the 
+            same weights through :class:`pyppbox.utils.registrytools.ModelRegistry`.
         """
         self.cfg = cfg
+        self.stats = getNullStats()
         self.cpu_only = False
         if isinstance(self.cfg.device, str):
             if self.cfg.device.lower() == 'cpu':
@@ -62,13 +71,9 @@ class MyYOLOULT(object):
         ignore_this_logger("ultralytics")
         ignore_this_logger("pyppbox-ultralytics")
         ignore_this_logger("vsensebox-ultralytics")
-        if "nas" in self.cfg.model_file:
-            # YOLO NAS isn't stable yet :/
-            from ultralytics import NAS
-            self.model = NAS(self.cfg.model_file)
-        else:
-            from ultralytics import YOLO
-            self.model = YOLO(self.cfg.model_file)
+        key = getModelKey("YOLO_Ultralytics", self.cfg.model_file, self.cfg.device, int(self.cfg.imgsz))
+        self.model = acquireModel(key, self.__loadModel__, owner=self, shared=shared)
+        if "nas" not in self.cfg.model_file:
             if "pose" in self.cfg.model_file.lower():
                 from ultralytics.utils.plotting import Colors
                 self.colors = Colors()
@@ -77,6 +82,16 @@ class MyYOLOULT(object):
                 self.skeleton = [[16, 14], [14, 12], [17, 15], [15, 13], [12, 13], [6, 12], [7, 13], [6, 7], [6, 8],
                                 [7, 9], [8, 10], [9, 11], [2, 3], [1, 2], [1, 3], [2, 4], [3, 5], [4, 6], [5, 7]]
 
+    def __loadModel__(self):
+        # Internal function
+        if "nas" in self.cfg.model_file:
+            # YOLO NAS isn't stable yet :/
+            from ultralytics import NAS
+            return NAS(self.cfg.model_file)
+        else:
+            from ultralytics import YOLO
+            return YOLO(self.cfg.model_file)
+
     def __kpts__(self, img, kpts, radius=5, kpt_line=True):
         # Internal function
         h, w, c = img.shape
@@ -140,12 +155,6 @@ class MyYOLOULT(object):
         float
             A list of the detection confidence of every detected object.
         """
-        numpy_dets = []
-        pboxes_xyxy = []
-        pboxes_xywh = []
-        repspoints = []
-        keypoints = []
-        confs = []
         dets = self.model.predict(
             img,
             imgsz=int(self.cfg.imgsz),
@@ -156,43 +165,14 @@ class MyYOLOULT(object):
             max_det=int(self.cfg.max_det),
             verbose=False
         )
-        if self.cpu_only:
-            numpy_dets = dets[0].numpy()
-        else:
-            numpy_dets = dets[0].cuda().cpu().to("cpu").numpy()
-        dt_boxes_xyxy = numpy_dets.boxes.xyxy
-        dt_confidences = numpy_dets.boxes.conf
-        dt_keypoints = dets[0].keypoints
-        if dt_keypoints is not None:
-            rev_dt_kps = reversed(dt_keypoints)
-            for box_xyxy, conf, kp in zip(dt_boxes_xyxy, dt_confidences, rev_dt_kps):
-                box_xyxy = box_xyxy.astype(int)
-                box_xywh = to_xywh(box_xyxy)
-                if box_xywh[2] >= min_width_filter:
-                    pboxes_xywh.append(box_xywh)
-                    pboxes_xyxy.append(box_xyxy)
-                    repspoint = findRepspoint(box_xyxy, self.cfg.repspoint_calibration)
-                    repspoints.append(repspoint)
-                    keypoint = kp.data[0]
-                    keypoints.append(keypoint)
-                    confs.append(float(conf))
-                    if visual:
-                        cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
-                        cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
-                        self.__kpts__(img, keypoint, kpt_line=True)
-        elif len(dt_boxes_xyxy) > 0:
-            for box_xyxy, conf in zip(dt_boxes_xyxy, dt_confidences):
-                box_xyxy = box_xyxy.astype(int)
-                box_xywh = to_xywh(box_xyxy)
-                if box_xywh[2] >= min_width_filter:
-                    pboxes_xywh.append(box_xywh)
-                    pboxes_xyxy.append(box_xyxy)
-                    repspoint = findRepspoint(box_xyxy, self.cfg.repspoint_calibration)
-                    repspoints.append(repspoint)
-                    confs.append(float(conf))
-                    if visual:
-                        cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
-                        cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
+        (boxes_xywh, boxes_xyxy, repspoints, confs, keypoints) = self.makeArrays(
+            dets[0], min_width_filter=min_width_filter)
+        if visual: self.__draw__(img, boxes_xyxy, repspoints, keypoints)
+        pboxes_xywh = list(boxes_xywh)
+        pboxes_xyxy = list(boxes_xyxy)
+        repspoints = [tuple(p) for p in repspoints.tolist()]
+        keypoints = [] if keypoints is None else list(keypoints)
+        confs = confs.tolist()
         return img, pboxes_xywh, pboxes_xyxy, repspoints, keypoints, confs
 
     def detectPeople(self, img, visual=True, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
@@ -218,10 +198,51 @@ class MyYOLOULT(object):
         Mat
             A :obj:`Mat` like image.
         """
-        numpy_dets = []
-        people = []
-        dets = self.model.predict(
-            img,
+        with self.stats.timer("detect.predict"):
+            dets = self.predictBatch(img)
+        with self.stats.timer("detect.people"):
+            return self.makePeople(img, dets[0], 
+                                   visual=visual, 
+                                   min_width_filter=min_width_filter, 
+                                   alt_repspoint=alt_repspoint, 
+                                   alt_repspoint_top=alt_repspoint_top)
+
+    def detectPeopleBatch(self, imgs, visual=False, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
+        """Detect person(s) in a batch of :obj:`Mat` like images with one single :code:`predict()`.
+
+        Parameters
+        ----------
+        imgs : list[Mat, ...]
+            A list of :obj:`Mat` like images.
+        visual : bool, default=False
+            An indication of whether to visualize the detected people.
+        min_width_filter : int, default=15
+            Minimum width filter of a detected person.
+        alt_repspoint : bool, default=False
+            An indication of whether to use the alternative :meth:`findRepspointBB`.
+        alt_repspoint_top : bool, default=True
+            A parameter passed to :obj:`prefer_top` of :meth:`findRepspointBB`.
+
+        Returns
+        -------
+        list[tuple(list[Person, ...], Mat), ...]
+            A list of (detected people, image) in the same order as :obj:`imgs`, exactly as 
+            returned by :meth:`detectPeople()` for each image.
+        """
+        if len(imgs) == 0: return []
+        dets = self.predictBatch(list(imgs))
+        return [self.makePeople(img, det, 
+                                visual=visual, 
+                                min_width_filter=min_width_filter, 
+                                alt_repspoint=alt_repspoint, 
+                                alt_repspoint_top=alt_repspoint_top) for img, det in zip(imgs, dets)]
+
+    def predictBatch(self, imgs):
+        """
+        :meta private:
+        """
+        return self.model.predict(
+            imgs,
             imgsz=int(self.cfg.imgsz),
             conf=float(self.cfg.conf),
             classes=0,
@@ -230,42 +251,46 @@ class MyYOLOULT(object):
             max_det=int(self.cfg.max_det),
             verbose=False
         )
+
+    def makePeople(self, img, det, visual=True, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
+        """
+        :meta private:
+        """
+        (boxes_xywh, boxes_xyxy, repspoints, confs, keypoints) = self.makeArrays(
+            det, 
+            min_width_filter=min_width_filter, 
+            alt_repspoint=alt_repspoint, 
+            alt_repspoint_top=alt_repspoint_top)
+        if visual: self.__draw__(img, boxes_xyxy, repspoints, keypoints)
+        return toPeople(boxes_xywh, boxes_xyxy, repspoints, confs, keypoints=keypoints), img
+
+    def makeArrays(self, det, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True):
+        """
+        :meta private:
+        """
+        # All the detections are filtered and converted at once, the people are made later
         if self.cpu_only:
-            numpy_dets = dets[0].numpy()
+            numpy_dets = det.numpy()
         else:
-            numpy_dets = dets[0].cuda().cpu().to("cpu").numpy()
-        dt_boxes_xyxy = numpy_dets.boxes.xyxy
-        dt_confidences = numpy_dets.boxes.conf
-        dt_keypoints = dets[0].keypoints
-        if dt_keypoints is not None:
-            i = 0
-            rev_dt_kps = reversed(dt_keypoints)
-            for box_xyxy, conf, kp in zip(dt_boxes_xyxy, dt_confidences, rev_dt_kps):
-                box_xyxy = box_xyxy.astype(int)
-                box_xywh = to_xywh(box_xyxy)
-                if box_xywh[2] >= min_width_filter:
-                    keypoint = kp.data[0]
-                    if alt_repspoint: repspoint = findRepspointBB(box_xyxy, prefer_top=alt_repspoint_top)
-                    else: repspoint = findRepspoint(box_xyxy, self.cfg.repspoint_calibration)
-                    people.append(Person(i, i, box_xywh=box_xywh, box_xyxy=box_xyxy,
-                                  keypoints=keypoint, repspoint=repspoint, det_conf=float(conf)))
-                    i += 1
-                    if visual:
-                        cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
-                        cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
-                        self.__kpts__(img, keypoint, kpt_line=True)
-        elif len(dt_boxes_xyxy) > 0:
-            i = 0
-            for box_xyxy, conf in zip(dt_boxes_xyxy, dt_confidences):
-                box_xyxy = box_xyxy.astype(int)
-                box_xywh = to_xywh(box_xyxy)
-                if box_xywh[2] >= min_width_filter:
-                    if alt_repspoint: repspoint = findRepspointBB(box_xyxy, prefer_top=alt_repspoint_top)
-                    else: repspoint = findRepspoint(box_xyxy, self.cfg.repspoint_calibration)
-                    people.append(Person(i, i, box_xywh=box_xywh, box_xyxy=box_xyxy, 
-                                  repspoint=repspoint, det_conf=float(conf)))
-                    i += 1
-                    if visual:
-                        cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
-                        cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
-        return people, img
+            numpy_dets = det.cuda().cpu().to("cpu").numpy()
+        boxes_xyxy = np.asarray(numpy_dets.boxes.xyxy).reshape(-1, 4).astype(int)
+        confs = np.asarray(numpy_dets.boxes.conf).reshape(-1)
+        boxes_xywh = boxes_xyxy.copy()
+        boxes_xywh[:, 2:] -= boxes_xyxy[:, :2]
+        keep = boxes_xywh[:, 2] >= min_width_filter
+        keypoints = None
+        if det.keypoints is not None:
+            # Compact float32 (N, 17, 3), in the same order as the boxes
+            keypoints = np.asarray(numpy_dets.keypoints.data, dtype=np.float32)
+            keypoints = np.ascontiguousarray(keypoints[keep])
+        (boxes_xywh, boxes_xyxy, confs) = (boxes_xywh[keep], boxes_xyxy[keep], confs[keep])
+        if alt_repspoint: repspoints = findRepspointsBB(boxes_xyxy, prefer_top=alt_repspoint_top)
+        else: repspoints = findRepspoints(boxes_xyxy, self.cfg.repspoint_calibration)
+        return boxes_xywh, boxes_xyxy, repspoints, confs, keypoints
+
+    def __draw__(self, img, boxes_xyxy, repspoints, keypoints=None):
+        # Internal function
+        for i, (box_xyxy, repspoint) in enumerate(zip(boxes_xyxy.tolist(), repspoints.tolist())):
+            cv2.circle(img, (repspoint[0], repspoint[1]), 5, (0, 0, 255), -1)
+            cv2.rectangle(img, (box_xyxy[0], box_xyxy[1]), (box_xyxy[2], box_xyxy[3]), (255, 255, 0), 2)
+            if keypoints is not None: self.__kpts__(img, keypoints[i], kpt_line=True)
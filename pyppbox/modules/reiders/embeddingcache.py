@@ -0,0 +1,157 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+
+import os
+import json
+import hashlib
+import numpy as np
+
+from typing import Callable, List
+
+from pyppbox.utils.logtools import add_info_log, add_warning_log
+
+
+class EmbeddingCache(object):
+
+    """A persistent cache of the embeddings of the training images, kept next to the classifier 
+    .pkl file as a memory-mapped :code:`.emb.npy` matrix and a :code:`.emb.json` index. An 
+    image is identified by its path, size, and modification time, and the whole cache is tied 
+    to a model key, e.g. the model name and the hash of its weights. Only the new or changed 
+    images are embedded again, and the entries of the removed images are pruned.
+    """
+
+    def __init__(self, classifier_pkl: str, model_key: str):
+        """Initialize the cache of the given classifier file.
+
+        Parameters
+        ----------
+        classifier_pkl : str
+            Path of the classifier .pkl file, which defines the paths of the cache files.
+        model_key : str
+            A key of the model which computes the embeddings, see :func:`getModelHash()`.
+        """
+        prefix = os.path.splitext(classifier_pkl)[0]
+        self.npy_file = prefix + ".emb.npy"
+        self.index_file = prefix + ".emb.json"
+        self.model_key = model_key
+
+    def __loadIndex__(self):
+        if not os.path.isfile(self.index_file): return {}, None
+        try:
+            with open(self.index_file, 'r') as index_file:
+                index = json.load(index_file)
+            if index.get('model_key') == self.model_key and os.path.isfile(self.npy_file):
+                return index['entries'], np.load(self.npy_file, mmap_mode='r')
+        except Exception as e:
+            add_warning_log(f"--------RI : Embedding cache is ignored -> {e}")
+        return {}, None
+
+    def __save__(self, keys, emb_array):
+        # Write to temporary files then replace, so an interrupted run never corrupts the cache
+        tmp_npy = self.npy_file + ".tmp.npy"
+        out = np.lib.format.open_memmap(tmp_npy, mode='w+', dtype=np.float32, shape=emb_array.shape)
+        out[:] = emb_array
+        out.flush()
+        del out
+        tmp_index = self.index_file + ".tmp"
+        with open(tmp_index, 'w') as index_file:
+            json.dump({'model_key': self.model_key, 
+                       'entries': {k[0]: [k[1], k[2], i] for i, k in enumerate(keys)}}, index_file)
+        os.replace(tmp_npy, self.npy_file)
+        os.replace(tmp_index, self.index_file)
+
+    def getEmbeddings(self, paths: List[str], embed: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Get the embeddings of the given image files, computing only the missing ones.
+
+        Parameters
+        ----------
+        paths : list[str, ...]
+            A list of image files.
+        embed : Callable[[list[str, ...]], ndarray]
+            A function which returns the (M, D) embeddings of a list of M image files.
+
+        Returns
+        -------
+        ndarray
+            The (N, D) embeddings of :obj:`paths` in the same order.
+        """
+        entries, cached = self.__loadIndex__()
+        if len(paths) == 0 and cached is None:
+            # Nothing to embed and no cache to get the dimension from
+            return np.zeros((0, 0), dtype=np.float32)
+        keys = []
+        for path in paths:
+            stat = os.stat(path)
+            keys.append((os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns))
+        rows = []
+        missing = []
+        for i, (key, size, mtime) in enumerate(keys):
+            entry = entries.get(key)
+            if cached is not None and entry is not None and entry[0] == size and entry[1] == mtime:
+                rows.append(entry[2])
+            else:
+                rows.append(-1)
+                missing.append(i)
+        stale = len(set(entries) - set(key[0] for key in keys))
+        add_info_log(f"--------RI : Embedding cache -> {len(paths) - len(missing)} cached, "
+                     f"{len(missing)} to compute, {stale} pruned")
+        if len(missing) == 0 and stale == 0:
+            return np.asarray(cached[np.asarray(rows, dtype=np.int64)], dtype=np.float32)
+        new_array = None
+        if len(missing) > 0:
+            new_array = np.asarray(embed([paths[i] for i in missing]), dtype=np.float32)
+        dim = new_array.shape[1] if new_array is not None else cached.shape[1]
+        emb_array = np.zeros((len(paths), dim), dtype=np.float32)
+        hits = np.flatnonzero(np.asarray(rows) >= 0)
+        if len(hits) > 0:
+            emb_array[hits] = cached[np.asarray(rows, dtype=np.int64)[hits]]
+        if new_array is not None:
+            emb_array[missing] = new_array
+        del cached
+        self.__save__(keys, emb_array)
+        return emb_array
+
+
+def getModelHash(*args) -> str:
+    """Return a key of a model made of the given names and the SHA-1 of the given files.
+
+    Parameters
+    ----------
+    *args : str
+        Model names or model files, e.g. :code:`getModelHash(model_name, model_path)`.
+
+    Returns
+    -------
+    str
+        The key of the model.
+    """
+    sha1 = hashlib.sha1()
+    for arg in args:
+        arg = str(arg)
+        if os.path.isfile(arg):
+            with open(arg, 'rb') as model_file:
+                for chunk in iter(lambda: model_file.read(1 << 20), b''):
+                    sha1.update(chunk)
+        else:
+            sha1.update(arg.encode('utf-8'))
+    return sha1.hexdigest()
+
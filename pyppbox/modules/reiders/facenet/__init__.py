@@ -20,13 +20,17 @@
 
 
 import os
+import copy
 import pickle
+import threading
 import cv2
 import skimage.transform
 import numpy as np
 
 from pyppbox.utils.commontools import getFileName, silencer
-from pyppbox.utils.logtools import add_info_log, add_warning_log, ignore_this_logger
+from pyppbox.utils.logtools import add_info_log, add_warning_log, add_error_log, ignore_this_logger
+from pyppbox.utils.registrytools import acquireModel, getModelKey
+from pyppbox.utils.stattools import getNullStats
 
 ignore_this_logger("tensorflow")
 ignore_this_logger("facenet")
@@ -42,11 +46,34 @@ tf.autograph.set_verbosity(1)
 
 from .origin import facenet as fn
 from .origin import detect_face as df
+from ..embeddingcache import EmbeddingCache, getModelHash
+from ..trainloader import embedImages
+from ..gallery import (GalleryClassifier, makeClassifier, enrollGalleryIdentity, 
+                       removeGalleryIdentity, dumpClassifier, loadClassifier)
+
+
+class FaceNetModel(object):
+
+    """
+    :meta private:
+    """
+
+    def __init__(self, model_det, model_file, gpu_mem):
+        with tf.Graph().as_default():
+            gpu_options = tf.compat.v1.GPUOptions(per_process_gpu_memory_fraction=float(gpu_mem))
+            self.sess = tf.compat.v1.Session(config=tf.compat.v1.ConfigProto(gpu_options=gpu_options, allow_soft_placement=True))
+            with self.sess.as_default():
+                self.pnet, self.rnet, self.onet = df.create_mtcnn(self.sess, model_det)
+                fn.load_model(model_file)
+                self.images_placeholder = tf.compat.v1.get_default_graph().get_tensor_by_name("input:0")
+                self.embeddings = tf.compat.v1.get_default_graph().get_tensor_by_name("embeddings:0")
+                self.phase_train_placeholder = tf.compat.v1.get_default_graph().get_tensor_by_name("phase_train:0")
+                self.embedding_size = self.embeddings.get_shape()[1]
 
 
 class MyFaceNet(object):
 
-    def __init__(self, cfg, auto_load=False):
+    def __init__(self, cfg, auto_load=False, shared=False):
         """Initialize according to the given :obj:`cfg` and :obj:`auto_load`.
 
         Parameters
@@ -55,6 +82,10 @@ class MyFaceNet(object):
             A :class:`RCFGFaceNet` object which manages the configurations of reidier FaceNet.
         auto_load : bool, optional
             An indication of whether to automatically call :meth:`load_classifier()`.
+        shared : bool, default=False
+            An indication of whether to share the TF session, MTCNN, and FaceNet model with the 
+            other objects loading the same models through 
+            :class:`pyppbox.utils.registrytools.ModelRegistry`. The classifier is never shared.
         """
         self.unk = cfg.unified_strings.unk_fid
         self.err = cfg.unified_strings.err_fid
@@ -63,6 +94,7 @@ class MyFaceNet(object):
         self.classifier_file = cfg.classifier_pkl
         self.batch_size = cfg.batch_size
         self.min_confidence = int(100 * cfg.min_confidence)
+        self.classifier_type = cfg.classifier_type
         self.gpu_mem = cfg.gpu_mem
         self.train_data = cfg.train_data
         self.minsize = 20  # minimum size of face
@@ -71,48 +103,89 @@ class MyFaceNet(object):
         self.margin = 44
         self.image_size = 182
         self.input_image_size = 160
+        self.shared = shared
+        self.facenet_model = None
+        self.lock = threading.RLock()
+        self.classifier_lock = threading.Lock()
+        self.stats = getNullStats()
         self.auto_load = auto_load
         if self.auto_load:
             self.load_classifier()
 
+    def load_model(self):
+        """Load the TF session, MTCNN, and FaceNet model from the configurations, which is done 
+        once and automatically by :meth:`load_classifier()`.
+        """
+        if self.facenet_model is None:
+            key = getModelKey("FaceNet", self.model_det, self.model_file, float(self.gpu_mem))
+            self.facenet_model = acquireModel(key, 
+                                              lambda: FaceNetModel(self.model_det, self.model_file, self.gpu_mem), 
+                                              owner=self, 
+                                              shared=self.shared)
+            if self.shared: self.lock = self.facenet_model.lock
+            self.sess = self.facenet_model.sess
+            self.pnet = self.facenet_model.pnet
+            self.rnet = self.facenet_model.rnet
+            self.onet = self.facenet_model.onet
+            self.images_placeholder = self.facenet_model.images_placeholder
+            self.embeddings = self.facenet_model.embeddings
+            self.phase_train_placeholder = self.facenet_model.phase_train_placeholder
+            self.embedding_size = self.facenet_model.embedding_size
+
+    @property
+    def model(self):
+        return self.classifier[0]
+
+    @property
+    def pnames(self):
+        return self.classifier[1]
+
     def load_classifier(self):
-        with tf.Graph().as_default():
-            gpu_options = tf.compat.v1.GPUOptions(per_process_gpu_memory_fraction=float(self.gpu_mem))
-            self.sess = tf.compat.v1.Session(config=tf.compat.v1.ConfigProto(gpu_options=gpu_options, allow_soft_placement=True))
-            with self.sess.as_default():
-                self.pnet, self.rnet, self.onet = df.create_mtcnn(self.sess, self.model_det)
-                self.labels_names_file = os.path.splitext(self.classifier_file)[0] + ".txt"
-                with open(self.labels_names_file, 'r') as fp:
-                    self.pnames = fp.readlines()
-                    self.pnames = [line.rstrip('\n') for line in self.pnames]
-                self.pnames = sorted(self.pnames)
-                # add_info_log("--------RI : " + str(self.pnames))
-                fn.load_model(self.model_file)
-                self.images_placeholder = tf.compat.v1.get_default_graph().get_tensor_by_name("input:0")
-                self.embeddings = tf.compat.v1.get_default_graph().get_tensor_by_name("embeddings:0")
-                self.phase_train_placeholder = tf.compat.v1.get_default_graph().get_tensor_by_name("phase_train:0")
-                self.embedding_size = self.embeddings.get_shape()[1]
-                self.classifier_file_exp = os.path.expanduser(self.classifier_file)
-                with open(self.classifier_file_exp, 'rb') as infile:
-                    (self.model, class_names) = pickle.load(infile)
-                add_info_log(f"--------RI : Classifier loaded! <- {getFileName(self.classifier_file)}")
+        """Load the classifier model from the configurations.
+        """
+        self.load_model()
+        self.labels_names_file = os.path.splitext(self.classifier_file)[0] + ".txt"
+        self.classifier_file_exp = os.path.expanduser(self.classifier_file)
+        # The names are the ones saved with the model, the text file may be from another version, 
+        # and the model and its names are replaced together, see enrollIdentity()
+        (model, class_names) = loadClassifier(self.classifier_file_exp)
+        self.classifier = (model, sorted(class_names))
+        # add_info_log("--------RI : " + str(self.pnames))
+        add_info_log(f"--------RI : Classifier loaded! <- {getFileName(self.classifier_file)}")
 
-    def predict(self, scaled_reshape_img):
+    def predict(self, scaled_reshape_img, model=None):
         """
         :meta private:
         """
         best_class = -1
         best_proba = -1
+        if model is None: model = self.model
         feed_dict = {self.images_placeholder: scaled_reshape_img, self.phase_train_placeholder: False}
         emb_array = np.zeros((1, self.embedding_size))
-        emb_array[0, :] = self.sess.run(self.embeddings, feed_dict=feed_dict)
-        predictions = self.model.predict_proba(emb_array)
+        with self.stats.timer("reid.embedding"):
+            emb_array[0, :] = self.sess.run(self.embeddings, feed_dict=feed_dict)
+        with self.stats.timer("reid.classifier"):
+            predictions = model.predict_proba(emb_array)
         best_class_indices = np.argmax(predictions, axis=1)
         best_class_probabilities = predictions[np.arange(len(best_class_indices)), best_class_indices]
         best_class = int(np.asarray(best_class_indices[0]).item())
         best_proba = float(np.asarray(best_class_probabilities[0]).item() * 100)
         return best_class, best_proba
 
+    def predict_batch(self, scaled_reshape_imgs, model=None):
+        """
+        :meta private:
+        """
+        if model is None: model = self.model
+        feed_dict = {self.images_placeholder: scaled_reshape_imgs, self.phase_train_placeholder: False}
+        with self.stats.timer("reid.embedding"):
+            emb_array = self.sess.run(self.embeddings, feed_dict=feed_dict)
+        with self.stats.timer("reid.classifier"):
+            predictions = model.predict_proba(emb_array)
+        best_class_indices = np.argmax(predictions, axis=1)
+        best_class_probabilities = predictions[np.arange(len(best_class_indices)), best_class_indices]
+        return best_class_indices.astype(int).tolist(), (best_class_probabilities * 100).astype(float).tolist()
+
     def recognize(self, img, is_bgr=True):
         """Recognize or re-identify a person in the given :obj:`img`.
 
@@ -133,16 +206,19 @@ class MyFaceNet(object):
         result = ""
         conf = 100.0
         img = self.prepare_image(img, is_bgr=is_bgr)
-        bboxes, _ = df.detect_face(img, self.minsize, self.pnet, self.rnet, self.onet, self.threshold, self.factor)
+        with self.stats.timer("reid.mtcnn"), self.lock:
+            bboxes, _ = df.detect_face(img, self.minsize, self.pnet, self.rnet, self.onet, self.threshold, self.factor)
         if bboxes.shape[0] > 0:
             scaled_reshape_img = self.make_facenet_image(bboxes, img)
-            best_class, best_proba = self.predict(scaled_reshape_img)
+            (model, pnames) = self.classifier
+            with self.lock:
+                best_class, best_proba = self.predict(scaled_reshape_img, model=model)
             if best_class != -1 and best_proba != -1:
                 if best_proba < self.min_confidence:
                     result = self.unk
                     # add_info_log("--------RI : Result is below required confidence! -> Return " + str(self.unk))
                 else:
-                    result = self.pnames[best_class]
+                    result = pnames[best_class]
                     conf = best_proba
                     # add_info_log('--------RI : Result -> "%s"' % result)
         else:
@@ -150,6 +226,58 @@ class MyFaceNet(object):
             result = self.err
         return result, conf
 
+    def recognizeBatch(self, imgs, is_bgr=True, face_boxes=None):
+        """Recognize or re-identify the persons in the given list of images, e.g. the face 
+        regions of all the persons in a frame. It gives the same results as calling 
+        :meth:`recognize()` on each image, but the faces are detected by one bulk MTCNN, then 
+        embedded by one :code:`sess.run()` and classified by one :code:`predict_proba()`.
+
+        Parameters
+        ----------
+        imgs : list[Mat, ...]
+            A list of :obj:`Mat` like images.
+        is_bgr : bool, default=True
+            An indication of whether the color channel of given :obj:`imgs` is BGR.
+        face_boxes : list[ndarray or None, ...], default=None
+            A list of the known face box :code:`[x1, y1, x2, y2]` in each image, e.g. found by 
+            :func:`pyppbox.utils.persontools.findFaceBoxKP`, or :code:`None` to find the face 
+            by MTCNN. MTCNN is skipped for the images with a known face box.
+
+        Returns
+        -------
+        list[tuple[str, float], ...]
+            A list of (class name, confidence), one for each image.
+        """
+        results = [(self.err, 100.0)] * len(imgs)
+        if len(imgs) == 0: return results
+        if face_boxes is None: face_boxes = [None] * len(imgs)
+        imgs = [self.prepare_image(img, is_bgr=is_bgr) for img in imgs]
+        bboxes = [None if box is None else np.asarray(box).reshape(1, -1) for box in face_boxes]
+        mtcnn_indices = [i for i, box in enumerate(bboxes) if box is None]
+        if len(mtcnn_indices) > 0:
+            with self.stats.timer("reid.mtcnn"), self.lock:
+                dets = df.bulk_detect_face([imgs[i] for i in mtcnn_indices], 0, self.pnet, self.rnet, self.onet, 
+                                           self.threshold, self.factor, minsize=self.minsize)
+            for i, det in zip(mtcnn_indices, dets):
+                if det is not None and det[0].shape[0] > 0: bboxes[i] = det[0]
+        indices = []
+        scaled_reshape_imgs = []
+        for i, (img, bbox) in enumerate(zip(imgs, bboxes)):
+            if bbox is not None:
+                indices.append(i)
+                scaled_reshape_imgs.append(self.make_facenet_image(bbox, img))
+        if len(indices) > 0:
+            (model, pnames) = self.classifier
+            with self.lock:
+                best_classes, best_probas = self.predict_batch(np.concatenate(scaled_reshape_imgs, axis=0), 
+                                                               model=model)
+            for i, best_class, best_proba in zip(indices, best_classes, best_probas):
+                if best_proba < self.min_confidence:
+                    results[i] = (self.unk, 100.0)
+                else:
+                    results[i] = (pnames[best_class], best_proba)
+        return results
+
     def recognize_file(self, img_path):
         """
         :meta private:
@@ -186,8 +314,18 @@ class MyFaceNet(object):
         scaled_reshape_img = scaled_img.reshape(-1, self.input_image_size, self.input_image_size, 3)
         return scaled_reshape_img
 
-    def train_classifier(self, C=1.0, kernel='rbf', probability=True, decision_function_shape='ovr'):
-        """Train a classifier and dump into pickle .pkl file.
+    def train_classifier(
+        self, 
+        C=1.0, 
+        kernel='rbf', 
+        probability=True, 
+        decision_function_shape='ovr', 
+        use_cache=True, 
+        num_workers=4
+    ):
+        """Train a classifier of the configured :obj:`classifier_type` and dump into pickle .pkl 
+        file. The parameters are only used by :code:`'SVC'`, while :code:`'Gallery'` and 
+        :code:`'Centroid'` build a :class:`pyppbox.modules.reiders.gallery.GalleryClassifier`.
 
         Parameters
         ----------
@@ -202,9 +340,14 @@ class MyFaceNet(object):
         decision_function_shape : str, default='ovr'
             Choice of function: :code:`'ovo'` or :code:`'ovr'`, passed to sklearn's 
             :code:`SVC(decision_function_shape=decision_function_shape, ...)`.
+        use_cache : bool, default=True
+            An indication of whether to keep the embeddings of the training images in a 
+            :class:`pyppbox.modules.reiders.embeddingcache.EmbeddingCache` next to the classifier 
+            file, so only the new or changed images are embedded by the next training.
+        num_workers : int, default=4
+            Number of threads loading the images ahead of the embedding, while the number of 
+            images embedded at once is the configured :obj:`batch_size`.
         """
-        import math
-        from sklearn.svm import SVC
         with tf.Graph().as_default():
 
             gpu_options = tf.compat.v1.GPUOptions(per_process_gpu_memory_fraction=float(self.gpu_mem))
@@ -224,27 +367,32 @@ class MyFaceNet(object):
                 images_placeholder = tf.compat.v1.get_default_graph().get_tensor_by_name("input:0")
                 embeddings = tf.compat.v1.get_default_graph().get_tensor_by_name("embeddings:0")
                 phase_train_placeholder = tf.compat.v1.get_default_graph().get_tensor_by_name("phase_train:0")
-                embedding_size = embeddings.get_shape()[1]
 
                 # Run forward pass to calculate embeddings
                 add_info_log('--------RI : Calculating features ... ')
-                batch_size = self.batch_size
                 image_size = 160
-                nrof_images = len(paths)
-                nrof_batches_per_epoch = int(math.ceil(1.0 * nrof_images / batch_size))
-                emb_array = np.zeros((nrof_images, embedding_size))
-                for i in range(nrof_batches_per_epoch):
-                    start_index = i * batch_size
-                    end_index = min((i + 1) * batch_size, nrof_images)
-                    paths_batch = paths[start_index:end_index]
-                    images = fn.load_data(paths_batch, False, False, image_size)
-                    feed_dict = {images_placeholder: images, phase_train_placeholder: False}
-                    emb_array[start_index:end_index, :] = sess.run(embeddings, feed_dict=feed_dict)
+                def load_image(path):
+                    return fn.load_data([path], False, False, image_size)[0].astype(np.float32)
+                def embed_images(images):
+                    feed_dict = {images_placeholder: np.stack(images), phase_train_placeholder: False}
+                    return sess.run(embeddings, feed_dict=feed_dict)
+                def calculate_embeddings(paths):
+                    # Load in a thread pool while the previous batch is being embedded
+                    return embedImages(paths, 
+                                       load_image, 
+                                       embed_images, 
+                                       batch_size=self.batch_size, 
+                                       num_workers=num_workers)
+                if use_cache:
+                    cache = EmbeddingCache(classifier_filename_exp, getModelHash("FaceNet", self.model_file))
+                    emb_array = cache.getEmbeddings(paths, calculate_embeddings)
+                else:
+                    emb_array = calculate_embeddings(paths)
 
                 # Train classifier
                 add_info_log('--------RI : Training classifier ... ')
-                model = SVC(C=C, kernel=kernel, probability=probability, 
-                            decision_function_shape=decision_function_shape)
+                model = makeClassifier(self.classifier_type, C=C, kernel=kernel, probability=probability, 
+                                       decision_function_shape=decision_function_shape)
                 model.fit(emb_array, labels)
 
                 # Create a list of class names & save classifier model
@@ -256,3 +404,81 @@ class MyFaceNet(object):
                 with open(classes_txt, 'w') as classes_file:
                     classes_file.writelines([str(c) + "\n" for c in class_names])
                 add_info_log(f"--------RI : Classes file saved! -> {classes_txt}")
+
+    def __checkGallery__(self, caller):
+        if not isinstance(self.model, GalleryClassifier):
+            msg = (f"MyFaceNet : {caller}() -> Only a 'Gallery' or 'Centroid' classifier can be "
+                   "updated incrementally, train it with classifier_type='Gallery' or 'Centroid'.")
+            add_error_log(msg)
+            raise ValueError(msg)
+
+    def __loadFaceImages__(self, images, is_bgr):
+        # Same preprocessing as the training images of train_classifier()
+        faces = np.zeros((len(images), self.input_image_size, self.input_image_size, 3))
+        for i, img in enumerate(images):
+            if isinstance(img, str):
+                faces[i] = fn.load_data([img], False, False, self.input_image_size)[0]
+            else:
+                img = self.prepare_image(img, is_bgr=is_bgr)
+                if img.shape[0] != self.image_size or img.shape[1] != self.image_size:
+                    img = cv2.resize(img, (self.image_size, self.image_size), interpolation=cv2.INTER_CUBIC)
+                faces[i] = fn.crop(fn.prewhiten(img), False, self.input_image_size)
+        return faces
+
+    def enrollIdentity(self, name, images, is_bgr=True):
+        """Add a new identity, or more images of an existing one, to the loaded classifier by 
+        computing the embeddings of the given :obj:`images` only, then rewrite the classifier 
+        .pkl and the classes .txt files atomically. Only a 'Gallery' or 'Centroid' classifier 
+        is supported.
+
+        Parameters
+        ----------
+        name : str
+            The class name of the identity.
+        images : list[str or Mat, ...]
+            A list of image files or :obj:`Mat` like images of the aligned face, e.g. 182x182 
+            like the training data.
+        is_bgr : bool, default=True
+            An indication of whether the color channel of the given :obj:`Mat` like images is BGR.
+        """
+        self.__checkGallery__("enrollIdentity")
+        if len(images) == 0:
+            msg = "MyFaceNet : enrollIdentity() -> The input 'images' is empty."
+            add_error_log(msg)
+            raise ValueError(msg)
+        faces = self.__loadFaceImages__(images, is_bgr)
+        emb_array = np.zeros((len(faces), self.embedding_size))
+        for start in range(0, len(faces), self.batch_size):
+            end = min(start + self.batch_size, len(faces))
+            feed_dict = {self.images_placeholder: faces[start:end], self.phase_train_placeholder: False}
+            with self.lock:
+                emb_array[start:end, :] = self.sess.run(self.embeddings, feed_dict=feed_dict)
+        # Update a copy, so the ongoing predictions keep using a consistent classifier, and 
+        # one update at a time, so none of them is lost
+        with self.classifier_lock:
+            model = copy.deepcopy(self.model)
+            pnames = enrollGalleryIdentity(model, self.pnames, name, emb_array)
+            dumpClassifier(self.classifier_file_exp, self.labels_names_file, model, pnames)
+            self.classifier = (model, pnames)
+        add_info_log(f"--------RI : Identity '{name}' enrolled with {len(images)} image(s)")
+
+    def removeIdentity(self, name):
+        """Remove an identity from the loaded classifier, then rewrite the classifier .pkl and 
+        the classes .txt files atomically. Only a 'Gallery' or 'Centroid' classifier is supported.
+
+        Parameters
+        ----------
+        name : str
+            The class name of the identity.
+        """
+        self.__checkGallery__("removeIdentity")
+        with self.classifier_lock:
+            if name not in self.pnames or len(self.pnames) < 2:
+                msg = f"MyFaceNet : removeIdentity() -> Can't remove '{name}' from {self.pnames}."
+                add_error_log(msg)
+                raise ValueError(msg)
+            model = copy.deepcopy(self.model)
+            pnames = removeGalleryIdentity(model, self.pnames, name)
+            dumpClassifier(self.classifier_file_exp, self.labels_names_file, model, pnames)
+            self.classifier = (model, pnames)
+        add_info_log(f"--------RI : Identity '{name}' removed")
@@ -416,13 +416,15 @@ def detect_face(img, minsize, pnet, rnet, onet, threshold, factor):
     return total_boxes, points
 
 
-def bulk_detect_face(images, detection_window_size_ratio, pnet, rnet, onet, threshold, factor):
+def bulk_detect_face(images, detection_window_size_ratio, pnet, rnet, onet, threshold, factor, minsize=None):
     """Detects faces in a list of images
     images: list containing input images
     detection_window_size_ratio: ratio of minimum face size to smallest image dimension
     pnet, rnet, onet: caffemodel
     threshold: threshold=[th1 th2 th3], th1-3 are three steps's threshold [0-1]
     factor: the factor used to create a scaling pyramid of face sizes to detect in the image.
+    minsize: if set, the absolute minimum faces' size used instead of detection_window_size_ratio, 
+    which gives the same scale pyramid as detect_face()
     """
     all_scales = [None] * len(images)
     images_with_boxes = [None] * len(images)
@@ -435,13 +437,16 @@ def bulk_detect_face(images, detection_window_size_ratio, pnet, rnet, onet, thre
         all_scales[index] = []
         h = img.shape[0]
         w = img.shape[1]
-        minsize = int(detection_window_size_ratio * np.minimum(w, h))
         factor_count = 0
         minl = np.amin([h, w])
-        if minsize <= 12:
-            minsize = 12
+        if minsize is None:
+            img_minsize = int(detection_window_size_ratio * np.minimum(w, h))
+            if img_minsize <= 12:
+                img_minsize = 12
+        else:
+            img_minsize = minsize
 
-        m = 12.0 / minsize
+        m = 12.0 / img_minsize
         minl = minl * m
         while minl >= 12:
             all_scales[index].append(m * np.power(factor, factor_count))
@@ -534,6 +539,9 @@ def bulk_detect_face(images, detection_window_size_ratio, pnet, rnet, onet, thre
         if 'rnet_input' in image_obj:
             bulk_rnet_input = np.append(bulk_rnet_input, image_obj['rnet_input'], axis=0)
 
+    if bulk_rnet_input.shape[0] == 0:
+        return [None] * len(images)
+
     out = rnet(bulk_rnet_input)
     out0 = np.transpose(out[0])
     out1 = np.transpose(out[1])
@@ -590,6 +598,9 @@ def bulk_detect_face(images, detection_window_size_ratio, pnet, rnet, onet, thre
         if 'onet_input' in image_obj:
             bulk_onet_input = np.append(bulk_onet_input, image_obj['onet_input'], axis=0)
 
+    if bulk_onet_input.shape[0] == 0:
+        return [None] * len(images)
+
     out = onet(bulk_onet_input)
 
     out0 = np.transpose(out[0])
@@ -0,0 +1,228 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+
+import os
+import pickle
+import numpy as np
+
+from pyppbox.utils.logtools import add_error_log
+
+
+class GalleryClassifier(object):
+
+    """A classifier of embeddings, used as an alternative to sklearn's :code:`SVC` by the 
+    reiders. It stores the L2-normalized embeddings of the gallery, or one normalized centroid 
+    per identity, as a contiguous float32 matrix, so a batch of queries costs one matrix 
+    multiplication. :meth:`predict_proba()` returns the cosine similarity to the closest 
+    embedding of each identity, clipped to [0, 1], so :obj:`min_confidence` of the reider is 
+    used as the minimum similarity.
+
+    Attributes
+    ----------
+    mode : str
+        :code:`'gallery'` keeps all the embeddings, :code:`'centroid'` keeps one per identity.
+    classes_ : ndarray
+        The sorted class labels, the columns of :meth:`predict_proba()`.
+    embeddings : ndarray
+        The (N, D) float32 matrix of the normalized embeddings, grouped by class.
+    labels : ndarray
+        The class label of each row of :attr:`embeddings`.
+    sums : ndarray
+        The (C, D) sums of the normalized embeddings of each class, only for 
+        :code:`'centroid'`, so the centroids can be updated by :meth:`add()`.
+    """
+
+    def __init__(self, mode='gallery'):
+        if mode not in ('gallery', 'centroid'):
+            msg = f"GalleryClassifier : __init__() -> mode='{mode}' is not supported."
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.mode = mode
+
+    def __normalize__(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        return X / np.maximum(norms, 1e-12)
+
+    def fit(self, X, y):
+        """Build the gallery from the embeddings :obj:`X` and their labels :obj:`y`.
+
+        Parameters
+        ----------
+        X : array-like
+            The (N, D) embeddings.
+        y : array-like
+            The N class labels.
+
+        Returns
+        -------
+        GalleryClassifier
+            This object.
+        """
+        self.__build__(self.__normalize__(X), np.asarray(y, dtype=np.int64))
+        return self
+
+    def __build__(self, X, y):
+        # X holds the normalized embeddings, or the per-class sums for 'centroid'
+        order = np.argsort(y, kind='stable')
+        X, y = X[order], y[order]
+        self.classes_, starts = np.unique(y, return_index=True)
+        if self.mode == 'centroid':
+            self.sums = np.add.reduceat(X, starts, axis=0)
+            X = self.__normalize__(self.sums)
+            y = self.classes_.copy()
+            starts = np.arange(len(self.classes_))
+        self.embeddings = np.ascontiguousarray(X)
+        self.labels = y
+        self.__starts__ = starts
+
+    def __base__(self):
+        return self.sums if self.mode == 'centroid' else self.embeddings
+
+    def add(self, X, label):
+        """Add the embeddings of one class, new or existing, without refitting the others.
+
+        Parameters
+        ----------
+        X : array-like
+            The (N, D) embeddings.
+        label : int
+            The class label of all the embeddings.
+        """
+        X = self.__normalize__(X)
+        self.__build__(np.concatenate([self.__base__(), X]), 
+                       np.concatenate([self.labels, np.full(len(X), label, dtype=self.labels.dtype)]))
+
+    def remove(self, label):
+        """Remove all the embeddings of a class.
+
+        Parameters
+        ----------
+        label : int
+            The class label.
+        """
+        keep = self.labels != label
+        self.__build__(self.__base__()[keep], self.labels[keep])
+
+    def relabel(self, mapping):
+        """Change the class labels, e.g. when a class name is inserted into a sorted list.
+
+        Parameters
+        ----------
+        mapping : array-like
+            The new label of every old label, :code:`new_label = mapping[old_label]`.
+        """
+        mapping = np.asarray(mapping, dtype=self.labels.dtype)
+        self.__build__(self.__base__(), mapping[self.labels])
+
+    def predict_proba(self, X):
+        """Compute the score of every class for a batch of embeddings.
+
+        Parameters
+        ----------
+        X : array-like
+            The (M, D) query embeddings.
+
+        Returns
+        -------
+        ndarray
+            The (M, C) scores in [0, 1], where C is the number of :attr:`classes_`.
+        """
+        sims = self.__normalize__(X) @ self.embeddings.T
+        if self.mode == 'gallery':
+            sims = np.maximum.reduceat(sims, self.__starts__, axis=1)
+        return np.clip(sims, 0.0, 1.0)
+
+    def predict(self, X):
+        """Predict the class labels of a batch of embeddings.
+
+        Parameters
+        ----------
+        X : array-like
+            The (M, D) query embeddings.
+
+        Returns
+        -------
+        ndarray
+            The M predicted class labels.
+        """
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def makeClassifier(classifier_type, C=1.0, kernel='rbf', probability=True, decision_function_shape='ovr'):
+    """
+    :meta private:
+    """
+    name = str(classifier_type).lower()
+    if name == 'svc':
+        from sklearn.svm import SVC
+        return SVC(C=C, kernel=kernel, probability=probability, 
+                   decision_function_shape=decision_function_shape)
+    elif name in ('gallery', 'centroid'):
+        return GalleryClassifier(mode=name)
+    msg = f"makeClassifier() -> classifier_type='{classifier_type}' is not supported."
+    add_error_log(msg)
+    raise ValueError(msg)
+
+def enrollGalleryIdentity(model, class_names, name, embeddings):
+    """
+    :meta private:
+    """
+    # Keep the class names sorted, like the training datasets and the loaded names of FaceNet
+    new_names = sorted(set(class_names) | {name})
+    model.relabel([new_names.index(n) for n in class_names])
+    model.add(embeddings, new_names.index(name))
+    return new_names
+
+def removeGalleryIdentity(model, class_names, name):
+    """
+    :meta private:
+    """
+    new_names = [n for n in class_names if n != name]
+    model.remove(class_names.index(name))
+    model.relabel([new_names.index(n) if n != name else -1 for n in class_names])
+    return new_names
+
+def loadClassifier(classifier_pkl):
+    """
+    :meta private:
+    """
+    # The class names come with the model from the same file, never from the text file
+    with open(classifier_pkl, 'rb') as classifier_file:
+        (model, class_names) = pickle.load(classifier_file)
+    return model, list(class_names)
+
+def dumpClassifier(classifier_pkl, classes_txt, model, class_names):
+    """
+    :meta private:
+    """
+    # Each file is written to a temporary file then replaced, so none is ever partial. The pair 
+    # is not replaced at once, so only the pickle, which holds both the model and the class 
+    # names, is read back by loadClassifier(), the text file is only for display
+    tmp_pkl = classifier_pkl + ".tmp"
+    with open(tmp_pkl, 'wb') as classifier_file:
+        pickle.dump((model, class_names), classifier_file)
+    tmp_txt = classes_txt + ".tmp"
+    with open(tmp_txt, 'w') as classes_file:
+        classes_file.writelines([str(c) + "\n" for c in class_names])
+    os.replace(tmp_pkl, classifier_pkl)
+    os.replace(tmp_txt, classes_txt)
@@ -20,19 +20,27 @@
 
 
 import cv2
+import copy
 import pickle
+import threading
 import numpy as np
-from sklearn.svm import SVC
+from PIL import Image
 
 from pyppbox.utils.commontools import getFileName
-from pyppbox.utils.logtools import add_info_log
+from pyppbox.utils.logtools import add_info_log, add_error_log
+from pyppbox.utils.registrytools import acquireModel, getModelKey
+from pyppbox.utils.stattools import getNullStats
 
+from ..gallery import (GalleryClassifier, makeClassifier, enrollGalleryIdentity, 
+                       removeGalleryIdentity, dumpClassifier, loadClassifier)
+from ..embeddingcache import EmbeddingCache, getModelHash
+from ..trainloader import embedImages
 from .utils import deepreid_extractor, get_dataset, get_image_paths_and_labels
 
 
 class MyTorchreid(object):
 
-    def __init__(self, cfg, auto_load=False):
+    def __init__(self, cfg, auto_load=False, shared=False):
         """Initialize according to the given :obj:`cfg` and :obj:`auto_load`.
 
         Parameters
@@ -41,6 +49,10 @@ class MyTorchreid(object):
             A :class:`RCFGTorchreid` object which manages the configurations of reidier Torchreid.
         auto_load : bool, optional
             An indication of whether to automatically call :meth:`load_classifier()`.
+        shared : bool, default=False
+            An indication of whether to share the feature extractor with the other objects loading 
+            the same model through :class:`pyppbox.utils.registrytools.ModelRegistry`. The 
+            classifier is never shared.
         """
         self.unk = cfg.unified_strings.unk_did
         self.err = cfg.unified_strings.err_did
@@ -51,28 +63,46 @@ class MyTorchreid(object):
         self.model_path = cfg.model_path
         self.device = cfg.device
         self.min_confidence = int(100 * cfg.min_confidence)
+        self.classifier_type = cfg.classifier_type
         # add_info_log("--------RI : Initializing ReID model ...")
-        self.extractor = deepreid_extractor(self.model_name, self.mdir, 
-                                            self.model_path, device=self.device)
+        key = getModelKey("Torchreid", self.model_name, self.model_path, self.device)
+        self.extractor = acquireModel(key, 
+                                      lambda: deepreid_extractor(self.model_name, self.mdir, 
+                                                                 self.model_path, device=self.device), 
+                                      owner=self, 
+                                      shared=shared)
+        self.stats = getNullStats()
+        self.classifier_lock = threading.Lock()
         self.auto_load = auto_load
         if self.auto_load:
             self.load_classifier()
 
+    @property
+    def model(self):
+        return self.classifier[0]
+
+    @property
+    def class_names(self):
+        return self.classifier[1]
+
     def load_classifier(self):
         """Load the classifier model from the configurations.
         """
-        with open(self.classifier_pkl, 'rb') as classifier_file:
-            (self.model, self.class_names) = pickle.load(classifier_file)
+        # The model and its names are replaced together, see enrollIdentity()
+        self.classifier = loadClassifier(self.classifier_pkl)
         add_info_log(f"--------RI : Classifier loaded! <- {getFileName(self.classifier_pkl)}")
 
-    def predict(self, img):
+    def predict(self, img, model=None):
         """
         :meta private:
         """
         best_class = -1
         best_proba = -1
-        emb_array = self.extractor(img).cpu().numpy()
-        predictions = self.model.predict_proba(emb_array)
+        if model is None: model = self.model
+        with self.stats.timer("reid.embedding"):
+            emb_array = self.extractor(img).cpu().numpy()
+        with self.stats.timer("reid.classifier"):
+            predictions = model.predict_proba(emb_array)
         best_class_indices = np.argmax(predictions, axis=1)
         best_class_probabilities = predictions[np.arange(len(best_class_indices)), best_class_indices]
         best_class = int(np.asarray(best_class_indices[0]).item())
@@ -99,13 +129,14 @@ class MyTorchreid(object):
         result = ""
         conf = 100.0
         img = self.prepare_image(img, is_bgr=is_bgr)
-        best_class, best_proba = self.predict(img)
+        (model, class_names) = self.classifier
+        best_class, best_proba = self.predict(img, model=model)
         if best_class != -1 and best_proba != -1:
             if best_proba < self.min_confidence:
                 result = self.unk
                 # add_info_log(f"--------RI : Result is below required confidence! -> Return {self.unk}")
             else:
-                result = self.class_names[best_class]
+                result = class_names[best_class]
                 conf = best_proba
                 # add_info_log('--------RI : Result = "%s"' % result)
         else:
@@ -113,6 +144,86 @@ class MyTorchreid(object):
             result = self.err
         return result, conf
 
+    def recognizeBatch(self, imgs, is_bgr=True, return_embeddings=False):
+        """Recognize or re-identify a batch of people in the given list of :obj:`imgs` 
+        by running the feature extractor and the classifier only once.
+
+        Parameters
+        ----------
+        imgs : list[Mat, ...]
+            A list of :obj:`Mat` like images, e.g. the cropped people of a frame.
+        is_bgr : bool, default=True
+            An indication of whether the color channel of given :obj:`imgs` is BGR.
+        return_embeddings : bool, default=False
+            An indication of whether to return the embeddings as well.
+
+        Returns
+        -------
+        list[tuple(str, float), ...]
+            A list of (class name, confidence) in the same order as :obj:`imgs`, 
+            exactly as returned by :meth:`recognize()` for each image.
+        ndarray
+            The embeddings of :obj:`imgs` as a (N, D) array, only if :obj:`return_embeddings=True`.
+        """
+        results = []
+        emb_array = None
+        if len(imgs) > 0:
+            emb_array = self.extractFeatures(imgs, is_bgr=is_bgr)
+            results = self.recognizeFeatures(emb_array)
+        if return_embeddings: return results, emb_array
+        return results
+
+    def extractFeatures(self, imgs, is_bgr=True):
+        """Extract the appearance features of a batch of people in the given list of 
+        :obj:`imgs` by running the feature extractor only once, e.g. to share them with tracker 
+        DeepSORT and re-identify the people later by :meth:`recognizeFeatures()`.
+
+        Parameters
+        ----------
+        imgs : list[Mat, ...]
+            A list of :obj:`Mat` like images, e.g. the cropped people of a frame.
+        is_bgr : bool, default=True
+            An indication of whether the color channel of given :obj:`imgs` is BGR.
+
+        Returns
+        -------
+        ndarray
+            The features of :obj:`imgs` as a (N, D) array.
+        """
+        imgs = [self.prepare_image(img, is_bgr=is_bgr) for img in imgs]
+        with self.stats.timer("reid.embedding"):
+            return self.extractor(imgs).cpu().numpy()
+
+    def recognizeFeatures(self, features):
+        """Recognize or re-identify a batch of people by their features extracted by 
+        :meth:`extractFeatures()`, which runs only the classifier.
+
+        Parameters
+        ----------
+        features : ndarray
+            The features as a (N, D) array.
+
+        Returns
+        -------
+        list[tuple(str, float), ...]
+            A list of (class name, confidence) in the same order as :obj:`features`.
+        """
+        results = []
+        if len(features) > 0:
+            (model, class_names) = self.classifier
+            with self.stats.timer("reid.classifier"):
+                predictions = model.predict_proba(np.asarray(features))
+            best_class_indices = np.argmax(predictions, axis=1)
+            best_class_probabilities = predictions[np.arange(len(best_class_indices)), best_class_indices]
+            for best_class, best_proba in zip(best_class_indices, best_class_probabilities * 100):
+                best_class = int(best_class)
+                best_proba = float(best_proba)
+                if best_proba < self.min_confidence:
+                    results.append((self.unk, 100.0))
+                else:
+                    results.append((class_names[best_class], best_proba))
+        return results
+
     def recognize_file(self, img_path):
         """
         :meta private:
@@ -128,8 +239,19 @@ class MyTorchreid(object):
             img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         return img
 
-    def train_classifier(self, C=1.0, kernel='rbf', probability=True, decision_function_shape='ovr'):
-        """Train a classifier and dump into pickle .pkl file.
+    def train_classifier(
+        self, 
+        C=1.0, 
+        kernel='rbf', 
+        probability=True, 
+        decision_function_shape='ovr', 
+        use_cache=True, 
+        batch_size=64, 
+        num_workers=4
+    ):
+        """Train a classifier of the configured :obj:`classifier_type` and dump into pickle .pkl 
+        file. The parameters are only used by :code:`'SVC'`, while :code:`'Gallery'` and 
+        :code:`'Centroid'` build a :class:`pyppbox.modules.reiders.gallery.GalleryClassifier`.
 
         Parameters
         ----------
@@ -144,15 +266,34 @@ class MyTorchreid(object):
         decision_function_shape : str, default='ovr'
             Choice of function: :code:`'ovo'` or :code:`'ovr'`, passed to sklearn's 
             :code:`SVC(decision_function_shape=decision_function_shape, ...)`.
+        use_cache : bool, default=True
+            An indication of whether to keep the embeddings of the training images in a 
+            :class:`pyppbox.modules.reiders.embeddingcache.EmbeddingCache` next to the classifier 
+            file, so only the new or changed images are embedded by the next training.
+        batch_size : int, default=64
+            Number of images embedded at once.
+        num_workers : int, default=4
+            Number of threads loading the images ahead of the embedding.
         """
         dataset = get_dataset(self.train_data)
         paths, labels = get_image_paths_and_labels(dataset)
         add_info_log("--------RI : Extracting features ...")
-        emb_array = self.extractor(paths).cpu().numpy()
+        def calculate_embeddings(paths):
+            # Decode in a thread pool while the extractor embeds the previous batch
+            return embedImages(paths, 
+                               lambda path: np.asarray(Image.open(path).convert('RGB')), 
+                               lambda imgs: self.extractor(imgs).cpu().numpy(), 
+                               batch_size=batch_size, 
+                               num_workers=num_workers)
+        if use_cache:
+            cache = EmbeddingCache(self.classifier_pkl, getModelHash("Torchreid", self.model_name, self.model_path))
+            emb_array = cache.getEmbeddings(paths, calculate_embeddings)
+        else:
+            emb_array = calculate_embeddings(paths)
         add_info_log(f"--------RI : (total_images, features) = {emb_array.shape}")
         add_info_log("--------RI : Training classifier ... ")
-        _model = SVC(C=C, kernel=kernel, probability=probability, 
-                     decision_function_shape=decision_function_shape)
+        _model = makeClassifier(self.classifier_type, C=C, kernel=kernel, probability=probability, 
+                                decision_function_shape=decision_function_shape)
         _model.fit(emb_array, labels)
         _class_names = [cls.name.replace('_', ' ') for cls in dataset]
         add_info_log(f"--------RI : class_name = {_class_names}")
@@ -163,3 +304,62 @@ class MyTorchreid(object):
         with open(classes_txt, 'w') as classes_file:
             classes_file.writelines([str(c) + "\n" for c in _class_names])
         add_info_log(f"--------RI : Classes file saved! -> {classes_txt}")
+
+    def __checkGallery__(self, caller):
+        if not isinstance(self.model, GalleryClassifier):
+            msg = (f"MyTorchreid : {caller}() -> Only a 'Gallery' or 'Centroid' classifier can be "
+                   "updated incrementally, train it with classifier_type='Gallery' or 'Centroid'.")
+            add_error_log(msg)
+            raise ValueError(msg)
+
+    def enrollIdentity(self, name, images, is_bgr=True):
+        """Add a new identity, or more images of an existing one, to the loaded classifier by 
+        extracting the features of the given :obj:`images` only, then rewrite the classifier 
+        .pkl and the classes .txt files atomically. Only a 'Gallery' or 'Centroid' classifier 
+        is supported.
+
+        Parameters
+        ----------
+        name : str
+            The class name of the identity.
+        images : list[str or Mat, ...]
+            A list of image files or :obj:`Mat` like images of the person, e.g. 128x256.
+        is_bgr : bool, default=True
+            An indication of whether the color channel of the given :obj:`Mat` like images is BGR.
+        """
+        self.__checkGallery__("enrollIdentity")
+        if len(images) == 0:
+            msg = "MyTorchreid : enrollIdentity() -> The input 'images' is empty."
+            add_error_log(msg)
+            raise ValueError(msg)
+        images = [img if isinstance(img, str) else self.prepare_image(img, is_bgr=is_bgr) for img in images]
+        emb_array = self.extractor(images).cpu().numpy()
+        # Update a copy, so the ongoing predictions keep using a consistent classifier, and 
+        # one update at a time, so none of them is lost
+        with self.classifier_lock:
+            model = copy.deepcopy(self.model)
+            class_names = enrollGalleryIdentity(model, self.class_names, name, emb_array)
+            dumpClassifier(self.classifier_pkl, self.classifier_pkl[:-3] + "txt", model, class_names)
+            self.classifier = (model, class_names)
+        add_info_log(f"--------RI : Identity '{name}' enrolled with {len(images)} image(s)")
+
+    def removeIdentity(self, name):
+        """Remove an identity from the loaded classifier, then rewrite the classifier .pkl and 
+        the classes .txt files atomically. Only a 'Gallery' or 'Centroid' classifier is supported.
+
+        Parameters
+        ----------
+        name : str
+            The class name of the identity.
+        """
+        self.__checkGallery__("removeIdentity")
+        with self.classifier_lock:
+            if name not in self.class_names or len(self.class_names) < 2:
+                msg = f"MyTorchreid : removeIdentity() -> Can't remove '{name}' from {self.class_names}."
+                add_error_log(msg)
+                raise ValueError(msg)
+            model = copy.deepcopy(self.model)
+            class_names = removeGalleryIdentity(model, self.class_names, name)
+            dumpClassifier(self.classifier_pkl, self.classifier_pkl[:-3] + "txt", model, class_names)
+            self.classifier = (model, class_names)
+        add_info_log(f"--------RI : Identity '{name}' removed")
@@ -0,0 +1,141 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+
+import time
+import numpy as np
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Tuple
+
+from pyppbox.utils.logtools import add_info_log
+
+
+class PrefetchLoader(object):
+
+    """An iterator over the batches of the decoded and preprocessed training images. The images 
+    are loaded by a thread pool while the previous batches are being embedded, and at most 
+    :obj:`prefetch` batches are loaded ahead, so the memory stays bounded by 
+    :code:`(prefetch + 1) * batch_size` images whatever the size of the dataset.
+    """
+
+    def __init__(
+        self, 
+        paths: List[str], 
+        load: Callable[[str], Any], 
+        batch_size: int = 64, 
+        num_workers: int = 4, 
+        prefetch: int = 2
+    ):
+        """Initialize the loader.
+
+        Parameters
+        ----------
+        paths : list[str, ...]
+            A list of image files.
+        load : Callable[[str], Any]
+            A thread-safe function which decodes and preprocesses one image file.
+        batch_size : int, default=64
+            Number of images in a batch.
+        num_workers : int, default=4
+            Number of loading threads.
+        prefetch : int, default=2
+            Number of batches loaded ahead.
+        """
+        self.paths = paths
+        self.load = load
+        self.batch_size = max(1, int(batch_size))
+        self.num_workers = max(1, int(num_workers))
+        self.prefetch = max(1, int(prefetch))
+
+    def __len__(self):
+        return (len(self.paths) + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self) -> Iterator[Tuple[int, List[Any]]]:
+        starts = iter(range(0, len(self.paths), self.batch_size))
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="ppb-loader") as pool:
+            def submit():
+                start = next(starts, None)
+                if start is None: return
+                batch_paths = self.paths[start:start + self.batch_size]
+                pending.append((start, [pool.submit(self.load, path) for path in batch_paths]))
+            for _ in range(self.prefetch): submit()
+            while pending:
+                start, futures = pending.popleft()
+                submit()
+                yield start, [future.result() for future in futures]
+
+
+def embedImages(
+    paths: List[str], 
+    load: Callable[[str], Any], 
+    embed: Callable[[List[Any]], np.ndarray], 
+    batch_size: int = 64, 
+    num_workers: int = 4, 
+    prefetch: int = 2, 
+    log_every: float = 10.0
+) -> np.ndarray:
+    """Embed the given image files batch by batch with a :class:`PrefetchLoader`, and report 
+    the progress in images per second.
+
+    Parameters
+    ----------
+    paths : list[str, ...]
+        A list of image files.
+    load : Callable[[str], Any]
+        A thread-safe function which decodes and preprocesses one image file.
+    embed : Callable[[list[Any, ...]], ndarray]
+        A function which returns the (M, D) embeddings of a list of M loaded images.
+    batch_size : int, default=64
+        Number of images in a batch.
+    num_workers : int, default=4
+        Number of loading threads.
+    prefetch : int, default=2
+        Number of batches loaded ahead.
+    log_every : float, default=10.0
+        Seconds between two progress logs.
+
+    Returns
+    -------
+    ndarray
+        The (N, D) float32 embeddings of :obj:`paths` in the same order.
+    """
+    emb_array = None
+    start_time = time.perf_counter()
+    last_log = start_time
+    done = 0
+    for start, images in PrefetchLoader(paths, load, batch_size=batch_size, 
+                                        num_workers=num_workers, prefetch=prefetch):
+        batch_emb = np.asarray(embed(images), dtype=np.float32)
+        if emb_array is None:
+            emb_array = np.zeros((len(paths), batch_emb.shape[1]), dtype=np.float32)
+        emb_array[start:start + len(images)] = batch_emb
+        done += len(images)
+        now = time.perf_counter()
+        if now - last_log >= log_every or done == len(paths):
+            last_log = now
+            add_info_log(f"--------RI : Embedded {done}/{len(paths)} images "
+                         f"({done / max(now - start_time, 1e-9):.1f} images/s)")
+    if emb_array is None: emb_array = np.zeros((0, 0), dtype=np.float32)
+    return emb_array
+
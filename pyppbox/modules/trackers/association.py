@@ -0,0 +1,179 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+
+import numpy as np
+
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+
+def findCandidatePairs(boxes_a, boxes_b, cell_size=None):
+    """Find all the pairs of boxes of :obj:`boxes_a` and :obj:`boxes_b` which intersect or touch, 
+    using a uniform grid instead of testing all the pairs. Each box is put in the cells it 
+    covers, then only the boxes sharing a cell are tested, so the cost grows with the local 
+    density rather than with :code:`len(boxes_a) * len(boxes_b)`.
+
+    Parameters
+    ----------
+    boxes_a : ndarray
+        Boxes :code:`[[x1, y1, x2, y2], ...]`, :code:`shape=(N, 4)`.
+    boxes_b : ndarray
+        Boxes :code:`[[x1, y1, x2, y2], ...]`, :code:`shape=(M, 4)`, points are boxes of zero size.
+    cell_size : float, default=None
+        Size of the grid cells, or :code:`None` to use the median size of the boxes.
+
+    Returns
+    -------
+    ndarray
+        Indices of the boxes of :obj:`boxes_a`, :code:`shape=(K,)`.
+    ndarray
+        Indices of the boxes of :obj:`boxes_b`, :code:`shape=(K,)`, the pairs are sorted by 
+        :obj:`boxes_a` then :obj:`boxes_b` indices.
+    """
+    boxes_a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if cell_size is None:
+        sizes = np.concatenate([boxes_a[:, 2:] - boxes_a[:, :2], boxes_b[:, 2:] - boxes_b[:, :2]])
+        cell_size = float(np.median(sizes))
+    cell_size = max(float(cell_size), 1.0)
+    origin = np.minimum(boxes_a[:, :2].min(axis=0), boxes_b[:, :2].min(axis=0))
+    cells_a, index_a = toGridCells(boxes_a, origin, cell_size)
+    cells_b, index_b = toGridCells(boxes_b, origin, cell_size)
+
+    # Join the (cell, box) entries of both sets on the cell
+    order = np.argsort(cells_b, kind='stable')
+    cells_b, index_b = cells_b[order], index_b[order]
+    starts = np.searchsorted(cells_b, cells_a, side='left')
+    counts = np.searchsorted(cells_b, cells_a, side='right') - starts
+    pair_a = np.repeat(index_a, counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_b = index_b[np.repeat(starts, counts) + offsets]
+
+    # Two boxes covering several cells together meet more than once
+    keys = np.unique(pair_a * len(boxes_b) + pair_b)
+    pair_a, pair_b = keys // len(boxes_b), keys % len(boxes_b)
+    a, b = boxes_a[pair_a], boxes_b[pair_b]
+    overlap = ((a[:, 0] <= b[:, 2]) & (b[:, 0] <= a[:, 2]) & 
+               (a[:, 1] <= b[:, 3]) & (b[:, 1] <= a[:, 3]))
+    return pair_a[overlap], pair_b[overlap]
+
+def toGridCells(boxes, origin, cell_size):
+    """
+    :meta private:
+    """
+    # All the (cell, box) entries of the cells covered by each box
+    lo = np.floor((boxes[:, :2] - origin) / cell_size).astype(np.int64)
+    hi = np.floor((boxes[:, 2:] - origin) / cell_size).astype(np.int64)
+    span = hi - lo + 1
+    num_cells = span[:, 0] * span[:, 1]
+    index = np.repeat(np.arange(len(boxes)), num_cells)
+    local = np.arange(num_cells.sum()) - np.repeat(np.cumsum(num_cells) - num_cells, num_cells)
+    cx = lo[index, 0] + local % span[index, 0]
+    cy = lo[index, 1] + local // span[index, 0]
+    # Unique cell keys, the cells are at most (2^31)^2 apart
+    return cx * (1 << 31) + cy, index
+
+def solveSparse(rows, cols, costs, num_rows, num_cols, gated_cost=None):
+    """Solve the linear assignment problem of the feasible pairs only. The pairs are split into 
+    the connected components of the bipartite graph of the rows and the columns, and each 
+    component is solved as a small independent dense problem, where the missing pairs are 
+    infeasible. A component of a single pair is matched directly.
+
+    With :obj:`gated_cost`, the result is the same as solving the dense problem where every 
+    missing pair costs :obj:`gated_cost` then dropping the matched missing pairs, because the 
+    feasible pairs of different components never compete. Otherwise, the number of matched 
+    pairs is maximized first, then their total cost is minimized.
+
+    Parameters
+    ----------
+    rows : ndarray
+        Row indices of the feasible pairs, :code:`shape=(K,)`, without duplicated pairs.
+    cols : ndarray
+        Column indices of the feasible pairs, :code:`shape=(K,)`.
+    costs : ndarray
+        Costs of the feasible pairs, :code:`shape=(K,)`.
+    num_rows : int
+        Number of rows.
+    num_cols : int
+        Number of columns.
+    gated_cost : float, default=None
+        The cost of the missing pairs of the equivalent dense problem, which should be larger 
+        than the costs of the feasible pairs.
+
+    Returns
+    -------
+    ndarray
+        Matched pairs :code:`[[row, col], ...]`, :code:`shape=(k, 2)`, sorted by row.
+    ndarray
+        Unmatched rows, sorted.
+    ndarray
+        Unmatched columns, sorted.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    costs = np.asarray(costs, dtype=np.float64)
+    matches = [np.zeros((0, 2), dtype=np.int64)]
+    if len(rows) > 0:
+        graph = coo_matrix((np.ones(len(rows)), (rows, num_rows + cols)), 
+                           shape=(num_rows + num_cols, num_rows + num_cols))
+        _, labels = connected_components(graph, directed=False)
+        pair_labels = labels[rows]
+        # Components of a single pair need no solver
+        row_counts = np.bincount(labels[:num_rows], minlength=labels.max() + 1)
+        col_counts = np.bincount(labels[num_rows:], minlength=labels.max() + 1)
+        single = (row_counts[pair_labels] == 1) & (col_counts[pair_labels] == 1)
+        if gated_cost is not None:
+            single &= costs < gated_cost
+        matches.append(np.stack([rows[single], cols[single]], axis=1))
+        if not single.all():
+            rest = np.flatnonzero(~single)
+            order = rest[np.argsort(pair_labels[rest], kind='stable')]
+            bounds = np.flatnonzero(np.diff(pair_labels[order])) + 1
+            for group in np.split(order, bounds):
+                matches.append(solveComponent(rows[group], cols[group], costs[group], gated_cost))
+    matches = np.concatenate(matches, axis=0)
+    matches = matches[np.argsort(matches[:, 0], kind='stable')]
+    row_mask = np.ones(num_rows, dtype=bool)
+    col_mask = np.ones(num_cols, dtype=bool)
+    row_mask[matches[:, 0]] = False
+    col_mask[matches[:, 1]] = False
+    return matches, np.flatnonzero(row_mask), np.flatnonzero(col_mask)
+
+def solveComponent(rows, cols, costs, gated_cost=None):
+    """
+    :meta private:
+    """
+    unique_rows, local_rows = np.unique(rows, return_inverse=True)
+    unique_cols, local_cols = np.unique(cols, return_inverse=True)
+    if gated_cost is None:
+        # Any feasible pair is cheaper than leaving a row unmatched
+        gated_cost = 1.0 + (np.abs(costs).max() + 1.0) * min(len(unique_rows), len(unique_cols))
+    cost_matrix = np.full((len(unique_rows), len(unique_cols)), float(gated_cost))
+    cost_matrix[local_rows, local_cols] = costs
+    feasible = np.zeros(cost_matrix.shape, dtype=bool)
+    feasible[local_rows, local_cols] = True
+    r, c = linear_sum_assignment(cost_matrix)
+    keep = feasible[r, c]
+    return np.stack([unique_rows[r[keep]], unique_cols[c[keep]]], axis=1)
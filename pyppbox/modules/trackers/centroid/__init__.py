@@ -23,8 +23,9 @@ import numpy as np
 from math import hypot
 from typing import List, Tuple
 
-from pyppbox.utils.persontools import Person
+from pyppbox.utils.persontools import Person, PeopleFrame
 from pyppbox.utils.logtools import add_error_log
+from pyppbox.modules.trackers.association import findCandidatePairs, solveSparse
 
 try:
     import lap
@@ -79,6 +80,7 @@ class MyCentroid(object):
             A TCFGCentroid object which manages the configurations of tracker Centroid.
         """
         self.max_spread = cfg.max_spread
+        self.sparse = bool(cfg.sparse)
         self.previous_list: List[Person] = []
         self.current_list: List[Person] = []
         # Monotonic counter to prevent accidental CID reuse across frames
@@ -135,6 +137,9 @@ class MyCentroid(object):
                 np.arange(Np, dtype=np.int32),
             )
 
+        if self.sparse:
+            return self._sparse_match(curr_points, prev_points, max_spread)
+
         dist_mat = _euclidean_dist_matrix(curr_points, prev_points)
 
         # Gate distances above max_spread by assigning a large cost
@@ -165,25 +170,53 @@ class MyCentroid(object):
 
         return matched, unmatched_curr, unmatched_prev
 
+    def _sparse_match(
+        self,
+        curr_points: np.ndarray,
+        prev_points: np.ndarray,
+        max_spread: float,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Same as :meth:`_lap_match`, but only the pairs within :obj:`max_spread` are found with a 
+        grid and solved as small independent problems, see 
+        :func:`pyppbox.modules.trackers.association.solveSparse`.
+        """
+        spread = np.float32(max_spread)
+        curr_boxes = np.concatenate([curr_points - spread, curr_points + spread], axis=1)
+        prev_boxes = np.concatenate([prev_points, prev_points], axis=1)
+        rows, cols = findCandidatePairs(curr_boxes, prev_boxes, cell_size=2 * max_spread)
+        diff = curr_points[rows] - prev_points[cols]
+        dist = np.sqrt(np.sum(diff * diff, axis=1, dtype=np.float32), dtype=np.float32)
+        keep = dist <= max_spread
+        matched, unmatched_curr, unmatched_prev = solveSparse(rows[keep], cols[keep], dist[keep], 
+                                                              curr_points.shape[0], 
+                                                              prev_points.shape[0], 
+                                                              gated_cost=1e6)
+        return (matched.astype(np.int32), unmatched_curr.astype(np.int32), 
+                unmatched_prev.astype(np.int32))
+
     def update(self, person_list, img=None):
         """Update the tracker and return the updated list of 
         :class:`pyppbox.utils.persontools.Person`.
 
         Parameters
         ----------
-        person_list : list[Person, ...]
-            A list of :class:`pyppbox.utils.persontools.Person` object which stores 
-            the detected people in the given :obj:`img`.
+        person_list : list[Person, ...] or PeopleFrame
+            A list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame`, which stores the detected people 
+            in the given :obj:`img`.
         img : any, default=None
             Being consistent with other trackers, will be ignored.
 
         Returns
         -------
-        list[Person, ...]
-            The updated list of :class:`pyppbox.utils.persontools.Person` object.
+        list[Person, ...] or PeopleFrame
+            The updated list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame` if :obj:`person_list` is one.
         """
         self.previous_list = self.current_list
-        self.current_list = []
+        # An empty PeopleFrame is returned as it is
+        self.current_list = person_list if isinstance(person_list, PeopleFrame) else []
         used_cids = set()
 
         if len(person_list) > 0:
@@ -192,27 +225,36 @@ class MyCentroid(object):
                 self.current_list = person_list
 
                 # Build index maps for points present
-                prev_idx_map = []
-                prev_pts = []
-                for i, p in enumerate(self.previous_list):
-                    rp = getattr(p, "repspoint", None)
-                    if rp is not None:
-                        prev_idx_map.append(i)
-                        prev_pts.append([float(rp[0]), float(rp[1])])
-
-                cur_idx_map = []
-                cur_pts = []
-                for i, p in enumerate(self.current_list):
-                    rp = getattr(p, "repspoint", None)
-                    if rp is not None:
-                        cur_idx_map.append(i)
-                        cur_pts.append([float(rp[0]), float(rp[1])])
+                if isinstance(self.previous_list, PeopleFrame):
+                    prev_idx_map = list(range(len(self.previous_list)))
+                    prev_pts = self.previous_list.repspoints.astype(np.float64)
+                else:
+                    prev_idx_map = []
+                    prev_pts = []
+                    for i, p in enumerate(self.previous_list):
+                        rp = getattr(p, "repspoint", None)
+                        if rp is not None:
+                            prev_idx_map.append(i)
+                            prev_pts.append([float(rp[0]), float(rp[1])])
+
+                if isinstance(self.current_list, PeopleFrame):
+                    # Every person of a PeopleFrame has a repspoint
+                    cur_idx_map = list(range(len(self.current_list)))
+                    cur_pts = self.current_list.repspoints.astype(np.float64)
+                else:
+                    cur_idx_map = []
+                    cur_pts = []
+                    for i, p in enumerate(self.current_list):
+                        rp = getattr(p, "repspoint", None)
+                        if rp is not None:
+                            cur_idx_map.append(i)
+                            cur_pts.append([float(rp[0]), float(rp[1])])
 
                 matched_pairs = []
                 unmatched_cur_all = set(range(len(self.current_list)))
 
                 # Prefer LAP-based matching when available
-                if lap is not None and len(prev_pts) and len(cur_pts):
+                if (lap is not None or self.sparse) and len(prev_pts) and len(cur_pts):
                     cur_arr = np.asarray(cur_pts, dtype=np.float32)
                     prev_arr = np.asarray(prev_pts, dtype=np.float32)
                     matched, unmatched_cur, _ = self._lap_match(cur_arr, prev_arr, float(self.max_spread))
@@ -21,8 +21,10 @@
 
 import numpy as np
 
-from pyppbox.utils.persontools import Person
+from pyppbox.utils.persontools import Person, PeopleFrame, mapPeopleByCID, findClosestBoxes
 from pyppbox.utils.logtools import add_error_log, ignore_this_logger
+from pyppbox.utils.registrytools import acquireModel, getModelKey
+from pyppbox.utils.stattools import getNullStats
 
 ignore_this_logger("tensorflow")
 ignore_this_logger("preprocessing")
@@ -33,7 +35,6 @@ ignore_this_logger("tracker")
 
 from .origin import preprocessing
 from .origin import nn_matching
-from .origin import generate_detections as gdet
 from .origin.detection import Detection as DSDetection
 from .origin.tracker import Tracker as DSTracker
 
@@ -43,47 +44,41 @@ class MyDeepSORT(object):
     """Class used as a custom layer or interface for interacting with DeepSORT tracker.
     """
 
-    def __init__(self, cfg):
+    def __init__(self, cfg, shared=False):
         """Initialize according to the given :obj:`cfg` and :obj:`auto_load`.
 
         Parameters
         ----------
         cfg : TCFGDeepSORT
             A :class:`TCFGDeepSORT` object which manages the configurations of tracker DeepSORT.
+        shared : bool, default=False
+            An indication of whether to share the feature encoder with the other objects loading 
+            the same model through :class:`pyppbox.utils.registrytools.ModelRegistry`. The 
+            tracker state is never shared.
         """
         self.previous_list = []
         self.current_list = []
         self.current_frame = 0
         self.nms_max_overlap = cfg.nms_max_overlap
-        self.encoder = gdet.create_box_encoder(cfg.model_file, batch_size=16)
+        self.feature_source = str(cfg.feature_source).lower()
+        if self.feature_source not in ('deepsort', 'reider', 'person'):
+            msg = (f"MyDeepSORT : __init__() -> feature_source='{cfg.feature_source}' is not supported, "
+                   "use 'DeepSORT', 'ReIDer', or 'Person'.")
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.encoder = None
+        if self.feature_source == 'deepsort':
+            # TF is only needed by the encoder
+            from .origin import generate_detections as gdet
+            self.encoder = acquireModel(getModelKey("DeepSORT", cfg.model_file), 
+                                        lambda: gdet.create_box_encoder(cfg.model_file, batch_size=16), 
+                                        owner=self, 
+                                        shared=shared)
         self.metric = nn_matching.NearestNeighborDistanceMetric("cosine", cfg.max_cosine_distance, 
-                                                                cfg.nn_budget)
-        self.tracker = DSTracker(self.metric)
-
-
-    def __getCurrentIndexByBoxXYXY__(self, box, max_spread=128):
-        index = -1
-        box_list = box.tolist()
-        min_box_spread = 8192
-        i = 0
-        for p in self.current_list:
-            pbbox_list = p.box_xyxy.tolist()
-            max_ss = max([abs(box_list[j] - pbbox_list[j]) for j in range(0, 4)])
-            if max_ss < min_box_spread:
-                min_box_spread = max_ss
-                index = i
-            i += 1
-        if min_box_spread > max_spread: index = -1
-        return index
-
-
-    def __getIndexFromPreviousList__(self, cid):
-        pindex = -1
-        for i in range(0, len(self.previous_list)):
-            if cid == self.previous_list[i].cid:
-                pindex = i
-                break
-        return pindex
+                                                                cfg.nn_budget, 
+                                                                half=bool(cfg.gallery_fp16))
+        self.tracker = DSTracker(self.metric, sparse=bool(cfg.sparse))
+        self.stats = getNullStats()
 
 
     def update(self, person_list, img=None, max_spread=128):
@@ -92,9 +87,10 @@ class MyDeepSORT(object):
 
         Parameters
         ----------
-        person_list : list[Person, ...]
-            A list of :class:`pyppbox.utils.persontools.Person` object which stores 
-            the detected people in the given :obj:`img`.
+        person_list : list[Person, ...] or PeopleFrame
+            A list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame`, which stores the detected people 
+            in the given :obj:`img`.
         img : any, default=None
             A :obj:`Mat` like image.
         max_spread : int, default=5
@@ -104,11 +100,13 @@ class MyDeepSORT(object):
 
         Returns
         -------
-        list[Person, ...]
-            The updated list of :class:`pyppbox.utils.persontools.Person` object.
+        list[Person, ...] or PeopleFrame
+            The updated list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame` if :obj:`person_list` is one.
         """
         self.previous_list = self.current_list
-        self.current_list = []
+        # An empty PeopleFrame is returned as it is
+        self.current_list = person_list if isinstance(person_list, PeopleFrame) else []
 
         if len(person_list) > 0:
             if isinstance(person_list[0], Person):
@@ -117,12 +115,29 @@ class MyDeepSORT(object):
                 dconfidences = []
                 dclasses = []
 
-                for i in range(0, len(person_list)):
-                    dboxes.append(person_list[i].box_xywh)
-                    dconfidences.append(person_list[i].det_conf)
-                    dclasses.append('person')
-
-                dfeatures = self.encoder(img, dboxes)
+                if isinstance(person_list, PeopleFrame):
+                    # The columns of the people with the given feature
+                    indices = [i for i, f in enumerate(person_list.features) 
+                               if self.encoder is not None or f is not None]
+                    dboxes = list(person_list.boxes_xywh[indices])
+                    dconfidences = person_list.det_confs[indices].tolist()
+                    dclasses = ['person'] * len(indices)
+                else:
+                    for i in range(0, len(person_list)):
+                        # A person without the given feature is not tracked
+                        if self.encoder is None and person_list[i].feature is None: continue
+                        dboxes.append(person_list[i].box_xywh)
+                        dconfidences.append(person_list[i].det_conf)
+                        dclasses.append('person')
+
+                if self.encoder is None:
+                    if isinstance(person_list, PeopleFrame):
+                        dfeatures = [f for f in person_list.features if f is not None]
+                    else:
+                        dfeatures = [p.feature for p in person_list if p.feature is not None]
+                else:
+                    with self.stats.timer("track.encoder"):
+                        dfeatures = self.encoder(img, dboxes)
                 detections = [DSDetection(dbox, dconfidence, dclass, dfeature) 
                               for dbox, dconfidence, dclass, dfeature in 
                               zip(dboxes, dconfidences, dclasses, dfeatures)]
@@ -132,24 +147,27 @@ class MyDeepSORT(object):
                 indices = preprocessing.non_max_suppression(dboxes, self.nms_max_overlap, scores)
                 detections = [detections[i] for i in indices]
 
-                self.tracker.predict()
-                self.tracker.update(detections)
-
-                for track in self.tracker.tracks:
-                    if not track.is_confirmed() or track.time_since_update > 1:
-                        continue
-                    box_xyxy = track.to_tlbr()
-                    new_cid = int(track.track_id)
-                    cindex = self.__getCurrentIndexByBoxXYXY__(box_xyxy, max_spread=max_spread)
+                with self.stats.timer("track.update"):
+                    self.tracker.predict()
+                    self.tracker.update(detections)
+
+                tracks = [t for t in self.tracker.tracks 
+                          if t.is_confirmed() and t.time_since_update <= 1]
+                cindexes = findClosestBoxes([t.to_tlbr() for t in tracks], 
+                                            self.current_list, 
+                                            max_spread=max_spread).tolist()
+                previous_people = mapPeopleByCID(self.previous_list)
+                for track, cindex in zip(tracks, cindexes):
                     if cindex >= 0:
+                        new_cid = int(track.track_id)
                         self.current_list[cindex].cid = new_cid
-                        pindex = self.__getIndexFromPreviousList__(new_cid)
-                        if pindex >= 0 and self.current_frame > 3:
-                            self.current_list[cindex].faceid = self.previous_list[pindex].faceid
-                            self.current_list[cindex].deepid = self.previous_list[pindex].deepid
-                            self.current_list[cindex].faceid_conf = self.previous_list[pindex].faceid_conf
-                            self.current_list[cindex].deepid_conf = self.previous_list[pindex].deepid_conf
-                            self.current_list[cindex].misc = self.previous_list[pindex].misc
+                        previous_person = previous_people.get(new_cid)
+                        if previous_person is not None and self.current_frame > 3:
+                            self.current_list[cindex].faceid = previous_person.faceid
+                            self.current_list[cindex].deepid = previous_person.deepid
+                            self.current_list[cindex].faceid_conf = previous_person.faceid_conf
+                            self.current_list[cindex].deepid_conf = previous_person.deepid_conf
+                            self.current_list[cindex].misc = previous_person.misc
             else:
                 msg = ("MyDeepSORT : update() -> The element of input 'person_list' list has unsupported type.")
                 add_error_log(msg)
@@ -1,5 +1,6 @@
 import numpy as np
 from . import linear_assignment
+from pyppbox.modules.trackers.association import findCandidatePairs
 
 
 def iou(bbox, candidates):
@@ -77,3 +78,53 @@ def iou_cost(tracks, detections, track_indices=None,
         candidates = np.asarray([detections[i].tlwh for i in detection_indices])
         cost_matrix[row, :] = 1. - iou(bbox, candidates)
     return cost_matrix
+
+
+def iou_pairs(tracks, detections, track_indices, detection_indices):
+    """Find the overlapping pairs of tracks and detections and their
+    intersection over union distance, the sparse version of `iou_cost`. The
+    tracks which are not updated in the previous frame are left out, as
+    `iou_cost` gives them an infinite cost.
+
+    Parameters
+    ----------
+    tracks : List[deep_sort.track.Track]
+        A list of tracks.
+    detections : List[deep_sort.detection.Detection]
+        A list of detections.
+    track_indices : List[int]
+        A list of indices to tracks that should be matched.
+    detection_indices : List[int]
+        A list of indices to detections that should be matched.
+
+    Returns
+    -------
+    (ndarray, ndarray, ndarray)
+        Returns the positions of the paired tracks in `track_indices`, the
+        positions of the paired detections in `detection_indices`, and
+        `1 - iou` of the pairs.
+
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if len(track_indices) == 0 or len(detection_indices) == 0:
+        return empty, empty, np.zeros(0)
+    bboxes = np.asarray([tracks[i].to_tlwh() for i in track_indices])
+    candidates = np.asarray([detections[i].tlwh for i in detection_indices])
+    recent = np.flatnonzero(np.asarray(
+        [tracks[i].time_since_update <= 1 for i in track_indices]))
+    if len(recent) == 0:
+        return empty, empty, np.zeros(0)
+    tlbr = np.concatenate(
+        [bboxes[recent, :2], bboxes[recent, :2] + bboxes[recent, 2:]], axis=1)
+    candidates_tlbr = np.concatenate(
+        [candidates[:, :2], candidates[:, :2] + candidates[:, 2:]], axis=1)
+    rows, cols = findCandidatePairs(tlbr, candidates_tlbr)
+    rows = recent[rows]
+
+    a, b = bboxes[rows], candidates[cols]
+    wh = np.maximum(0., np.minimum(a[:, :2] + a[:, 2:], b[:, :2] + b[:, 2:]) -
+                    np.maximum(a[:, :2], b[:, :2]))
+    area_intersection = wh.prod(axis=1)
+    iou = area_intersection / (
+        a[:, 2:].prod(axis=1) + b[:, 2:].prod(axis=1) - area_intersection)
+    return rows, cols, 1. - iou
@@ -20,6 +20,28 @@ chi2inv95 = {
     9: 16.919}
 
 
+def _solve_lower(chol_factor, b):
+    """Solve `L x = b` for stacked lower triangular `L` of shape (N, k, k) and
+    `b` of shape (N, k, M) by forward substitution."""
+    x = np.empty(b.shape)
+    for i in range(chol_factor.shape[-1]):
+        acc = b[:, i, :] - np.einsum(
+            'nj,njm->nm', chol_factor[:, i, :i], x[:, :i, :])
+        x[:, i, :] = acc / chol_factor[:, i, i, np.newaxis]
+    return x
+
+
+def _solve_upper_t(chol_factor, b):
+    """Solve `L^T x = b` for stacked lower triangular `L` of shape (N, k, k)
+    and `b` of shape (N, k, M) by backward substitution."""
+    x = np.empty(b.shape)
+    for i in reversed(range(chol_factor.shape[-1])):
+        acc = b[:, i, :] - np.einsum(
+            'nj,njm->nm', chol_factor[:, i + 1:, i], x[:, i + 1:, :])
+        x[:, i, :] = acc / chol_factor[:, i, i, np.newaxis]
+    return x
+
+
 class KalmanFilter(object):
     """
     A simple Kalman filter for tracking bounding boxes in image space.
@@ -227,3 +249,179 @@ class KalmanFilter(object):
             overwrite_b=True)
         squared_maha = np.sum(z * z, axis=0)
         return squared_maha
+
+    def initiate_batch(self, measurements):
+        """Create tracks from unassociated measurements, the batched version
+        of `initiate`.
+
+        Parameters
+        ----------
+        measurements : ndarray
+            An Nx4 dimensional matrix of bounding box coordinates (x, y, a, h).
+
+        Returns
+        -------
+        (ndarray, ndarray)
+            Returns the Nx8 dimensional mean matrix and Nx8x8 dimensional
+            covariance matrix of the new tracks.
+
+        """
+        measurements = np.asarray(measurements, dtype=np.float64).reshape(-1, 4)
+        mean = np.concatenate(
+            [measurements, np.zeros_like(measurements)], axis=1)
+        h = measurements[:, 3]
+        std = np.stack([
+            2 * self._std_weight_position * h,
+            2 * self._std_weight_position * h,
+            np.full_like(h, 1e-2),
+            2 * self._std_weight_position * h,
+            10 * self._std_weight_velocity * h,
+            10 * self._std_weight_velocity * h,
+            np.full_like(h, 1e-5),
+            10 * self._std_weight_velocity * h], axis=1)
+        covariance = _diag(np.square(std))
+        return mean, covariance
+
+    def predict_batch(self, mean, covariance):
+        """Run Kalman filter prediction step on N tracks at once, the batched
+        version of `predict`.
+
+        Parameters
+        ----------
+        mean : ndarray
+            The Nx8 dimensional mean matrix of the previous time step.
+        covariance : ndarray
+            The Nx8x8 dimensional covariance matrix of the previous time step.
+
+        Returns
+        -------
+        (ndarray, ndarray)
+            Returns the mean and covariance matrices of the predicted states.
+
+        """
+        h = mean[:, 3]
+        std = np.stack([
+            self._std_weight_position * h,
+            self._std_weight_position * h,
+            np.full_like(h, 1e-2),
+            self._std_weight_position * h,
+            self._std_weight_velocity * h,
+            self._std_weight_velocity * h,
+            np.full_like(h, 1e-5),
+            self._std_weight_velocity * h], axis=1)
+        motion_cov = _diag(np.square(std))
+
+        # The motion matrix only adds the velocities to the positions
+        mean = mean.copy()
+        mean[:, :4] += mean[:, 4:]
+        fp = covariance.copy()
+        fp[:, :4, :] += covariance[:, 4:, :]
+        covariance = fp.copy()
+        covariance[:, :, :4] += fp[:, :, 4:]
+        return mean, covariance + motion_cov
+
+    def project_batch(self, mean, covariance):
+        """Project N state distributions to measurement space, the batched
+        version of `project`.
+
+        Parameters
+        ----------
+        mean : ndarray
+            The Nx8 dimensional mean matrix.
+        covariance : ndarray
+            The Nx8x8 dimensional covariance matrix.
+
+        Returns
+        -------
+        (ndarray, ndarray)
+            Returns the Nx4 projected mean and Nx4x4 projected covariance
+            matrices.
+
+        """
+        h = mean[:, 3]
+        std = np.stack([
+            self._std_weight_position * h,
+            self._std_weight_position * h,
+            np.full_like(h, 1e-1),
+            self._std_weight_position * h], axis=1)
+        # The update matrix only selects the first 4 elements
+        return mean[:, :4].copy(), covariance[:, :4, :4] + _diag(np.square(std))
+
+    def update_batch(self, mean, covariance, measurements):
+        """Run Kalman filter correction step on N tracks at once, the batched
+        version of `update`.
+
+        Parameters
+        ----------
+        mean : ndarray
+            The Nx8 dimensional predicted mean matrix.
+        covariance : ndarray
+            The Nx8x8 dimensional covariance matrix.
+        measurements : ndarray
+            The Nx4 dimensional measurement matrix (x, y, a, h).
+
+        Returns
+        -------
+        (ndarray, ndarray)
+            Returns the measurement-corrected state distributions.
+
+        """
+        projected_mean, projected_cov = self.project_batch(mean, covariance)
+
+        chol_factor = np.linalg.cholesky(projected_cov)
+        # K' = S^-1 (P H')'
+        kalman_gain_t = _solve_upper_t(
+            chol_factor, _solve_lower(chol_factor, covariance[:, :4, :]))
+        kalman_gain = kalman_gain_t.transpose(0, 2, 1)
+        innovation = measurements - projected_mean
+
+        new_mean = mean + np.einsum('ni,nji->nj', innovation, kalman_gain)
+        new_covariance = covariance - np.matmul(
+            np.matmul(kalman_gain, projected_cov), kalman_gain_t)
+        return new_mean, new_covariance
+
+    def gating_distance_batch(self, mean, covariance, measurements,
+                              only_position=False):
+        """Compute gating distance between N state distributions and M
+        measurements, the batched version of `gating_distance`.
+
+        Parameters
+        ----------
+        mean : ndarray
+            The Nx8 dimensional mean matrix.
+        covariance : ndarray
+            The Nx8x8 dimensional covariance matrix.
+        measurements : ndarray
+            An Mx4 dimensional matrix of M measurements (x, y, a, h).
+        only_position : Optional[bool]
+            If True, distance computation is done with respect to the bounding
+            box center position only.
+
+        Returns
+        -------
+        ndarray
+            Returns an NxM matrix, where the (i, j) element contains the
+            squared Mahalanobis distance between the i-th state distribution
+            and `measurements[j]`.
+
+        """
+        mean, covariance = self.project_batch(mean, covariance)
+        if only_position:
+            mean, covariance = mean[:, :2], covariance[:, :2, :2]
+            measurements = measurements[:, :2]
+
+        # The inverses of the small triangular factors turn the N triangular
+        # solves with M right-hand sides into one batched matrix product
+        cholesky_factor = np.linalg.cholesky(covariance)
+        inv_factor_t = np.linalg.inv(cholesky_factor).transpose(0, 2, 1)
+        d = measurements[np.newaxis, :, :] - mean[:, np.newaxis, :]
+        z = np.matmul(d, inv_factor_t)
+        return np.einsum('nmi,nmi->nm', z, z)
+
+
+def _diag(values):
+    """Stack the diagonal matrices of the rows of `values`."""
+    n, k = values.shape
+    out = np.zeros((n, k, k))
+    out[:, np.arange(k), np.arange(k)] = values
+    return out
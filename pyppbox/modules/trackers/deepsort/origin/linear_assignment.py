@@ -1,6 +1,7 @@
 import numpy as np
 from . import kalman_filter
 from scipy.optimize import linear_sum_assignment
+from pyppbox.modules.trackers.association import findCandidatePairs, solveSparse
 
 
 INFTY_COST = 1e+5
@@ -52,26 +53,31 @@ def min_cost_matching(
 
     cost_matrix = distance_metric(
         tracks, detections, track_indices, detection_indices)
+    return _assign(cost_matrix, max_distance, track_indices, detection_indices)
+
+
+def _assign(cost_matrix, max_distance, track_indices, detection_indices):
+    """Solve the linear assignment problem of a ready cost matrix, see
+    `min_cost_matching`. The matched and unmatched sets are found with
+    boolean masks. The given `cost_matrix` is modified in place.
+    """
     cost_matrix[cost_matrix > max_distance] = max_distance + 1e-5
-    indices = linear_sum_assignment(cost_matrix)
-    indices = np.asarray(indices)
-    indices = np.transpose(indices)
-
-    matches, unmatched_tracks, unmatched_detections = [], [], []
-    for col, detection_idx in enumerate(detection_indices):
-        if col not in indices[:, 1]:
-            unmatched_detections.append(detection_idx)
-    for row, track_idx in enumerate(track_indices):
-        if row not in indices[:, 0]:
-            unmatched_tracks.append(track_idx)
-    for row, col in indices:
-        track_idx = track_indices[row]
-        detection_idx = detection_indices[col]
-        if cost_matrix[row, col] > max_distance:
-            unmatched_tracks.append(track_idx)
-            unmatched_detections.append(detection_idx)
-        else:
-            matches.append((track_idx, detection_idx))
+    rows, cols = linear_sum_assignment(cost_matrix)
+
+    track_indices = np.asarray(track_indices)
+    detection_indices = np.asarray(detection_indices)
+    gated = cost_matrix[rows, cols] > max_distance
+    assigned_rows = np.zeros(len(track_indices), dtype=bool)
+    assigned_rows[rows] = True
+    assigned_cols = np.zeros(len(detection_indices), dtype=bool)
+    assigned_cols[cols] = True
+
+    matches = list(zip(track_indices[rows[~gated]].tolist(),
+                       detection_indices[cols[~gated]].tolist()))
+    unmatched_tracks = track_indices[~assigned_rows].tolist() + \
+        track_indices[rows[gated]].tolist()
+    unmatched_detections = detection_indices[~assigned_cols].tolist() + \
+        detection_indices[cols[gated]].tolist()
     return matches, unmatched_tracks, unmatched_detections
 
 
@@ -121,21 +127,45 @@ def matching_cascade(
 
     unmatched_detections = detection_indices
     matches = []
-    for level in range(cascade_depth):
+    if len(track_indices) == 0 or len(detection_indices) == 0:
+        return matches, list(track_indices), unmatched_detections
+
+    # The cost of a track and a detection does not depend on the other rows
+    # and columns. The first level, usually most of the tracks, is solved
+    # with its own cost matrix, then the cost matrix of all the deeper levels
+    # is computed once, only for the detections left, and each level solves
+    # its rows and the columns still left
+    track_levels = np.asarray(
+        [tracks[k].time_since_update for k in track_indices]) - 1
+    levels = np.unique(track_levels)
+    levels = levels[(levels >= 0) & (levels < cascade_depth)]
+    cost_matrix = None
+    for level in levels:
         if len(unmatched_detections) == 0:  # No detections left
             break
 
-        track_indices_l = [
-            k for k in track_indices
-            if tracks[k].time_since_update == 1 + level
-        ]
-        if len(track_indices_l) == 0:  # Nothing to match at this level
+        rows_l = np.flatnonzero(track_levels == level)
+        if level == levels[0]:
+            track_indices_l = [track_indices[r] for r in rows_l]
+            matches_l, _, unmatched_detections = _assign(
+                distance_metric(tracks, detections, track_indices_l,
+                                unmatched_detections),
+                max_distance, track_indices_l, unmatched_detections)
+            matches += matches_l
             continue
-
-        matches_l, _, unmatched_detections = \
-            min_cost_matching(
-                distance_metric, max_distance, tracks, detections,
-                track_indices_l, unmatched_detections)
+        if cost_matrix is None:
+            rows_deep = np.flatnonzero(
+                (track_levels >= level) & (track_levels < cascade_depth))
+            row_of = np.full(len(track_indices), -1, dtype=np.int64)
+            row_of[rows_deep] = np.arange(len(rows_deep))
+            col_of = {d: col for col, d in enumerate(unmatched_detections)}
+            cost_matrix = distance_metric(
+                tracks, detections, [track_indices[r] for r in rows_deep],
+                unmatched_detections)
+        cols_l = np.asarray([col_of[d] for d in unmatched_detections])
+        matches_l, _, unmatched_detections = _assign(
+            cost_matrix[np.ix_(row_of[rows_l], cols_l)], max_distance,
+            [track_indices[r] for r in rows_l], unmatched_detections)
         matches += matches_l
     unmatched_tracks = list(set(track_indices) - set(k for k, _ in matches))
     return matches, unmatched_tracks, unmatched_detections
@@ -182,9 +212,184 @@ def gate_cost_matrix(
     gating_threshold = kalman_filter.chi2inv95[gating_dim]
     measurements = np.asarray(
         [detections[i].to_xyah() for i in detection_indices])
-    for row, track_idx in enumerate(track_indices):
-        track = tracks[track_idx]
-        gating_distance = kf.gating_distance(
-            track.mean, track.covariance, measurements, only_position)
-        cost_matrix[row, gating_distance > gating_threshold] = gated_cost
+    if len(track_indices) == 0 or len(measurements) == 0:
+        return cost_matrix
+    means = np.asarray([tracks[i].mean for i in track_indices])
+    covariances = np.asarray([tracks[i].covariance for i in track_indices])
+    gating_distance = kf.gating_distance_batch(
+        means, covariances, measurements, only_position)
+    cost_matrix[gating_distance > gating_threshold] = gated_cost
     return cost_matrix
+
+
+def gate_pairs(
+        kf, tracks, detections, track_indices, detection_indices,
+        only_position=False):
+    """Find the pairs of tracks and detections which pass the gating of
+    `gate_cost_matrix`, without computing the full matrix. Since the squared
+    Mahalanobis distance is at least the squared distance along any axis over
+    its variance, a detection can only pass the gate of a track when its
+    center is inside the box of half-size `sqrt(threshold * variance)` around
+    the projected track center, so only the pairs found in these boxes by
+    `association.findCandidatePairs` are tested.
+
+    Parameters
+    ----------
+    kf : The Kalman filter.
+    tracks : List[track.Track]
+        A list of predicted tracks at the current time step.
+    detections : List[detection.Detection]
+        A list of detections at the current time step.
+    track_indices : List[int]
+        List of track indices to gate.
+    detection_indices : List[int]
+        List of detection indices to gate.
+    only_position : Optional[bool]
+        If True, only the x, y position of the state distribution is considered
+        during gating. Defaults to False.
+
+    Returns
+    -------
+    (ndarray, ndarray)
+        Returns the positions of the paired tracks in `track_indices` and of
+        the paired detections in `detection_indices`.
+
+    """
+    if len(track_indices) == 0 or len(detection_indices) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    gating_dim = 2 if only_position else 4
+    gating_threshold = kalman_filter.chi2inv95[gating_dim]
+    means = np.asarray([tracks[i].mean for i in track_indices])
+    covariances = np.asarray([tracks[i].covariance for i in track_indices])
+    measurements = np.asarray(
+        [detections[i].to_xyah() for i in detection_indices])
+    mean, covariance = kf.project_batch(means, covariances)
+
+    half_size = np.sqrt(gating_threshold * np.stack(
+        [covariance[:, 0, 0], covariance[:, 1, 1]], axis=1))
+    gates = np.concatenate(
+        [mean[:, :2] - half_size, mean[:, :2] + half_size], axis=1)
+    centers = np.concatenate([measurements[:, :2], measurements[:, :2]], axis=1)
+    rows, cols = findCandidatePairs(
+        gates, centers, cell_size=np.median(2 * half_size))
+
+    if only_position:
+        mean, covariance = mean[:, :2], covariance[:, :2, :2]
+        measurements = measurements[:, :2]
+    inv_factor = np.linalg.inv(np.linalg.cholesky(covariance))
+    d = measurements[cols] - mean[rows]
+    z = np.einsum('kij,kj->ki', inv_factor[rows], d)
+    passed = np.einsum('ki,ki->k', z, z) <= gating_threshold
+    return rows[passed], cols[passed]
+
+
+def min_cost_matching_sparse(
+        rows, cols, costs, max_distance, track_indices, detection_indices):
+    """Solve linear assignment problem of the given pairs only, the sparse
+    version of `min_cost_matching`. The pairs which are not given, or which
+    cost more than `max_distance`, are infeasible, and the result is the same
+    as `min_cost_matching` up to ties.
+
+    Parameters
+    ----------
+    rows : ndarray
+        Positions of the paired tracks in `track_indices`.
+    cols : ndarray
+        Positions of the paired detections in `detection_indices`.
+    costs : ndarray
+        Association costs of the pairs.
+    max_distance : float
+        Gating threshold. Associations with cost larger than this value are
+        disregarded.
+    track_indices : List[int]
+        List of track indices.
+    detection_indices : List[int]
+        List of detection indices.
+
+    Returns
+    -------
+    (List[(int, int)], List[int], List[int])
+        Returns a tuple with the following three entries:
+        * A list of matched track and detection indices.
+        * A list of unmatched track indices.
+        * A list of unmatched detection indices.
+
+    """
+    feasible = costs <= max_distance
+    pairs, unmatched_rows, unmatched_cols = solveSparse(
+        rows[feasible], cols[feasible], costs[feasible],
+        len(track_indices), len(detection_indices),
+        gated_cost=max_distance + 1e-5)
+    track_indices = np.asarray(track_indices, dtype=np.int64)
+    detection_indices = np.asarray(detection_indices, dtype=np.int64)
+    matches = list(zip(track_indices[pairs[:, 0]].tolist(),
+                       detection_indices[pairs[:, 1]].tolist()))
+    return (matches, track_indices[unmatched_rows].tolist(),
+            detection_indices[unmatched_cols].tolist())
+
+
+def matching_cascade_sparse(
+        rows, cols, costs, max_distance, cascade_depth, tracks, track_indices,
+        detection_indices):
+    """Run matching cascade on the given pairs only, the sparse version of
+    `matching_cascade`.
+
+    Parameters
+    ----------
+    rows : ndarray
+        Positions of the paired tracks in `track_indices`.
+    cols : ndarray
+        Positions of the paired detections in `detection_indices`.
+    costs : ndarray
+        Association costs of the pairs.
+    max_distance : float
+        Gating threshold. Associations with cost larger than this value are
+        disregarded.
+    cascade_depth: int
+        The cascade depth, should be se to the maximum track age.
+    tracks : List[track.Track]
+        A list of predicted tracks at the current time step.
+    track_indices : List[int]
+        List of track indices.
+    detection_indices : List[int]
+        List of detection indices.
+
+    Returns
+    -------
+    (List[(int, int)], List[int], List[int])
+        Returns a tuple with the following three entries:
+        * A list of matched track and detection indices.
+        * A list of unmatched track indices.
+        * A list of unmatched detection indices.
+
+    """
+    matches = []
+    unmatched_cols = np.ones(len(detection_indices), dtype=bool)
+    track_levels = np.asarray(
+        [tracks[k].time_since_update for k in track_indices],
+        dtype=np.int64).reshape(-1) - 1
+    for level in np.unique(track_levels):
+        if level < 0 or level >= cascade_depth:
+            continue
+        if not unmatched_cols.any():  # No detections left
+            break
+
+        rows_l = np.flatnonzero(track_levels == level)
+        cols_l = np.flatnonzero(unmatched_cols)
+        # The pairs of this level, re-indexed to its tracks and detections
+        row_pos = np.full(len(track_indices), -1, dtype=np.int64)
+        row_pos[rows_l] = np.arange(len(rows_l))
+        col_pos = np.full(len(detection_indices), -1, dtype=np.int64)
+        col_pos[cols_l] = np.arange(len(cols_l))
+        in_level = (row_pos[rows] >= 0) & (col_pos[cols] >= 0)
+        matches_l, _, _ = min_cost_matching_sparse(
+            row_pos[rows[in_level]], col_pos[cols[in_level]],
+            costs[in_level], max_distance, rows_l, cols_l)
+        for row, col in matches_l:
+            unmatched_cols[col] = False
+            matches.append((track_indices[row], detection_indices[col]))
+    matched = set(k for k, _ in matches)
+    unmatched_tracks = [k for k in track_indices if k not in matched]
+    unmatched_detections = np.asarray(
+        detection_indices, dtype=np.int64)[unmatched_cols].tolist()
+    return matches, unmatched_tracks, unmatched_detections
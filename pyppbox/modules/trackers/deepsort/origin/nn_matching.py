@@ -101,6 +101,12 @@ class NearestNeighborDistanceMetric(object):
     A nearest neighbor distance metric that, for each target, returns
     the closest distance to any sample that has been observed so far.
 
+    The samples are kept in a preallocated gallery of shape
+    (targets, budget, dimensionality), where each target owns a row used as a
+    ring buffer of its most recent samples, so updating the gallery does not
+    rebuild it and the distances to all targets are computed with one matrix
+    product.
+
     Parameters
     ----------
     metric : str
@@ -111,28 +117,73 @@ class NearestNeighborDistanceMetric(object):
     budget : Optional[int]
         If not None, fix samples per class to at most this number. Removes
         the oldest samples when the budget is reached.
+    half : Optional[bool]
+        If True, the gallery is stored as float16 to halve its memory,
+        otherwise as float32. The distances are always computed in float32.
 
     Attributes
     ----------
     samples : Dict[int -> List[ndarray]]
         A dictionary that maps from target identities to the list of samples
-        that have been observed so far.
+        that have been observed so far, built from the gallery on access.
 
     """
 
-    def __init__(self, metric, matching_threshold, budget=None):
+    def __init__(self, metric, matching_threshold, budget=None, half=False):
 
 
         if metric == "euclidean":
-            self._metric = _nn_euclidean_distance
+            self._normalize = False
         elif metric == "cosine":
-            self._metric = _nn_cosine_distance
+            self._normalize = True
         else:
             raise ValueError(
                 "Invalid metric; must be either 'euclidean' or 'cosine'")
         self.matching_threshold = matching_threshold
         self.budget = budget
-        self.samples = {}
+        self._dtype = np.float16 if half else np.float32
+        self._gallery = None
+        self._count = np.zeros((0, ), dtype=np.int64)
+        self._head = np.zeros((0, ), dtype=np.int64)
+        self._rows = {}
+        self._free_rows = []
+
+    @property
+    def samples(self):
+        samples = {}
+        for target, row in self._rows.items():
+            count, head = self._count[row], self._head[row]
+            order = (np.arange(count) + head - count) % self._gallery.shape[1]
+            samples[target] = list(self._gallery[row, order].astype(np.float32))
+        return samples
+
+    def _allocate(self, num_targets, num_samples, dim):
+        # Grow the gallery so it holds at least the given shape, keeping the
+        # samples in place
+        if self._gallery is None:
+            old_targets, old_samples = 0, 0
+        else:
+            old_targets, old_samples, dim = self._gallery.shape
+        if num_targets <= old_targets and num_samples <= old_samples:
+            return
+        if num_targets > old_targets:
+            num_targets = max(num_targets, 2 * old_targets, 16)
+        num_targets = max(num_targets, old_targets)
+        if self.budget is None:
+            if num_samples > old_samples:
+                num_samples = max(num_samples, 2 * old_samples, 16)
+            num_samples = max(num_samples, old_samples)
+        else:
+            num_samples = self.budget
+        gallery = np.zeros((num_targets, num_samples, dim), dtype=self._dtype)
+        if self._gallery is not None:
+            gallery[:old_targets, :old_samples] = self._gallery
+        self._gallery = gallery
+        self._count = np.concatenate(
+            [self._count, np.zeros(num_targets - old_targets, np.int64)])
+        self._head = np.concatenate(
+            [self._head, np.zeros(num_targets - old_targets, np.int64)])
+        self._free_rows += list(range(num_targets - 1, old_targets - 1, -1))
 
     def partial_fit(self, features, targets, active_targets):
         """Update the distance metric with new data.
@@ -147,11 +198,62 @@ class NearestNeighborDistanceMetric(object):
             A list of targets that are currently present in the scene.
 
         """
-        for feature, target in zip(features, targets):
-            self.samples.setdefault(target, []).append(feature)
-            if self.budget is not None:
-                self.samples[target] = self.samples[target][-self.budget:]
-        self.samples = {k: self.samples[k] for k in active_targets}
+        active_targets = set(active_targets)
+        for target in [t for t in self._rows if t not in active_targets]:
+            row = self._rows.pop(target)
+            self._count[row] = 0
+            self._head[row] = 0
+            self._free_rows.append(row)
+
+        if len(features) == 0:
+            return
+        features = np.asarray(features, dtype=np.float32)
+        if self._normalize:
+            features = features / np.linalg.norm(
+                features, axis=1, keepdims=True)
+        targets = np.asarray(targets)
+        unique_targets, inverse, counts = np.unique(
+            targets, return_inverse=True, return_counts=True)
+        new_targets = [t for t in unique_targets.tolist()
+                       if t not in self._rows and t in active_targets]
+        num_targets = 0 if self._gallery is None else self._gallery.shape[0]
+        free = len(self._free_rows)
+        self._allocate(num_targets + max(0, len(new_targets) - free),
+                       int(counts.max()) if self.budget is None
+                       else self.budget, features.shape[1])
+        for target in new_targets:
+            self._rows[target] = self._free_rows.pop()
+
+        # The rank of each feature among the features of its target, so the
+        # features of one target fill consecutive slots of its ring buffer
+        order = np.argsort(inverse, kind='stable')
+        starts = np.cumsum(counts) - counts
+        rank = np.empty(len(targets), dtype=np.int64)
+        rank[order] = np.arange(len(targets)) - np.repeat(starts, counts)
+
+        keep = np.asarray([t in self._rows for t in unique_targets.tolist()])
+        if not keep.any():
+            return
+        rows = np.asarray([self._rows.get(t, -1)
+                           for t in unique_targets.tolist()], dtype=np.int64)
+        capacity = self._gallery.shape[1]
+        if self.budget is None:
+            self._allocate(self._gallery.shape[0],
+                           int((self._count[rows[keep]] + counts[keep]).max()),
+                           features.shape[1])
+            capacity = self._gallery.shape[1]
+        # Only the last `capacity` features of a target survive
+        selected = keep[inverse] & (rank >= (counts - capacity)[inverse])
+        feature_rows = rows[inverse][selected]
+        slots = (self._head[feature_rows] + rank[selected]) % capacity
+        self._gallery[feature_rows, slots] = features[selected]
+        rows, counts = rows[keep], counts[keep]
+        if self.budget is None:
+            # The gallery grows instead of wrapping around
+            self._head[rows] += counts
+        else:
+            self._head[rows] = (self._head[rows] + counts) % capacity
+        self._count[rows] = np.minimum(self._count[rows] + counts, capacity)
 
     def distance(self, features, targets):
         """Compute distance between features and targets.
@@ -171,7 +273,66 @@ class NearestNeighborDistanceMetric(object):
             `targets[i]` and `features[j]`.
 
         """
-        cost_matrix = np.zeros((len(targets), len(features)))
-        for i, target in enumerate(targets):
-            cost_matrix[i, :] = self._metric(self.samples[target], features)
-        return cost_matrix
+        if len(targets) == 0 or len(features) == 0:
+            return np.zeros((len(targets), len(features)))
+        features = np.asarray(features, dtype=np.float32)
+        if self._normalize:
+            features = features / np.linalg.norm(
+                features, axis=1, keepdims=True)
+        rows = np.asarray([self._rows[t] for t in targets], dtype=np.int64)
+        capacity = int(self._count[rows].max())
+        # Slots [0, count) are the valid ones until the ring buffer is full
+        gallery = self._gallery[rows, :capacity].astype(np.float32)
+        dots = np.matmul(gallery, features.T)
+        if self._normalize:
+            distances = 1. - dots
+        else:
+            distances = np.square(gallery).sum(axis=2)[:, :, None] - 2. * dots \
+                + np.square(features).sum(axis=1)[None, None, :]
+        valid = np.arange(capacity)[None, :] < self._count[rows][:, None]
+        distances[~valid] = np.inf
+        cost_matrix = distances.min(axis=1)
+        if not self._normalize:
+            cost_matrix = np.maximum(0.0, cost_matrix)
+        return cost_matrix.astype(np.float64)
+
+    def distance_pairs(self, features, targets):
+        """Compute distance between paired features and targets, the sparse
+        version of `distance`.
+
+        Parameters
+        ----------
+        features : ndarray
+            A KxM matrix of K features of dimensionality M.
+        targets : List[int]
+            A list of K targets, `targets[k]` is matched against
+            `features[k]`.
+
+        Returns
+        -------
+        ndarray
+            Returns a vector of length K, where element k contains the closest
+            squared distance between `targets[k]` and `features[k]`.
+
+        """
+        if len(targets) == 0:
+            return np.zeros((0, ))
+        features = np.asarray(features, dtype=np.float32)
+        if self._normalize:
+            features = features / np.linalg.norm(
+                features, axis=1, keepdims=True)
+        rows = np.asarray([self._rows[t] for t in targets], dtype=np.int64)
+        capacity = int(self._count[rows].max())
+        gallery = self._gallery[rows, :capacity].astype(np.float32)
+        dots = np.einsum('kbm,km->kb', gallery, features)
+        if self._normalize:
+            distances = 1. - dots
+        else:
+            distances = np.square(gallery).sum(axis=2) - 2. * dots \
+                + np.square(features).sum(axis=1)[:, None]
+        valid = np.arange(capacity)[None, :] < self._count[rows][:, None]
+        distances[~valid] = np.inf
+        distances = distances.min(axis=1)
+        if not self._normalize:
+            distances = np.maximum(0.0, distances)
+        return distances.astype(np.float64)
@@ -1,4 +1,5 @@
 # vim: expandtab:ts=4:sw=4
+import numpy as np
 
 
 class TrackState:
@@ -16,6 +17,120 @@ class TrackState:
     Deleted = 3
 
 
+class TrackStore:
+    """
+    The states of a set of tracks kept as a structure of arrays, so the Kalman
+    filter steps and the track management of all tracks run as a few batched
+    array operations. Row `i` of every array belongs to `tracks[i]`.
+
+    Parameters
+    ----------
+    n_init : int
+        Number of consecutive detections before a track is confirmed.
+    max_age : int
+        The maximum number of consecutive misses before a track is deleted.
+
+    Attributes
+    ----------
+    mean : ndarray
+        The Nx8 dimensional mean matrix.
+    covariance : ndarray
+        The Nx8x8 dimensional covariance matrix.
+    track_id : ndarray
+        The N track identifiers.
+    hits : ndarray
+        The N total numbers of measurement updates.
+    age : ndarray
+        The N total numbers of frames since first occurrence.
+    time_since_update : ndarray
+        The N total numbers of frames since last measurement update.
+    state : ndarray
+        The N track states, see `TrackState`.
+    tracks : List[Track]
+        The `Track` views of the N rows.
+
+    """
+
+    def __init__(self, n_init, max_age):
+        self.n_init = n_init
+        self.max_age = max_age
+        self.mean = np.zeros((0, 8))
+        self.covariance = np.zeros((0, 8, 8))
+        self.track_id = np.zeros((0, ), dtype=np.int64)
+        self.hits = np.zeros((0, ), dtype=np.int64)
+        self.age = np.zeros((0, ), dtype=np.int64)
+        self.time_since_update = np.zeros((0, ), dtype=np.int64)
+        self.state = np.zeros((0, ), dtype=np.int64)
+        self.tracks = []
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def _grow(self, mean, covariance, track_ids):
+        n = len(track_ids)
+        self.mean = np.concatenate([self.mean, mean], axis=0)
+        self.covariance = np.concatenate(
+            [self.covariance, covariance], axis=0)
+        self.track_id = np.concatenate(
+            [self.track_id, np.asarray(track_ids, dtype=np.int64)])
+        self.hits = np.concatenate([self.hits, np.ones(n, dtype=np.int64)])
+        self.age = np.concatenate([self.age, np.ones(n, dtype=np.int64)])
+        self.time_since_update = np.concatenate(
+            [self.time_since_update, np.zeros(n, dtype=np.int64)])
+        self.state = np.concatenate(
+            [self.state, np.full(n, TrackState.Tentative, dtype=np.int64)])
+
+    def add(self, mean, covariance, track_ids, features):
+        """Append new tentative tracks.
+
+        Parameters
+        ----------
+        mean : ndarray
+            The Kx8 dimensional mean matrix of the new tracks.
+        covariance : ndarray
+            The Kx8x8 dimensional covariance matrix of the new tracks.
+        track_ids : List[int]
+            The K unique track identifiers.
+        features : List[Optional[ndarray]]
+            The K feature vectors of the detections the tracks originate from.
+
+        """
+        first = len(self.tracks)
+        self._grow(mean, covariance, track_ids)
+        for k, feature in enumerate(features):
+            self.tracks.append(Track._view(self, first + k, feature))
+
+    def keep(self, mask):
+        """Keep only the tracks of the given boolean mask, in order.
+
+        Parameters
+        ----------
+        mask : ndarray
+            A boolean array of length N.
+
+        """
+        self.mean = self.mean[mask]
+        self.covariance = self.covariance[mask]
+        self.track_id = self.track_id[mask]
+        self.hits = self.hits[mask]
+        self.age = self.age[mask]
+        self.time_since_update = self.time_since_update[mask]
+        self.state = self.state[mask]
+        self.tracks = [t for t, k in zip(self.tracks, mask) if k]
+        for i, track in enumerate(self.tracks):
+            track._index = i
+
+
+def _store_field(name):
+    def fget(self):
+        return getattr(self._store, name)[self._index]
+
+    def fset(self, value):
+        getattr(self._store, name)[self._index] = value
+
+    return property(fget, fset)
+
+
 class Track:
     """
     A single target track with state space `(x, y, a, h)` and associated
@@ -61,24 +176,49 @@ class Track:
         A cache of features. On each measurement update, the associated feature
         vector is added to this list.
 
+    A track is a view of one row of a `TrackStore`. A track created directly
+    owns a store of its own, while the tracks of a `tracker.Tracker` share the
+    store of the tracker.
+
     """
 
+    mean = _store_field('mean')
+    covariance = _store_field('covariance')
+    track_id = _store_field('track_id')
+    hits = _store_field('hits')
+    age = _store_field('age')
+    time_since_update = _store_field('time_since_update')
+    state = _store_field('state')
+
     def __init__(self, mean, covariance, track_id, n_init, max_age,
                  feature=None):
-        self.mean = mean
-        self.covariance = covariance
-        self.track_id = track_id
-        self.hits = 1
-        self.age = 1
-        self.time_since_update = 0
-
-        self.state = TrackState.Tentative
+        self._store = TrackStore(n_init, max_age)
+        self._store._grow(np.asarray(mean, dtype=np.float64).reshape(1, 8),
+                          np.asarray(covariance, dtype=np.float64).reshape(1, 8, 8),
+                          [track_id])
+        self._store.tracks.append(self)
+        self._index = 0
         self.features = []
         if feature is not None:
             self.features.append(feature)
 
-        self._n_init = n_init
-        self._max_age = max_age
+    @classmethod
+    def _view(cls, store, index, feature=None):
+        track = cls.__new__(cls)
+        track._store = store
+        track._index = index
+        track.features = []
+        if feature is not None:
+            track.features.append(feature)
+        return track
+
+    @property
+    def _n_init(self):
+        return self._store.n_init
+
+    @property
+    def _max_age(self):
+        return self._store.max_age
 
     def to_tlwh(self):
         """Get current position in bounding box format `(top left x, top left y,
@@ -3,7 +3,7 @@ import numpy as np
 from . import kalman_filter
 from . import linear_assignment
 from . import iou_matching
-from .track import Track
+from .track import TrackState, TrackStore
 
 
 class Tracker:
@@ -20,6 +20,13 @@ class Tracker:
         Number of consecutive detections before the track is confirmed. The
         track state is set to `Deleted` if a miss occurs within the first
         `n_init` frames.
+    sparse : bool
+        If True, only the pairs of tracks and detections which pass the
+        gating, or which overlap for the IOU association, are considered, and
+        the association is solved by independent small problems, so its cost
+        grows with the local density rather than with the number of tracks.
+        The matches are the same as the dense association up to ties, but the
+        new tracks may be started in another order, so their ids can differ.
 
     Attributes
     ----------
@@ -32,27 +39,40 @@ class Tracker:
     kf : kalman_filter.KalmanFilter
         A Kalman filter to filter target trajectories in image space.
     tracks : List[Track]
-        The list of active tracks at the current time step.
+        The list of active tracks at the current time step, which are views of
+        the rows of a `track.TrackStore` so the Kalman filter steps and the
+        track management run batched over all tracks.
 
     """
 
-    def __init__(self, metric, max_iou_distance=0.7, max_age=30, n_init=3):
+    def __init__(self, metric, max_iou_distance=0.7, max_age=30, n_init=3,
+                 sparse=False):
         self.metric = metric
         self.max_iou_distance = max_iou_distance
         self.max_age = max_age
         self.n_init = n_init
+        self.sparse = sparse
 
         self.kf = kalman_filter.KalmanFilter()
-        self.tracks = []
+        self._store = TrackStore(n_init, max_age)
         self._next_id = 1
 
+    @property
+    def tracks(self):
+        return self._store.tracks
+
     def predict(self):
         """Propagate track state distributions one time step forward.
 
         This function should be called once every time step, before `update`.
         """
-        for track in self.tracks:
-            track.predict(self.kf)
+        store = self._store
+        if len(store) == 0:
+            return
+        store.mean, store.covariance = self.kf.predict_batch(
+            store.mean, store.covariance)
+        store.age += 1
+        store.time_since_update += 1
 
     def update(self, detections):
         """Perform measurement update and track management.
@@ -68,14 +88,30 @@ class Tracker:
             self._match(detections)
 
         # Update track set.
-        for track_idx, detection_idx in matches:
-            self.tracks[track_idx].update(
-                self.kf, detections[detection_idx])
-        for track_idx in unmatched_tracks:
-            self.tracks[track_idx].mark_missed()
-        for detection_idx in unmatched_detections:
-            self._initiate_track(detections[detection_idx])
-        self.tracks = [t for t in self.tracks if not t.is_deleted()]
+        store = self._store
+        if len(matches) > 0:
+            track_indices = np.asarray([k for k, _ in matches])
+            measurements = np.asarray(
+                [detections[i].to_xyah() for _, i in matches])
+            store.mean[track_indices], store.covariance[track_indices] = \
+                self.kf.update_batch(store.mean[track_indices],
+                                     store.covariance[track_indices],
+                                     measurements)
+            for track_idx, detection_idx in matches:
+                store.tracks[track_idx].features.append(
+                    detections[detection_idx].feature)
+            store.hits[track_indices] += 1
+            store.time_since_update[track_indices] = 0
+            confirm = (store.state[track_indices] == TrackState.Tentative) & \
+                (store.hits[track_indices] >= self.n_init)
+            store.state[track_indices[confirm]] = TrackState.Confirmed
+        if len(unmatched_tracks) > 0:
+            track_indices = np.asarray(unmatched_tracks)
+            delete = (store.state[track_indices] == TrackState.Tentative) | \
+                (store.time_since_update[track_indices] > self.max_age)
+            store.state[track_indices[delete]] = TrackState.Deleted
+        self._initiate_tracks([detections[i] for i in unmatched_detections])
+        store.keep(store.state != TrackState.Deleted)
 
         # Update distance metric.
         active_targets = [t.track_id for t in self.tracks if t.is_confirmed()]
@@ -90,6 +126,8 @@ class Tracker:
             np.asarray(features), np.asarray(targets), active_targets)
 
     def _match(self, detections):
+        if self.sparse:
+            return self._match_sparse(detections)
 
         def gated_metric(tracks, dets, track_indices, detection_indices):
             features = np.array([dets[i].feature for i in detection_indices])
@@ -129,9 +167,62 @@ class Tracker:
         unmatched_tracks = list(set(unmatched_tracks_a + unmatched_tracks_b))
         return matches, unmatched_tracks, unmatched_detections
 
-    def _initiate_track(self, detection):
-        mean, covariance = self.kf.initiate(detection.to_xyah())
-        self.tracks.append(Track(
-            mean, covariance, self._next_id, self.n_init, self.max_age,
-            detection.feature))
-        self._next_id += 1
+    def _match_sparse(self, detections):
+        detection_indices = list(range(len(detections)))
+
+        # Split track set into confirmed and unconfirmed tracks.
+        confirmed_tracks = [
+            i for i, t in enumerate(self.tracks) if t.is_confirmed()]
+        unconfirmed_tracks = [
+            i for i, t in enumerate(self.tracks) if not t.is_confirmed()]
+
+        # Associate confirmed tracks using appearance features of the gated
+        # pairs only.
+        rows, cols = linear_assignment.gate_pairs(
+            self.kf, self.tracks, detections, confirmed_tracks,
+            detection_indices)
+        features = np.array([detections[i].feature for i in cols])
+        targets = [self.tracks[confirmed_tracks[i]].track_id for i in rows]
+        costs = self.metric.distance_pairs(features, targets)
+        matches_a, unmatched_tracks_a, unmatched_detections = \
+            linear_assignment.matching_cascade_sparse(
+                rows, cols, costs, self.metric.matching_threshold,
+                self.max_age, self.tracks, confirmed_tracks,
+                detection_indices)
+
+        # Associate remaining tracks together with unconfirmed tracks using IOU
+        # of the overlapping pairs only.
+        iou_track_candidates = unconfirmed_tracks + [
+            k for k in unmatched_tracks_a if
+            self.tracks[k].time_since_update == 1]
+        unmatched_tracks_a = [
+            k for k in unmatched_tracks_a if
+            self.tracks[k].time_since_update != 1]
+        if self.max_iou_distance < 1.:
+            rows, cols, costs = iou_matching.iou_pairs(
+                self.tracks, detections, iou_track_candidates,
+                unmatched_detections)
+            matches_b, unmatched_tracks_b, unmatched_detections = \
+                linear_assignment.min_cost_matching_sparse(
+                    rows, cols, costs, self.max_iou_distance,
+                    iou_track_candidates, unmatched_detections)
+        else:
+            # Even the pairs which do not overlap are feasible
+            matches_b, unmatched_tracks_b, unmatched_detections = \
+                linear_assignment.min_cost_matching(
+                    iou_matching.iou_cost, self.max_iou_distance, self.tracks,
+                    detections, iou_track_candidates, unmatched_detections)
+
+        matches = matches_a + matches_b
+        unmatched_tracks = list(set(unmatched_tracks_a + unmatched_tracks_b))
+        return matches, unmatched_tracks, unmatched_detections
+
+    def _initiate_tracks(self, detections):
+        if len(detections) == 0:
+            return
+        mean, covariance = self.kf.initiate_batch(
+            [d.to_xyah() for d in detections])
+        track_ids = list(range(self._next_id, self._next_id + len(detections)))
+        self._store.add(mean, covariance, track_ids,
+                        [d.feature for d in detections])
+        self._next_id += len(detections)
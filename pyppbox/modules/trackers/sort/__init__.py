@@ -19,12 +19,13 @@
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 
-from pyppbox.utils.persontools import Person
+from pyppbox.utils.persontools import Person, PeopleFrame, mapPeopleByCID
 from pyppbox.utils.logtools import add_error_log, ignore_this_logger
 
 ignore_this_logger("sort")
 
 from .origin.sort import Sort
+from .batched import BatchedSort
 
 
 class MySORT(object):
@@ -40,7 +41,15 @@ class MySORT(object):
         cfg : TCFGSORT
             A :class:`TCFGDeepSORT` object which manages the configurations of tracker SORT.
         """
-        self.st = Sort(cfg.max_age, cfg.min_hits, cfg.iou_threshold)
+        engine = str(cfg.engine).lower()
+        if engine == 'batched':
+            self.st = BatchedSort(cfg.max_age, cfg.min_hits, cfg.iou_threshold, sparse=bool(cfg.sparse))
+        elif engine == 'classic':
+            self.st = Sort(cfg.max_age, cfg.min_hits, cfg.iou_threshold)
+        else:
+            msg = f"MySORT : __init__() -> engine='{cfg.engine}' is not supported, use 'Batched' or 'Classic'."
+            add_error_log(msg)
+            raise ValueError(msg)
         self.previous_list = []
         self.current_list = []
 
@@ -70,47 +79,44 @@ class MySORT(object):
         return track_index, updated_cid
 
 
-    def __getIndexFromPreviousList__(self, cid):
-        pindex = -1
-        for i in range(0, len(self.previous_list)):
-            if cid == self.previous_list[i].cid:
-                pindex = i
-                break
-        return pindex
-
-
     def update(self, person_list, img=None):
         """Update the tracker and return the updated list of 
         :class:`pyppbox.utils.persontools.Person`.
 
         Parameters
         ----------
-        person_list : list[Person, ...]
-            A list of :class:`pyppbox.utils.persontools.Person` object which stores 
-            the detected people in the given :obj:`img`.
+        person_list : list[Person, ...] or PeopleFrame
+            A list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame`, which stores the detected people 
+            in the given :obj:`img`.
         img : any, default=None
             Being consistent with other trackers, will be ignored.
 
         Returns
         -------
-        list[Person, ...]
-            The updated list of :class:`pyppbox.utils.persontools.Person` object.
+        list[Person, ...] or PeopleFrame
+            The updated list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame` if :obj:`person_list` is one.
         """
         self.previous_list = self.current_list
-        self.current_list = []
+        # An empty PeopleFrame is returned as it is
+        self.current_list = person_list if isinstance(person_list, PeopleFrame) else []
 
         if len(person_list) > 0:
             if isinstance(person_list[0], Person):
                 self.current_list = self.st.update_pyppbox(person_list)
-                for i in range (0, len(self.current_list)):
-                    if len(self.previous_list) > 0:
-                        pindex = self.__getIndexFromPreviousList__(self.current_list[i].cid)
-                        if pindex >= 0:
-                            self.current_list[i].faceid = self.previous_list[pindex].faceid
-                            self.current_list[i].deepid = self.previous_list[pindex].deepid
-                            self.current_list[i].faceid_conf = self.previous_list[pindex].faceid_conf
-                            self.current_list[i].deepid_conf = self.previous_list[pindex].deepid_conf
-                            self.current_list[i].misc = self.previous_list[pindex].misc
+                if isinstance(person_list, PeopleFrame) and isinstance(self.current_list, list):
+                    # The classic engine returns the views of the given PeopleFrame
+                    self.current_list = person_list.select([p.index for p in self.current_list])
+                previous_people = mapPeopleByCID(self.previous_list)
+                for person in self.current_list:
+                    previous_person = previous_people.get(person.cid)
+                    if previous_person is not None:
+                        person.faceid = previous_person.faceid
+                        person.deepid = previous_person.deepid
+                        person.faceid_conf = previous_person.faceid_conf
+                        person.deepid_conf = previous_person.deepid_conf
+                        person.misc = previous_person.misc
             else:
                 msg = ("MySORT : update() -> The element of input 'person_list' list has unsupported type.")
                 add_error_log(msg)
@@ -0,0 +1,330 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+
+import numpy as np
+
+from .origin.sort import KalmanBoxTracker, associate_detections_to_trackers
+from pyppbox.modules.trackers.association import findCandidatePairs, solveSparse
+from pyppbox.utils.persontools import PeopleFrame
+
+
+# The constant velocity model of SORT, see KalmanBoxTracker
+__sort_R__ = np.diag([1.0, 1.0, 10.0, 10.0])
+__sort_P0__ = np.diag([10.0, 10.0, 10.0, 10.0, 10000.0, 10000.0, 10000.0])
+__sort_Q__ = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001])
+__sort_I__ = np.eye(7)
+
+
+def toZ(bboxes):
+    """
+    :meta private:
+    """
+    # Same operations and dtype as convert_bbox_to_z() of each row
+    w = bboxes[:, 2] - bboxes[:, 0]
+    h = bboxes[:, 3] - bboxes[:, 1]
+    x = bboxes[:, 0] + w / 2.0
+    y = bboxes[:, 1] + h / 2.0
+    return np.stack([x, y, w * h, w / h], axis=1)
+
+def toBBoxes(x):
+    """
+    :meta private:
+    """
+    # Same operations as convert_x_to_bbox() of each row
+    w = np.sqrt(x[:, 2] * x[:, 3])
+    h = x[:, 2] / w
+    return np.stack([x[:, 0] - w / 2.0, x[:, 1] - h / 2.0, x[:, 0] + w / 2.0, x[:, 1] + h / 2.0], axis=1)
+
+
+def associateSparse(detections, trackers, iou_threshold=0.3):
+    """Same as :code:`associate_detections_to_trackers()`, but only the overlapping pairs found 
+    by :func:`pyppbox.modules.trackers.association.findCandidatePairs` are tested, and only the 
+    small independent problems of :func:`pyppbox.modules.trackers.association.solveSparse` are 
+    solved. The pairs below :obj:`iou_threshold` are infeasible, so the matches may only differ 
+    from the dense solver when it trades a feasible pair for the ones it drops afterwards. 
+    :obj:`iou_threshold` must be > 0.
+
+    Returns
+    -------
+    ndarray
+        Matches :code:`[[det_index, trk_index], ...]`, :code:`shape=(k, 2)`.
+    ndarray
+        Unmatched detections.
+    ndarray
+        Unmatched trackers.
+    """
+    detections = np.asarray(detections, dtype=np.float32)
+    trackers = np.asarray(trackers, dtype=np.float32)
+    rows, cols = findCandidatePairs(detections[:, :4], trackers[:, :4])
+    # Same operations and dtype as iou_batch() of each pair
+    a, b = detections[rows], trackers[cols]
+    w = np.maximum(0.0, np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0]))
+    h = np.maximum(0.0, np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1]))
+    inter = w * h
+    union = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1]) + (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]) - inter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou = np.where(union > 0.0, inter / union, 0.0).astype(np.float32)
+    iou[~np.isfinite(iou)] = 0.0
+    feasible = iou >= iou_threshold
+    matches, unmatched_dets, unmatched_trks = solveSparse(rows[feasible], cols[feasible], 
+                                                          1.0 - iou[feasible], 
+                                                          len(detections), len(trackers), 
+                                                          gated_cost=1.0)
+    return (matches.astype(np.int32), unmatched_dets.astype(np.int32), 
+            unmatched_trks.astype(np.int32))
+
+
+class KalmanBoxStore(object):
+
+    """The constant velocity Kalman filters of all the tracks of SORT, stored as stacked 
+    arrays, so predicting or updating all the tracks takes a few NumPy operations instead of one 
+    :code:`filterpy.kalman.KalmanFilter` call per track. The results are the same as 
+    :code:`KalmanBoxTracker`. The tracks keep their order, new tracks are appended, and removed 
+    tracks are compacted away.
+
+    Attributes
+    ----------
+    x : ndarray
+        States of the tracks, :code:`shape=(N, 7)`.
+    P : ndarray
+        Covariances of the tracks, :code:`shape=(N, 7, 7)`.
+    ids : ndarray
+        IDs of the tracks, :code:`shape=(N,)`.
+    time_since_update : ndarray
+        Number of the predictions since the last update of each track, :code:`shape=(N,)`.
+    hits : ndarray
+        Number of the updates of each track, :code:`shape=(N,)`.
+    hit_streak : ndarray
+        Number of the consecutive updates of each track, :code:`shape=(N,)`.
+    age : ndarray
+        Number of the predictions of each track, :code:`shape=(N,)`.
+    """
+
+    def __init__(self):
+        self.x = np.zeros((0, 7))
+        self.P = np.zeros((0, 7, 7))
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.time_since_update = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.hit_streak = np.zeros(0, dtype=np.int64)
+        self.age = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, bboxes):
+        """Add new tracks and give them the next IDs of :code:`KalmanBoxTracker.count`.
+
+        Parameters
+        ----------
+        bboxes : ndarray
+            Bounding boxes :code:`[[x1, y1, x2, y2, ...], ...]`, :code:`shape=(M, >=4)`.
+
+        Returns
+        -------
+        ndarray
+            IDs of the new tracks, :code:`shape=(M,)`.
+        """
+        m = len(bboxes)
+        x = np.zeros((m, 7))
+        if m > 0: x[:, :4] = toZ(bboxes)
+        ids = np.arange(KalmanBoxTracker.count, KalmanBoxTracker.count + m, dtype=np.int64)
+        KalmanBoxTracker.count += m
+        zeros = np.zeros(m, dtype=np.int64)
+        self.x = np.concatenate([self.x, x])
+        self.P = np.concatenate([self.P, np.broadcast_to(__sort_P0__, (m, 7, 7))])
+        self.ids = np.concatenate([self.ids, ids])
+        self.time_since_update = np.concatenate([self.time_since_update, zeros])
+        self.hits = np.concatenate([self.hits, zeros])
+        self.hit_streak = np.concatenate([self.hit_streak, zeros])
+        self.age = np.concatenate([self.age, zeros])
+        return ids
+
+    def keep(self, mask):
+        """Keep only the tracks of the given :obj:`mask` and compact the arrays.
+
+        Parameters
+        ----------
+        mask : ndarray
+            A boolean mask of the tracks to keep, :code:`shape=(N,)`.
+        """
+        self.x = self.x[mask]
+        self.P = self.P[mask]
+        self.ids = self.ids[mask]
+        self.time_since_update = self.time_since_update[mask]
+        self.hits = self.hits[mask]
+        self.hit_streak = self.hit_streak[mask]
+        self.age = self.age[mask]
+
+    def predict(self):
+        """Advance all the tracks and return their predicted bounding boxes.
+
+        Returns
+        -------
+        ndarray
+            Bounding boxes :code:`[[x1, y1, x2, y2], ...]`, :code:`shape=(N, 4)`.
+        """
+        x = self.x
+        x[x[:, 6] + x[:, 2] <= 0, 6] *= 0.0
+        # x = Fx and P = FPF' + Q, F only adds the velocities to the first 3 elements
+        x[:, :3] += x[:, 4:]
+        FP = self.P.copy()
+        FP[:, :3, :] += self.P[:, 4:, :]
+        self.P = FP.copy()
+        self.P[:, :, :3] += FP[:, :, 4:]
+        self.P += __sort_Q__
+        self.age += 1
+        self.hit_streak[self.time_since_update > 0] = 0
+        self.time_since_update += 1
+        return toBBoxes(x)
+
+    def update(self, indices, bboxes):
+        """Update the given tracks with the observed bounding boxes.
+
+        Parameters
+        ----------
+        indices : ndarray
+            Indices of the tracks, :code:`shape=(M,)`, without duplicates.
+        bboxes : ndarray
+            Bounding boxes :code:`[[x1, y1, x2, y2, ...], ...]`, :code:`shape=(M, >=4)`.
+        """
+        if len(indices) == 0: return
+        z = toZ(bboxes)
+        x = self.x[indices]
+        P = self.P[indices]
+        # H only selects the first 4 elements, so PH' and HPH' are slices
+        y = z - x[:, :4]
+        PHT = np.ascontiguousarray(P[:, :, :4])
+        SI = np.linalg.inv(P[:, :4, :4] + __sort_R__)
+        K = np.matmul(PHT, SI)
+        x = x + np.matmul(K, y[:, :, None])[:, :, 0]
+        I_KH = np.repeat(__sort_I__[None], len(indices), axis=0)
+        I_KH[:, :, :4] -= K
+        KR = np.matmul(K, __sort_R__)
+        self.P[indices] = (np.matmul(np.matmul(I_KH, P), I_KH.transpose(0, 2, 1)) + 
+                           np.matmul(KR, K.transpose(0, 2, 1)))
+        self.x[indices] = x
+        self.time_since_update[indices] = 0
+        self.hits[indices] += 1
+        self.hit_streak[indices] += 1
+
+    def getStates(self):
+        """Return the current bounding boxes of all the tracks.
+
+        Returns
+        -------
+        ndarray
+            Bounding boxes :code:`[[x1, y1, x2, y2], ...]`, :code:`shape=(N, 4)`.
+        """
+        return toBBoxes(self.x)
+
+
+class BatchedSort(object):
+
+    """SORT on a :class:`KalmanBoxStore`, a drop-in replacement of :code:`Sort` which gives the 
+    same results with far less Python overhead when there are many tracks. With 
+    :obj:`sparse=True`, the association is done by :func:`associateSparse`, which scales with 
+    the local density of very crowded scenes.
+    """
+
+    def __init__(self, max_age=1, min_hits=3, iou_threshold=0.3, sparse=False):
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.iou_threshold = iou_threshold
+        # Even the pairs which do not overlap are feasible with iou_threshold <= 0
+        self.sparse = sparse and iou_threshold > 0
+        self.tracks = KalmanBoxStore()
+        self.frame_count = 0
+
+    def __predict__(self):
+        pos = self.tracks.predict()
+        trks = np.zeros((len(pos), 5), dtype=np.float32)
+        trks[:, :4] = pos
+        # Same as Sort: the NaN tracks are removed, and only the finite rows are matched
+        nan = np.isnan(trks).any(axis=1)
+        finite = np.isfinite(trks).all(axis=1)
+        trks = trks[finite]
+        if nan.any(): self.tracks.keep(~nan)
+        return trks
+
+    def __associate__(self, dets, trks):
+        if self.sparse:
+            return associateSparse(dets, trks, self.iou_threshold)
+        return associate_detections_to_trackers(dets, trks, self.iou_threshold)
+
+    def __isReturned__(self, indices):
+        tracks = self.tracks
+        return ((tracks.time_since_update[indices] < 1) & 
+                ((tracks.hit_streak[indices] >= self.min_hits) | (self.frame_count <= self.min_hits)))
+
+    def update(self, dets=np.empty((0, 5))):
+        """
+        Same as :code:`Sort.update()`.
+        """
+        self.frame_count += 1
+        trks = self.__predict__()
+        matched, unmatched_dets, _ = self.__associate__(dets, trks)
+        self.tracks.update(matched[:, 1], dets[matched[:, 0]])
+        self.tracks.add(dets[unmatched_dets])
+        # Sort returns the tracks in the reverse order
+        indices = np.arange(len(self.tracks))[::-1]
+        indices = indices[self.__isReturned__(indices)]
+        ret = np.concatenate([self.tracks.getStates()[indices], (self.tracks.ids[indices] + 1)[:, None]], axis=1)
+        self.tracks.keep(self.tracks.time_since_update <= self.max_age)
+        if len(ret) > 0:
+            return ret
+        return np.empty((0, 5))
+
+    def update_pyppbox(self, current_people):
+        """
+        Same as :code:`Sort.update_pyppbox()`, but a :class:`PeopleFrame` gives a new 
+        :class:`PeopleFrame` of the returned people.
+        """
+        self.frame_count += 1
+        if isinstance(current_people, PeopleFrame):
+            dets = current_people.getDets()
+        elif len(current_people) == 0:
+            dets = np.empty((0, 5), dtype=np.float32)
+        else:
+            dets = np.vstack([p.getDetRS() for p in current_people]).astype(np.float32, copy=False)
+        trks = self.__predict__()
+        matched, unmatched_dets, _ = self.__associate__(dets, trks)
+        self.tracks.update(matched[:, 1], dets[matched[:, 0]])
+        num_tracks = len(self.tracks)
+        new_ids = self.tracks.add(dets[unmatched_dets])
+        det_indices = np.concatenate([matched[:, 0], unmatched_dets]).astype(np.int64)
+        trk_indices = np.concatenate([matched[:, 1], np.arange(num_tracks, num_tracks + len(new_ids))]).astype(np.int64)
+        if isinstance(current_people, PeopleFrame):
+            current_people.cids[det_indices] = self.tracks.ids[trk_indices]
+            updated_people = current_people.select(det_indices[self.__isReturned__(trk_indices)])
+            self.tracks.keep(self.tracks.time_since_update <= self.max_age)
+            return updated_people
+        cids = self.tracks.ids[trk_indices].tolist()
+        returned = self.__isReturned__(trk_indices).tolist()
+        updated_people = []
+        for det_index, cid, is_returned in zip(det_indices.tolist(), cids, returned):
+            p = current_people[det_index]
+            p.cid = cid
+            if is_returned: updated_people.append(p)
+        self.tracks.keep(self.tracks.time_since_update <= self.max_age)
+        return updated_people
+
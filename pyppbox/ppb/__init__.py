@@ -135,6 +135,70 @@ def trainReIDClassifier(reider="", train_data="", classifier_pkl=""):
     """See :func:`pyppbox.ppb.mt.MT.trainReIDClassifier`"""
     _mt.trainReIDClassifier(reider=reider, train_data=train_data, classifier_pkl=classifier_pkl)
 
+def enrollIdentity(name, images, is_bgr=True):
+    """See :func:`pyppbox.ppb.mt.MT.enrollIdentity`"""
+    _mt.enrollIdentity(name, images, is_bgr=is_bgr)
+
+def removeIdentity(name):
+    """See :func:`pyppbox.ppb.mt.MT.removeIdentity`"""
+    _mt.removeIdentity(name)
+
+def reloadReIDClassifier():
+    """See :func:`pyppbox.ppb.mt.MT.reloadReIDClassifier`"""
+    _mt.reloadReIDClassifier()
+
+def setReIDCache(enable=True, ttl=30, max_size=256, iou_threshold=0.7, scale_threshold=0.2):
+    """See :func:`pyppbox.ppb.mt.MT.setReIDCache`"""
+    _mt.setReIDCache(enable=enable, 
+                     ttl=ttl, 
+                     max_size=max_size, 
+                     iou_threshold=iou_threshold, 
+                     scale_threshold=scale_threshold)
+
+def getReIDCacheStats():
+    """See :func:`pyppbox.ppb.mt.MT.getReIDCacheStats`"""
+    return _mt.getReIDCacheStats()
+
+def run(
+    source, 
+    sink=None, 
+    mode="throughput", 
+    queue_size=4, 
+    deduplicate=True, 
+    min_width_filter=15, 
+    alt_repspoint=False, 
+    alt_repspoint_top=True, 
+    max_frames=0
+):
+    """See :func:`pyppbox.ppb.mt.MT.run`"""
+    return _mt.run(source, 
+                   sink=sink, 
+                   mode=mode, 
+                   queue_size=queue_size, 
+                   deduplicate=deduplicate, 
+                   min_width_filter=min_width_filter, 
+                   alt_repspoint=alt_repspoint, 
+                   alt_repspoint_top=alt_repspoint_top, 
+                   max_frames=max_frames)
+
+def getRunStats():
+    """See :func:`pyppbox.ppb.mt.MT.getRunStats`"""
+    return _mt.getRunStats()
+
+def enableStats(enable=True, window=1000):
+    """See :func:`pyppbox.ppb.mt.MT.enableStats`"""
+    _mt.enableStats(enable=enable, window=window)
+
+def getStats():
+    """See :func:`pyppbox.ppb.mt.MT.getStats`"""
+    return _mt.getStats()
+
+def resetStats():
+    """See :func:`pyppbox.ppb.mt.MT.resetStats`"""
+    _mt.resetStats()
+
 __all__ = ['setConfigDir', 'setMainModules', 'forceFullGTMode', 'setMainDetector', 
            'getConfig', 'getMainConfig', 'detectPeople', 'setMainTracker', 'trackPeople', 
-           'setMainReIDer', 'reidPeople', 'trainReIDClassifier', 'MT']
+           'setMainReIDer', 'reidPeople', 'setReIDCache', 'getReIDCacheStats', 
+           'trainReIDClassifier', 'enrollIdentity', 'removeIdentity', 'reloadReIDClassifier', 
+           'run', 'getRunStats', 'enableStats', 'getStats', 'resetStats', 'MT']
@@ -0,0 +1,275 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+import time
+import queue
+import threading
+import numpy as np
+
+from collections import Counter, deque
+from typing import Any, Dict, Union
+
+from pyppbox.utils.logtools import add_info_log, add_error_log
+
+
+class DetectionRequest(object):
+
+    """A pending detection of one image, resolved by the batching thread.
+
+    :meta private:
+    """
+
+    def __init__(self, img, kwargs):
+        self.img = img
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+        self.submit_time = time.perf_counter()
+        self.done_time = None
+        self.__event__ = threading.Event()
+
+    def resolve(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.done_time = time.perf_counter()
+        self.__event__.set()
+
+    def wait(self, timeout=None, is_alive=None):
+        # Never block forever, a request is failed once the batching thread is gone
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.__event__.wait(0.1):
+            if is_alive is not None and not is_alive() and not self.__event__.is_set():
+                self.resolve(error=RuntimeError("DetectorBatcher is stopped."))
+            elif deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError(f"DetectorBatcher : No detection after {timeout} second(s).")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class DetectorBatcher(object):
+
+    """A batching front-end of a detector shared by several :class:`pyppbox.ppb.mt.MT` objects,
+    e.g. one per camera. The frames submitted by the callers within :obj:`window_ms` after the
+    first pending one, or up to :obj:`max_batch_size` frames, are detected together with one
+    batched :code:`predict()` of YOLO_Ultralytics or one :code:`cv2.dnn.blobFromImages()`
+    forward of YOLO_Classic, then the detected people are routed back to each caller.
+
+    Example:
+
+    >>> from pyppbox.standalone import MT
+    >>> from pyppbox.ppb.batching import DetectorBatcher
+    >>>
+    >>> batcher = DetectorBatcher("YOLO_Ultralytics", max_batch_size=8, window_ms=5.0)
+    >>> ppbmt = MT()
+    >>> ppbmt.setMainModules(main_yaml={'detector': 'None', 'tracker': 'SORT', 'reider': 'None'})
+    >>> ppbmt.setDetectorBatcher(batcher) # Do the same for the MT of every camera
+    >>> ...
+    >>> print(batcher.getStats())
+    >>> batcher.stop()
+    >>>
+
+    """
+
+    def __init__(
+        self,
+        detector: Union[str, Dict[str, Any], Any],
+        max_batch_size: int = 8,
+        window_ms: float = 5.0,
+        stats_size: int = 1000
+    ):
+        """Initialize and start the batching thread.
+
+        Parameters
+        ----------
+        detector : str or dict or MyYOLOCLS or MyYOLOULT
+            A supported name, a raw/ready dictionary, or a YAML/JSON file which is passed to
+            :meth:`pyppbox.ppb.mt.MT.setMainDetector()`, or a ready detector object. Only
+            YOLO_Classic and YOLO_Ultralytics are supported.
+        max_batch_size : int, default=8
+            Maximum number of frames in a batch.
+        window_ms : float, default=5.0
+            Maximum time in milliseconds to wait for more frames after the first pending one.
+        stats_size : int, default=1000
+            Number of the most recent requests and batches kept for the statistics.
+        """
+        from pyppbox.modules.detectors.yolocls import MyYOLOCLS
+        from pyppbox.modules.detectors.yoloult import MyYOLOULT
+        if not isinstance(detector, (MyYOLOCLS, MyYOLOULT)):
+            from pyppbox.ppb.mt import MT
+            mt = MT()
+            mt.setMainDetector(detector=detector)
+            detector = mt.__dt__
+        if not isinstance(detector, (MyYOLOCLS, MyYOLOULT)):
+            msg = "DetectorBatcher : __init__() -> Only YOLO_Classic and YOLO_Ultralytics are supported."
+            add_error_log(msg)
+            raise ValueError(msg)
+        if max_batch_size < 1:
+            msg = f"DetectorBatcher : __init__() -> max_batch_size={max_batch_size} must be >= 1."
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.detector = detector
+        self.max_batch_size = int(max_batch_size)
+        self.window_ms = float(window_ms)
+        self.__requests__ = queue.Queue()
+        self.__stats_lock__ = threading.Lock()
+        self.__latencies__ = deque(maxlen=stats_size)
+        self.__batch_sizes__ = deque(maxlen=stats_size)
+        self.__batch_times__ = deque(maxlen=stats_size)
+        self.__num_requests__ = 0
+        self.__num_batches__ = 0
+        self.__stop__ = threading.Event()
+        self.__submit_lock__ = threading.Lock()
+        self.__thread__ = threading.Thread(target=self.__loop__, daemon=True, name="ppb-batcher")
+        self.__thread__.start()
+        add_info_log(f"---PYPPBOX : DetectorBatcher started with max_batch_size={self.max_batch_size}, "
+                     f"window_ms={self.window_ms}")
+
+    def __collect__(self):
+        # Wait for the first request, then fill the batch until it is full or the window ends
+        try:
+            batch = [self.__requests__.get(timeout=0.05)]
+        except queue.Empty:
+            return []
+        deadline = batch[0].submit_time + self.window_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self.__requests__.get(timeout=remaining))
+                else:
+                    batch.append(self.__requests__.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def __loop__(self):
+        while not self.__stop__.is_set():
+            batch = self.__collect__()
+            if len(batch) == 0: continue
+            start = time.perf_counter()
+            try:
+                dets = self.detector.predictBatch([r.img for r in batch])
+            except Exception as e:
+                add_error_log(f"DetectorBatcher : predictBatch() -> {e}")
+                for r in batch: r.resolve(error=e)
+                continue
+            batch_time = time.perf_counter() - start
+            for r, det in zip(batch, dets):
+                try:
+                    r.resolve(result=self.detector.makePeople(r.img, det, **r.kwargs))
+                except Exception as e:
+                    r.resolve(error=e)
+            with self.__stats_lock__:
+                self.__num_requests__ += len(batch)
+                self.__num_batches__ += 1
+                self.__batch_sizes__.append(len(batch))
+                self.__batch_times__.append(batch_time)
+                self.__latencies__.extend([r.done_time - r.submit_time for r in batch])
+        # Never leave a caller waiting
+        while True:
+            try:
+                self.__requests__.get_nowait().resolve(error=RuntimeError("DetectorBatcher is stopped."))
+            except queue.Empty:
+                break
+
+    def detectPeople(self, img, visual=False, min_width_filter=15, alt_repspoint=False, alt_repspoint_top=True, 
+                     timeout=None):
+        """Submit an image and wait for its detected people, which is thread-safe and blocks
+        until the batch of the image is processed.
+
+        Parameters
+        ----------
+        img : Mat
+            A :obj:`Mat` like image.
+        visual : bool, default=False
+            An indication of whether to visualize the detected people.
+        min_width_filter : int, default=15
+            Minimum width filter of a detected person.
+        alt_repspoint : bool, default=False
+            An indication of whether to use the alternative :meth:`findRepspointBB`.
+        alt_repspoint_top : bool, default=True
+            A parameter passed to :obj:`prefer_top` of :meth:`findRepspointBB`.
+        timeout : float, default=None
+            Maximum time in seconds to wait for the detection before raising :obj:`TimeoutError`, 
+            or no limit if :code:`None`. A stopped batcher always raises :obj:`RuntimeError`.
+
+        Returns
+        -------
+        list[Person, ...]
+            A list of detected :class:`pyppbox.utils.persontools.Person` object.
+        Mat
+            A :obj:`Mat` like image.
+        """
+        request = DetectionRequest(img, {'visual': visual,
+                                         'min_width_filter': min_width_filter,
+                                         'alt_repspoint': alt_repspoint,
+                                         'alt_repspoint_top': alt_repspoint_top})
+        # Checked and queued under the lock of stop(), so the batching thread still answers it
+        with self.__submit_lock__:
+            if self.__stop__.is_set():
+                msg = "DetectorBatcher : detectPeople() -> The batcher is stopped."
+                add_error_log(msg)
+                raise RuntimeError(msg)
+            self.__requests__.put(request)
+        return request.wait(timeout=timeout, is_alive=self.__thread__.is_alive)
+
+    def getStats(self) -> Dict[str, Any]:
+        """Get the latency and batch-fill statistics of the most recent requests and batches.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`requests` and :code:`batches` (total counts),
+            :code:`mean_batch_size`, :code:`batch_fill` (mean batch size /
+            :attr:`max_batch_size`), :code:`batch_size_histogram`, :code:`mean_batch_ms`,
+            and the per-request latency :code:`latency_ms` as :code:`{'mean', 'p50', 'p95', 'max'}`.
+        """
+        with self.__stats_lock__:
+            latencies = 1000 * np.asarray(self.__latencies__, dtype=np.float64)
+            batch_sizes = np.asarray(self.__batch_sizes__, dtype=np.float64)
+            batch_times = 1000 * np.asarray(self.__batch_times__, dtype=np.float64)
+            histogram = dict(sorted(Counter(self.__batch_sizes__).items()))
+            num_requests = self.__num_requests__
+            num_batches = self.__num_batches__
+        mean_batch_size = float(batch_sizes.mean()) if batch_sizes.size > 0 else 0.0
+        latency_ms = {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        if latencies.size > 0:
+            latency_ms = {'mean': round(float(latencies.mean()), 3),
+                          'p50': round(float(np.percentile(latencies, 50)), 3),
+                          'p95': round(float(np.percentile(latencies, 95)), 3),
+                          'max': round(float(latencies.max()), 3)}
+        return {'requests': num_requests,
+                'batches': num_batches,
+                'mean_batch_size': round(mean_batch_size, 3),
+                'batch_fill': round(mean_batch_size / self.max_batch_size, 3),
+                'batch_size_histogram': histogram,
+                'mean_batch_ms': round(float(batch_times.mean()), 3) if batch_times.size > 0 else 0.0,
+                'latency_ms': latency_ms}
+
+    def stop(self):
+        """Stop the batching thread. The pending requests fail with :obj:`RuntimeError`.
+        """
+        with self.__submit_lock__:
+            self.__stop__.set()
+        self.__thread__.join()
+        add_info_log("---PYPPBOX : DetectorBatcher stopped.")
+
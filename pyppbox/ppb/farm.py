@@ -0,0 +1,291 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+import time
+import queue
+import signal
+import multiprocessing as mp
+
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from pyppbox.utils.logtools import add_info_log, add_warning_log, add_error_log
+
+
+PersonRecord = namedtuple(
+    'PersonRecord',
+    ['source', 'frame', 'cid', 'faceid', 'deepid', 'faceid_conf', 'deepid_conf',
+     'det_conf', 'repspoint', 'box_xyxy']
+)
+PersonRecord.__doc__ = """A compact and picklable record of a person, sent from a worker of
+:class:`MTFarm` to the parent process. :obj:`source` is the index of the source, :obj:`frame`
+is the frame index, :obj:`repspoint` is :code:`(x, y)`, and :obj:`box_xyxy` is
+:code:`(x1, y1, x2, y2)`."""
+
+
+def toPersonRecords(source, frame, people):
+    """
+    :meta private:
+    """
+    return [PersonRecord(source, frame, int(p.cid), str(p.faceid), str(p.deepid),
+                         float(p.faceid_conf), float(p.deepid_conf), float(p.det_conf),
+                         (int(p.repspoint[0]), int(p.repspoint[1])),
+                         tuple(int(v) for v in p.box_xyxy))
+            for p in people]
+
+def farmWorker(worker_id, main_yaml, config_dir, options, tasks, results, stop):
+    """
+    :meta private:
+    """
+    # The parent handles Ctrl-C and tells the workers to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import cv2
+    from pyppbox.ppb.mt import MT
+    try:
+        mt = MT(share_models=True)
+        if config_dir is not None: mt.setConfigDir(config_dir=config_dir, load_all=False)
+        mt.setMainModules(main_yaml=main_yaml)
+    except Exception as e:
+        results.put(('failed', worker_id, None, repr(e)))
+        return
+    results.put(('ready', worker_id, None, None))
+    while not stop.is_set():
+        try:
+            task = tasks.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if task is None: break
+        (source_index, source) = task
+        results.put(('started', worker_id, source_index, None))
+        frame_index = 0
+        cap = None
+        try:
+            mt.resetTracker()
+            cap = cv2.VideoCapture(source)
+            while cap.isOpened() and not stop.is_set():
+                hasFrame, frame = cap.read()
+                if not hasFrame: break
+                people, _ = mt.detectPeople(frame,
+                                            img_is_mat=True,
+                                            min_width_filter=options['min_width_filter'])
+                people = mt.trackPeople(frame, people, img_is_mat=True)
+                people, _ = mt.reidPeople(frame,
+                                          people,
+                                          deduplicate=options['deduplicate'],
+                                          img_is_mat=True)
+                results.put(('frame', worker_id, source_index,
+                             (frame_index, toPersonRecords(source_index, frame_index, people))))
+                frame_index += 1
+                if options['max_frames'] > 0 and frame_index >= options['max_frames']: break
+            results.put(('done', worker_id, source_index, frame_index))
+        except Exception as e:
+            results.put(('error', worker_id, source_index, repr(e)))
+        finally:
+            if cap is not None: cap.release()
+    results.put(('exit', worker_id, None, None))
+
+
+class MTFarm(object):
+
+    """A multi-process runner of many video or camera sources, which scales beyond the GIL-bound
+    multithreading of :class:`pyppbox.ppb.mt.MT`. It spawns :obj:`num_workers` processes, each
+    one owns an :class:`pyppbox.ppb.mt.MT` object built from the same main configurations and
+    loaded once. The sources are kept in a shared queue, so an idle worker always takes the
+    next pending source, and the people of every frame come back to the parent as compact
+    :class:`PersonRecord`. The workers use the :code:`spawn` start method, which is safe for
+    TF and torch, so the main script must be guarded by :code:`if __name__ == '__main__':`.
+
+    Example:
+
+    >>> from pyppbox.ppb.farm import MTFarm
+    >>>
+    >>> if __name__ == '__main__':
+    >>>     main_configs = {'detector': 'YOLO_Classic',
+    >>>                     'tracker': 'SORT',
+    >>>                     'reider': 'Torchreid'}
+    >>>     farm = MTFarm(main_configs, num_workers=4)
+    >>>     results = farm.run(["data/gta.mp4", "data/gta.mp4", "data/gta.mp4"])
+    >>>     for source_records in results:
+    >>>         print(len(source_records))
+    >>>     print(farm.getStats())
+    >>>
+
+    """
+
+    def __init__(
+        self,
+        main_yaml: Union[str, Dict[str, Any]],
+        num_workers: int = 2,
+        config_dir: Optional[str] = None,
+        deduplicate: bool = True,
+        min_width_filter: int = 15,
+        max_frames: int = 0,
+        shutdown_timeout: float = 10.0
+    ):
+        """Initialize a farm, the workers are spawned by :meth:`run()`.
+
+        Parameters
+        ----------
+        main_yaml : str or dict
+            A YAML/JSON file path, or a raw/ready dictionary of the main configurations, passed to
+            :meth:`pyppbox.ppb.mt.MT.setMainModules()` of every worker.
+        num_workers : int, default=2
+            Number of worker processes.
+        config_dir : str, default=None
+            A config directory passed to :meth:`pyppbox.ppb.mt.MT.setConfigDir()` of every worker,
+            or :code:`None` to use the internal config directory.
+        deduplicate : bool, default=True
+            Passed to :meth:`pyppbox.ppb.mt.MT.reidPeople()`.
+        min_width_filter : int, default=15
+            Passed to :meth:`pyppbox.ppb.mt.MT.detectPeople()`.
+        max_frames : int, default=0
+            Maximum number of frames processed for each source, or all the frames if :code:`0`.
+        shutdown_timeout : float, default=10.0
+            Seconds to wait for the workers to exit by themselves before terminating them.
+        """
+        if num_workers < 1:
+            msg = f"MTFarm : __init__() -> num_workers={num_workers} must be >= 1."
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.main_yaml = main_yaml
+        self.num_workers = int(num_workers)
+        self.config_dir = config_dir
+        self.options = {'deduplicate': deduplicate,
+                        'min_width_filter': min_width_filter,
+                        'max_frames': max_frames}
+        self.shutdown_timeout = shutdown_timeout
+        self.__stats__ = {}
+
+    def run(
+        self,
+        sources: List[Union[str, int]],
+        on_frame: Optional[Callable[[int, int, List[PersonRecord]], None]] = None
+    ) -> List[List[PersonRecord]]:
+        """Process all the :obj:`sources` and block until they are done, or until Ctrl-C which
+        stops the workers cleanly.
+
+        Parameters
+        ----------
+        sources : list[str or int, ...]
+            A list of video files, stream URLs, or camera indexes.
+        on_frame : Callable[[int, int, list[PersonRecord, ...]], None], default=None
+            A function called in the parent process with (source index, frame index, records)
+            as soon as a frame is processed. The records are not kept when it is set.
+
+        Returns
+        -------
+        list[list[PersonRecord, ...], ...]
+            The records of every source, in the same order as :obj:`sources`, or empty lists
+            when :obj:`on_frame` is set.
+        """
+        ctx = mp.get_context("spawn")
+        tasks = ctx.Queue()
+        results = ctx.Queue()
+        stop = ctx.Event()
+        records = [[] for _ in sources]
+        for task in enumerate(sources): tasks.put(task)
+        num_workers = min(self.num_workers, max(1, len(sources)))
+        for _ in range(num_workers): tasks.put(None)
+        workers = [ctx.Process(target=farmWorker,
+                               args=(i, self.main_yaml, self.config_dir, self.options, tasks, results, stop),
+                               name=f"ppb-farm-{i}",
+                               daemon=True)
+                   for i in range(num_workers)]
+        self.__stats__ = {'workers': num_workers,
+                          'sources': len(sources),
+                          'done': 0,
+                          'failed': 0,
+                          'frames': 0,
+                          'frames_per_worker': [0] * num_workers,
+                          'sources_per_worker': [0] * num_workers,
+                          'elapsed': 0.0,
+                          'fps': 0.0,
+                          'interrupted': False}
+        start = time.perf_counter()
+        for worker in workers: worker.start()
+        add_info_log(f"---PYPPBOX : MTFarm started {num_workers} workers for {len(sources)} sources.")
+        exited = 0
+        finished = 0
+        try:
+            while exited < num_workers and finished < len(sources):
+                try:
+                    (kind, worker_id, source_index, payload) = results.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers): break
+                    continue
+                if kind == 'frame':
+                    self.__stats__['frames'] += 1
+                    self.__stats__['frames_per_worker'][worker_id] += 1
+                    (frame_index, frame_records) = payload
+                    if on_frame is not None: on_frame(source_index, frame_index, frame_records)
+                    else: records[source_index].extend(frame_records)
+                elif kind == 'started':
+                    self.__stats__['sources_per_worker'][worker_id] += 1
+                elif kind == 'done':
+                    finished += 1
+                    self.__stats__['done'] += 1
+                elif kind == 'error':
+                    finished += 1
+                    self.__stats__['failed'] += 1
+                    add_warning_log(f"---PYPPBOX : MTFarm source {source_index} failed -> {payload}")
+                elif kind == 'failed':
+                    exited += 1
+                    add_error_log(f"MTFarm : run() -> Worker {worker_id} failed to start -> {payload}")
+                elif kind == 'exit':
+                    exited += 1
+        except KeyboardInterrupt:
+            self.__stats__['interrupted'] = True
+            add_info_log("---PYPPBOX : MTFarm interrupted, stopping the workers ...")
+        finally:
+            stop.set()
+            self.__shutdown__(workers, results)
+            elapsed = time.perf_counter() - start
+            self.__stats__['elapsed'] = round(elapsed, 3)
+            self.__stats__['fps'] = round(self.__stats__['frames'] / elapsed, 3) if elapsed > 0 else 0.0
+        add_info_log("---PYPPBOX : MTFarm finished.")
+        return records
+
+    def __shutdown__(self, workers, results):
+        # Keep draining so no worker blocks on a full pipe while exiting
+        deadline = time.perf_counter() + self.shutdown_timeout
+        while any(worker.is_alive() for worker in workers) and time.perf_counter() < deadline:
+            try:
+                results.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for worker in workers:
+            if worker.is_alive():
+                add_warning_log(f"---PYPPBOX : MTFarm terminating {worker.name}")
+                worker.terminate()
+            worker.join()
+
+    def getStats(self) -> Dict[str, Any]:
+        """Get the statistics of the last :meth:`run()`.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`workers`, :code:`sources`, :code:`done`, :code:`failed`,
+            :code:`frames`, :code:`frames_per_worker`, :code:`sources_per_worker`,
+            :code:`elapsed`, :code:`fps`, and :code:`interrupted`.
+        """
+        return dict(self.__stats__)
+
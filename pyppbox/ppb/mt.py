@@ -24,8 +24,9 @@ from pyppbox.utils.logtools import add_info_log, add_warning_log, add_error_log
 
 # Common
 import cv2
+import numpy as np
 from collections import Counter
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Callable, Dict, List, Union, Optional
 
 # Configurations
 from pyppbox.config.configtools import isDictString, getCFGDict
@@ -37,10 +38,13 @@ from pyppbox.config.myconfig import (
 )
 
 # Classes & tools
-from pyppbox.utils.persontools import Person
+from pyppbox.utils.persontools import Person, PeopleFrame, findFaceBoxKP
 from pyppbox.utils.gttools import GTInterpreter
 from pyppbox.utils.evatools import NothingDetecter, NothingTracker, NothingReider, TKOReider
 from pyppbox.utils.commontools import getAbsPathFDS, isExist, getCVMat, getAncestorDir
+from pyppbox.utils.stattools import MyStats, getNullStats
+from pyppbox.utils.cachetools import ReIDCache
+from pyppbox.ppb.pipeline import StreamRunner
 
 
 __none_cfg__ = NoneCFG("Fiat Moneey")
@@ -58,7 +62,7 @@ class MT(object):
     >>> from pyppbox.standalone import MT
     >>> 
     >>> def ppb_task(input, main_configs, name="Task"):
-    >>>     ppbmt = MT() # Use `MT` for multithreading
+    >>>     ppbmt = MT(share_models=True) # Use `MT` for multithreading, and share the same loaded models
     >>>     ppbmt.setMainModules(main_yaml=main_configs)
     >>>     cap = cv2.VideoCapture(input)
     >>>     while cap.isOpened():
@@ -102,7 +106,20 @@ class MT(object):
 
     """
 
-    def __init__(self):
+    def __init__(self, share_models: bool = False):
+        """Initialize an :class:`MT` object.
+
+        Parameters
+        ----------
+        share_models : bool, default=False
+            An indication of whether to share the loaded models of the detector, the tracker, and 
+            the reider with the other :class:`MT` objects of the same process loading the same models 
+            through :class:`pyppbox.utils.registrytools.ModelRegistry`, which saves memory and 
+            loading time when running many :class:`MT` objects in a multithreading application. 
+            The inference on a shared model is thread-safe, while the tracker state and the 
+            classifier remain private to each :class:`MT` object.
+        """
+        self.__share_models__ = share_models
         # config
         self.__cfg__ = MyConfigurator()
         self.__unistrings__ = self.__cfg__.unified_strings
@@ -111,6 +128,7 @@ class MT(object):
         self.__dt_is_set__ = False
         self.__dt_cfg__ = __none_cfg__
         self.__dt__ = None
+        self.__dt_batcher__ = None
         # tracker
         self.__tk_is_set__ = False
         self.__tk_cfg__ = __none_cfg__
@@ -121,6 +139,16 @@ class MT(object):
         self.__ri__ = None
         self.__deepidlistTMP__ = []
         self.__faceidlistTMP__ = []
+        self.__ri_cache__ = None
+        self.__ri_cache_tk__ = None
+        self.__ri_cache_ri__ = None
+        self.__ri_cache_unknowns__ = set()
+        self.__reid_frame__ = 0
+        self.__ri_features__ = {}
+        # streaming
+        self.__runner__ = None
+        # statistics
+        self.__stats__ = getNullStats()
 
 
     ###########################################
@@ -306,12 +334,12 @@ class MT(object):
             if self.__cfg__.mcfg.detector.lower() == self.__unistrings__.yolo_cls:
                 from pyppbox.modules.detectors.yolocls import MyYOLOCLS
                 self.__dt_cfg__ = self.__cfg__.dcfg_yolocs
-                self.__dt__ = MyYOLOCLS(self.__dt_cfg__)
+                self.__dt__ = MyYOLOCLS(self.__dt_cfg__, shared=self.__share_models__)
                 self.__dt_is_set__ = True
             elif self.__cfg__.mcfg.detector.lower() == self.__unistrings__.yolo_ult:
                 from pyppbox.modules.detectors.yoloult import MyYOLOULT
                 self.__dt_cfg__ = self.__cfg__.dcfg_yolout
-                self.__dt__ = MyYOLOULT(self.__dt_cfg__)
+                self.__dt__ = MyYOLOULT(self.__dt_cfg__, shared=self.__share_models__)
                 self.__dt_is_set__ = True
             elif self.__cfg__.mcfg.detector.lower() == self.__unistrings__.gt:
                 self.__dt_cfg__ = self.__cfg__.dcfg_gt
@@ -334,14 +362,14 @@ class MT(object):
                 from pyppbox.modules.detectors.yolocls import MyYOLOCLS
                 self.__dt_cfg__ = DCFGYOLOCLS()
                 self.__dt_cfg__.set(detector_dict)
-                self.__dt__ = MyYOLOCLS(self.__dt_cfg__)
+                self.__dt__ = MyYOLOCLS(self.__dt_cfg__, shared=self.__share_models__)
                 self.__dt_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set detector='{self.__dt_cfg__.dt_name}'")
             elif detector_dict['dt_name'].lower() == self.__unistrings__.yolo_ult:
                 from pyppbox.modules.detectors.yoloult import MyYOLOULT
                 self.__dt_cfg__ = DCFGYOLOULT()
                 self.__dt_cfg__.set(detector_dict)
-                self.__dt__ = MyYOLOULT(self.__dt_cfg__)
+                self.__dt__ = MyYOLOULT(self.__dt_cfg__, shared=self.__share_models__)
                 self.__dt_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set detector='{self.__dt_cfg__.dt_name}'")
             elif detector_dict['dt_name'].lower() == self.__unistrings__.gt:
@@ -399,7 +427,7 @@ class MT(object):
                 if not self.__cfg_is_set__: self.setConfigDir()
                 self.__cfg__.setAllDCFG()
                 self.__dt_cfg__ = self.__cfg__.dcfg_yolocs
-                self.__dt__ = MyYOLOCLS(self.__dt_cfg__)
+                self.__dt__ = MyYOLOCLS(self.__dt_cfg__, shared=self.__share_models__)
                 self.__dt_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set detector='{detector}'")
             elif detector.lower() == self.__unistrings__.yolo_ult:
@@ -407,7 +435,7 @@ class MT(object):
                 if not self.__cfg_is_set__: self.setConfigDir()
                 self.__cfg__.setAllDCFG()
                 self.__dt_cfg__ = self.__cfg__.dcfg_yolout
-                self.__dt__ = MyYOLOULT(self.__dt_cfg__)
+                self.__dt__ = MyYOLOULT(self.__dt_cfg__, shared=self.__share_models__)
                 self.__dt_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set detector='{detector}'")
             elif detector.lower() == self.__unistrings__.gt:
@@ -468,30 +496,60 @@ class MT(object):
             A :obj:`Mat` like image.
         """ 
         people = []
-        if self.__dt_is_set__: 
+        if self.__dt_batcher__ is not None:
+            if not img_is_mat: img = getCVMat(img)
+            with self.__stats__.timer("detect"):
+                people, img = self.__dt_batcher__.detectPeople(img, 
+                                                               visual=visual, 
+                                                               min_width_filter=min_width_filter, 
+                                                               alt_repspoint=alt_repspoint, 
+                                                               alt_repspoint_top=alt_repspoint_top)
+            self.__stats__.observe("detect.people_per_frame", len(people))
+            if save: self.__saveDetectionImage__(img, save_file)
+        elif self.__dt_is_set__: 
             if not isinstance(self.__dt__, NothingDetecter):
                 if not img_is_mat: img = getCVMat(img)
-                if (self.__dt_cfg__.dt_name.lower() == self.__unistrings__.yolo_cls or 
-                    self.__dt_cfg__.dt_name.lower() == self.__unistrings__.yolo_ult):
-                    people, img = self.__dt__.detectPeople(img, 
-                                                           visual=visual, 
-                                                           min_width_filter=min_width_filter, 
-                                                           alt_repspoint=alt_repspoint, 
-                                                           alt_repspoint_top=alt_repspoint_top)
-                elif self.__dt_cfg__.dt_name.lower() == self.__unistrings__.gt:
-                    people, img = self.__dt__.getPeople(img, visual=visual)
-                if save:
-                    if isExist(getAncestorDir(str(save_file))):
-                        filename = getAbsPathFDS(str(save_file))
-                        cv2.imwrite(filename=filename, img=img)
-                    else:
-                        msg = (f"PYPPBOX : detectPeople() -> save_file='{save_file}' is not valid.")
-                        add_error_log(msg)
-                        raise ValueError(msg)
+                self.__syncStats__(self.__dt__)
+                with self.__stats__.timer("detect"):
+                    if (self.__dt_cfg__.dt_name.lower() == self.__unistrings__.yolo_cls or 
+                        self.__dt_cfg__.dt_name.lower() == self.__unistrings__.yolo_ult):
+                        people, img = self.__dt__.detectPeople(img, 
+                                                               visual=visual, 
+                                                               min_width_filter=min_width_filter, 
+                                                               alt_repspoint=alt_repspoint, 
+                                                               alt_repspoint_top=alt_repspoint_top)
+                    elif self.__dt_cfg__.dt_name.lower() == self.__unistrings__.gt:
+                        people, img = self.__dt__.getPeople(img, visual=visual)
+                self.__stats__.observe("detect.people_per_frame", len(people))
+                if save: self.__saveDetectionImage__(img, save_file)
         else:
             add_warning_log("---PYPPBOX : detectPeople() -> The main detector is not set.")
         return people, img
 
+    def __saveDetectionImage__(self, img, save_file):
+        if isExist(getAncestorDir(str(save_file))):
+            filename = getAbsPathFDS(str(save_file))
+            cv2.imwrite(filename=filename, img=img)
+        else:
+            msg = (f"PYPPBOX : detectPeople() -> save_file='{save_file}' is not valid.")
+            add_error_log(msg)
+            raise ValueError(msg)
+
+    def setDetectorBatcher(self, batcher=None):
+        """Route :func:`detectPeople()` to a :class:`pyppbox.ppb.batching.DetectorBatcher` shared 
+        with other :class:`MT` objects, so the frames of several cameras are detected in batches. 
+        The main detector is ignored while a batcher is set.
+
+        Parameters
+        ----------
+        batcher : DetectorBatcher, default=None
+            A ready :class:`pyppbox.ppb.batching.DetectorBatcher` object, or :code:`None` to go 
+            back to the main detector.
+        """
+        self.__dt_batcher__ = batcher
+        if batcher is None: add_info_log("---PYPPBOX : Detector batcher is unset.")
+        else: add_info_log("---PYPPBOX : Detector batcher is set.")
+
 
     ###########################################
     # Tracker
@@ -514,7 +572,7 @@ class MT(object):
             elif self.__cfg__.mcfg.tracker.lower() == self.__unistrings__.deepsort:
                 from pyppbox.modules.trackers.deepsort import MyDeepSORT
                 self.__tk_cfg__ = self.__cfg__.tcfg_deepsort
-                self.__tk__ = MyDeepSORT(self.__tk_cfg__)
+                self.__tk__ = MyDeepSORT(self.__tk_cfg__, shared=self.__share_models__)
                 self.__tk_is_set__ = True
                 self.__setGTDTOnly__()
             elif self.__cfg__.mcfg.tracker.lower() == self.__unistrings__.none:
@@ -549,7 +607,7 @@ class MT(object):
                 from pyppbox.modules.trackers.deepsort import MyDeepSORT
                 self.__tk_cfg__ = TCFGDeepSORT()
                 self.__tk_cfg__.set(tracker_dict)
-                self.__tk__ = MyDeepSORT(self.__tk_cfg__)
+                self.__tk__ = MyDeepSORT(self.__tk_cfg__, shared=self.__share_models__)
                 self.__tk_is_set__ = True
                 self.__setGTDTOnly__()
                 add_info_log(f"---PYPPBOX : Set tracker='{self.__tk_cfg__.tk_name}'")
@@ -616,7 +674,7 @@ class MT(object):
                 if not self.__cfg_is_set__: self.setConfigDir()
                 self.__cfg__.setAllTCFG()
                 self.__tk_cfg__ = self.__cfg__.tcfg_deepsort
-                self.__tk__ = MyDeepSORT(self.__tk_cfg__)
+                self.__tk__ = MyDeepSORT(self.__tk_cfg__, shared=self.__share_models__)
                 self.__tk_is_set__ = True
                 self.__setGTDTOnly__()
                 add_info_log(f"---PYPPBOX : Set tracker='{tracker}'")
@@ -630,6 +688,26 @@ class MT(object):
         else:
             add_warning_log(f"---PYPPBOX : tracker='{tracker}' is not recognized.")
 
+    def resetTracker(self):
+        """Reset the state of the main tracker, e.g. before tracking people in a new video, by 
+        creating a new tracker with the same configurations. The shared models of 
+        :obj:`share_models=True` are kept loaded.
+        """
+        if self.__tk_is_set__:
+            old_tracker = self.__tk__
+            if self.__tk_cfg__.tk_name.lower() == self.__unistrings__.centroid:
+                from pyppbox.modules.trackers.centroid import MyCentroid
+                self.__tk__ = MyCentroid(self.__tk_cfg__)
+            elif self.__tk_cfg__.tk_name.lower() == self.__unistrings__.sort:
+                from pyppbox.modules.trackers.sort import MySORT
+                self.__tk__ = MySORT(self.__tk_cfg__)
+            elif self.__tk_cfg__.tk_name.lower() == self.__unistrings__.deepsort:
+                from pyppbox.modules.trackers.deepsort import MyDeepSORT
+                self.__tk__ = MyDeepSORT(self.__tk_cfg__, shared=self.__share_models__)
+            del old_tracker
+        else:
+            add_warning_log("---PYPPBOX : resetTracker() -> The main tracker is not set.")
+
     def trackPeople(self, img, people, img_is_mat=False):
         """Track people by giving an image and a list of detected people. :func:`setConfigDir()` 
         or :func:`setMainTracker()` must be called in advance.
@@ -638,23 +716,31 @@ class MT(object):
         ----------
         img : str or Mat
             Set an image file or a :obj:`Mat` like image.
-        people : list[Person, ...]
-            Set a list of :class:`pyppbox.utils.persontools.Person` object which stores the detected 
-            people in the input :obj:`img`.
+        people : list[Person, ...] or PeopleFrame
+            Set a list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame`, which stores the detected people in 
+            the input :obj:`img`.
         img_is_mat : bool, default=False
             Speed up the function by telling whether the :obj:`img` is :obj:`Mat` like image.
         
         Returns
         -------
-        list[Person, ...]
-            A list of :class:`pyppbox.utils.persontools.Person` object which stores people with 
-            updated IDs.
+        list[Person, ...] or PeopleFrame
+            A list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame` if :obj:`people` is one, which stores 
+            people with updated IDs.
         """
-        res = []
+        res = people.select([]) if isinstance(people, PeopleFrame) else []
         if self.__tk_is_set__: 
-            if isinstance(people, list):
+            if isinstance(people, (list, PeopleFrame)):
                 if not img_is_mat: img = getCVMat(img)
-                res = self.__tk__.update(people, img=img)
+                self.__syncStats__(self.__tk__)
+                self.__ri_features__ = {}
+                if getattr(self.__tk__, 'feature_source', None) == 'reider':
+                    with self.__stats__.timer("track.features"):
+                        self.__shareDeepFeatures__(img, people)
+                with self.__stats__.timer("track"):
+                    res = self.__tk__.update(people, img=img)
             else:
                 msg = "PYPPBOX : trackPeople() -> Input 'people' is not correct."
                 add_error_log(msg)
@@ -663,6 +749,34 @@ class MT(object):
             add_warning_log("---PYPPBOX : trackPeople() -> The main tracker is not set.")
         return res
 
+    def __shareDeepFeatures__(self, img, people):
+        # Extract the body features once for both DeepSORT and Torchreid
+        if not self.__ri_is_set__ or self.__ri_cfg__.ri_name.lower() != self.__unistrings__.torchreid:
+            msg = "PYPPBOX : trackPeople() -> DeepSORT feature_source='ReIDer' requires the main reider Torchreid."
+            add_error_log(msg)
+            raise ValueError(msg)
+        indices = []
+        miniframes = []
+        for index, person in enumerate(people):
+            miniframe = self.__cropDeepMiniframe__(img, person, "trackPeople")
+            if miniframe is not None:
+                indices.append(index)
+                miniframes.append(miniframe)
+        if len(miniframes) > 0:
+            self.__syncStats__(self.__ri__)
+            features = self.__ri__.extractFeatures(miniframes, is_bgr=True)
+            for index, feature in zip(indices, features):
+                people[index].feature = feature
+                # Keyed by the feature itself, which the dict keeps alive, as the people of a 
+                # PeopleFrame are views made on demand
+                self.__ri_features__[id(feature)] = feature
+
+    def __getSharedFeature__(self, person):
+        # The feature is reused only if it is still the one extracted by the main reider
+        feature = person.feature
+        if feature is not None and self.__ri_features__.get(id(feature), None) is feature: return feature
+        return None
+
 
     ###########################################
     # REIDer
@@ -673,13 +787,13 @@ class MT(object):
             if self.__cfg__.mcfg.reider.lower() == self.__unistrings__.facenet:
                 from pyppbox.modules.reiders.facenet import MyFaceNet
                 self.__ri_cfg__ = self.__cfg__.rcfg_facenet
-                self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=auto_load)
+                self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=auto_load, shared=self.__share_models__)
                 self.__ri_is_set__ = True
                 self.__setGTDTOnly__()
             elif self.__cfg__.mcfg.reider.lower() == self.__unistrings__.torchreid:
                 from pyppbox.modules.reiders.torchreid import MyTorchreid
                 self.__ri_cfg__ = self.__cfg__.rcfg_torchreid
-                self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=auto_load)
+                self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=auto_load, shared=self.__share_models__)
                 self.__ri_is_set__ = True
                 self.__setGTDTOnly__()
             elif self.__cfg__.mcfg.reider.lower() == self.__unistrings__.none:
@@ -703,7 +817,7 @@ class MT(object):
                 from pyppbox.modules.reiders.facenet import MyFaceNet
                 self.__ri_cfg__ = RCFGFaceNet()
                 self.__ri_cfg__.set(reider_dict)
-                self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=auto_load)
+                self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=auto_load, shared=self.__share_models__)
                 self.__ri_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set reider='{self.__ri_cfg__.ri_name}'")
                 self.__setGTDTOnly__()
@@ -711,7 +825,7 @@ class MT(object):
                 from pyppbox.modules.reiders.torchreid import MyTorchreid
                 self.__ri_cfg__ = RCFGTorchreid()
                 self.__ri_cfg__.set(reider_dict)
-                self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=auto_load)
+                self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=auto_load, shared=self.__share_models__)
                 self.__ri_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set reider='{self.__ri_cfg__.ri_name}'")
                 self.__setGTDTOnly__()
@@ -776,7 +890,7 @@ class MT(object):
                 if not self.__cfg_is_set__: self.setConfigDir()
                 self.__cfg__.setAllRCFG()
                 self.__ri_cfg__ = self.__cfg__.rcfg_facenet
-                self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=auto_load)
+                self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=auto_load, shared=self.__share_models__)
                 self.__ri_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set reider='{reider}'")
                 self.__setGTDTOnly__()
@@ -785,7 +899,7 @@ class MT(object):
                 if not self.__cfg_is_set__: self.setConfigDir()
                 self.__cfg__.setAllRCFG()
                 self.__ri_cfg__ = self.__cfg__.rcfg_torchreid
-                self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=auto_load)
+                self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=auto_load, shared=self.__share_models__)
                 self.__ri_is_set__ = True
                 add_info_log(f"---PYPPBOX : Set reider='{reider}'")
                 self.__setGTDTOnly__()
@@ -812,9 +926,10 @@ class MT(object):
         ----------
         img : str or Mat
             Set an image file or a :obj:`Mat` like image.
-        people : list[Person, ...]
-            Set a list of :class:`pyppbox.utils.persontools.Person` object which stores 
-            the detected or tracked people in the input :obj:`img`.
+        people : list[Person, ...] or PeopleFrame
+            Set a list of :class:`pyppbox.utils.persontools.Person` object, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame`, which stores the detected or tracked 
+            people in the input :obj:`img`.
         deduplicate : bool, default=True
             Indicate whether to re-reid people who have the same face ids or deep ids.
         img_is_mat : bool, default=False
@@ -822,25 +937,33 @@ class MT(object):
         
         Returns
         -------
-        list[Person, ...]
-            A list of :class:`pyppbox.utils.persontools.Person` object which stores people 
-            with the updated IDs.
+        list[Person, ...] or PeopleFrame
+            A list of :class:`pyppbox.utils.persontools.Person` object, or the given 
+            :class:`pyppbox.utils.persontools.PeopleFrame`, which stores people with the updated IDs.
         tuple(int, int)
             A tuple of (ReID count, ReID deduplicate count).
         """
-        res = []
+        res = people.select([]) if isinstance(people, PeopleFrame) else []
         reid_count = [0, 0]
         if self.__ri_is_set__:
             if self.__ri_cfg__.ri_name.lower() != self.__unistrings__.none:
                 if not self.__ri__.auto_load:
                     self.__ri__.load_classifier()
                     self.__ri__.auto_load = True
-            if isinstance(people, list):
+            if isinstance(people, (list, PeopleFrame)):
                 if len(people) > 0:
                     if isinstance(people[0], Person):
                         if not img_is_mat: img = getCVMat(img)
-                        res, reid_count[0] = self.__reidNormal__(img, people)
-                        if deduplicate: res, reid_count[1] = self.__reidDupkiller__(img, res)
+                        self.__syncStats__(self.__ri__)
+                        self.__reid_frame__ += 1
+                        self.__ri_cache_unknowns__.clear()
+                        with self.__stats__.timer("reid"):
+                            res, reid_count[0] = self.__reidNormal__(img, people)
+                        if deduplicate: 
+                            with self.__stats__.timer("reid.dedup"):
+                                res, reid_count[1] = self.__reidDupkiller__(img, res)
+                        self.__stats__.count("reid.calls", reid_count[0])
+                        self.__stats__.count("reid.dedup_calls", reid_count[1])
                     else:
                         msg = "PYPPBOX : reidPeople() -> Input 'people' has unsupported element."
                         add_error_log(msg)
@@ -879,74 +1002,128 @@ class MT(object):
         return people, 0
 
     def __reidDeepNormal__(self, img, people):
-        reid_count = 0
+        use_cache = self.__isReIDCacheOn__()
         index = 0
+        indices = []
+        miniframes = []
+        feature_indices = []
+        features = []
         self.__deepidlistTMP__ = []
         for person in people:
             deepid = person.deepid
             if self.__unistrings__.err_did in deepid or self.__unistrings__.unk_did in deepid:
-                miniframe = img.copy()
-                try:
-                    [x1, y1, x2, y2] = person.box_xyxy
-                    miniframe = miniframe[y1:y2, x1:x2]
-                    people[index].deepid, people[index].deepid_conf = self.__ri__.recognize(
-                        cv2.resize(miniframe, self.__ri_cfg__.model_wh), 
-                        is_bgr=True
-                    )
-                    reid_count += 1
-                except Exception as e:
-                    add_warning_log(f"---PYPPBOX : __reidDeepNormal__() -> {e}")
+                if not (use_cache and self.__reidFromCache__(person, face=False)):
+                    feature = self.__getSharedFeature__(person)
+                    if feature is not None:
+                        feature_indices.append(index)
+                        features.append(feature)
+                    else:
+                        miniframe = self.__cropDeepMiniframe__(img, person, "__reidDeepNormal__")
+                        if miniframe is not None:
+                            indices.append(index)
+                            miniframes.append(miniframe)
             self.__deepidlistTMP__.append(deepid)
             index += 1
+        reid_count = self.__recognizeDeepBatch__(people, indices, miniframes, "__reidDeepNormal__")
+        reid_count += self.__recognizeDeepBatch__(people, feature_indices, None, "__reidDeepNormal__", 
+                                                  features=features)
         return people, reid_count
 
     def __reidDupDeepkiller__(self, img, people):
         reid_count = 0
         if len(self.__deepidlistTMP__) != len(set(self.__deepidlistTMP__)):
             ddeepids = [k for k, v in Counter(self.__deepidlistTMP__).items() if v > 1]
-            for ddeepid in ddeepids:
-                index = 0
-                for person in people:
-                    try:
-                        if person.deepid == ddeepid:
-                            [x1, y1, x2, y2] = person.box_xyxy
-                            miniframe = img.copy()
-                            miniframe = miniframe[y1:y2, x1:x2]
-                            people[index].deepid, people[index].deepid_conf = self.__ri__.recognize(
-                                cv2.resize(miniframe, self.__ri_cfg__.model_wh), 
-                                is_bgr=True
-                            )
-                            reid_count += 1
-                    except Exception as e:
-                        add_warning_log(f"---PYPPBOX : __reidDupDeepkiller__() -> {e}")
-                    index += 1
+            index = 0
+            indices = []
+            miniframes = []
+            feature_indices = []
+            features = []
+            for person in people:
+                if person.deepid in ddeepids and id(person) not in self.__ri_cache_unknowns__:
+                    feature = self.__getSharedFeature__(person)
+                    if feature is not None:
+                        feature_indices.append(index)
+                        features.append(feature)
+                    else:
+                        miniframe = self.__cropDeepMiniframe__(img, person, "__reidDupDeepkiller__")
+                        if miniframe is not None:
+                            indices.append(index)
+                            miniframes.append(miniframe)
+                index += 1
+            reid_count = self.__recognizeDeepBatch__(people, indices, miniframes, "__reidDupDeepkiller__")
+            reid_count += self.__recognizeDeepBatch__(people, feature_indices, None, "__reidDupDeepkiller__", 
+                                                      features=features)
         return people, reid_count
 
-    def __reidFaceNormal__(self, img, people):
+    def __cropDeepMiniframe__(self, img, person, caller):
+        # Crop a view (no copy of the whole frame) and resize it to the model input
+        try:
+            [x1, y1, x2, y2] = person.box_xyxy
+            return cv2.resize(img[y1:y2, x1:x2], self.__ri_cfg__.model_wh)
+        except Exception as e:
+            self.__stats__.count("reid.exceptions")
+            add_warning_log(f"---PYPPBOX : {caller}() -> {e}")
+            return None
+
+    def __recognizeDeepBatch__(self, people, indices, miniframes, caller, features=None):
+        # Re-identify all the cropped people of a frame in one single batch, or only classify 
+        # their features when they are already extracted
         reid_count = 0
+        if len(indices) > 0:
+            try:
+                if features is None: 
+                    features = self.__ri__.extractFeatures(miniframes, is_bgr=True)
+                results = self.__ri__.recognizeFeatures(np.asarray(features))
+            except Exception as e:
+                self.__stats__.count("reid.exceptions")
+                add_warning_log(f"---PYPPBOX : {caller}() -> {e}")
+                # Fall back to one person at a time so a bad crop does not fail the others
+                if miniframes is None: miniframes = [None] * len(indices)
+                if features is None: features = [None] * len(indices)
+                (results, features) = zip(*[self.__recognizeDeep__(miniframe, feature, caller) 
+                                            for miniframe, feature in zip(miniframes, features)])
+            use_cache = self.__isReIDCacheOn__()
+            for index, result, embedding in zip(indices, results, features):
+                if result is None: continue
+                (deepid, deepid_conf) = result
+                if use_cache:
+                    self.__ri_cache__.put(people[index].cid, people[index].box_xyxy, 
+                                          deepid, deepid_conf, self.__reid_frame__, embedding=embedding)
+                people[index].deepid, people[index].deepid_conf = deepid, deepid_conf
+                reid_count += 1
+        return reid_count
+
+    def __recognizeDeep__(self, miniframe, feature, caller):
+        try:
+            if feature is None:
+                (results, features) = self.__ri__.recognizeBatch([miniframe], is_bgr=True, 
+                                                                 return_embeddings=True)
+                return results[0], features[0]
+            return self.__ri__.recognizeFeatures(np.asarray([feature]))[0], feature
+        except Exception as e:
+            self.__stats__.count("reid.exceptions")
+            add_warning_log(f"---PYPPBOX : {caller}() -> {e}")
+            return None, None
+
+    def __reidFaceNormal__(self, img, people):
+        use_cache = self.__isReIDCacheOn__()
         index = 0
+        indices = []
+        miniframes = []
+        face_boxes = []
         self.__faceidlistTMP__ = []
         for person in people:
             faceid = person.faceid
             if self.__unistrings__.err_fid in faceid or self.__unistrings__.unk_fid in faceid:
-                (x, y) = person.repspoint
-                miniframe = img.copy()
-                try:
-                    miniframe = miniframe[
-                        y + int(self.__cfg__.rcfg_facenet.yl_h_calibration[0]):
-                        y + int(self.__cfg__.rcfg_facenet.yl_h_calibration[1]), 
-                        x + int(self.__cfg__.rcfg_facenet.yl_w_calibration[0]):
-                        x + int(self.__cfg__.rcfg_facenet.yl_w_calibration[1])
-                    ]
-                    people[index].faceid, people[index].faceid_conf = self.__ri__.recognize(
-                        miniframe, 
-                        is_bgr=True
-                    )
-                    reid_count += 1
-                except Exception as e:
-                    add_warning_log(f"---PYPPBOX : __reidFaceNormal__() -> {e}")
+                if not (use_cache and self.__reidFromCache__(person, face=True)):
+                    miniframe, face_box = self.__cropFaceMiniframe__(img, person, "__reidFaceNormal__")
+                    if miniframe is not None:
+                        indices.append(index)
+                        miniframes.append(miniframe)
+                        face_boxes.append(face_box)
             self.__faceidlistTMP__.append(faceid)
             index += 1
+        reid_count = self.__recognizeFaceBatch__(people, indices, miniframes, face_boxes, "__reidFaceNormal__")
         return people, reid_count
 
     def __reidDupFacekiller__(self, img, people):
@@ -955,27 +1132,169 @@ class MT(object):
             dfaceids = [k for k, v in Counter(self.__faceidlistTMP__).items() if v > 1]
             for dfaceid in dfaceids:
                 index = 0
+                indices = []
+                miniframes = []
+                face_boxes = []
                 for person in people:
-                    try:
-                        if person.faceid == dfaceid:
-                            (x, y) = person.repspoint
-                            miniframe = img.copy()
-                            miniframe = miniframe[
-                                y + int(self.__cfg__.rcfg_facenet.yl_h_calibration[0]):
-                                y + int(self.__cfg__.rcfg_facenet.yl_h_calibration[1]), 
-                                x + int(self.__cfg__.rcfg_facenet.yl_w_calibration[0]):
-                                x + int(self.__cfg__.rcfg_facenet.yl_w_calibration[1])
-                            ]
-                            people[index].faceid, people[index].faceid_conf = self.__ri__.recognize(
-                                miniframe, 
-                                is_bgr=True
-                            )
-                            reid_count += 1
-                    except Exception as e:
-                        add_warning_log(f"---PYPPBOX : __reidDupFacekiller__() -> {e}")
+                    if person.faceid == dfaceid and id(person) not in self.__ri_cache_unknowns__:
+                        miniframe, face_box = self.__cropFaceMiniframe__(img, person, "__reidDupFacekiller__")
+                        if miniframe is not None:
+                            indices.append(index)
+                            miniframes.append(miniframe)
+                            face_boxes.append(face_box)
                     index += 1
+                reid_count += self.__recognizeFaceBatch__(people, indices, miniframes, face_boxes, 
+                                                          "__reidDupFacekiller__")
         return people, reid_count
 
+    def __cropFaceMiniframe__(self, img, person, caller):
+        # Crop a view (no copy of the whole frame), the reider converts it to a new RGB image
+        try:
+            face_box = self.__findFaceBoxKP__(img, person)
+            if face_box is not None:
+                [x1, y1, x2, y2] = face_box
+                self.__stats__.count("reid.kp_faces")
+                return img[y1:y2, x1:x2], np.array([0, 0, x2 - x1, y2 - y1])
+            (x, y) = person.repspoint
+            return img[
+                y + int(self.__cfg__.rcfg_facenet.yl_h_calibration[0]):
+                y + int(self.__cfg__.rcfg_facenet.yl_h_calibration[1]), 
+                x + int(self.__cfg__.rcfg_facenet.yl_w_calibration[0]):
+                x + int(self.__cfg__.rcfg_facenet.yl_w_calibration[1])
+            ], None
+        except Exception as e:
+            self.__stats__.count("reid.exceptions")
+            add_warning_log(f"---PYPPBOX : {caller}() -> {e}")
+            return None, None
+
+    def __findFaceBoxKP__(self, img, person):
+        # The face box by the pose keypoints, or None to let MTCNN find the face
+        fn_cfg = self.__ri_cfg__
+        if not fn_cfg.kp_face or len(person.keypoints) < 3: 
+            return None
+        # A face whose center is not in the person box belongs to someone else
+        face_box = findFaceBoxKP(person.keypoints, min_conf=fn_cfg.kp_face_conf, scale=fn_cfg.kp_face_scale, 
+                                 box_xyxy=person.box_xyxy)
+        if face_box is None: 
+            return None
+        (h, w) = img.shape[:2]
+        face_box = np.clip(face_box, 0, [w, h, w, h])
+        # A face box smaller than the minimum face size of MTCNN once clipped to the frame is 
+        # left to MTCNN
+        if min(face_box[2] - face_box[0], face_box[3] - face_box[1]) < self.__ri__.minsize:
+            return None
+        return face_box
+
+    def __recognizeFaceBatch__(self, people, indices, miniframes, face_boxes, caller):
+        # Re-identify all the cropped faces of a frame in one single batch
+        reid_count = 0
+        if len(miniframes) > 0:
+            try:
+                results = self.__ri__.recognizeBatch(miniframes, is_bgr=True, face_boxes=face_boxes)
+            except Exception as e:
+                self.__stats__.count("reid.exceptions")
+                add_warning_log(f"---PYPPBOX : {caller}() -> {e}")
+                # Fall back to one crop at a time so a bad crop does not fail the others
+                results = [self.__recognizeFace__(miniframe, face_box, caller) 
+                           for miniframe, face_box in zip(miniframes, face_boxes)]
+            use_cache = self.__isReIDCacheOn__()
+            for index, result in zip(indices, results):
+                if result is None: continue
+                people[index].faceid, people[index].faceid_conf = result
+                if use_cache: self.__cacheFaceID__(people[index])
+                reid_count += 1
+        return reid_count
+
+    def __recognizeFace__(self, miniframe, face_box, caller):
+        try:
+            return self.__ri__.recognizeBatch([miniframe], is_bgr=True, face_boxes=[face_box])[0]
+        except Exception as e:
+            self.__stats__.count("reid.exceptions")
+            add_warning_log(f"---PYPPBOX : {caller}() -> {e}")
+            return None
+
+    def __isReIDCacheOn__(self):
+        # The tracker ids are only meaningful with a real tracker
+        if (self.__ri_cache__ is None or not self.__tk_is_set__ or 
+            isinstance(self.__tk__, NothingTracker)):
+            return False
+        # The ids restart with a new tracker, and the labels change with a new reider
+        if self.__ri_cache_tk__ is not self.__tk__ or self.__ri_cache_ri__ is not self.__ri__:
+            self.__ri_cache__.clear()
+            self.__ri_cache_tk__ = self.__tk__
+            self.__ri_cache_ri__ = self.__ri__
+        return True
+
+    def __reidFromCache__(self, person, face):
+        entry = self.__ri_cache__.get(person.cid, person.box_xyxy, self.__reid_frame__)
+        if entry is None: return False
+        if face: 
+            person.faceid, person.faceid_conf = entry.label, entry.conf
+            unknown = self.__unistrings__.err_fid in entry.label or self.__unistrings__.unk_fid in entry.label
+        else: 
+            person.deepid, person.deepid_conf = entry.label, entry.conf
+            unknown = self.__unistrings__.err_did in entry.label or self.__unistrings__.unk_did in entry.label
+        # A track still unknown since its last inference is not a duplicate worth a second pass
+        if unknown: self.__ri_cache_unknowns__.add(id(person))
+        self.__stats__.count("reid.cache_hits")
+        return True
+
+    def __cacheFaceID__(self, person):
+        self.__ri_cache__.put(person.cid, person.box_xyxy, person.faceid, person.faceid_conf, self.__reid_frame__)
+
+    def setReIDCache(
+        self, 
+        enable: bool = True, 
+        ttl: int = 30, 
+        max_size: int = 256, 
+        iou_threshold: float = 0.7, 
+        scale_threshold: float = 0.2
+    ):
+        """Enable or disable the ReID cache keyed by the tracker :obj:`cid`. While a track is 
+        still unknown, :func:`reidPeople()` reuses its last result instead of running the reider 
+        again, as long as its bounding box has not changed much and the result is not older 
+        than :obj:`ttl` frames. The deduplication never reads the cache, but it skips the 
+        tracks which are still unknown from the cache. The cache is only used with Centroid, 
+        SORT, or DeepSORT, and it is cleared when the tracker or the reider is changed or reset. See :class:`pyppbox.utils.cachetools.ReIDCache`.
+
+        Parameters
+        ----------
+        enable : bool, default=True
+            An indication of whether to use the cache, which starts empty.
+        ttl : int, default=30
+            Maximum age of a cached result in frames.
+        max_size : int, default=256
+            Maximum number of cached tracks, the least recently used one is evicted first.
+        iou_threshold : float, default=0.7
+            Minimum IoU between the current and the cached bounding boxes.
+        scale_threshold : float, default=0.2
+            Maximum relative change of the bounding box area.
+        """
+        if enable:
+            self.__ri_cache__ = ReIDCache(ttl=ttl, 
+                                          max_size=max_size, 
+                                          iou_threshold=iou_threshold, 
+                                          scale_threshold=scale_threshold)
+            add_info_log(f"---PYPPBOX : ReID cache is set with ttl={ttl}, max_size={max_size}")
+        else:
+            self.__ri_cache__ = None
+            add_info_log("---PYPPBOX : ReID cache is unset.")
+        self.__ri_cache_tk__ = None
+        self.__ri_cache_ri__ = None
+
+    def getReIDCacheStats(self):
+        """Get the counters of the ReID cache, which measure the saved inference.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`size`, :code:`hits`, :code:`misses`, :code:`hit_rate`, 
+            :code:`expired`, and :code:`evicted`, or an empty dictionary if the cache is 
+            disabled.
+        """
+        if self.__ri_cache__ is None: return {}
+        return self.__ri_cache__.getStats()
+
     def trainReIDClassifier(
         self, 
         reider: Union[str, Dict[str, Any]] = "", 
@@ -1018,11 +1337,197 @@ class MT(object):
                 from pyppbox.modules.reiders.facenet import MyFaceNet
                 from pyppbox.modules.reiders.torchreid import MyTorchreid
                 if isinstance(self.__ri__, MyFaceNet):
-                    self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=False)
+                    self.__ri__ = MyFaceNet(self.__ri_cfg__, auto_load=False, shared=self.__share_models__)
                     add_info_log("------------- FaceNet --------------")
                 elif isinstance(self.__ri__, MyTorchreid):
-                    self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=False)
+                    self.__ri__ = MyTorchreid(self.__ri_cfg__, auto_load=False, shared=self.__share_models__)
                     add_info_log("------------ Torchreid -------------")
                 add_info_log("---PYPPBOX : train_data='" + str(self.__ri_cfg__.train_data) + "'")
                 add_info_log("---PYPPBOX : classifier_pkl='" + str(self.__ri_cfg__.classifier_pkl) + "'")
                 self.__ri__.train_classifier()
+
+    def __getLoadedReIDer__(self, caller):
+        from pyppbox.modules.reiders.facenet import MyFaceNet
+        from pyppbox.modules.reiders.torchreid import MyTorchreid
+        if not self.__ri_is_set__ or not isinstance(self.__ri__, (MyFaceNet, MyTorchreid)):
+            msg = f"PYPPBOX : {caller}() -> The main ReIDer must be FaceNet or Torchreid."
+            add_error_log(msg)
+            raise ValueError(msg)
+        if not self.__ri__.auto_load:
+            self.__ri__.load_classifier()
+            self.__ri__.auto_load = True
+        return self.__ri__
+
+    def enrollIdentity(self, name: str, images: List[Union[str, Any]], is_bgr: bool = True):
+        """Add a new identity, or more images of an existing one, to the classifier of the main 
+        reider without retraining it, by extracting the embeddings of the given :obj:`images` 
+        only. The classifier .pkl and the classes .txt files are rewritten atomically, and the 
+        running main reider uses the new classifier at once. The classifier must be trained with 
+        :code:`classifier_type` :code:`'Gallery'` or :code:`'Centroid'`, see 
+        :func:`trainReIDClassifier()`. :func:`setConfigDir()` or :func:`setMainReIDer()` must be 
+        called in advance.
+
+        Parameters
+        ----------
+        name : str
+            The class name of the identity.
+        images : list[str or Mat, ...]
+            A list of image files or :obj:`Mat` like images of the person, which are 128x256 
+            bodies for Torchreid and 182x182 aligned faces for FaceNet, like the training data.
+        is_bgr : bool, default=True
+            An indication of whether the color channel of the given :obj:`Mat` like images is BGR.
+        """
+        self.__getLoadedReIDer__("enrollIdentity").enrollIdentity(name, images, is_bgr=is_bgr)
+        self.__ri_cache_ri__ = None
+
+    def removeIdentity(self, name: str):
+        """Remove an identity from the classifier of the main reider without retraining it. 
+        The classifier .pkl and the classes .txt files are rewritten atomically. See 
+        :func:`enrollIdentity()`.
+
+        Parameters
+        ----------
+        name : str
+            The class name of the identity.
+        """
+        self.__getLoadedReIDer__("removeIdentity").removeIdentity(name)
+        self.__ri_cache_ri__ = None
+
+    def reloadReIDClassifier(self):
+        """Reload the classifier of the main reider from its files, e.g. after another 
+        :class:`MT` object or process has called :func:`enrollIdentity()` or 
+        :func:`removeIdentity()`. The loaded models are kept.
+        """
+        self.__getLoadedReIDer__("reloadReIDClassifier").load_classifier()
+        self.__ri_cache_ri__ = None
+
+
+    ###########################################
+    # Streaming
+    ###########################################
+
+    def run(
+        self, 
+        source: Any, 
+        sink: Optional[Callable[[int, Any, list, tuple], Optional[bool]]] = None, 
+        mode: str = "throughput", 
+        queue_size: int = 4, 
+        deduplicate: bool = True, 
+        min_width_filter: int = 15, 
+        alt_repspoint: bool = False, 
+        alt_repspoint_top: bool = True, 
+        max_frames: int = 0
+    ):
+        """Run the whole detect -> track -> reid loop on a video source in a pipelined way. 
+        Decoding, detection, tracking, and re-identification run in their own worker threads 
+        connected by bounded queues, so different frames are processed at the same time, while 
+        the frames still reach the tracker in order. :func:`setConfigDir()` or 
+        :func:`setMainModules()` must be called in advance. See 
+        :class:`pyppbox.ppb.pipeline.StreamRunner` for more details.
+
+        Parameters
+        ----------
+        source : str or int or cv2.VideoCapture or Iterable[Mat]
+            A video file, a stream URL, a camera index, an opened :obj:`cv2.VideoCapture`, or any 
+            iterable of :obj:`Mat` like images.
+        sink : Callable[[int, Mat, list[Person, ...], tuple(int, int)], bool or None], optional
+            A function called in the calling thread for each processed frame in order with 
+            (frame index, frame, re-identified people, reid count), e.g. to visualize or to 
+            save the result. Returning :code:`False` stops the run.
+        mode : str, default="throughput"
+            :code:`"throughput"` processes every frame, while :code:`"low-latency"` drops the 
+            stale frames waiting for the detector, which suits live cameras.
+        queue_size : int, default=4
+            Maximum number of frames waiting in front of each stage.
+        deduplicate : bool, default=True
+            Passed to :func:`reidPeople()`.
+        min_width_filter : int, default=15
+            Passed to :func:`detectPeople()`.
+        alt_repspoint : bool, default=False
+            Passed to :func:`detectPeople()`.
+        alt_repspoint_top : bool, default=True
+            Passed to :func:`detectPeople()`.
+        max_frames : int, default=0
+            Stop after :obj:`max_frames` frames, or process the whole source if :code:`0`.
+
+        Returns
+        -------
+        dict
+            The final statistics including the per-stage queue depth, see :func:`getRunStats()`.
+        """
+        self.__runner__ = StreamRunner(self, 
+                                       mode=mode, 
+                                       queue_size=queue_size, 
+                                       deduplicate=deduplicate, 
+                                       min_width_filter=min_width_filter, 
+                                       alt_repspoint=alt_repspoint, 
+                                       alt_repspoint_top=alt_repspoint_top, 
+                                       max_frames=max_frames)
+        return self.__runner__.run(source, sink=sink)
+
+    def getRunStats(self):
+        """Get the statistics of the current or the last :func:`run()`, which can be called from 
+        another thread or from the sink while running.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`{'mode', 'elapsed', 'fps', 'stages': {stage: {...}}}` where 
+            each stage of :code:`'decode'`, :code:`'detect'`, :code:`'track'`, :code:`'reid'`, and 
+            :code:`'sink'` reports its :code:`queue_depth`, :code:`max_queue_depth`, 
+            :code:`mean_queue_depth`, :code:`processed`, :code:`dropped`, and :code:`mean_ms`. 
+            An empty dictionary is returned if :func:`run()` has never been called.
+        """
+        if self.__runner__ is None: return {}
+        return self.__runner__.getStats()
+
+
+    ###########################################
+    # Statistics
+    ###########################################
+
+    def enableStats(self, enable: bool = True, window: int = 1000):
+        """Enable or disable the built-in statistics of :func:`detectPeople()`, 
+        :func:`trackPeople()`, and :func:`reidPeople()`. When disabled, which is the default, 
+        nothing is recorded and the instrumented code costs (almost) nothing. Enabling again 
+        starts from empty statistics.
+
+        Parameters
+        ----------
+        enable : bool, default=True
+            An indication of whether to record the statistics.
+        window : int, default=1000
+            Number of the most recent values kept by each histogram to compute the percentiles.
+        """
+        if enable: self.__stats__ = MyStats(window=window)
+        else: self.__stats__ = getNullStats()
+        for module in (self.__dt__, self.__tk__, self.__ri__): self.__syncStats__(module)
+
+    def __syncStats__(self, module):
+        # Hand the current recorder to a module which may have been replaced by setMain*()
+        if getattr(module, 'stats', None) is not None and module.stats is not self.__stats__:
+            module.stats = self.__stats__
+
+    def getStats(self):
+        """Get the statistics recorded since :func:`enableStats()` or :func:`resetStats()`.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`{'timings_ms': {...}, 'values': {...}, 'counters': {...}}`, 
+            or an empty dictionary if the statistics are disabled. The timings in milliseconds 
+            and the values report their :code:`count`, :code:`mean`, :code:`p50`, :code:`p90`, 
+            :code:`p99`, and :code:`max`. The stages are :code:`'detect'`, :code:`'track'`, 
+            :code:`'reid'`, and :code:`'reid.dedup'`, and the sub-stages depend on the modules, 
+            e.g. :code:`'detect.predict'` and :code:`'detect.people'` of the YOLO detectors, 
+            :code:`'track.encoder'` and :code:`'track.update'` of DeepSORT, and 
+            :code:`'reid.mtcnn'`, :code:`'reid.embedding'`, and :code:`'reid.classifier'` of the 
+            reiders. The values are :code:`'detect.people_per_frame'`, and the counters are 
+            :code:`'reid.calls'`, :code:`'reid.dedup_calls'`, and :code:`'reid.exceptions'`.
+        """
+        return self.__stats__.getStats()
+
+    def resetStats(self):
+        """Clear the recorded statistics, while keeping them enabled or disabled.
+        """
+        self.__stats__.reset()
@@ -0,0 +1,373 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+import cv2
+import time
+import queue
+import threading
+
+from typing import Any, Callable, Dict, Optional
+
+from pyppbox.utils.logtools import add_info_log, add_error_log
+
+
+__modes__ = ("throughput", "low-latency")
+__stages__ = ("decode", "detect", "track", "reid", "sink")
+__wait__ = 0.05 # Polling interval (seconds) of the blocking queue calls
+
+
+class StageStats(object):
+
+    """A small thread-safe accumulator of the queue depth and the processing time of a stage.
+
+    :meta private:
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.dropped = 0
+        self.busy_time = 0.0
+        self.depth = 0
+        self.max_depth = 0
+        self.__depth_sum__ = 0
+        self.__depth_count__ = 0
+        self.__lock__ = threading.Lock()
+
+    def sampleDepth(self, depth):
+        with self.__lock__:
+            self.depth = depth
+            self.max_depth = max(self.max_depth, depth)
+            self.__depth_sum__ += depth
+            self.__depth_count__ += 1
+
+    def addProcessed(self, busy_time):
+        with self.__lock__:
+            self.processed += 1
+            self.busy_time += busy_time
+
+    def addDropped(self):
+        with self.__lock__:
+            self.dropped += 1
+
+    def getDocument(self):
+        with self.__lock__:
+            mean_depth = self.__depth_sum__ / self.__depth_count__ if self.__depth_count__ > 0 else 0.0
+            mean_ms = 1000 * self.busy_time / self.processed if self.processed > 0 else 0.0
+            return {'queue_depth': self.depth,
+                    'max_queue_depth': self.max_depth,
+                    'mean_queue_depth': round(mean_depth, 3),
+                    'processed': self.processed,
+                    'dropped': self.dropped,
+                    'mean_ms': round(mean_ms, 3)}
+
+
+class StreamRunner(object):
+
+    """A pipelined streaming runner of a :class:`pyppbox.ppb.mt.MT` object. Each stage --
+    decode, detect, track, and reid -- runs in its own worker thread and is connected to the
+    next one with a bounded queue, so the decoding, the detection, and the re-identification of
+    different frames overlap. The sink runs in the calling thread, which keeps GUI functions
+    like :code:`cv2.imshow()` usable in the sink.
+
+    Frames always reach the tracker in order, and the tracking of a frame only starts once
+    the re-identification of the previous frame is done, so the IDs carried over by the
+    trackers are exactly the same as in the sequential loop.
+
+    Use :meth:`pyppbox.ppb.mt.MT.run()` rather than creating this class directly.
+    """
+
+    def __init__(
+        self,
+        mt,
+        mode: str = "throughput",
+        queue_size: int = 4,
+        deduplicate: bool = True,
+        min_width_filter: int = 15,
+        alt_repspoint: bool = False,
+        alt_repspoint_top: bool = True,
+        max_frames: int = 0
+    ):
+        """Initialize a streaming runner.
+
+        Parameters
+        ----------
+        mt : MT
+            A ready :class:`pyppbox.ppb.mt.MT` object whose main modules are already set.
+        mode : str, default="throughput"
+            :code:`"throughput"` never drops any frame, the decoder waits when the detector is
+            busy. :code:`"low-latency"` drops the stale frames waiting for the detector and always
+            keeps the most recent ones, which is preferred for live cameras.
+        queue_size : int, default=4
+            Maximum number of frames waiting in front of each stage.
+        deduplicate : bool, default=True
+            Passed to :meth:`pyppbox.ppb.mt.MT.reidPeople()`.
+        min_width_filter : int, default=15
+            Passed to :meth:`pyppbox.ppb.mt.MT.detectPeople()`.
+        alt_repspoint : bool, default=False
+            Passed to :meth:`pyppbox.ppb.mt.MT.detectPeople()`.
+        alt_repspoint_top : bool, default=True
+            Passed to :meth:`pyppbox.ppb.mt.MT.detectPeople()`.
+        max_frames : int, default=0
+            Stop after decoding :obj:`max_frames` frames, or never stop early if :code:`0`.
+        """
+        if mode not in __modes__:
+            msg = f"StreamRunner : __init__() -> mode='{mode}' is not one of {__modes__}."
+            add_error_log(msg)
+            raise ValueError(msg)
+        if queue_size < 1:
+            msg = f"StreamRunner : __init__() -> queue_size={queue_size} must be >= 1."
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.mt = mt
+        self.mode = mode
+        self.queue_size = queue_size
+        self.deduplicate = deduplicate
+        self.min_width_filter = min_width_filter
+        self.alt_repspoint = alt_repspoint
+        self.alt_repspoint_top = alt_repspoint_top
+        self.max_frames = max_frames
+        self.__reset__()
+
+    def __reset__(self):
+        self.__queues__ = {stage: queue.Queue(maxsize=self.queue_size) for stage in __stages__[1:]}
+        self.__stats__ = {stage: StageStats(stage) for stage in __stages__}
+        self.__stop__ = threading.Event()
+        self.__reid_done__ = threading.Semaphore(1)
+        self.__errors__ = []
+        self.__start_time__ = None
+        self.__end_time__ = None
+
+    def __put__(self, stage, item):
+        # Blocking put which gives up when the runner is stopped
+        q = self.__queues__[stage]
+        while not self.__stop__.is_set():
+            try:
+                q.put(item, timeout=__wait__)
+                self.__stats__[stage].sampleDepth(q.qsize())
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __putLatest__(self, stage, item):
+        # Non-blocking put which drops the oldest waiting frame when the queue is full
+        q = self.__queues__[stage]
+        while not self.__stop__.is_set():
+            try:
+                q.put_nowait(item)
+                self.__stats__[stage].sampleDepth(q.qsize())
+                return True
+            except queue.Full:
+                try:
+                    stale = q.get_nowait()
+                    if stale is None:
+                        q.put_nowait(None)
+                        return False
+                    self.__stats__[stage].addDropped()
+                except queue.Empty:
+                    continue
+        return False
+
+    def __get__(self, stage):
+        # Blocking get which returns None when the runner is stopped
+        q = self.__queues__[stage]
+        while not self.__stop__.is_set():
+            try:
+                item = q.get(timeout=__wait__)
+                self.__stats__[stage].sampleDepth(q.qsize())
+                return item
+            except queue.Empty:
+                continue
+        return None
+
+    def __fail__(self, stage, e):
+        add_error_log(f"StreamRunner : {stage} -> {e}")
+        self.__errors__.append((stage, e))
+        self.__stop__.set()
+
+    def __decode__(self, source):
+        cap = None
+        frame_index = 0
+        put = self.__putLatest__ if self.mode == "low-latency" else self.__put__
+        try:
+            if isinstance(source, (str, int)):
+                cap = cv2.VideoCapture(source)
+                frames = self.__readCapture__(cap)
+            elif isinstance(source, cv2.VideoCapture):
+                frames = self.__readCapture__(source)
+            else:
+                frames = iter(source)
+            while not self.__stop__.is_set():
+                start = time.perf_counter()
+                frame = next(frames, None)
+                if frame is None: break
+                self.__stats__['decode'].addProcessed(time.perf_counter() - start)
+                if not put('detect', (frame_index, frame)): break
+                frame_index += 1
+                if self.max_frames > 0 and frame_index >= self.max_frames: break
+        except Exception as e:
+            self.__fail__('decode', e)
+        finally:
+            if cap is not None: cap.release()
+            self.__put__('detect', None)
+
+    def __readCapture__(self, cap):
+        while cap.isOpened():
+            hasFrame, frame = cap.read()
+            if not hasFrame: break
+            yield frame
+
+    def __detect__(self):
+        try:
+            while True:
+                item = self.__get__('detect')
+                if item is None: break
+                (frame_index, frame) = item
+                start = time.perf_counter()
+                people, _ = self.mt.detectPeople(frame,
+                                                 img_is_mat=True,
+                                                 visual=False,
+                                                 min_width_filter=self.min_width_filter,
+                                                 alt_repspoint=self.alt_repspoint,
+                                                 alt_repspoint_top=self.alt_repspoint_top)
+                self.__stats__['detect'].addProcessed(time.perf_counter() - start)
+                if not self.__put__('track', (frame_index, frame, people)): break
+        except Exception as e:
+            self.__fail__('detect', e)
+        finally:
+            self.__put__('track', None)
+
+    def __track__(self):
+        try:
+            while True:
+                item = self.__get__('track')
+                if item is None: break
+                (frame_index, frame, people) = item
+                # Wait until the previous frame is re-identified
+                while not self.__reid_done__.acquire(timeout=__wait__):
+                    if self.__stop__.is_set(): return
+                start = time.perf_counter()
+                if self.mt.__tk_is_set__:
+                    people = self.mt.trackPeople(frame, people, img_is_mat=True)
+                self.__stats__['track'].addProcessed(time.perf_counter() - start)
+                if not self.__put__('reid', (frame_index, frame, people)): break
+        except Exception as e:
+            self.__fail__('track', e)
+        finally:
+            self.__put__('reid', None)
+
+    def __reid__(self):
+        try:
+            while True:
+                item = self.__get__('reid')
+                if item is None: break
+                (frame_index, frame, people) = item
+                start = time.perf_counter()
+                reid_count = (0, 0)
+                if self.mt.__ri_is_set__:
+                    people, reid_count = self.mt.reidPeople(frame,
+                                                            people,
+                                                            deduplicate=self.deduplicate,
+                                                            img_is_mat=True)
+                self.__stats__['reid'].addProcessed(time.perf_counter() - start)
+                self.__reid_done__.release()
+                if not self.__put__('sink', (frame_index, frame, people, reid_count)): break
+        except Exception as e:
+            self.__fail__('reid', e)
+        finally:
+            self.__put__('sink', None)
+
+    def run(
+        self,
+        source: Any,
+        sink: Optional[Callable[[int, Any, list, tuple], Optional[bool]]] = None
+    ) -> Dict[str, Any]:
+        """Run the pipeline until the :obj:`source` is exhausted, the :obj:`sink` returns
+        :code:`False`, or :code:`KeyboardInterrupt`.
+
+        Parameters
+        ----------
+        source : str or int or cv2.VideoCapture or Iterable[Mat]
+            A video file, a stream URL, a camera index, an opened :obj:`cv2.VideoCapture`, or any
+            iterable of :obj:`Mat` like images.
+        sink : Callable[[int, Mat, list[Person, ...], tuple(int, int)], bool or None], optional
+            A function called in the calling thread for each processed frame in order with
+            (frame index, frame, people, reid count). Returning :code:`False` stops the run.
+
+        Returns
+        -------
+        dict
+            The final statistics, see :meth:`getStats()`.
+        """
+        self.__reset__()
+        self.__start_time__ = time.perf_counter()
+        workers = [threading.Thread(target=self.__decode__, args=(source,), daemon=True, name="ppb-decode"),
+                   threading.Thread(target=self.__detect__, daemon=True, name="ppb-detect"),
+                   threading.Thread(target=self.__track__, daemon=True, name="ppb-track"),
+                   threading.Thread(target=self.__reid__, daemon=True, name="ppb-reid")]
+        for worker in workers: worker.start()
+        add_info_log(f"---PYPPBOX : StreamRunner started in '{self.mode}' mode.")
+        try:
+            while True:
+                item = self.__get__('sink')
+                if item is None: break
+                start = time.perf_counter()
+                keep_going = sink(*item) if sink is not None else True
+                self.__stats__['sink'].addProcessed(time.perf_counter() - start)
+                if keep_going is False: break
+        except KeyboardInterrupt:
+            add_info_log("---PYPPBOX : StreamRunner interrupted.")
+        finally:
+            self.__stop__.set()
+            for worker in workers: worker.join()
+            self.__end_time__ = time.perf_counter()
+        if len(self.__errors__) > 0:
+            (stage, e) = self.__errors__[0]
+            msg = f"StreamRunner : run() -> Stage '{stage}' failed: {e}"
+            add_error_log(msg)
+            raise RuntimeError(msg) from e
+        add_info_log("---PYPPBOX : StreamRunner finished.")
+        return self.getStats()
+
+    def getStats(self) -> Dict[str, Any]:
+        """Get the statistics of the current or the last run. The queue depth of a stage is the
+        number of frames waiting in front of it, so the stage with the fullest queue is the
+        bottleneck.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`{'mode', 'elapsed', 'fps', 'stages': {stage: {...}}}` where
+            each stage reports :code:`queue_depth`, :code:`max_queue_depth`,
+            :code:`mean_queue_depth`, :code:`processed`, :code:`dropped`, and :code:`mean_ms`.
+        """
+        elapsed = 0.0
+        if self.__start_time__ is not None:
+            end_time = self.__end_time__ if self.__end_time__ is not None else time.perf_counter()
+            elapsed = end_time - self.__start_time__
+        stages = {stage: self.__stats__[stage].getDocument() for stage in __stages__}
+        fps = stages['sink']['processed'] / elapsed if elapsed > 0 else 0.0
+        return {'mode': self.mode,
+                'elapsed': round(elapsed, 3),
+                'fps': round(fps, 3),
+                'stages': stages}
+
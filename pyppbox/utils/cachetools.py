@@ -0,0 +1,179 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ReIDCacheEntry(object):
+
+    """The last re-identification result of a track.
+
+    Attributes
+    ----------
+    box_xyxy : tuple(int, int, int, int)
+        The bounding box of the person when the result was computed.
+    label : str
+        The re-identified face id or deep id.
+    conf : float
+        The confidence of :attr:`label`.
+    frame : int
+        The frame index when the result was computed.
+    embedding : ndarray or None
+        The embedding of the person if it is provided by the reider.
+    """
+
+    __slots__ = ('box_xyxy', 'label', 'conf', 'frame', 'embedding')
+
+    def __init__(self, box_xyxy, label, conf, frame, embedding=None):
+        self.box_xyxy = box_xyxy
+        self.label = label
+        self.conf = conf
+        self.frame = frame
+        self.embedding = embedding
+
+
+class ReIDCache(object):
+
+    """A bounded cache of the re-identification results keyed by the tracker :obj:`cid`, used 
+    by :class:`pyppbox.ppb.mt.MT` to skip the inference of a track whose bounding box has not 
+    changed much since its last inference. An entry expires after :obj:`ttl` frames, so every 
+    track is still re-identified regularly, and the least recently used entry is evicted when 
+    the cache holds more than :obj:`max_size` tracks.
+    """
+
+    def __init__(
+        self, 
+        ttl: int = 30, 
+        max_size: int = 256, 
+        iou_threshold: float = 0.7, 
+        scale_threshold: float = 0.2
+    ):
+        """Initialize an empty cache.
+
+        Parameters
+        ----------
+        ttl : int, default=30
+            Maximum age of an entry in frames, counted from its last inference.
+        max_size : int, default=256
+            Maximum number of cached tracks.
+        iou_threshold : float, default=0.7
+            Minimum IoU between the current and the cached bounding boxes for a hit.
+        scale_threshold : float, default=0.2
+            Maximum relative change of the bounding box area for a hit.
+        """
+        self.ttl = int(ttl)
+        self.max_size = int(max_size)
+        self.iou_threshold = float(iou_threshold)
+        self.scale_threshold = float(scale_threshold)
+        self.__entries__ = OrderedDict()
+        self.__hits__ = 0
+        self.__misses__ = 0
+        self.__expired__ = 0
+        self.__evicted__ = 0
+
+    def __isSimilar__(self, box_a, box_b):
+        area_a = max(0, box_a[2] - box_a[0]) * max(0, box_a[3] - box_a[1])
+        area_b = max(0, box_b[2] - box_b[0]) * max(0, box_b[3] - box_b[1])
+        if area_a <= 0 or area_b <= 0: return False
+        if abs(area_a / area_b - 1.0) > self.scale_threshold: return False
+        iw = min(box_a[2], box_b[2]) - max(box_a[0], box_b[0])
+        ih = min(box_a[3], box_b[3]) - max(box_a[1], box_b[1])
+        if iw <= 0 or ih <= 0: return False
+        inter = iw * ih
+        return inter / (area_a + area_b - inter) >= self.iou_threshold
+
+    def get(self, cid: int, box_xyxy, frame: int) -> Optional[ReIDCacheEntry]:
+        """Get the cached result of a track if it is still valid for the current bounding box.
+
+        Parameters
+        ----------
+        cid : int
+            The tracker id of the person.
+        box_xyxy : array-like
+            The current bounding box of the person.
+        frame : int
+            The current frame index.
+
+        Returns
+        -------
+        ReIDCacheEntry or None
+            The cached entry on a hit, or :code:`None` on a miss.
+        """
+        entry = self.__entries__.get(cid)
+        if entry is not None:
+            if frame - entry.frame > self.ttl:
+                del self.__entries__[cid]
+                self.__expired__ += 1
+            elif self.__isSimilar__(tuple(int(v) for v in box_xyxy), entry.box_xyxy):
+                self.__entries__.move_to_end(cid)
+                self.__hits__ += 1
+                return entry
+        self.__misses__ += 1
+        return None
+
+    def put(self, cid: int, box_xyxy, label: str, conf: float, frame: int, embedding=None):
+        """Store the new result of a track.
+
+        Parameters
+        ----------
+        cid : int
+            The tracker id of the person.
+        box_xyxy : array-like
+            The bounding box of the person used for the inference.
+        label : str
+            The re-identified face id or deep id.
+        conf : float
+            The confidence of :obj:`label`.
+        frame : int
+            The current frame index.
+        embedding : ndarray, default=None
+            The embedding of the person if it is provided by the reider.
+        """
+        self.__entries__[cid] = ReIDCacheEntry(tuple(int(v) for v in box_xyxy), label, conf, frame, embedding)
+        self.__entries__.move_to_end(cid)
+        while len(self.__entries__) > self.max_size:
+            self.__entries__.popitem(last=False)
+            self.__evicted__ += 1
+
+    def clear(self):
+        """Remove all the entries, e.g. when the tracker ids restart. The counters are kept.
+        """
+        self.__entries__.clear()
+
+    def getStats(self) -> Dict[str, Any]:
+        """Get the counters of the cache.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`size`, :code:`hits`, :code:`misses`, :code:`hit_rate`, 
+            :code:`expired`, and :code:`evicted`.
+        """
+        lookups = self.__hits__ + self.__misses__
+        return {'size': len(self.__entries__),
+                'hits': self.__hits__,
+                'misses': self.__misses__,
+                'hit_rate': round(self.__hits__ / lookups, 3) if lookups > 0 else 0.0,
+                'expired': self.__expired__,
+                'evicted': self.__evicted__}
+
@@ -19,7 +19,10 @@
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 
+import numpy as np
+
 from .gttools import GTInterpreter, convertStringToNPL
+from .restools import BinResReader, isBinRes
 from .commontools import joinFPathFull, getAbsPathFDS, isExist, getAncestorDir
 from .logtools import add_info_log, add_warning_log, add_error_log
 
@@ -437,18 +440,97 @@ def findPersonIndexGTFrame(gt_frame, box_xyxy, box_xyxy_index=4, max_spread_limi
     if min_box_spread > max_spread_limit: index = -1
     return index
 
+def __compareBinRes2Ref__(res, ref, res_box_xyxy_index, ref_box_xyxy_index, 
+                          res_compare_index, ref_compare_index, box_max_spread, max_pairs=2**20):
+    # compareRes2Ref() on the columns of two BinResReader, or None if the indexes are not 
+    # the box_xyxy and IDs. The first min(len(ref_frame), len(res_frame)) people of a result 
+    # frame are matched to the closest box of the reference frame, like findPersonIndexGTFrame()
+    columns = []
+    for reader, box_index, compare_index in ((res, res_box_xyxy_index, res_compare_index), 
+                                             (ref, ref_box_xyxy_index, ref_compare_index)):
+        if not (0 <= box_index < len(reader.text_columns) and 0 <= compare_index < len(reader.text_columns)):
+            return None
+        id_mode = reader.text_columns[compare_index]
+        if reader.text_columns[box_index] != "box_xyxy" or id_mode not in ("deepid", "faceid"):
+            return None
+        columns.append((reader.deepid_codes if id_mode == "deepid" else reader.faceid_codes, 
+                        reader.deepid_names if id_mode == "deepid" else reader.faceid_names))
+    if len(ref) == 0: return None
+    # The lowercase IDs of both files as codes of one table
+    table = {}
+    (res_codes, res_names), (ref_codes, ref_names) = columns
+    res_lower = np.asarray([table.setdefault(n.lower(), len(table)) for n in res_names], np.int64)
+    ref_lower = np.asarray([table.setdefault(n.lower(), len(table)) for n in ref_names], np.int64)
+    init_frame = int(ref.frames[0])
+    last_frame = init_frame + int(ref.frame_index[-1]) + 1
+    frames = np.union1d(ref.frame_index, res.frame_index)
+    frames = frames[(frames >= init_frame) & (frames < last_frame)]
+    counts = []
+    for reader in (ref, res):
+        if len(reader) == 0:
+            counts.append((np.zeros(len(frames), np.int64), np.zeros(len(frames), np.int64)))
+            continue
+        i = np.minimum(np.searchsorted(reader.frame_index, frames), len(reader.frame_index) - 1)
+        found = reader.frame_index[i] == frames
+        counts.append((np.where(found, reader.frame_offsets[i], 0), 
+                       np.where(found, reader.frame_offsets[i + 1] - reader.frame_offsets[i], 0)))
+    (ref_starts, ref_lens), (res_starts, res_lens) = counts
+    missed_detect = int(np.maximum(ref_lens - res_lens, 0).sum())
+    fault_detect = int(np.maximum(res_lens - ref_lens, 0).sum())
+    diff_count = 0
+    compared = np.minimum(ref_lens, res_lens)
+    # Every compared result is paired with every reference in its frame, by chunks of frames
+    pairs = np.cumsum(compared * ref_lens)
+    paired = 0
+    chunk_start = 0
+    while chunk_start < len(frames):
+        chunk_stop = max(int(np.searchsorted(pairs, paired + max_pairs, 'right')), chunk_start + 1)
+        chunk = slice(chunk_start, chunk_stop)
+        paired = int(pairs[chunk_stop - 1])
+        chunk_start = chunk_stop
+        k, n = compared[chunk], ref_lens[chunk]
+        if k.sum() == 0: continue
+        # The compared results and the start and size of their reference frame
+        res_rows = np.repeat(res_starts[chunk] - np.cumsum(k) + k, k) + np.arange(k.sum())
+        ref_rows_start = np.repeat(ref_starts[chunk], k)
+        ref_rows_len = np.repeat(n, k)
+        pair_starts = np.cumsum(ref_rows_len) - ref_rows_len
+        pair_res = np.repeat(res_rows, ref_rows_len)
+        pair_ref = np.repeat(ref_rows_start - pair_starts, ref_rows_len) + np.arange(ref_rows_len.sum())
+        spreads = np.abs(res.boxes_xyxy[pair_res].astype(np.int64) - ref.boxes_xyxy[pair_ref]).max(axis=1)
+        min_spreads = np.minimum.reduceat(spreads, pair_starts)
+        closest = np.minimum.reduceat(np.where(spreads == np.repeat(min_spreads, ref_rows_len), 
+                                               pair_ref, len(ref)), pair_starts)
+        matched = (min_spreads < 8192) & (min_spreads <= box_max_spread)
+        fault_detect += int((~matched).sum())
+        res_rows, closest = res_rows[matched], closest[matched]
+        wrong = res_lower[res_codes[res_rows]] != ref_lower[ref_codes[closest]]
+        diff_count += int(wrong.sum())
+        for frame, ref_code, res_code in zip(res.frames[res_rows[wrong]].tolist(), 
+                                             ref_codes[closest[wrong]].tolist(), 
+                                             res_codes[res_rows[wrong]].tolist()):
+            add_info_log(
+                f"compareRes2Ref() -> Frame \t@{frame}\t   ---------->   (Ref) "
+                f"{ref_names[ref_code]}\t -v.s- \t(Res) "
+                f"{res_names[res_code].lower()}"
+            )
+    return diff_count, missed_detect, fault_detect, len(ref)
+
 def compareRes2Ref(res_txt, ref_txt, res_box_xyxy_index=5, ref_box_xyxy_index=4, 
                    res_compare_index=2, ref_compare_index=2, box_max_spread=5):
     """Compare the result text file generated by :class:`ResIO` to any reference 
     or GT (Ground-truth) text file, ideally used for comparing the strings of 
-    :obj:`deepid` or :obj:`faceid` in result to the reference.
+    :obj:`deepid` or :obj:`faceid` in result to the reference. Either file can be 
+    a binary result file of :class:`pyppbox.utils.restools.BinResWriter`, where 
+    the indexes are the ones of its text layout. If both are, and the compared 
+    columns are IDs, all the frames are compared at once on the columns.
 
     Parameters
     ----------
     res_txt : str
-        A path of the result text file.
+        A path of the result text file, or of a binary result file.
     ref_txt : str
-        A path of the reference text file.
+        A path of the reference text file, or of a binary result file.
     res_box_xyxy_index : int, default=5
         Index of bounding box :code:`[X1, Y1, X2, Y2]` in the result text file.
     ref_box_xyxy_index : int, default=4
@@ -483,60 +565,70 @@ def compareRes2Ref(res_txt, ref_txt, res_box_xyxy_index=5, ref_box_xyxy_index=4,
     total_detections = 0
     
     if isExist(str(ref_txt)):
-        ref_interpreter = GTInterpreter()
-        ref_interpreter.setGT(getAbsPathFDS(ref_txt))
         
         if isExist(str(res_txt)):
-            res_interpreter = GTInterpreter()
-            res_interpreter.setGT(getAbsPathFDS(res_txt))
-            init_frame = ref_interpreter.init_frame
-            last_frame = init_frame + ref_interpreter.gt_frames_list[-1] + 1
-            
-            for frame in range(init_frame, last_frame):
-                ref_frame = ref_interpreter.findGTFrame(frame)
-                res_frame = res_interpreter.findGTFrame(frame)
-                tmp = len(ref_frame) - len(res_frame)
-                i = 0
-                if tmp >= 0:
-                    missed_detect = missed_detect + tmp
-                    for i in range(0, len(res_frame)):
-                        person_index_to_compare = findPersonIndexGTFrame(
-                            ref_frame, 
-                            convertStringToNPL(res_frame[i][res_box_xyxy_index]), 
-                            box_xyxy_index=ref_box_xyxy_index, 
-                            max_spread_limit=box_max_spread
-                        )
-                        if person_index_to_compare >= 0:
-                            if (ref_frame[person_index_to_compare][ref_compare_index].lower() != 
-                                res_frame[i][res_compare_index].lower()):
-                                add_info_log(
-                                    f"compareRes2Ref() -> Frame \t@{frame}\t   ---------->   (Ref) "
-                                    f"{ref_frame[person_index_to_compare][ref_compare_index]}\t -v.s- \t(Res) "
-                                    f"{res_frame[i][res_compare_index].lower()}"
-                                )
-                                diff_count += 1
-                        else: fault_detect += 1
-                else:
-                    fault_detect = fault_detect + abs(tmp)
-                    for i in range(0, len(ref_frame)):
-                        person_index_to_compare = findPersonIndexGTFrame(
-                            ref_frame, 
-                            convertStringToNPL(res_frame[i][res_box_xyxy_index]), 
-                            box_xyxy_index=ref_box_xyxy_index, 
-                            max_spread_limit=box_max_spread
-                        )
-                        if person_index_to_compare >= 0:
-                            if (ref_frame[person_index_to_compare][ref_compare_index].lower() != 
-                                res_frame[i][res_compare_index].lower()):
-                                add_info_log(
-                                    f"compareRes2Ref() -> Frame \t@{frame}\t   ---------->   (Ref) "
-                                    f"{ref_frame[person_index_to_compare][ref_compare_index]}\t -v.s- \t(Res) "
-                                    f"{res_frame[i][res_compare_index].lower()}"
-                                )
-                                diff_count += 1
-                        else: fault_detect += 1
+            counts = None
+            if isBinRes(ref_txt) and isBinRes(res_txt):
+                counts = __compareBinRes2Ref__(BinResReader(getAbsPathFDS(res_txt)), 
+                                               BinResReader(getAbsPathFDS(ref_txt)), 
+                                               res_box_xyxy_index, ref_box_xyxy_index, 
+                                               res_compare_index, ref_compare_index, 
+                                               box_max_spread)
+            if counts is not None:
+                diff_count, missed_detect, fault_detect, total_detections = counts
+            else:
+                ref_interpreter = GTInterpreter()
+                ref_interpreter.setGT(getAbsPathFDS(ref_txt))
+                res_interpreter = GTInterpreter()
+                res_interpreter.setGT(getAbsPathFDS(res_txt))
+                init_frame = ref_interpreter.init_frame
+                last_frame = init_frame + ref_interpreter.gt_frames_list[-1] + 1
+                
+                for frame in range(init_frame, last_frame):
+                    ref_frame = ref_interpreter.findGTFrame(frame)
+                    res_frame = res_interpreter.findGTFrame(frame)
+                    tmp = len(ref_frame) - len(res_frame)
+                    i = 0
+                    if tmp >= 0:
+                        missed_detect = missed_detect + tmp
+                        for i in range(0, len(res_frame)):
+                            person_index_to_compare = findPersonIndexGTFrame(
+                                ref_frame, 
+                                convertStringToNPL(res_frame[i][res_box_xyxy_index]), 
+                                box_xyxy_index=ref_box_xyxy_index, 
+                                max_spread_limit=box_max_spread
+                            )
+                            if person_index_to_compare >= 0:
+                                if (ref_frame[person_index_to_compare][ref_compare_index].lower() != 
+                                    res_frame[i][res_compare_index].lower()):
+                                    add_info_log(
+                                        f"compareRes2Ref() -> Frame \t@{frame}\t   ---------->   (Ref) "
+                                        f"{ref_frame[person_index_to_compare][ref_compare_index]}\t -v.s- \t(Res) "
+                                        f"{res_frame[i][res_compare_index].lower()}"
+                                    )
+                                    diff_count += 1
+                            else: fault_detect += 1
+                    else:
+                        fault_detect = fault_detect + abs(tmp)
+                        for i in range(0, len(ref_frame)):
+                            person_index_to_compare = findPersonIndexGTFrame(
+                                ref_frame, 
+                                convertStringToNPL(res_frame[i][res_box_xyxy_index]), 
+                                box_xyxy_index=ref_box_xyxy_index, 
+                                max_spread_limit=box_max_spread
+                            )
+                            if person_index_to_compare >= 0:
+                                if (ref_frame[person_index_to_compare][ref_compare_index].lower() != 
+                                    res_frame[i][res_compare_index].lower()):
+                                    add_info_log(
+                                        f"compareRes2Ref() -> Frame \t@{frame}\t   ---------->   (Ref) "
+                                        f"{ref_frame[person_index_to_compare][ref_compare_index]}\t -v.s- \t(Res) "
+                                        f"{res_frame[i][res_compare_index].lower()}"
+                                    )
+                                    diff_count += 1
+                            else: fault_detect += 1
     
-            total_detections = ref_interpreter.total_detections
+                total_detections = ref_interpreter.total_detections
             score = float((total_detections - diff_count - missed_detect)/total_detections)
 
             msg = (f"\n#####################################################################\n\n"
@@ -24,6 +24,7 @@ import cv2
 import numpy as np
 
 from .persontools import Person
+from .restools import BinResReader, isBinRes
 from .commontools import getFileName
 from .logtools import add_info_log, add_error_log
 
@@ -109,12 +110,14 @@ class GTIO(object):
 
     def loadGT(self, gt_file_txt):
         """Read an input of GT (Ground-truth) text file, and return the :obj:`gt_frames`, 
-        :obj:`gt_frames_list`, :obj:`total_detections`, and :obj:`init_frame`.
+        :obj:`gt_frames_list`, :obj:`total_detections`, and :obj:`init_frame`. A binary 
+        result file of :class:`pyppbox.utils.restools.BinResWriter` is read from its columns 
+        instead, and its boxes are :obj:`ndarray` instead of strings.
 
         Parameters
         ----------
         gt_file_txt : str
-            A file path of GT (Ground-truth) text.
+            A file path of GT (Ground-truth) text, or of a binary result file.
         
         Returns
         -------
@@ -130,6 +133,7 @@ class GTIO(object):
         int
             Initial frame index.
         """
+        if isBinRes(gt_file_txt): return self.__loadBinGT__(gt_file_txt)
         gt_frames = []
         gt_frames_list = []
         total_detections = 0
@@ -171,6 +175,33 @@ class GTIO(object):
             raise ValueError(msg)
         return gt_frames, gt_frames_list, total_detections, init_frame
 
+    def __loadBinGT__(self, gt_file_bin):
+        # The GT-format people of a binary result file, in the column order of its text layout
+        try:
+            reader = BinResReader(gt_file_bin)
+            columns = {"frame": reader.frames.tolist(), 
+                       "repspoint": [tuple(p) for p in reader.repspoints.tolist()]}
+            if reader.deepid_codes is not None: columns["deepid"] = reader.getIDs("deepid")
+            if reader.faceid_codes is not None: columns["faceid"] = reader.getIDs("faceid")
+            if reader.boxes_xywh is not None: columns["box_xywh"] = list(np.array(reader.boxes_xywh, dtype=int))
+            if reader.boxes_xyxy is not None: columns["box_xyxy"] = list(np.array(reader.boxes_xyxy, dtype=int))
+            gt_people = [list(p) for p in zip(*[columns[name] for name in reader.text_columns])]
+            offsets = reader.frame_offsets.tolist()
+            gt_frames = [gt_people[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+            gt_frames_list = reader.frame_index.tolist()
+            total_detections = len(gt_people)
+            init_frame = gt_frames_list[0] if total_detections > 0 else 0
+            if total_detections == 0:
+                gt_frames = [[]]
+                gt_frames_list = [0]
+            add_info_log(f"------GTIO : Loaded <- {getFileName(gt_file_bin)}")
+            add_info_log(f"------GTIO : Found {len(gt_frames)} nonempty frame(s) and the initial frame is {init_frame}.")
+        except Exception as e:
+            msg = "GTIO : loadGT() -> " + str(e)
+            add_error_log(msg)
+            raise ValueError(msg)
+        return gt_frames, gt_frames_list, total_detections, init_frame
+
 
 class GTInterpreter(object):
 
@@ -249,7 +280,7 @@ class GTInterpreter(object):
         Parameters
         ----------
         gt_file_txt : str
-            A file path of GT (Ground-truth) text.
+            A file path of GT (Ground-truth) text, or of a binary result file.
         """
         (self.gt_frames, 
          self.gt_frames_list, 
@@ -332,6 +363,7 @@ def convertStringToNPL(input):
     """
     :meta private:
     """
+    if not isinstance(input, str): return np.asarray(input).astype(int)
     input = input.replace("#", "")
     input = input.replace("[", "")
     input = input.replace("]", "")
@@ -19,6 +19,7 @@
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 
+import threading
 import numpy as np
 from pyppbox.config.unifiedstrings import UnifiedStrings
 
@@ -54,10 +55,15 @@ class Person(object):
         Confidence of :attr:`faceid`.
     deepid_conf : float, default=0.0
         Confidence of :attr:`deepid`.
+    feature : ndarray, default=None
+        Appearance feature of the body, shape=(D,), e.g. shared between DeepSORT and Torchreid.
     misc : list[], optional
         Miscellaneous items.
     """
 
+    __slots__ = ('init_id', 'cid', 'box_xywh', 'box_xyxy', 'keypoints', 'repspoint', 'det_conf', 
+                 'faceid', 'deepid', 'faceid_conf', 'deepid_conf', 'feature', 'misc')
+
     def __init__(
             self, 
             init_id, 
@@ -70,7 +76,8 @@ class Person(object):
             faceid=__ustrings__.unk_fid, 
             deepid=__ustrings__.unk_did, 
             faceid_conf=100.0, 
-            deepid_conf=100.0
+            deepid_conf=100.0, 
+            feature=None
         ):
 
         """
@@ -102,6 +109,8 @@ class Person(object):
             Confidence of :attr:`faceid`.
         deepid_conf : float, default=0.0
             Confidence of :attr:`deepid`.
+        feature : ndarray, default=None
+            Appearance feature of the body, :code:`shape=(D,)`.
         misc : list[], optional
             Miscellaneous items.
         """
@@ -116,6 +125,7 @@ class Person(object):
         self.deepid = deepid
         self.faceid_conf = faceid_conf
         self.deepid_conf = deepid_conf
+        self.feature = feature
         self.misc = []
 
     def updateIDs(self, new_cid, new_faceid, new_deepid, 
@@ -170,6 +180,397 @@ class Person(object):
 #####################################################################################
 
 
+__id_names__ = []
+__id_codes__ = {}
+__id_lock__ = threading.Lock()
+
+def internID(name):
+    """Intern a face ID or deep ID, so it is stored as a small integer code in the columns 
+    of :class:`PeopleFrame`. The same name always gets the same code.
+
+    Parameters
+    ----------
+    name : str
+        A face ID or deep ID.
+
+    Returns
+    -------
+    int
+        The code of the :obj:`name`.
+    """
+    code = __id_codes__.get(name)
+    if code is None:
+        with __id_lock__:
+            code = __id_codes__.get(name)
+            if code is None:
+                code = len(__id_names__)
+                __id_names__.append(name)
+                __id_codes__[name] = code
+    return code
+
+def getInternedID(code):
+    """Get the face ID or deep ID of a code given by :func:`internID`.
+
+    Parameters
+    ----------
+    code : int
+        A code given by :func:`internID`.
+
+    Returns
+    -------
+    str
+        The face ID or deep ID.
+    """
+    return __id_names__[code]
+
+def __column__(name, cast=None):
+    # A property of PersonView reading and writing the row of a column of its PeopleFrame
+    def fget(self):
+        value = getattr(self.frame, name)[self.index]
+        return value if cast is None else cast(value)
+    def fset(self, value):
+        getattr(self.frame, name)[self.index] = value
+    return property(fget, fset)
+
+def __idColumn__(name):
+    # Same as __column__() but for an interned ID column
+    def fget(self):
+        return __id_names__[getattr(self.frame, name)[self.index]]
+    def fset(self, value):
+        getattr(self.frame, name)[self.index] = internID(value)
+    return property(fget, fset)
+
+def __repspointGet__(self):
+    return tuple(self.frame.repspoints[self.index].tolist())
+
+def __repspointSet__(self, value):
+    self.frame.repspoints[self.index] = value
+
+def __keypointsGet__(self):
+    if self.frame.keypoints is None: return []
+    return self.frame.keypoints[self.index]
+
+def __keypointsSet__(self, value):
+    value = __toKeypoints__(value)
+    if self.frame.keypoints is None:
+        if value.size == 0: return
+        self.frame.keypoints = np.zeros((len(self.frame), ) + value.shape, dtype=np.float32)
+    self.frame.keypoints[self.index] = value if value.size > 0 else 0
+
+def __toKeypoints__(keypoints):
+    # The keypoints of one person as float32, also from a torch tensor
+    if hasattr(keypoints, 'cpu'): keypoints = keypoints.cpu().numpy()
+    return np.asarray(keypoints, dtype=np.float32)
+
+
+class PersonView(Person):
+
+    """
+    A lightweight :class:`Person` which holds no data but reads and writes the row 
+    :attr:`index` of a :class:`PeopleFrame`, so it works wherever a :class:`Person` does. 
+    A deep copy of it is a detached :class:`Person`.
+
+    Attributes
+    ----------
+    frame : PeopleFrame
+        The :class:`PeopleFrame` of the person.
+    index : int
+        The row of the person in :attr:`frame`.
+    """
+
+    __slots__ = ('frame', 'index')
+
+    def __init__(self, frame, index):
+        self.frame = frame
+        self.index = index
+
+    init_id = __column__('init_ids', int)
+    cid = __column__('cids', int)
+    box_xywh = __column__('boxes_xywh')
+    box_xyxy = __column__('boxes_xyxy')
+    keypoints = property(__keypointsGet__, __keypointsSet__)
+    repspoint = property(__repspointGet__, __repspointSet__)
+    det_conf = __column__('det_confs', float)
+    faceid = __idColumn__('faceid_codes')
+    deepid = __idColumn__('deepid_codes')
+    faceid_conf = __column__('faceid_confs', float)
+    deepid_conf = __column__('deepid_confs', float)
+    feature = __column__('features')
+    misc = __column__('miscs')
+
+    def __deepcopy__(self, memo):
+        return self.frame.getPerson(self.index)
+
+    def __reduce__(self):
+        return (PersonView, (self.frame, self.index))
+
+
+class PeopleFrame(object):
+
+    """
+    A class used to represent the people of a frame as columns instead of a list of 
+    :class:`Person`. The boxes, points, confidences and keypoints of all the people are held 
+    in contiguous arrays, and the face IDs and deep IDs are interned by :func:`internID`. It 
+    is accepted wherever a list of :class:`Person` is, and its items are :class:`PersonView` 
+    made on demand.
+
+    Attributes
+    ----------
+    init_ids : ndarray
+        Initial IDs, :code:`shape=(N,)`, :code:`dtype=int64`.
+    cids : ndarray
+        Current IDs, :code:`shape=(N,)`, :code:`dtype=int64`.
+    boxes_xywh : ndarray
+        Bounding boxes :code:`[x, y, width, height]`, :code:`shape=(N, 4)`, :code:`dtype=int32`.
+    boxes_xyxy : ndarray
+        Bounding boxes :code:`[x1, y1, x2, y2]`, :code:`shape=(N, 4)`, :code:`dtype=int32`.
+    keypoints : ndarray or None
+        Keypoints of the bodies, e.g. :code:`shape=(N, 17, 3)`, :code:`dtype=float32`, or 
+        :code:`None` if there is none.
+    repspoints : ndarray
+        Respesented 2D points :code:`[x, y]`, :code:`shape=(N, 2)`, :code:`dtype=int32`.
+    det_confs : ndarray
+        Confidences of detection, :code:`shape=(N,)`, :code:`dtype=float32`.
+    faceid_codes : ndarray
+        Codes of the face IDs given by :func:`internID`, :code:`shape=(N,)`, :code:`dtype=int32`.
+    deepid_codes : ndarray
+        Codes of the deep IDs given by :func:`internID`, :code:`shape=(N,)`, :code:`dtype=int32`.
+    faceid_confs : ndarray
+        Confidences of the face IDs, :code:`shape=(N,)`, :code:`dtype=float32`.
+    deepid_confs : ndarray
+        Confidences of the deep IDs, :code:`shape=(N,)`, :code:`dtype=float32`.
+    features : list[ndarray or None, ...]
+        Appearance features of the bodies.
+    miscs : list[list[], ...]
+        Miscellaneous items of every person.
+    """
+
+    def __init__(self, boxes_xywh=None, boxes_xyxy=None, repspoints=None, det_confs=None, keypoints=None):
+        """Construct a PeopleFrame from the arrays of the detected people, e.g. given by a 
+        detector. One of :obj:`boxes_xywh` and :obj:`boxes_xyxy` finds the other one. The IDs 
+        are the indexes of the people, and the face IDs and deep IDs are unknown.
+
+        Parameters
+        ----------
+        boxes_xywh : ndarray, default=None
+            Bounding boxes :code:`[x, y, width, height]`, :code:`shape=(N, 4)`.
+        boxes_xyxy : ndarray, default=None
+            Bounding boxes :code:`[x1, y1, x2, y2]`, :code:`shape=(N, 4)`.
+        repspoints : ndarray, default=None
+            Respesented 2D points :code:`[x, y]`, :code:`shape=(N, 2)`, :code:`(0, 0)` if 
+            :code:`None`.
+        det_confs : ndarray, default=None
+            Confidences of detection, :code:`shape=(N,)`, :code:`0.5` if :code:`None`.
+        keypoints : ndarray, default=None
+            Keypoints of the bodies, e.g. :code:`shape=(N, 17, 3)`.
+        """
+        if boxes_xywh is None and boxes_xyxy is None:
+            boxes_xyxy = np.zeros((0, 4), dtype=np.int32)
+        if boxes_xyxy is not None:
+            self.boxes_xyxy = np.array(boxes_xyxy, dtype=np.int32).reshape(-1, 4)
+        if boxes_xywh is not None:
+            self.boxes_xywh = np.array(boxes_xywh, dtype=np.int32).reshape(-1, 4)
+        else:
+            self.boxes_xywh = self.boxes_xyxy.copy()
+            self.boxes_xywh[:, 2:] -= self.boxes_xyxy[:, :2]
+        if boxes_xyxy is None:
+            self.boxes_xyxy = self.boxes_xywh.copy()
+            self.boxes_xyxy[:, 2:] += self.boxes_xywh[:, :2]
+        num_people = len(self.boxes_xyxy)
+        self.init_ids = np.arange(num_people, dtype=np.int64)
+        self.cids = np.arange(num_people, dtype=np.int64)
+        if repspoints is None: 
+            self.repspoints = np.zeros((num_people, 2), dtype=np.int32)
+        else:
+            self.repspoints = np.array(repspoints, dtype=np.int32).reshape(-1, 2)
+        if det_confs is None: 
+            self.det_confs = np.full(num_people, 0.5, dtype=np.float32)
+        else:
+            self.det_confs = np.array(det_confs, dtype=np.float32).reshape(-1)
+        self.keypoints = None
+        if keypoints is not None and len(keypoints) > 0:
+            self.keypoints = np.ascontiguousarray(__toKeypoints__(keypoints))
+        self.faceid_codes = np.full(num_people, internID(__ustrings__.unk_fid), dtype=np.int32)
+        self.deepid_codes = np.full(num_people, internID(__ustrings__.unk_did), dtype=np.int32)
+        self.faceid_confs = np.full(num_people, 100.0, dtype=np.float32)
+        self.deepid_confs = np.full(num_people, 100.0, dtype=np.float32)
+        self.features = [None] * num_people
+        self.miscs = [[] for _ in range(num_people)]
+        self.__views__ = [None] * num_people
+
+    def __len__(self):
+        return len(self.cids)
+
+    def __getitem__(self, index):
+        # The same view is returned every time, so its id() is stable like a Person
+        if index < 0: index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PeopleFrame : __getitem__() -> Index out of range.")
+        view = self.__views__[index]
+        if view is None:
+            view = PersonView(self, index)
+            self.__views__[index] = view
+        return view
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getstate__(self):
+        # The views are made again on demand
+        state = self.__dict__.copy()
+        del state['__views__']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__views__ = [None] * len(self)
+
+    def getPerson(self, index):
+        """Get a detached :class:`Person` copy of a person.
+
+        Parameters
+        ----------
+        index : int
+            The index of the person.
+
+        Returns
+        -------
+        Person
+            A :class:`Person` object.
+        """
+        person = Person(int(self.init_ids[index]), 
+                        int(self.cids[index]), 
+                        box_xywh=self.boxes_xywh[index].copy(), 
+                        box_xyxy=self.boxes_xyxy[index].copy(), 
+                        keypoints=[] if self.keypoints is None else self.keypoints[index].copy(), 
+                        repspoint=tuple(self.repspoints[index].tolist()), 
+                        det_conf=float(self.det_confs[index]), 
+                        faceid=__id_names__[self.faceid_codes[index]], 
+                        deepid=__id_names__[self.deepid_codes[index]], 
+                        faceid_conf=float(self.faceid_confs[index]), 
+                        deepid_conf=float(self.deepid_confs[index]), 
+                        feature=self.features[index])
+        misc = self.miscs[index]
+        person.misc = misc if misc is None else list(misc)
+        return person
+
+    def getPeople(self):
+        """Get the detached :class:`Person` copies of all the people.
+
+        Returns
+        -------
+        list[Person, ...]
+            A list of :class:`Person` object.
+        """
+        return [self.getPerson(index) for index in range(len(self))]
+
+    def getDets(self):
+        """Get the detection bounding boxes with confidences of all the people, the same as 
+        stacking :meth:`Person.getDetRS` of every person.
+
+        Returns
+        -------
+        ndarray
+            Numpy array of x1, y1, x2, y2, and confidence, :code:`shape=(N, 5)`, 
+            :code:`dtype=float32`.
+        """
+        return np.concatenate((self.boxes_xyxy, self.det_confs[:, None]), axis=1).astype(np.float32)
+
+    def select(self, indices):
+        """Get a new :class:`PeopleFrame` of the given people, their misc lists are shared.
+
+        Parameters
+        ----------
+        indices : list[int, ...] or ndarray
+            The indexes of the people, or a boolean mask.
+
+        Returns
+        -------
+        PeopleFrame
+            A new :class:`PeopleFrame` object.
+        """
+        indices = np.arange(len(self))[np.asarray(indices).reshape(-1)].tolist() if len(indices) > 0 else []
+        frame = PeopleFrame.__new__(PeopleFrame)
+        for name in ('init_ids', 'cids', 'boxes_xywh', 'boxes_xyxy', 'repspoints', 'det_confs', 
+                     'faceid_codes', 'deepid_codes', 'faceid_confs', 'deepid_confs'):
+            setattr(frame, name, getattr(self, name)[indices])
+        frame.keypoints = None if self.keypoints is None else self.keypoints[indices]
+        frame.features = [self.features[i] for i in indices]
+        frame.miscs = [self.miscs[i] for i in indices]
+        frame.__views__ = [None] * len(indices)
+        return frame
+
+    def copy(self):
+        """Get a copy of the :class:`PeopleFrame`, the features are shared.
+
+        Returns
+        -------
+        PeopleFrame
+            A new :class:`PeopleFrame` object.
+        """
+        frame = self.select(np.arange(len(self)))
+        frame.miscs = [misc if misc is None else list(misc) for misc in frame.miscs]
+        return frame
+
+
+def toPeopleFrame(people):
+    """Convert a list of :class:`Person` into a :class:`PeopleFrame`, a missing bounding box 
+    :code:`box_xywh` or :code:`box_xyxy` is found by the other one.
+
+    Parameters
+    ----------
+    people : list[Person, ...] or PeopleFrame
+        A list of :class:`Person` object, or a :class:`PeopleFrame` returned as it is.
+
+    Returns
+    -------
+    PeopleFrame
+        A :class:`PeopleFrame` object.
+    """
+    if isinstance(people, PeopleFrame): return people
+    num_people = len(people)
+    boxes = np.zeros((2, num_people, 4), dtype=np.int32)
+    has_box = np.zeros((2, num_people), dtype=bool)
+    keypoints = []
+    for i, p in enumerate(people):
+        for j, box in enumerate((p.box_xywh, p.box_xyxy)):
+            box = np.asarray(box).reshape(-1)
+            if len(box) == 4:
+                boxes[j, i] = box
+                has_box[j, i] = True
+        keypoints.append(__toKeypoints__(p.keypoints))
+    xywh_only = has_box[0] & ~has_box[1]
+    boxes[1, xywh_only] = boxes[0, xywh_only]
+    boxes[1, xywh_only, 2:] += boxes[0, xywh_only, :2]
+    xyxy_only = has_box[1] & ~has_box[0]
+    boxes[0, xyxy_only] = boxes[1, xyxy_only]
+    boxes[0, xyxy_only, 2:] -= boxes[1, xyxy_only, :2]
+    frame = PeopleFrame(boxes_xywh=boxes[0], 
+                        boxes_xyxy=boxes[1], 
+                        repspoints=[p.repspoint for p in people] if num_people > 0 else None, 
+                        det_confs=[p.det_conf for p in people] if num_people > 0 else None)
+    shapes = [k.shape for k in keypoints if k.size > 0]
+    if len(shapes) > 0:
+        if len(set(shapes)) > 1:
+            raise ValueError("PeopleFrame : toPeopleFrame() -> The people have different keypoints.")
+        frame.keypoints = np.zeros((num_people, ) + shapes[0], dtype=np.float32)
+        for i, k in enumerate(keypoints):
+            if k.size > 0: frame.keypoints[i] = k
+    frame.init_ids[:] = [p.init_id for p in people]
+    frame.cids[:] = [p.cid for p in people]
+    frame.faceid_codes[:] = [internID(p.faceid) for p in people]
+    frame.deepid_codes[:] = [internID(p.deepid) for p in people]
+    frame.faceid_confs[:] = [p.faceid_conf for p in people]
+    frame.deepid_confs[:] = [p.deepid_conf for p in people]
+    frame.features = [p.feature for p in people]
+    frame.miscs = [p.misc for p in people]
+    return frame
+
+
+#####################################################################################
+
+
 def findRepspoint(box_xyxy, calibrate_weight):
     """Find respesented point :code:`(x, y)` of a :class:`pyppbox.utils.persontools.Person` 
     object by its bounding :code:`box_xyxy` of :code:`[x1, y1, x2, y2]`. The :obj:`calibrate_weight` 
@@ -224,6 +625,88 @@ def findRepspointBB(box_xyxy, prefer_top=True):
     return (x, y)
 
 
+def findRepspoints(boxes_xyxy, calibrate_weight):
+    """Find the respesented points of many bounding boxes at once, the array version of
+    :func:`findRepspoint` giving the same points.
+
+    Parameters
+    ----------
+    boxes_xyxy : ndarray
+        Bounding boxes :code:`[x1, y1, x2, y2]`, :code:`shape=(N, 4)`, :code:`dtype=int`.
+    calibrate_weight : float
+        Calibration weight.
+
+    Returns
+    -------
+    ndarray
+        Respesented 2D points :code:`[x, y]`, :code:`shape=(N, 2)`, :code:`dtype=int`.
+    """
+    boxes_xyxy = np.asarray(boxes_xyxy).reshape(-1, 4)
+    x = ((boxes_xyxy[:, 0] + boxes_xyxy[:, 2]) / 2).astype(int)
+    y_start = np.minimum(boxes_xyxy[:, 1], boxes_xyxy[:, 3])
+    y_dist = np.abs(boxes_xyxy[:, 1] - boxes_xyxy[:, 3])
+    y = (y_start + calibrate_weight*y_dist).astype(int)
+    return np.stack((x, y), axis=1)
+
+
+def findRepspointsBB(boxes_xyxy, prefer_top=True):
+    """Find the respesented points of many bounding boxes at once, the array version of
+    :func:`findRepspointBB` giving the same points.
+
+    Parameters
+    ----------
+    boxes_xyxy : ndarray
+        Bounding boxes :code:`[x1, y1, x2, y2]`, :code:`shape=(N, 4)`, :code:`dtype=int`.
+    prefer_top : bool, default=True
+        Decide whether :code:`y` is at the top or bottom of the bounding boxes.
+
+    Returns
+    -------
+    ndarray
+        Respesented 2D points :code:`[x, y]`, :code:`shape=(N, 2)`, :code:`dtype=int`.
+    """
+    boxes_xyxy = np.asarray(boxes_xyxy).reshape(-1, 4)
+    x = ((boxes_xyxy[:, 0] + boxes_xyxy[:, 2]) / 2).astype(int)
+    if prefer_top:
+        y = np.minimum(boxes_xyxy[:, 1], boxes_xyxy[:, 3])
+    else:
+        y = np.maximum(boxes_xyxy[:, 1], boxes_xyxy[:, 3])
+    return np.stack((x, y.astype(int)), axis=1)
+
+
+def toPeople(boxes_xywh, boxes_xyxy, repspoints, confs, keypoints=None):
+    """Make the :class:`pyppbox.utils.persontools.Person` objects of the detections given as
+    arrays, e.g. by a detector which filters and converts all its detections at once. The
+    :attr:`init_id` and :attr:`cid` are the indexes of the detections.
+
+    Parameters
+    ----------
+    boxes_xywh : ndarray
+        Bounding boxes :code:`[x, y, width, height]`, :code:`shape=(N, 4)`, :code:`dtype=int`.
+    boxes_xyxy : ndarray
+        Bounding boxes :code:`[x1, y1, x2, y2]`, :code:`shape=(N, 4)`, :code:`dtype=int`.
+    repspoints : ndarray
+        Respesented 2D points :code:`[x, y]`, :code:`shape=(N, 2)`, :code:`dtype=int`.
+    confs : ndarray
+        Confidences of detection, :code:`shape=(N,)`.
+    keypoints : ndarray, default=None
+        Keypoints of the bodies, e.g. :code:`shape=(N, 17, 3)`, :code:`dtype=float32`.
+
+    Returns
+    -------
+    list[Person, ...]
+        A list of :class:`pyppbox.utils.persontools.Person` object.
+    """
+    # Plain Python values once for all, not per person
+    repspoints = [tuple(p) for p in np.asarray(repspoints).tolist()]
+    confs = np.asarray(confs).tolist()
+    if keypoints is None:
+        return [Person(i, i, box_xywh=boxes_xywh[i], box_xyxy=boxes_xyxy[i],
+                       repspoint=repspoints[i], det_conf=confs[i]) for i in range(len(confs))]
+    return [Person(i, i, box_xywh=boxes_xywh[i], box_xyxy=boxes_xyxy[i], keypoints=keypoints[i],
+                   repspoint=repspoints[i], det_conf=confs[i]) for i in range(len(confs))]
+
+
 def findRepspointUP(keypoint, box_xyxy, calibrate_weight, prefer_box=True):
     """Find respesented point :code:`(x, y)` of a :class:`pyppbox.utils.persontools.Person` 
     object by its YOLOv8 pose :code:`keypoint` (17 keypoints) or by the bounding :code:`box_xyxy` 
@@ -258,3 +741,110 @@ def findRepspointUP(keypoint, box_xyxy, calibrate_weight, prefer_box=True):
         (x, y) = findRepspoint(box_xyxy, calibrate_weight)
     return (x, y)
 
+
+
+def findFaceBoxKP(keypoint, min_conf=0.5, scale=2.5, min_size=20, box_xyxy=None):
+    """Find the face bounding box :code:`[x1, y1, x2, y2]` of a 
+    :class:`pyppbox.utils.persontools.Person` object by its YOLOv8 pose :code:`keypoint` 
+    (17 keypoints), using the nose, left eye, and right eye. The box is a square centered 
+    between the eyes and the nose, and its size is :obj:`scale` times the larger of the eye 
+    distance and twice the eye-to-nose height.
+
+    Parameters
+    ----------
+    keypoint : ndarray
+        17 keypoints generated by YOLOv8 (Ultralytics), each one is :code:`[x, y]` or 
+        :code:`[x, y, confidence]`.
+    min_conf : float, default=0.5
+        Minimum confidence of the nose and both eyes, or the keypoints without confidence 
+        must not be :code:`[0, 0]`.
+    scale : float, default=2.5
+        Scale of the face size.
+    min_size : int, default=20
+        Minimum size of the face box.
+    box_xyxy : ndarray, optional
+        Bounding box :code:`[x1, y1, x2, y2]` of the person, the face is rejected if its 
+        center is outside, i.e. the keypoints are the ones of someone else.
+
+    Returns
+    -------
+    ndarray or None
+        Face bounding box :code:`[x1, y1, x2, y2]`, :code:`shape=(4,)`, :code:`dtype=int`, 
+        or :code:`None` if the keypoints are missing, unconfident, the face is too small, 
+        or it is not in :obj:`box_xyxy`.
+    """
+    if hasattr(keypoint, 'cpu'): keypoint = keypoint.cpu().numpy()
+    keypoint = np.asarray(keypoint, dtype=np.float64)
+    if keypoint.ndim != 2 or keypoint.shape[0] < 3 or keypoint.shape[1] < 2:
+        return None
+    head = keypoint[:3]
+    if head.shape[1] >= 3:
+        if np.any(head[:, 2] < min_conf): return None
+    elif np.any(np.all(head[:, :2] == 0, axis=1)):
+        return None
+    (nose, leye, reye) = head[:, :2]
+    eye_mid = (leye + reye) / 2
+    size = scale * max(np.linalg.norm(leye - reye), 2 * abs(nose[1] - eye_mid[1]))
+    if size < min_size:
+        return None
+    (cx, cy) = (eye_mid + nose) / 2
+    if box_xyxy is not None and len(box_xyxy) == 4:
+        (x1, y1, x2, y2) = box_xyxy
+        if not (x1 <= cx <= x2 and y1 <= cy <= y2):
+            return None
+    half = size / 2
+    return np.array([cx - half, cy - half, cx + half, cy + half]).astype(int)
+
+
+def mapPeopleByCID(people):
+    """Map the :attr:`cid` of the :class:`pyppbox.utils.persontools.Person` objects to the 
+    objects, so a person of a given :attr:`cid` is found in O(1). If several people share a 
+    :attr:`cid`, the first one is kept.
+
+    Parameters
+    ----------
+    people : list[Person, ...]
+        A list of :class:`pyppbox.utils.persontools.Person` object.
+
+    Returns
+    -------
+    dict
+        A dictionary of :code:`{cid: Person}`.
+    """
+    people_by_cid = {}
+    for p in people:
+        people_by_cid.setdefault(p.cid, p)
+    return people_by_cid
+
+def findClosestBoxes(boxes_xyxy, people, max_spread=128):
+    """Find the closest person of each box, where the distance of a box and a person is the 
+    largest absolute difference of their :code:`[x1, y1, x2, y2]`, computed for all the pairs 
+    at once.
+
+    Parameters
+    ----------
+    boxes_xyxy : ndarray
+        Bounding boxes :code:`[[x1, y1, x2, y2], ...]`, :code:`shape=(N, 4)`.
+    people : list[Person, ...] or PeopleFrame
+        A list of :class:`pyppbox.utils.persontools.Person` object, or a :class:`PeopleFrame`.
+    max_spread : int, default=128
+        The largest distance of a box and its closest person.
+
+    Returns
+    -------
+    ndarray
+        The index of the closest person in :obj:`people` of each box, the first one in case of 
+        a tie, or :code:`-1` if no person is within :obj:`max_spread`, :code:`shape=(N,)`.
+    """
+    boxes_xyxy = np.asarray(boxes_xyxy, dtype=np.float64).reshape(-1, 4)
+    if len(boxes_xyxy) == 0 or len(people) == 0:
+        return np.full(len(boxes_xyxy), -1, dtype=np.int64)
+    if isinstance(people, PeopleFrame):
+        people_boxes = people.boxes_xyxy.astype(np.float64)
+    else:
+        people_boxes = np.asarray([p.box_xyxy for p in people], dtype=np.float64).reshape(-1, 4)
+    spread = np.abs(boxes_xyxy[:, None, :] - people_boxes[None, :, :]).max(axis=2)
+    closest = spread.argmin(axis=1)
+    min_spread = spread[np.arange(len(boxes_xyxy)), closest]
+    closest[min_spread > max_spread] = -1
+    return closest
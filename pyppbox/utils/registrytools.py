@@ -0,0 +1,176 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+import os
+import weakref
+import threading
+
+from typing import Any, Callable, Dict
+from collections.abc import Hashable
+
+from pyppbox.utils.logtools import add_info_log
+
+
+class SharedModel(object):
+
+    """A thread-safe proxy of a model shared by several module objects, e.g. several
+    :class:`pyppbox.ppb.mt.MT` objects in a multithreading application. Calling the proxy or
+    any method of the wrapped model is serialized by the reentrant :attr:`lock`, while the
+    non-callable attributes are returned as is.
+
+    Attributes
+    ----------
+    key : Hashable
+        The key of the model in the :class:`ModelRegistry`.
+    model : Any
+        The wrapped model.
+    lock : threading.RLock
+        The lock used to serialize the inference on the wrapped model.
+    """
+
+    def __init__(self, key: Hashable, model: Any):
+        self.key = key
+        self.model = model
+        self.lock = threading.RLock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            return self.model(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name in ('key', 'model', 'lock'):
+            raise AttributeError(name)
+        attr = getattr(self.model, name)
+        if callable(attr):
+            def locked_attr(*args, **kwargs):
+                with self.lock:
+                    return attr(*args, **kwargs)
+            return locked_attr
+        return attr
+
+
+class ModelRegistry(object):
+
+    """A process-wide and reference-counted registry of the loaded models. A model is loaded
+    once for each key, which should be made of everything that defines the loaded weights, e.g.
+    the model file, the device, and the input size. It is unloaded when the last owner releases
+    it. Use :func:`getModelRegistry()` to get the registry of the current process.
+    """
+
+    def __init__(self):
+        self.__lock__ = threading.Lock()
+        self.__models__ = {}
+        self.__refs__ = {}
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any], owner: Any = None) -> SharedModel:
+        """Get the shared model of the given :obj:`key`, or load it by calling :obj:`factory`
+        if it is not loaded yet, and increase its reference count.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the model.
+        factory : Callable[[], Any]
+            A function which loads and returns the model.
+        owner : Any, default=None
+            An object which owns a reference, so the reference is released automatically when
+            :obj:`owner` is garbage collected. Otherwise, :meth:`release()` must be called.
+
+        Returns
+        -------
+        SharedModel
+            The shared model.
+        """
+        with self.__lock__:
+            if key not in self.__models__:
+                # Loading under the lock makes sure the same model is never loaded twice
+                self.__models__[key] = SharedModel(key, factory())
+                self.__refs__[key] = 0
+                add_info_log(f"---PYPPBOX : Model registry loaded {key}")
+            self.__refs__[key] += 1
+            shared_model = self.__models__[key]
+        if owner is not None:
+            weakref.finalize(owner, self.release, key)
+        return shared_model
+
+    def release(self, key: Hashable):
+        """Decrease the reference count of the model of the given :obj:`key`, and unload it
+        when the count reaches 0.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the model.
+        """
+        with self.__lock__:
+            if key in self.__refs__:
+                self.__refs__[key] -= 1
+                if self.__refs__[key] <= 0:
+                    del self.__refs__[key]
+                    del self.__models__[key]
+
+    def getInfo(self) -> Dict[Hashable, int]:
+        """Get the reference count of every loaded model.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`{key: reference count}`.
+        """
+        with self.__lock__:
+            return dict(self.__refs__)
+
+
+__model_registry__ = ModelRegistry()
+
+def getModelRegistry():
+    """Get the :class:`ModelRegistry` of the current process.
+
+    Returns
+    -------
+    ModelRegistry
+        The model registry of the current process.
+    """
+    return __model_registry__
+
+def acquireModel(key, factory, owner=None, shared=True):
+    """
+    :meta private:
+    """
+    if shared:
+        return __model_registry__.acquire(key, factory, owner=owner)
+    return factory()
+
+def getModelKey(*args):
+    """
+    :meta private:
+    """
+    key = []
+    for arg in args:
+        if isinstance(arg, str) and os.path.isfile(arg):
+            arg = os.path.normcase(os.path.realpath(arg))
+        elif isinstance(arg, (list, tuple)):
+            arg = tuple(arg)
+        elif not isinstance(arg, Hashable):
+            arg = str(arg)
+        key.append(arg)
+    return tuple(key)
+
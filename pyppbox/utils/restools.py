@@ -19,12 +19,18 @@
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 
+import re
+import json
+import time
+import array
+import queue
+import threading
 import numpy as np
 
 from copy import deepcopy
 
-from .persontools import Person
-from .logtools import add_info_log, add_warning_log
+from .persontools import Person, PeopleFrame
+from .logtools import add_info_log, add_warning_log, add_error_log
 from .commontools import (joinFPathFull, getGlobalRootDir, isExist, 
                           getAbsPathFDS, getTimestamp)
 
@@ -33,10 +39,70 @@ default_dump_dir = joinFPathFull(getGlobalRootDir(), "data/res/")
 default_dump_file = joinFPathFull(default_dump_dir, "res.txt")
 default_dumpall_file = joinFPathFull(default_dump_dir, "res_all.txt")
 
+def __stripID__(name):
+    # An ID with its confidence like 'Name 95%' is dumped without it
+    if '%' in name: name = name[:-4]
+    return name
+
+def formatRecord(frame, person, dump_mode=3, id_mode="deepid", include_misc=False, max_misc=5):
+    """Format a result record of a person, one line of the text file dumped by 
+    :class:`ResIO` or written by :class:`StreamResIO`.
+
+    Parameters
+    ----------
+    frame : int or str
+        A frame index.
+    person : Person
+        An object of :class:`pyppbox.utils.persontools.Person` class.
+    dump_mode : int, default=3
+        Set 1 to format: frame index, repspoint, ID(s).
+        Set 2 to format: frame index, repspoint, ID(s), box_xywh.
+        Set 3 to format: frame index, repspoint, ID(s), box_xywh, box_xyxy.
+    id_mode : str, default="deepid"
+        Set :code:`"deepid"`, :code:`"faceid"`, or :code:`"all"` for both deepid and faceid.
+    include_misc : bool, default=False
+        Set whether to include misc (Miscellaneous items).
+    max_misc : int, default=5
+        Set the maximum number of miscellaneous items to include.
+
+    Returns
+    -------
+    str
+        The record ending with a new line.
+    """
+    record = ""
+    ids = None
+    if id_mode == "deepid": ids = __stripID__(person.deepid)
+    elif id_mode == "faceid": ids = __stripID__(person.faceid)
+    elif id_mode == "all": ids = f"{__stripID__(person.deepid)}\t{__stripID__(person.faceid)}"
+    if ids is not None:
+        if dump_mode == 1:
+            record = f"{frame}\t{person.repspoint}\t{ids}\n"
+        elif dump_mode == 2:
+            record = f"{frame}\t{person.repspoint}\t{ids}\t{person.box_xywh}\n"
+        else:
+            record = f"{frame}\t{person.repspoint}\t{ids}\t{person.box_xywh}\t{person.box_xyxy}\n"
+    if include_misc:
+        if person.misc:
+            misc = person.misc[:max_misc]
+            record = record[:-1] + '\t' + '\t'.join(str(m) for m in misc) + '\n'
+    return record
+
+def __checkDumpDir__(dump_dir, caller):
+    # The absolute dump directory, or the default one if it does not exist
+    if isExist(dump_dir):
+        return getAbsPathFDS(dump_dir)
+    add_warning_log(f"-----{caller} : dump_dir='{dump_dir}' does not exist!")
+    add_warning_log(f"-----{caller} : Override dump_dir='{default_dump_dir}'.")
+    return default_dump_dir
+
+
 class ResIO(object):
 
     """
-    A class used to generate and dump results into text file.
+    A class used to generate and dump results into text file. The frame index and the x of 
+    the repspoint of every person are kept as arrays parallel to :attr:`people`, so the 
+    records are sorted by frame and x at once when they are dumped.
 
     Attributes
     ----------
@@ -45,12 +111,21 @@ class ResIO(object):
     people : list[Person, ...]
         A list of object :class:`pyppbox.utils.persontools.Person`.
     sorted_people : list[Person, ...]
-        A list used to store the sorted list of :attr:`people`.
+        The list of :attr:`people` sorted by frame index and x, in the order they are dumped.
     """
 
     def __init__(self):
-        self.frames = []
         self.people = []
+        self.__frames__ = array.array('q')
+        self.__xs__ = array.array('d')
+
+    @property
+    def frames(self):
+        return [str(f) for f in self.__frames__]
+
+    @property
+    def sorted_people(self):
+        return [self.people[i] for i in self.__sort_people_by_x__().tolist()]
 
     def addPerson(self, frame, person):
         """Add a :obj:`frame` index and a :class:`pyppbox.utils.persontools.Person` 
@@ -64,7 +139,8 @@ class ResIO(object):
             An object of :class:`pyppbox.utils.persontools.Person` class.
         """
         if isinstance(person, Person):
-            self.frames.append(str(frame))
+            self.__frames__.append(int(frame))
+            self.__xs__.append(person.repspoint[0])
             self.people.append(person)
         else:
             raise ValueError("RESIO : addPerson() -> Input 'person' is not valid.")
@@ -77,14 +153,22 @@ class ResIO(object):
         ----------
         frame : int
             A frame index.
-        people : list[Person, ...]
-            A list of object :class:`pyppbox.utils.persontools.Person`.
+        people : list[Person, ...] or PeopleFrame
+            A list of object :class:`pyppbox.utils.persontools.Person`, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame` which is copied once for all.
         """
-        if isinstance(people, list):
+        if isinstance(people, PeopleFrame):
+            # The views of one copy instead of a deep copy of every person
+            people = people.copy()
+            self.__frames__.extend([int(frame)] * len(people))
+            self.__xs__.extend(people.repspoints[:, 0].tolist())
+            self.people.extend(people)
+        elif isinstance(people, list):
             if len(people) > 0:
                 if isinstance(people[0], Person):
                     for person in people:
-                        self.frames.append(str(frame))
+                        self.__frames__.append(int(frame))
+                        self.__xs__.append(person.repspoint[0])
                         self.people.append(deepcopy(person))
                 else:
                     raise ValueError("RESIO : addPeople() -> Input 'people' is not valid.")
@@ -116,45 +200,10 @@ class ResIO(object):
             else :
                 add_warning_log(f"-----RESIO : id_mode='{id_mode}' is not recognized.")
                 add_warning_log(f"-----RESIO : Override id_mode='{id_mode}'.")
-        self.__sort_people_by_x__()
         dump_mode = int(dump_mode)
         if dump_mode < 1 and dump_mode > 3:
             add_warning_log("-----RESIO : 'dump_mode' is out of range -> Override 'dump_mode=3'")
-        with open(dump_file, 'w') as dumpfile:
-            for f, p in zip(self.frames, self.sorted_people):
-                dump_str = ""
-                if dump_mode == 1:
-                    if id_mode == "deepid": 
-                        tmp_deepid = p.deepid
-                        if '%' in tmp_deepid: tmp_deepid = tmp_deepid[:-4]
-                        dump_str = f"{f}\t{p.repspoint}\t{tmp_deepid}\n"
-                    elif id_mode == "faceid": 
-                        tmp_faceid = p.faceid
-                        if '%' in tmp_faceid: tmp_faceid = tmp_faceid[:-4]
-                        dump_str = f"{f}\t{p.repspoint}\t{tmp_faceid}\n"
-                elif dump_mode == 2:
-                    if id_mode == "deepid": 
-                        tmp_deepid = p.deepid
-                        if '%' in tmp_deepid: tmp_deepid = tmp_deepid[:-4]
-                        dump_str = f"{f}\t{p.repspoint}\t{tmp_deepid}\t{p.box_xywh}\n"
-                    elif id_mode == "faceid": 
-                        tmp_faceid = p.faceid
-                        if '%' in tmp_faceid: tmp_faceid = tmp_faceid[:-4]
-                        dump_str = f"{f}\t{p.repspoint}\t{tmp_faceid}\t{p.box_xywh}\n"
-                else:
-                    if id_mode == "deepid": 
-                        tmp_deepid = p.deepid
-                        if '%' in tmp_deepid: tmp_deepid = tmp_deepid[:-4]
-                        dump_str = f"{f}\t{p.repspoint}\t{tmp_deepid}\t{p.box_xywh}\t{p.box_xyxy}\n"
-                    elif id_mode == "faceid": 
-                        tmp_faceid = p.faceid
-                        if '%' in tmp_faceid: tmp_faceid = tmp_faceid[:-4]
-                        dump_str = f"{f}\t{p.repspoint}\t{tmp_faceid}\t{p.box_xywh}\t{p.box_xyxy}\n"
-                if include_misc:
-                    if p.misc:
-                        misc = p.misc[:max_misc]
-                        dump_str = dump_str[:-1] + '\t' + '\t'.join(str(m) for m in misc) + '\n'
-                dumpfile.write(dump_str)
+        self.__write__(dump_file, dump_mode, id_mode, include_misc, max_misc)
         add_info_log(f"-----RESIO : Successfully dump to '{dump_file}'")
 
     def dumpAll(self, dump_dir=default_dump_dir, dump_mode=3, include_misc=False, max_misc=5):
@@ -176,64 +225,699 @@ class ResIO(object):
         """
         dump_file = self.__generateFileName__(dump_dir)
         dump_mode = int(dump_mode)
-        self.__sort_people_by_x__()
         if dump_mode < 1 and dump_mode > 3:
             add_warning_log("-----RESIO : 'dump_mode' is out of range -> Override 'dump_mode=3'")
-        with open(dump_file, 'w') as dumpfile:
-            for f, p in zip(self.frames, self.sorted_people):
-                dump_str = ""
-                tmp_deepid = p.deepid
-                tmp_faceid = p.faceid
-                if '%' in tmp_deepid: tmp_deepid = tmp_deepid[:-4]
-                if '%' in tmp_faceid: tmp_faceid = tmp_faceid[:-4]
-                if dump_mode == 1:
-                    dump_str = f"{f}\t{p.repspoint}\t{tmp_deepid}\t{tmp_faceid}\n"
-                elif dump_mode == 2:
-                    dump_str = f"{f}\t{p.repspoint}\t{tmp_deepid}\t{tmp_faceid}\t{p.box_xywh}\n"
-                else:
-                    dump_str = f"{f}\t{p.repspoint}\t{tmp_deepid}\t{tmp_faceid}\t{p.box_xywh}\t{p.box_xyxy}\n"
-                if include_misc:
-                    if p.misc:
-                        misc = p.misc[:max_misc]
-                        dump_str = dump_str[:-1] + '\t' + '\t'.join(str(m) for m in misc) + '\n'
-                dumpfile.write(dump_str)
+        self.__write__(dump_file, dump_mode, "all", include_misc, max_misc)
         add_info_log(f"-----RESIO : Successfully dump to '{dump_file}'")
 
     def __generateFileName__(self, dump_dir=default_dump_dir):
         timestamp = getTimestamp()
         dump_file_name = f"res_{timestamp}_full.txt"
-        if isExist(dump_dir):
-            dump_dir = getAbsPathFDS(dump_dir)
-        else:
-            add_warning_log(f"-----RESIO : dump_dir='{dump_dir}' does not exist!")
-            dump_dir = default_dump_dir
-            add_warning_log(f"-----RESIO : Override dump_dir='{dump_dir}'.")
+        dump_dir = __checkDumpDir__(dump_dir, "RESIO")
         dump_file_name = joinFPathFull(dump_dir, dump_file_name)
         return dump_file_name
 
     def __sort_people_by_x__(self):
-        self.sorted_people = []
-        tmp_x = []
-        tmp_pp = []
-        len_frames = len(self.frames)
-        if len_frames > 0:
-            current_frame = int(self.frames[0])
-            previous_frame = int(self.frames[0])
-            for frame, person in zip(self.frames, self.people):
-                (x, _) = person.repspoint
-                current_frame = int(frame)
-                if current_frame == previous_frame:
-                    tmp_pp.append(person)
-                    tmp_x.append(x)
-                elif current_frame > previous_frame:
-                    previous_frame = current_frame
-                    sorted_idx = np.argsort(tmp_x)
-                    tmp_pp_np = np.array(tmp_pp)[sorted_idx]
-                    self.sorted_people = self.sorted_people + tmp_pp_np.tolist()
-                    tmp_pp = []
-                    tmp_x = []
-                    tmp_pp.append(person)
-                    tmp_x.append(x)
-            sorted_idx = np.argsort(tmp_x)
-            tmp_pp_np = np.array(tmp_pp)[sorted_idx]
-            self.sorted_people = self.sorted_people + tmp_pp_np.tolist()
+        # The record indexes sorted by frame, then by x, keeping the order they were added in
+        return np.lexsort((np.array(self.__xs__, dtype=np.float64), np.array(self.__frames__, dtype=np.int64)))
+
+    def __write__(self, dump_file, dump_mode, id_mode, include_misc, max_misc, block_size=65536):
+        # Format the sorted records block by block straight into the file
+        order = self.__sort_people_by_x__()
+        frames = np.array(self.__frames__, dtype=np.int64)
+        with open(dump_file, 'w') as dumpfile:
+            for start in range(0, len(order), block_size):
+                block = order[start:start + block_size]
+                dumpfile.writelines([formatRecord(f, self.people[i], dump_mode, id_mode, include_misc, max_misc) 
+                                     for f, i in zip(frames[block].tolist(), block.tolist())])
+
+
+class StreamResIO(object):
+
+    """
+    A class used to write the results into text files while running, instead of keeping them 
+    in memory until :meth:`ResIO.dump()`. The records have the same layouts as the ones of 
+    :meth:`ResIO.dump()` and :meth:`ResIO.dumpAll()`. The people of a frame are formatted as 
+    they are added, sorted by x once the frame is complete, i.e. when the people of another 
+    frame are added, and written by a background thread through a bounded queue, so the 
+    memory use stays constant. The files rotate by size or time, always between two frames.
+
+    Attributes
+    ----------
+    files : list[str, ...]
+        The files written so far.
+    """
+
+    def __init__(
+        self, 
+        dump_dir=default_dump_dir, 
+        dump_mode=3, 
+        id_mode="deepid", 
+        include_misc=False, 
+        max_misc=5, 
+        max_bytes=0, 
+        max_seconds=0, 
+        queue_size=64
+    ):
+        """Start the background writer. Call :meth:`close()` at the end, or use it as a 
+        context manager, so the last frame is written.
+
+        Parameters
+        ----------
+        dump_dir : str, default='{pyppbox root}/data/res'
+            A directory where to write the result text files.
+        dump_mode : int, default=3
+            Set 1 to write: frame index, repspoint, ID(s).
+            Set 2 to write: frame index, repspoint, ID(s), box_xywh.
+            Set 3 to write: frame index, repspoint, ID(s), box_xywh, box_xyxy.
+        id_mode : str, default="deepid"
+            Set :code:`"deepid"`, :code:`"faceid"`, or :code:`"all"` for both deepid and faceid 
+            like :meth:`ResIO.dumpAll()`.
+        include_misc : bool, default=False
+            Set whether to include misc (Miscellaneous items).
+        max_misc : int, default=5
+            Set the maximum number of miscellaneous items to include.
+        max_bytes : int, default=0
+            Start a new file once the current one reaches :obj:`max_bytes` bytes, or never if 
+            :code:`0`.
+        max_seconds : float, default=0
+            Start a new file once the current one is :obj:`max_seconds` seconds old, or never 
+            if :code:`0`.
+        queue_size : int, default=64
+            Maximum number of complete frames waiting for the writer, adding people waits when 
+            the queue is full.
+        """
+        id_mode = str(id_mode).lower()
+        if id_mode not in ("deepid", "faceid", "all"):
+            msg = f"StreamResIO : __init__() -> id_mode='{id_mode}' is not supported, use 'deepid', 'faceid', or 'all'."
+            add_error_log(msg)
+            raise ValueError(msg)
+        if queue_size < 1:
+            msg = f"StreamResIO : __init__() -> queue_size={queue_size} must be >= 1."
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.dump_dir = __checkDumpDir__(dump_dir, "STREAMRESIO")
+        self.dump_mode = int(dump_mode)
+        self.id_mode = id_mode
+        self.include_misc = include_misc
+        self.max_misc = max_misc
+        self.max_bytes = int(max_bytes)
+        self.max_seconds = float(max_seconds)
+        self.files = []
+        self.__timestamp__ = getTimestamp()
+        self.__frame__ = None
+        self.__xs__ = []
+        self.__records__ = []
+        self.__error__ = None
+        self.__closed__ = False
+        self.__queue__ = queue.Queue(maxsize=queue_size)
+        self.__writer__ = threading.Thread(target=self.__write__, name="pyppbox-streamresio", daemon=True)
+        self.__writer__.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def addPerson(self, frame, person):
+        """Add a :obj:`frame` index and a :class:`pyppbox.utils.persontools.Person` object in 
+        that :obj:`frame` index. The person is formatted at once, so it can still be changed 
+        afterwards.
+
+        Parameters
+        ----------
+        frame : int
+            A frame index.
+        person : Person
+            An object of :class:`pyppbox.utils.persontools.Person` class.
+        """
+        if not isinstance(person, Person):
+            raise ValueError("STREAMRESIO : addPerson() -> Input 'person' is not valid.")
+        self.__addRecords__(frame, [person])
+
+    def addPeople(self, frame, people):
+        """Add a frame index and a list of :class:`pyppbox.utils.persontools.Person` object in 
+        that :obj:`frame` index. The people are formatted at once, so they can still be changed 
+        afterwards.
+
+        Parameters
+        ----------
+        frame : int
+            A frame index.
+        people : list[Person, ...] or PeopleFrame
+            A list of object :class:`pyppbox.utils.persontools.Person`, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame`.
+        """
+        if isinstance(people, (list, PeopleFrame)):
+            if len(people) > 0:
+                if isinstance(people[0], Person):
+                    self.__addRecords__(frame, people)
+                else:
+                    raise ValueError("STREAMRESIO : addPeople() -> Input 'people' is not valid.")
+
+    def flush(self):
+        """Complete the current frame and wait until everything added so far is written.
+        """
+        self.__complete__()
+        self.__queue__.join()
+        self.__raise__()
+
+    def close(self):
+        """Write everything added so far and stop the background writer.
+        """
+        if self.__closed__: return
+        self.__complete__()
+        self.__closed__ = True
+        self.__queue__.put(None)
+        self.__writer__.join()
+        self.__raise__()
+
+    def __addRecords__(self, frame, people):
+        if self.__closed__:
+            raise ValueError("STREAMRESIO : addPeople() -> The writer is closed.")
+        frame = str(frame)
+        if frame != self.__frame__:
+            self.__complete__()
+            self.__frame__ = frame
+        for person in people:
+            self.__xs__.append(person.repspoint[0])
+            self.__records__.append(formatRecord(frame, person, self.dump_mode, self.id_mode, 
+                                                 self.include_misc, self.max_misc))
+
+    def __complete__(self):
+        # Sort the people of the current frame by x like ResIO.dump() and queue them
+        if len(self.__records__) > 0:
+            self.__raise__()
+            sorted_idx = np.argsort(self.__xs__, kind='stable')
+            self.__queue__.put(''.join([self.__records__[i] for i in sorted_idx.tolist()]))
+        self.__xs__ = []
+        self.__records__ = []
+
+    def __raise__(self):
+        if self.__error__ is not None:
+            msg = f"STREAMRESIO : Failed to write the results -> {self.__error__}"
+            add_error_log(msg)
+            raise IOError(msg)
+
+    def __write__(self):
+        # The background writer, a chunk is all the records of a frame
+        dumpfile = None
+        size = 0
+        opened = 0.0
+        while True:
+            chunk = self.__queue__.get()
+            try:
+                if chunk is None: break
+                if self.__error__ is not None: continue
+                if dumpfile is not None and ((self.max_bytes > 0 and size >= self.max_bytes) or 
+                    (self.max_seconds > 0 and time.monotonic() - opened >= self.max_seconds)):
+                    dumpfile.close()
+                    dumpfile = None
+                if dumpfile is None:
+                    dump_file = joinFPathFull(self.dump_dir, f"res_{self.__timestamp__}_{len(self.files):04d}.txt")
+                    dumpfile = open(dump_file, 'w')
+                    self.files.append(dump_file)
+                    size = 0
+                    opened = time.monotonic()
+                    add_info_log(f"-----STREAMRESIO : Writing to '{dump_file}'")
+                dumpfile.write(chunk)
+                size += len(chunk.encode())
+                # Nothing is left in the buffer while waiting, so a crash loses nothing written
+                if self.__queue__.empty(): dumpfile.flush()
+            except Exception as e:
+                self.__error__ = e
+            finally:
+                self.__queue__.task_done()
+        if dumpfile is not None: dumpfile.close()
+
+
+#############################################################################################################
+
+
+__bin_magic__ = b"PPBXRES\x01"
+__bin_align__ = 64
+
+def __textColumns__(dump_mode, id_mode):
+    # The columns of a record in the text layout of formatRecord()
+    columns = ["frame", "repspoint"]
+    if id_mode == "all": columns += ["deepid", "faceid"]
+    else: columns.append(id_mode)
+    if dump_mode >= 2: columns.append("box_xywh")
+    if dump_mode >= 3: columns.append("box_xyxy")
+    return columns
+
+def __checkBinLayout__(dump_mode, id_mode, caller):
+    # The dump_mode and id_mode of a binary result file, like the text ones of formatRecord()
+    id_mode = str(id_mode).lower()
+    if id_mode not in ("deepid", "faceid", "all"):
+        msg = f"{caller} -> id_mode='{id_mode}' is not supported, use 'deepid', 'faceid', or 'all'."
+        add_error_log(msg)
+        raise ValueError(msg)
+    dump_mode = int(dump_mode)
+    if dump_mode not in (1, 2, 3):
+        msg = f"{caller} -> dump_mode={dump_mode} is not supported, use 1, 2, or 3."
+        add_error_log(msg)
+        raise ValueError(msg)
+    return dump_mode, id_mode
+
+def __encodeIDs__(names, table):
+    # Dictionary-encode the names with the {name: code} table, which grows
+    return np.asarray([table.setdefault(name, len(table)) for name in names], dtype=np.int32)
+
+def __writeBin__(bin_file, dump_mode, id_mode, frames, cids, repspoints, boxes_xywh, boxes_xyxy, 
+                 deepid_codes, faceid_codes, deepid_names, faceid_names):
+    # Group the records by frame, keeping their order within a frame, then write the header 
+    # and the aligned columns
+    order = np.argsort(frames, kind='stable')
+    frames = frames[order]
+    frame_index, frame_starts = np.unique(frames, return_index=True)
+    columns = {
+        "frames": frames,
+        "cids": cids[order],
+        "repspoints": repspoints[order],
+        "frame_index": frame_index.astype(np.int64),
+        "frame_offsets": np.append(frame_starts, len(frames)).astype(np.int64),
+    }
+    if dump_mode >= 2: columns["boxes_xywh"] = boxes_xywh[order]
+    if dump_mode >= 3: columns["boxes_xyxy"] = boxes_xyxy[order]
+    if id_mode in ("deepid", "all"): columns["deepid_codes"] = deepid_codes[order]
+    if id_mode in ("faceid", "all"): columns["faceid_codes"] = faceid_codes[order]
+    layout = {}
+    offset = 0
+    for name, column in columns.items():
+        layout[name] = [column.dtype.str, list(column.shape), offset]
+        offset += -(-column.nbytes // __bin_align__) * __bin_align__
+    header = json.dumps({
+        "version": 1, 
+        "dump_mode": dump_mode, 
+        "id_mode": id_mode, 
+        "records": len(frames), 
+        "columns": layout, 
+        "deepid_names": deepid_names, 
+        "faceid_names": faceid_names
+    }).encode()
+    start = -(-(len(__bin_magic__) + 8 + len(header)) // __bin_align__) * __bin_align__
+    with open(bin_file, 'wb') as binfile:
+        binfile.write(__bin_magic__)
+        binfile.write(np.uint64(len(header)).tobytes())
+        binfile.write(header)
+        for name, column in columns.items():
+            binfile.seek(start + layout[name][2])
+            binfile.write(np.ascontiguousarray(column).tobytes())
+        binfile.truncate(start + offset)
+
+def __formatBox__(box):
+    # A box like the str() of its int ndarray, e.g. '[593 241  89 270]'
+    values = [str(v) for v in box]
+    width = max(len(v) for v in values)
+    return '[' + ' '.join(v.rjust(width) for v in values) + ']'
+
+def __parseColumn__(column, size):
+    # All the points or boxes of a text column at once, like convertStringToNPL()
+    text = " ".join(column)
+    for c in "#[](),": text = text.replace(c, " ")
+    return np.asarray(text.split(), dtype=float).astype(np.int32).reshape(-1, size)
+
+def isBinRes(res_file):
+    """Return whether a file is a binary result file written by :class:`BinResWriter` or 
+    :func:`convertRes2Bin()`.
+
+    Parameters
+    ----------
+    res_file : str
+        A file path.
+
+    Returns
+    -------
+    bool
+        :code:`True` if the file starts with the binary result header.
+    """
+    try:
+        with open(res_file, 'rb') as resfile:
+            return resfile.read(len(__bin_magic__)) == __bin_magic__
+    except OSError:
+        return False
+
+
+class BinResWriter(object):
+
+    """
+    A class used to write the results into a binary columnar file instead of the text file of 
+    :class:`ResIO`. The records are the ones of :meth:`ResIO.dump()`, sorted by x in each frame, 
+    but every field is stored as an :code:`int32` column: frames, cids, repspoints, boxes, and 
+    the deepids and faceids as codes into their tables of names. An index of the frames and 
+    their offsets lets :class:`BinResReader` find the records of a frame without reading the 
+    others. The people of a frame are converted to arrays once the frame is complete, and the 
+    file is written by :meth:`close()`.
+
+    Attributes
+    ----------
+    bin_file : str
+        The path of the binary result file.
+    dump_mode : int
+        1, 2, or 3, which columns of boxes are written like :meth:`ResIO.dump()`.
+    id_mode : str
+        :code:`"deepid"`, :code:`"faceid"`, or :code:`"all"`.
+    """
+
+    def __init__(self, bin_file, dump_mode=3, id_mode="all"):
+        """Initialize the writer of :obj:`bin_file`. Call :meth:`close()` at the end, or use 
+        it as a context manager, so the file is written.
+
+        Parameters
+        ----------
+        bin_file : str
+            A file path of the binary result file.
+        dump_mode : int, default=3
+            Set 1 to write: frame index, cid, repspoint, ID(s).
+            Set 2 to write: frame index, cid, repspoint, ID(s), box_xywh.
+            Set 3 to write: frame index, cid, repspoint, ID(s), box_xywh, box_xyxy.
+        id_mode : str, default="all"
+            Set :code:`"deepid"`, :code:`"faceid"`, or :code:`"all"` for both deepid and faceid.
+        """
+        self.dump_mode, self.id_mode = __checkBinLayout__(dump_mode, id_mode, "BinResWriter : __init__()")
+        self.bin_file = bin_file
+        self.__frame__ = None
+        self.__people__ = []
+        self.__chunks__ = []
+        self.__deepids__ = {}
+        self.__faceids__ = {}
+        self.__closed__ = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def addPerson(self, frame, person):
+        """Add a :obj:`frame` index and a :class:`pyppbox.utils.persontools.Person` object in 
+        that :obj:`frame` index.
+
+        Parameters
+        ----------
+        frame : int
+            A frame index.
+        person : Person
+            An object of :class:`pyppbox.utils.persontools.Person` class.
+        """
+        if not isinstance(person, Person):
+            raise ValueError("BINRESWRITER : addPerson() -> Input 'person' is not valid.")
+        self.__addRecords__(frame, [person])
+
+    def addPeople(self, frame, people):
+        """Add a frame index and a list of :class:`pyppbox.utils.persontools.Person` object in 
+        that :obj:`frame` index.
+
+        Parameters
+        ----------
+        frame : int
+            A frame index.
+        people : list[Person, ...] or PeopleFrame
+            A list of object :class:`pyppbox.utils.persontools.Person`, or a 
+            :class:`pyppbox.utils.persontools.PeopleFrame`.
+        """
+        if isinstance(people, (list, PeopleFrame)):
+            if len(people) > 0:
+                if isinstance(people[0], Person):
+                    self.__addRecords__(frame, people)
+                else:
+                    raise ValueError("BINRESWRITER : addPeople() -> Input 'people' is not valid.")
+
+    def close(self):
+        """Write the binary result file with everything added so far.
+        """
+        if self.__closed__: return
+        self.__complete__()
+        self.__closed__ = True
+        if len(self.__chunks__) > 0:
+            columns = [np.concatenate(c) for c in zip(*self.__chunks__)]
+        else:
+            columns = [np.zeros((0, ), np.int32), np.zeros((0, ), np.int32), 
+                       np.zeros((0, 2), np.int32), np.zeros((0, 4), np.int32), 
+                       np.zeros((0, 4), np.int32), np.zeros((0, ), np.int32), 
+                       np.zeros((0, ), np.int32)]
+        __writeBin__(self.bin_file, self.dump_mode, self.id_mode, *columns, 
+                     list(self.__deepids__), list(self.__faceids__))
+        self.__chunks__ = []
+        add_info_log(f"-----BINRESWRITER : Successfully dump to '{self.bin_file}'")
+
+    def __addRecords__(self, frame, people):
+        if self.__closed__:
+            raise ValueError("BINRESWRITER : addPeople() -> The writer is closed.")
+        frame = int(frame)
+        if frame != self.__frame__:
+            self.__complete__()
+            self.__frame__ = frame
+        self.__people__.extend(people)
+
+    def __complete__(self):
+        # Convert the people of the current frame to arrays, sorted by x like ResIO.dump()
+        people = self.__people__
+        if len(people) == 0: return
+        self.__people__ = []
+        repspoints = np.asarray([p.repspoint for p in people], dtype=np.int32).reshape(-1, 2)
+        sorted_idx = np.argsort(repspoints[:, 0], kind='stable')
+        people = [people[i] for i in sorted_idx.tolist()]
+        boxes_xywh = np.zeros((len(people), 4), np.int32)
+        boxes_xyxy = np.zeros((len(people), 4), np.int32)
+        try:
+            if self.dump_mode >= 2:
+                boxes_xywh = np.asarray([p.box_xywh for p in people], dtype=np.int32).reshape(-1, 4)
+            if self.dump_mode >= 3:
+                boxes_xyxy = np.asarray([p.box_xyxy for p in people], dtype=np.int32).reshape(-1, 4)
+        except ValueError:
+            msg = f"BINRESWRITER : addPeople() -> A person in frame {self.__frame__} has no valid box."
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.__chunks__.append((
+            np.full(len(people), self.__frame__, np.int32), 
+            np.asarray([p.cid for p in people], dtype=np.int32), 
+            repspoints[sorted_idx], 
+            boxes_xywh, 
+            boxes_xyxy, 
+            __encodeIDs__([__stripID__(p.deepid) for p in people], self.__deepids__), 
+            __encodeIDs__([__stripID__(p.faceid) for p in people], self.__faceids__)
+        ))
+
+
+class BinResReader(object):
+
+    """
+    A class used to read a binary result file written by :class:`BinResWriter` or 
+    :func:`convertRes2Bin()`. The file is memory-mapped and every column is a read-only 
+    :obj:`ndarray` over the mapping, so nothing is parsed or copied until it is used.
+
+    Attributes
+    ----------
+    bin_file : str
+        The path of the binary result file.
+    dump_mode : int
+        1, 2, or 3, which columns of boxes are stored like :meth:`ResIO.dump()`.
+    id_mode : str
+        :code:`"deepid"`, :code:`"faceid"`, or :code:`"all"`.
+    text_columns : list[str, ...]
+        The names of the columns of a record in the text layout of :meth:`ResIO.dump()`, 
+        e.g. :code:`["frame", "repspoint", "deepid", "box_xywh", "box_xyxy"]`.
+    frames : ndarray
+        The frame index of each record, :code:`shape=(N,)`, :code:`dtype=int32`.
+    cids : ndarray
+        The cid of each record, :code:`-1` if it is unknown, :code:`shape=(N,)`, 
+        :code:`dtype=int32`.
+    repspoints : ndarray
+        The repspoints, :code:`shape=(N, 2)`, :code:`dtype=int32`.
+    boxes_xywh : ndarray or None
+        The boxes :code:`[x, y, width, height]`, :code:`shape=(N, 4)`, :code:`dtype=int32`, 
+        or :code:`None` if :attr:`dump_mode` < 2.
+    boxes_xyxy : ndarray or None
+        The boxes :code:`[x1, y1, x2, y2]`, :code:`shape=(N, 4)`, :code:`dtype=int32`, 
+        or :code:`None` if :attr:`dump_mode` < 3.
+    deepid_codes : ndarray or None
+        The codes of the deepids in :attr:`deepid_names`, :code:`shape=(N,)`, 
+        :code:`dtype=int32`, or :code:`None` if there is no deepid.
+    faceid_codes : ndarray or None
+        The codes of the faceids in :attr:`faceid_names`, :code:`shape=(N,)`, 
+        :code:`dtype=int32`, or :code:`None` if there is no faceid.
+    deepid_names : list[str, ...]
+        The table of the deepids.
+    faceid_names : list[str, ...]
+        The table of the faceids.
+    frame_index : ndarray
+        The sorted frame indexes which have records, :code:`shape=(F,)`, :code:`dtype=int64`.
+    frame_offsets : ndarray
+        The records of :code:`frame_index[i]` are the ones from :code:`frame_offsets[i]` to 
+        :code:`frame_offsets[i + 1]`, :code:`shape=(F + 1,)`, :code:`dtype=int64`.
+    """
+
+    def __init__(self, bin_file):
+        """Map the binary result file.
+
+        Parameters
+        ----------
+        bin_file : str
+            A file path of the binary result file.
+        """
+        if not isBinRes(bin_file):
+            msg = f"BinResReader : __init__() -> '{bin_file}' is not a binary result file."
+            add_error_log(msg)
+            raise ValueError(msg)
+        self.bin_file = bin_file
+        mapping = np.memmap(bin_file, dtype=np.uint8, mode='r')
+        header_size = int(mapping[len(__bin_magic__):len(__bin_magic__) + 8].view('<u8')[0])
+        header_end = len(__bin_magic__) + 8 + header_size
+        header = json.loads(bytes(mapping[len(__bin_magic__) + 8:header_end]).decode())
+        start = -(-header_end // __bin_align__) * __bin_align__
+        self.dump_mode = header["dump_mode"]
+        self.id_mode = header["id_mode"]
+        self.text_columns = __textColumns__(self.dump_mode, self.id_mode)
+        self.deepid_names = header["deepid_names"]
+        self.faceid_names = header["faceid_names"]
+        self.boxes_xywh = None
+        self.boxes_xyxy = None
+        self.deepid_codes = None
+        self.faceid_codes = None
+        for name, (dtype, shape, offset) in header["columns"].items():
+            setattr(self, name, np.ndarray(tuple(shape), dtype=np.dtype(dtype), 
+                                           buffer=mapping, offset=start + offset))
+
+    def __len__(self):
+        return len(self.frames)
+
+    def findFrame(self, frame):
+        """Return the records of a frame as a slice of the columns.
+
+        Parameters
+        ----------
+        frame : int
+            A frame index.
+
+        Returns
+        -------
+        slice
+            The slice of the records in the :obj:`frame`, which is empty if there is none.
+        """
+        i = int(np.searchsorted(self.frame_index, frame))
+        if i < len(self.frame_index) and self.frame_index[i] == frame:
+            return slice(int(self.frame_offsets[i]), int(self.frame_offsets[i + 1]))
+        return slice(0, 0)
+
+    def getIDs(self, id_mode="deepid", records=slice(None)):
+        """Return the deepids or faceids of the records.
+
+        Parameters
+        ----------
+        id_mode : str, default="deepid"
+            Set :code:`"deepid"` or :code:`"faceid"`.
+        records : slice or ndarray, default=slice(None)
+            The records, all of them by default.
+
+        Returns
+        -------
+        list[str, ...]
+            The IDs of the :obj:`records`.
+        """
+        codes = self.deepid_codes if id_mode == "deepid" else self.faceid_codes
+        names = self.deepid_names if id_mode == "deepid" else self.faceid_names
+        if codes is None:
+            msg = f"BinResReader : getIDs() -> '{self.bin_file}' has no {id_mode}."
+            add_error_log(msg)
+            raise ValueError(msg)
+        return [names[c] for c in codes[records].tolist()]
+
+    def getPeople(self, frame):
+        """Return the people of a frame.
+
+        Parameters
+        ----------
+        frame : int
+            A frame index.
+
+        Returns
+        -------
+        list[Person, ...]
+            A list of :class:`pyppbox.utils.persontools.Person` object, where the missing 
+            columns keep their default values.
+        """
+        records = self.findFrame(frame)
+        people = []
+        for i in range(records.start, records.stop):
+            person = Person(int(self.cids[i]), int(self.cids[i]), 
+                            repspoint=tuple(self.repspoints[i].tolist()))
+            if self.boxes_xywh is not None: person.box_xywh = np.array(self.boxes_xywh[i], dtype=int)
+            if self.boxes_xyxy is not None: person.box_xyxy = np.array(self.boxes_xyxy[i], dtype=int)
+            if self.deepid_codes is not None: person.deepid = self.deepid_names[self.deepid_codes[i]]
+            if self.faceid_codes is not None: person.faceid = self.faceid_names[self.faceid_codes[i]]
+            people.append(person)
+        return people
+
+
+def convertRes2Bin(res_txt, bin_file, dump_mode=3, id_mode="deepid"):
+    """Convert a result text file of :class:`ResIO`, or a GT (Ground-truth) text file in the 
+    same layout, into a binary result file. The lines are split in one pass and every column 
+    is parsed at once. The cids are unknown in the text files and set to :code:`-1`, and the 
+    miscellaneous items are dropped.
+
+    Parameters
+    ----------
+    res_txt : str
+        A file path of the result text file.
+    bin_file : str
+        A file path of the binary result file to write.
+    dump_mode : int, default=3
+        The :obj:`dump_mode` used to dump the :obj:`res_txt`.
+    id_mode : str, default="deepid"
+        The :obj:`id_mode` used to dump the :obj:`res_txt`, :code:`"all"` for 
+        :meth:`ResIO.dumpAll()`. A GT (Ground-truth) file is like :code:`"deepid"`.
+    """
+    dump_mode, id_mode = __checkBinLayout__(dump_mode, id_mode, "convertRes2Bin()")
+    names = __textColumns__(dump_mode, id_mode)
+    try:
+        with open(res_txt, 'r') as resfile:
+            lines = [re.split(r'\t+', line.replace("\n", "")) for line in resfile if line.strip()]
+        columns = dict(zip(names, zip(*[line[:len(names)] for line in lines])))
+        if len(lines) > 0 and len(columns) < len(names):
+            raise ValueError(f"A line has less than {len(names)} columns")
+        frames = np.asarray(columns.get("frame", ()), dtype=np.int32)
+        deepids = {}
+        faceids = {}
+        __writeBin__(
+            bin_file, dump_mode, id_mode, 
+            frames, 
+            np.full(len(frames), -1, np.int32), 
+            __parseColumn__(columns.get("repspoint", ()), 2), 
+            __parseColumn__(columns.get("box_xywh", ()), 4) if dump_mode >= 2 else None, 
+            __parseColumn__(columns.get("box_xyxy", ()), 4) if dump_mode >= 3 else None, 
+            __encodeIDs__(columns.get("deepid", ()), deepids), 
+            __encodeIDs__(columns.get("faceid", ()), faceids), 
+            list(deepids), 
+            list(faceids)
+        )
+    except Exception as e:
+        msg = f"convertRes2Bin() -> {e}"
+        add_error_log(msg)
+        raise ValueError(msg)
+    add_info_log(f"-----RESIO : Converted '{res_txt}' -> '{bin_file}'")
+
+def convertBin2Res(bin_file, res_txt):
+    """Convert a binary result file into a result text file in the layout of 
+    :meth:`ResIO.dump()`, or :meth:`ResIO.dumpAll()` if it has both deepids and faceids.
+
+    Parameters
+    ----------
+    bin_file : str
+        A file path of the binary result file.
+    res_txt : str
+        A file path of the result text file to write.
+    """
+    reader = BinResReader(bin_file)
+    columns = [[str(f) for f in reader.frames.tolist()], 
+               [f"({x}, {y})" for x, y in reader.repspoints.tolist()]]
+    if reader.deepid_codes is not None: columns.append(reader.getIDs("deepid"))
+    if reader.faceid_codes is not None: columns.append(reader.getIDs("faceid"))
+    if reader.boxes_xywh is not None: columns.append([__formatBox__(b) for b in reader.boxes_xywh.tolist()])
+    if reader.boxes_xyxy is not None: columns.append([__formatBox__(b) for b in reader.boxes_xyxy.tolist()])
+    with open(res_txt, 'w') as resfile:
+        for record in zip(*columns):
+            resfile.write('\t'.join(record) + '\n')
+    add_info_log(f"-----RESIO : Converted '{bin_file}' -> '{res_txt}'")
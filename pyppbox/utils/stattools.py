@@ -0,0 +1,238 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#                                                                           #
+#   pyppbox: Toolbox for people detecting, tracking, and re-identifying.    #
+#   Copyright (C) 2025 UMONS-Numediart                                      #
+#                                                                           #
+#   This program is free software: you can redistribute it and/or modify    #
+#   it under the terms of the GNU General Public License as published by    #
+#   the Free Software Foundation, either version 3 of the License, or       #
+#   (at your option) any later version.                                     #
+#                                                                           #
+#   This program is distributed in the hope that it will be useful,         #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#   GNU General Public License for more details.                            #
+#                                                                           #
+#   You should have received a copy of the GNU General Public License       #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                           #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+import time
+import threading
+import numpy as np
+
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Dict
+
+
+class RollingHistogram(object):
+
+    """A histogram of the most recent values, plus the count and the sum of all the values.
+
+    Attributes
+    ----------
+    values : collections.deque
+        The most recent values.
+    count : int
+        Number of all the added values.
+    total : float
+        Sum of all the added values.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.values = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.values.append(value)
+        self.count += 1
+        self.total += value
+
+    def getDocument(self, digits=3) -> Dict[str, Any]:
+        """Return a summary of the histogram.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`count` and :code:`mean` of all the values, and :code:`p50`,
+            :code:`p90`, :code:`p99`, :code:`max` of the most recent values.
+        """
+        doc = {'count': self.count, 'mean': 0.0, 'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+        if self.count > 0:
+            values = np.asarray(self.values, dtype=np.float64)
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            doc['mean'] = round(self.total / self.count, digits)
+            doc['p50'] = round(float(p50), digits)
+            doc['p90'] = round(float(p90), digits)
+            doc['p99'] = round(float(p99), digits)
+            doc['max'] = round(float(values.max()), digits)
+        return doc
+
+
+class StageTimer(object):
+
+    """
+    :meta private:
+    """
+
+    __slots__ = ('stats', 'name', 'start')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.addTime(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class MyStats(object):
+
+    """A thread-safe recorder of the timings (in milliseconds) of named stages, the values such as
+    the number of people per frame, and the counters such as the swallowed exceptions. The names
+    use dots for the sub-stages, e.g. :code:`'detect'` and :code:`'detect.predict'`.
+
+    Example:
+
+    >>> stats = MyStats()
+    >>> with stats.timer('detect'):
+    >>>     ...
+    >>> stats.observe('people_per_frame', 5)
+    >>> stats.count('reid.exceptions')
+    >>> print(stats.getStats())
+    >>>
+
+    """
+
+    enabled = True
+
+    def __init__(self, window: int = 1000):
+        """Initialize the recorder.
+
+        Parameters
+        ----------
+        window : int, default=1000
+            Number of the most recent values kept by each histogram to compute the percentiles.
+        """
+        self.window = window
+        self.__lock__ = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all the recorded timings, values, and counters.
+        """
+        with self.__lock__:
+            self.__timings__ = {}
+            self.__values__ = {}
+            self.__counters__ = {}
+
+    def timer(self, name: str):
+        """Return a context manager which records the time spent in its block.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        """
+        return StageTimer(self, name)
+
+    def addTime(self, name: str, seconds: float):
+        """Record a timing of a stage.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        seconds : float
+            The time spent in seconds.
+        """
+        with self.__lock__:
+            if name not in self.__timings__: self.__timings__[name] = RollingHistogram(self.window)
+            self.__timings__[name].add(1000 * seconds)
+
+    def observe(self, name: str, value: float):
+        """Record a value, e.g. the number of people per frame.
+
+        Parameters
+        ----------
+        name : str
+            Name of the value.
+        value : float
+            The value.
+        """
+        with self.__lock__:
+            if name not in self.__values__: self.__values__[name] = RollingHistogram(self.window)
+            self.__values__[name].add(value)
+
+    def count(self, name: str, n: int = 1):
+        """Increase a counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter.
+        n : int, default=1
+            The increment.
+        """
+        with self.__lock__:
+            self.__counters__[name] = self.__counters__.get(name, 0) + n
+
+    def getStats(self) -> Dict[str, Any]:
+        """Return all the recorded statistics.
+
+        Returns
+        -------
+        dict
+            A dictionary of :code:`{'timings_ms': {name: {...}}, 'values': {name: {...}},
+            'counters': {name: int}}`, see :meth:`RollingHistogram.getDocument()`.
+        """
+        with self.__lock__:
+            return {'timings_ms': {k: v.getDocument() for k, v in sorted(self.__timings__.items())},
+                    'values': {k: v.getDocument() for k, v in sorted(self.__values__.items())},
+                    'counters': dict(sorted(self.__counters__.items()))}
+
+
+class NullStats(object):
+
+    """A recorder which records nothing, used when the statistics are disabled so the
+    instrumented code costs (almost) nothing.
+    """
+
+    enabled = False
+    __null_timer__ = nullcontext()
+
+    def reset(self):
+        pass
+
+    def timer(self, name):
+        return self.__null_timer__
+
+    def addTime(self, name, seconds):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def getStats(self):
+        return {}
+
+
+__null_stats__ = NullStats()
+
+def getNullStats():
+    """
+    :meta private:
+    """
+    return __null_stats__
+
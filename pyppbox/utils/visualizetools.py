@@ -22,7 +22,7 @@
 import cv2
 import numpy as np
 
-from .persontools import Person
+from .persontools import Person, PeopleFrame
 from .commontools import getCVMat
 from .logtools import add_error_log, add_warning_log
 
@@ -105,8 +105,9 @@ def visualizePeople(img, people, show_box=True, show_skl=(True,True,5), show_ids
     ----------
     img : str or Mat
         An image file or a :obj:`Mat` like image.
-    people : list[Person, ...]
-        Set a list of :class:`pyppbox.utils.persontools.Person` object found in the input :obj:`img`.
+    people : list[Person, ...] or PeopleFrame
+        Set a list of :class:`pyppbox.utils.persontools.Person` object, or a 
+        :class:`pyppbox.utils.persontools.PeopleFrame`, found in the input :obj:`img`.
     show_box : bool, default=True
         Indicate whether to visualize bounding boxes.
     show_skl : tuple(bool, bool, int), default=(True,True,5)
@@ -137,7 +138,7 @@ def visualizePeople(img, people, show_box=True, show_skl=(True,True,5), show_ids
     # Override `img_is_mat` to False when `img` is a file.
     if img_is_mat and isinstance(img, str): img_is_mat = False
     if not img_is_mat: img = getCVMat(img)
-    if isinstance(people, list):
+    if isinstance(people, (list, PeopleFrame)):
         if len(people) > 0:
             if isinstance(people[0], Person):
                 h, w, c = img.shape